@@ -0,0 +1,112 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compare the channels available for the data canal of an actor
+
+A producer process, playing the puller role, sends hwpc reports one by one to
+a consumer, playing the dispatcher role, through the pull socket of the
+consumer (zmq channel) or through a shared memory ring (shm channel). The
+consumer computes the latency of each report from the timestamp set by the
+producer.
+
+For each channel, display the median and 99th percentile latency of reports
+sent one by one and the throughput when the consumer is flooded
+
+usage : python -m benchmarks.channel [NUMBER_OF_MESSAGES]
+"""
+import multiprocessing
+import statistics
+import sys
+import time
+
+from powerapi.actor import SocketInterface, ZMQ_CHANNEL, SHM_CHANNEL
+from powerapi.test_utils.report.hwpc import gen_hwpc_reports
+
+
+class StampedMessage:
+    """
+    Message carrying a report and the time when it was sent
+    """
+    def __init__(self, report):
+        self.report = report
+        self.stamp = time.monotonic()
+
+
+def produce(socket_interface, reports, ready, paced):
+    socket_interface.connect_data()
+    ready.wait()
+    for report in reports:
+        socket_interface.send_data(StampedMessage(report))
+        if paced:
+            time.sleep(0.001)
+    socket_interface.close()
+
+
+def consume(socket_interface, number_of_messages):
+    latencies = []
+    while len(latencies) < number_of_messages:
+        for msg in socket_interface.receive_many():
+            latencies.append(time.monotonic() - msg.stamp)
+    return latencies
+
+
+def run(channel, reports, paced):
+    socket_interface = SocketInterface('bench_' + channel, 1000, channel=channel)
+    socket_interface.setup()
+    ready = multiprocessing.Event()
+    producer = multiprocessing.Process(target=produce, args=(socket_interface, reports, ready, paced))
+    producer.start()
+    begin = time.perf_counter()
+    ready.set()
+    latencies = consume(socket_interface, len(reports))
+    duration = time.perf_counter() - begin
+    producer.join()
+    socket_interface.close()
+    return sorted(latencies), duration
+
+
+def bench_channel(channel, reports):
+    latencies, _ = run(channel, reports[:len(reports) // 10], True)
+    _, flood_time = run(channel, reports, False)
+    return (statistics.median(latencies) * 1e6, latencies[int(len(latencies) * 0.99)] * 1e6,
+            len(reports) / flood_time)
+
+
+def main(number_of_messages):
+    reports = gen_hwpc_reports(number_of_messages, number_of_cores=8)
+
+    print('%-10s %16s %16s %18s' % ('channel', 'p50 (us/msg)', 'p99 (us/msg)', 'throughput (msg/s)'))
+    for channel in (ZMQ_CHANNEL, SHM_CHANNEL):
+        p50, p99, throughput = bench_channel(channel, reports)
+        print('%-10s %16.1f %16.1f %18.0f' % (channel, p50, p99, throughput))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
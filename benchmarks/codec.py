@@ -0,0 +1,94 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compare the codecs available for the actors socket interface
+
+For each codec, display the size of an encoded HWPCReport and the time needed
+to encode/decode it, to send it through a SocketInterface, and to forward a
+received report to another actor (as the dispatcher does), with the report
+decoded and encoded again or sent in a routing envelope
+
+usage : python -m benchmarks.codec [NUMBER_OF_MESSAGES]
+"""
+import sys
+import time
+
+from powerapi.actor import SocketInterface, CODECS, get_codec
+from powerapi.test_utils.report.hwpc import gen_hwpc_reports
+
+
+def bench_codec(codec_name, reports):
+    codec = get_codec(codec_name)
+    size = sum(sum(memoryview(frame).nbytes for frame in codec.encode(report)) for report in reports)
+
+    begin = time.perf_counter()
+    for report in reports:
+        codec.decode([memoryview(frame) for frame in codec.encode(report)])
+    codec_time = time.perf_counter() - begin
+
+    socket_interface = SocketInterface('bench_' + codec_name, 1000, codec=codec_name)
+    socket_interface.setup()
+    socket_interface.connect_data()
+    begin = time.perf_counter()
+    for report in reports:
+        socket_interface.send_data(report)
+        socket_interface.receive()
+    socket_time = time.perf_counter() - begin
+    socket_interface.close()
+
+    return size / len(reports), codec_time * 1e6 / len(reports), socket_time * 1e6 / len(reports)
+
+
+def bench_forward(codec_name, reports, envelope):
+    codec = get_codec(codec_name)
+    received = [[memoryview(frame) for frame in codec.encode_message(report, envelope)] for report in reports]
+
+    begin = time.perf_counter()
+    for frames in received:
+        msg = codec.decode_message(frames, open_envelope=False)
+        codec.encode_message(msg)
+    return (time.perf_counter() - begin) * 1e6 / len(reports)
+
+
+def main(number_of_messages):
+    reports = gen_hwpc_reports(number_of_messages)
+
+    print('%-10s %12s %16s %16s %16s %16s' % ('codec', 'bytes/msg', 'codec (us/msg)', 'socket (us/msg)',
+                                              'forward (us/msg)', 'envelope (us/msg)'))
+    for codec_name in CODECS:
+        size, codec_time, socket_time = bench_codec(codec_name, reports)
+        forward_time = bench_forward(codec_name, reports, False)
+        envelope_time = bench_forward(codec_name, reports, True)
+        print('%-10s %12.1f %16.2f %16.2f %16.2f %16.2f' % (codec_name, size, codec_time, socket_time, forward_time,
+                                                          envelope_time))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,91 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measure the time needed to find the handler of a message in an actor State
+and the DispatchRule of a report in a RouteTable
+
+Each structure is filled with NUMBER_OF_TYPES message types and the lookup
+is made for the last registered type, which was the worst case of the linear
+scan
+
+usage : python -m benchmarks.dispatch [NUMBER_OF_TYPES] [NUMBER_OF_LOOKUPS]
+"""
+import sys
+import time
+
+from mock import Mock
+
+from powerapi.actor import State
+from powerapi.dispatcher import RouteTable
+from powerapi.dispatch_rule import DispatchRule
+from powerapi.handler import Handler
+
+
+def gen_message_types(number_of_types):
+    return [type('Message' + str(i), (object,), {}) for i in range(number_of_types)]
+
+
+def bench_lookup(lookup, msg, number_of_lookups):
+    begin = time.perf_counter()
+    for _ in range(number_of_lookups):
+        lookup(msg)
+    return (time.perf_counter() - begin) * 1e9 / number_of_lookups
+
+
+def linear_lookup(mapping):
+    def lookup(msg):
+        for (msg_type, value) in mapping:
+            if isinstance(msg, msg_type):
+                return value
+        return None
+    return lookup
+
+
+def main(number_of_types, number_of_lookups):
+    message_types = gen_message_types(number_of_types)
+    msg = message_types[-1]()
+
+    state = State(Mock())
+    route_table = RouteTable()
+    for msg_type in message_types:
+        state.add_handler(msg_type, Handler(state))
+        route_table.dispatch_rule(msg_type, DispatchRule(primary=False))
+
+    print('%-32s %14s' % ('lookup (' + str(number_of_types) + ' types)', 'ns/lookup'))
+    print('%-32s %14.1f' % ('linear scan', bench_lookup(linear_lookup(state.handlers), msg, number_of_lookups)))
+    print('%-32s %14.1f' % ('State.get_corresponding_handler',
+                            bench_lookup(state.get_corresponding_handler, msg, number_of_lookups)))
+    print('%-32s %14.1f' % ('RouteTable.get_dispatch_rule',
+                            bench_lookup(route_table.get_dispatch_rule, msg, number_of_lookups)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
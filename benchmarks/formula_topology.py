@@ -0,0 +1,160 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compare the topologies available between the dispatcher and its formulas when
+the dispatcher hosts thousands of formulas
+
+The dispatcher and its formulas run as threads of the benchmark process, which
+plays the puller role. Formulas are created by sending one report per formula
+id, by steps of a tenth of the formula ids. After each step, display the file
+descriptors opened by the process, the time needed to create a formula and the
+dispatch latency (from the puller to the formula) of reports sent one by one to
+formulas picked at random.
+
+With the push topology, each formula binds a pull and a control socket and the
+dispatcher connects a push and a pair socket to them, the process runs out of
+file descriptors before the router topology, where each formula connects a
+single dealer socket to the router socket of the dispatcher. Each topology is
+measured in its own process
+
+usage : python -m benchmarks.formula_topology [NUMBER_OF_FORMULAS] [TOPOLOGY]
+"""
+import datetime
+import os
+import queue
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from powerapi.actor import Actor, State, Supervisor, TOPOLOGIES, THREAD_RUNTIME, INPROC_TRANSPORT
+from powerapi.dispatch_rule import HWPCDispatchRule, HWPCDepthLevel
+from powerapi.dispatcher import DispatcherActor, RouteTable
+from powerapi.handler import Handler, PoisonPillMessageHandler
+from powerapi.message import PoisonPillMessage
+from powerapi.report import Report, HWPCReport
+
+#: (int): number of steps used to create the formulas
+NUMBER_OF_STEPS = 10
+
+#: (int): number of reports sent one by one to measure the dispatch latency
+NUMBER_OF_SAMPLES = 500
+
+#: (queue.Queue): name of the formula and time of the reception of each report
+RECEPTIONS = queue.Queue()
+
+
+class ReceptionHandler(Handler):
+
+    def handle(self, msg):
+        RECEPTIONS.put((self.state.actor.name, time.perf_counter()))
+
+
+class BenchFormula(Actor):
+
+    def __init__(self, name, level_logger):
+        Actor.__init__(self, name, level_logger)
+        self.state = State(self)
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, PoisonPillMessageHandler(self.state))
+        self.add_handler(Report, ReceptionHandler(self.state))
+
+
+def gen_report(formula_index):
+    return HWPCReport(datetime.datetime.now(), 'sensor' + str(formula_index), 'target', {})
+
+
+def count_fds():
+    return len(os.listdir('/proc/self/fd'))
+
+
+def send_and_wait(dispatcher, formula_index):
+    begin = time.perf_counter()
+    dispatcher.send_data(gen_report(formula_index))
+    _, reception = RECEPTIONS.get(timeout=10)
+    return reception - begin
+
+
+def bench_topology(topology, number_of_formulas):
+    route_table = RouteTable()
+    route_table.dispatch_rule(HWPCReport, HWPCDispatchRule(HWPCDepthLevel.ROOT, primary=True))
+    dispatcher = DispatcherActor('bench_dispatcher', BenchFormula, route_table, runtime=THREAD_RUNTIME,
+                                 transport=INPROC_TRANSPORT, formula_runtime=THREAD_RUNTIME,
+                                 formula_topology=topology)
+    Supervisor().launch_actor(dispatcher)
+    max_fds, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    initial_fds = count_fds()
+
+    step = max(1, number_of_formulas // NUMBER_OF_STEPS)
+    created = 0
+    fds_per_formula = 0
+    while created < number_of_formulas:
+        next_step = min(number_of_formulas, created + step)
+        if count_fds() + fds_per_formula * (next_step - created) > max_fds * 0.9:
+            print('%-8s %9s   stopped, %d formulas would exceed the limit of %d file descriptors' %
+                  (topology, '', next_step, max_fds))
+            break
+
+        begin = time.perf_counter()
+        for formula_index in range(created, next_step):
+            send_and_wait(dispatcher, formula_index)
+        creation_time = (time.perf_counter() - begin) / (next_step - created)
+        created = next_step
+
+        fds = count_fds()
+        fds_per_formula = (fds - initial_fds) / created
+        latencies = sorted(send_and_wait(dispatcher, random.randrange(created)) for _ in range(NUMBER_OF_SAMPLES))
+        print('%-8s %9d %8d %12.1f %15.2f %12.1f %12.1f' %
+              (topology, created, fds, fds_per_formula, creation_time * 1e3, statistics.median(latencies) * 1e6,
+               latencies[int(len(latencies) * 0.99)] * 1e6))
+        sys.stdout.flush()
+
+    dispatcher.hard_kill()
+    dispatcher.join()
+
+
+def main(number_of_formulas, topology=None):
+    if topology is not None:
+        bench_topology(topology, number_of_formulas)
+        return
+    print('%-8s %9s %8s %12s %15s %12s %12s' % ('topology', 'formulas', 'fds', 'fds/formula', 'create (ms/f)',
+                                                'p50 (us)', 'p99 (us)'))
+    sys.stdout.flush()
+    for topology_name in TOPOLOGIES:
+        subprocess.run([sys.executable, '-m', 'benchmarks.formula_topology', str(number_of_formulas), topology_name],
+                       check=False)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,91 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measure the per message overhead of the debug logging of the actors hot paths
+
+Compare the former eager logging (message built with str and concatenation
+before calling logger.debug) to the HotPathLogger, with the debug level
+disabled, enabled and enabled with sampling. Logged records are handled by a
+NullHandler, so only the cost of building them is measured
+
+usage : python -m benchmarks.hot_logging [NUMBER_OF_MESSAGES]
+        python -O -m benchmarks.hot_logging [NUMBER_OF_MESSAGES]
+"""
+import logging
+import sys
+import time
+
+from powerapi.test_utils.report.hwpc import gen_hwpc_reports
+from powerapi.utils import HotPathLogger
+
+NAME = 'bench_actor'
+
+
+def eager(logger, _, reports):
+    for report in reports:
+        logger.debug('send data [' + str(report) + '] to ' + NAME)
+
+
+def lazy(_, hot_logger, reports):
+    for report in reports:
+        if __debug__:
+            hot_logger.debug('send data [%s] to %s', report, NAME)
+
+
+def bench(function, level, sample_rate, reports):
+    logger = logging.getLogger('bench_hot_logging')
+    logger.propagate = False
+    logger.handlers = [logging.NullHandler()]
+    logger.setLevel(level)
+    hot_logger = HotPathLogger(logger, sample_rate)
+
+    begin = time.perf_counter()
+    function(logger, hot_logger, reports)
+    return (time.perf_counter() - begin) / len(reports) * 1e9
+
+
+def main(number_of_messages):
+    reports = gen_hwpc_reports(number_of_messages, number_of_cores=8)
+    cases = [('eager', eager, logging.WARNING, 1),
+             ('lazy', lazy, logging.WARNING, 1),
+             ('eager', eager, logging.DEBUG, 1),
+             ('lazy', lazy, logging.DEBUG, 1),
+             ('lazy 1/100', lazy, logging.DEBUG, 100)]
+
+    if not __debug__:
+        print('python runs with -O : the lazy hot path logging code is removed')
+    print('%-12s %-8s %18s' % ('logging', 'level', 'overhead (ns/msg)'))
+    for name, function, level, sample_rate in cases:
+        overhead = bench(function, level, sample_rate, reports)
+        print('%-12s %-8s %18.0f' % (name, logging.getLevelName(level), overhead))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,107 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Measure the time needed by a JsonStream to frame hwpc reports of 1 KB to 1 MB,
+with each framing
+
+For each size, the json reports of TOTAL_SIZE bytes are written in a stream
+reader and read with a JsonStream. The reports are those of many-core
+sensors : a group of events for each core of each socket
+
+usage : python -m benchmarks.json_stream [FRAMING...]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from powerapi.utils import JsonStream, FRAMINGS, NEWLINE_FRAMING, LENGTH_PREFIXED_FRAMING, LENGTH_PREFIX
+
+#: (tuple): approximate size (in bytes) of the benchmarked reports
+REPORT_SIZES = (1 << 10, 10 << 10, 100 << 10, 1 << 20)
+#: (int): number of bytes of reports framed for each size
+TOTAL_SIZE = 16 << 20
+#: (int): number of cores of a socket
+CORES_PER_SOCKET = 64
+
+
+def gen_json_report(size):
+    """
+    :return str: a json hwpc report of about size bytes
+    """
+    def gen_core(core_id):
+        value = core_id * 1000
+        return {'MPERF': value, 'APERF': value + 1, 'TSC': value + 2, 'time_enabled': value + 3,
+                'time_running': value + 4}
+
+    report = {'timestamp': '2020-09-08T15:46:44.856', 'sensor': 'sensor', 'target': 'all', 'groups': {'msr': {}}}
+    sockets = report['groups']['msr']
+    core_size = len(json.dumps({'0': gen_core(0)}))
+    for core_id in range(max(1, size // core_size)):
+        sockets.setdefault(str(core_id // CORES_PER_SOCKET), {})[str(core_id)] = gen_core(core_id)
+    return json.dumps(report)
+
+
+def frame(json_report, framing):
+    data = json_report.encode('utf-8')
+    if framing == NEWLINE_FRAMING:
+        return data + b'\n'
+    if framing == LENGTH_PREFIXED_FRAMING:
+        return LENGTH_PREFIX.pack(len(data)) + data
+    return data
+
+
+async def read_all(data, framing):
+    stream_reader = asyncio.StreamReader(limit=len(data) + 1)
+    stream_reader.feed_data(data)
+    stream_reader.feed_eof()
+    stream = JsonStream(stream_reader, framing=framing)
+
+    number_of_reports = 0
+    begin = time.perf_counter()
+    while await stream.read_json_object() is not None:
+        number_of_reports += 1
+    return number_of_reports, time.perf_counter() - begin
+
+
+def main(framings):
+    print('%-8s %10s %8s %10s %15s' % ('framing', 'size (KB)', 'reports', 'MB/s', 'us per report'))
+    for size in REPORT_SIZES:
+        json_report = gen_json_report(size)
+        for framing in framings:
+            data = frame(json_report, framing) * max(4, TOTAL_SIZE // size)
+            number_of_reports, duration = asyncio.run(read_all(data, framing))
+            print('%-8s %10.1f %8d %10.1f %15.1f' % (framing, len(json_report) / 1024, number_of_reports,
+                                                     len(data) / duration / (1 << 20),
+                                                     duration / number_of_reports * 1e6))
+            sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or FRAMINGS)
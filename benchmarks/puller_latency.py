@@ -0,0 +1,151 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Measure the ingest latency of a puller reading a stream database that has to
+be polled, and the time needed to stop it
+
+Reports are appended to an in-memory stream database at random intervals (a
+mean of INTERVAL ms), the puller reads them and sends them to a dispatcher
+that records the time elapsed since their insertion. The puller then is
+killed, and the time until its termination is measured. The puller and the
+dispatcher run as threads of the benchmark process
+
+usage : python -m benchmarks.puller_latency [NUMBER_OF_REPORTS] [INTERVAL]
+"""
+import collections
+import queue
+import random
+import statistics
+import sys
+import threading
+import time
+
+from powerapi.actor import Actor, State, Supervisor, THREAD_RUNTIME, INPROC_TRANSPORT
+from powerapi.database import BaseDB, IterDB
+from powerapi.filter import Filter
+from powerapi.handler import Handler, PoisonPillMessageHandler, StartHandler
+from powerapi.message import PoisonPillMessage, StartMessage
+from powerapi.puller import PullerActor
+from powerapi.report import Report
+
+#: (queue.Queue): latency (in s) of each report received by the dispatcher
+LATENCIES = queue.Queue()
+
+
+class QueueIterDB(IterDB):
+
+    def __init__(self, reports):
+        IterDB.__init__(self, None, None, True)
+        self.reports = reports
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return self.reports.popleft()
+        except IndexError:
+            raise StopIteration()
+
+
+class QueueDB(BaseDB):
+    """
+    Stream database whose reports are appended to a deque, it can't tell when
+    a report is available and has to be polled
+    """
+
+    def __init__(self):
+        BaseDB.__init__(self)
+        self.reports = collections.deque()
+
+    def connect(self):
+        pass
+
+    def iter(self, report_model, stream_mode):
+        return QueueIterDB(self.reports)
+
+
+class LatencyHandler(Handler):
+
+    def handle(self, msg):
+        LATENCIES.put(time.perf_counter() - msg.timestamp)
+
+
+class BenchDispatcher(Actor):
+
+    def __init__(self, name):
+        Actor.__init__(self, name, runtime=THREAD_RUNTIME, transport=INPROC_TRANSPORT)
+        self.state = State(self)
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, PoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, StartHandler(self.state))
+        self.add_handler(Report, LatencyHandler(self.state))
+
+
+def produce(database, number_of_reports, interval):
+    for _ in range(number_of_reports):
+        time.sleep(random.expovariate(1 / interval))
+        database.reports.append(Report(time.perf_counter(), 'sensor', 'target'))
+
+
+def main(number_of_reports, interval):
+    supervisor = Supervisor()
+    dispatcher = BenchDispatcher('bench_dispatcher')
+    supervisor.launch_actor(dispatcher)
+
+    database = QueueDB()
+    report_filter = Filter()
+    report_filter.filter(lambda report: True, dispatcher)
+    puller = PullerActor('bench_puller', database, report_filter, None, stream_mode=True)
+    puller.set_runtime(THREAD_RUNTIME, INPROC_TRANSPORT)
+    supervisor.launch_actor(puller)
+
+    producer = threading.Thread(target=produce, args=(database, number_of_reports, interval / 1000))
+    producer.start()
+    latencies = sorted(LATENCIES.get(timeout=10) for _ in range(number_of_reports))
+    producer.join()
+
+    # the puller closes the sockets of its dispatcher when it is killed
+    dispatcher.hard_kill()
+    dispatcher.join()
+    begin = time.perf_counter()
+    puller.hard_kill()
+    puller.join()
+    shutdown = time.perf_counter() - begin
+
+    print('%8s %12s %12s %12s %15s' % ('reports', 'p50 (ms)', 'p99 (ms)', 'max (ms)', 'shutdown (ms)'))
+    print('%8d %12.2f %12.2f %12.2f %15.1f' % (number_of_reports, statistics.median(latencies) * 1e3,
+                                               latencies[int(len(latencies) * 0.99)] * 1e3, latencies[-1] * 1e3,
+                                               shutdown * 1e3))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,160 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measure the effect of the actors scheduling on their throughput and jitter and
+on the monitored workload
+
+A producer process, playing the puller role, sends hwpc reports to a
+consumer process, playing the dispatcher role, while a workload made of one
+busy process per available core runs at the default priority. The benchmark
+is run with different schedulings applied to the producer and the consumer :
+
+ - default : inherited affinity and policy
+ - nice : niceness 10
+ - batch : SCHED_BATCH policy
+ - idle : SCHED_IDLE policy
+ - pinned : actors pinned on the last available core (housekeeping core),
+            the workload avoiding it (only with more than one core)
+
+For each scheduling, display the actors throughput, the median, 99th
+percentile and standard deviation (jitter) of the reports latency and the
+workload throughput
+
+usage : python -m benchmarks.scheduling [NUMBER_OF_MESSAGES]
+"""
+import logging
+import multiprocessing
+import statistics
+import sys
+import time
+
+from powerapi.actor import SocketInterface, Scheduling, get_available_cpus, BATCH_POLICY, IDLE_POLICY
+from powerapi.test_utils.report.hwpc import gen_hwpc_reports
+
+LOGGER = logging.getLogger('benchmark')
+
+
+class StampedMessage:
+    """
+    Message carrying a report and the time when it was sent
+    """
+    def __init__(self, report):
+        self.report = report
+        self.stamp = time.monotonic()
+
+
+def produce(socket_interface, scheduling, reports, ready):
+    if scheduling is not None:
+        scheduling.apply(LOGGER)
+    socket_interface.connect_data()
+    ready.wait()
+    for report in reports:
+        socket_interface.send_data(StampedMessage(report))
+    socket_interface.close()
+
+
+def consume(socket_interface, scheduling, number_of_messages, ready, results):
+    if scheduling is not None:
+        scheduling.apply(LOGGER)
+    socket_interface.setup()
+    ready.set()
+    latencies = []
+    begin = time.perf_counter()
+    while len(latencies) < number_of_messages:
+        for msg in socket_interface.receive_many():
+            latencies.append(time.monotonic() - msg.stamp)
+    results.put((latencies, time.perf_counter() - begin))
+    socket_interface.close()
+
+
+def busy_loop(cpus, counter, stop):
+    if cpus is not None:
+        Scheduling(cpus).apply(LOGGER)
+    iterations = 0
+    while not stop.is_set():
+        for _ in range(10000):
+            iterations += 1
+    with counter.get_lock():
+        counter.value += iterations
+
+
+def run(scheduling, workload_cpus, reports):
+    stop = multiprocessing.Event()
+    counter = multiprocessing.Value('Q', 0)
+    workload = [multiprocessing.Process(target=busy_loop, args=(workload_cpus, counter, stop))
+                for _ in range(len(get_available_cpus()))]
+    for process in workload:
+        process.start()
+
+    socket_interface = SocketInterface('bench_scheduling', 1000)
+    ready = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    consumer = multiprocessing.Process(target=consume, args=(socket_interface, scheduling, len(reports), ready,
+                                                             results))
+    consumer.start()
+    ready.wait()
+    producer = multiprocessing.Process(target=produce, args=(socket_interface, scheduling, reports, ready))
+    begin = time.perf_counter()
+    producer.start()
+    latencies, duration = results.get()
+    workload_duration = time.perf_counter() - begin
+    producer.join()
+    consumer.join()
+
+    stop.set()
+    for process in workload:
+        process.join()
+    return sorted(latencies), duration, counter.value / workload_duration
+
+
+def main(number_of_messages):
+    reports = gen_hwpc_reports(number_of_messages, number_of_cores=8)
+    cpus = get_available_cpus()
+    housekeeping_cpu = max(cpus)
+
+    schedulings = [('default', None, None),
+                   ('nice', Scheduling(nice=10), None),
+                   ('batch', Scheduling(policy=BATCH_POLICY), None),
+                   ('idle', Scheduling(policy=IDLE_POLICY), None)]
+    if len(cpus) > 1:
+        schedulings.append(('pinned', Scheduling({housekeeping_cpu}), cpus - {housekeeping_cpu}))
+
+    print('%-10s %18s %16s %16s %16s %20s' % ('scheduling', 'throughput (msg/s)', 'p50 (us/msg)', 'p99 (us/msg)',
+                                               'jitter (us)', 'workload (Mit/s)'))
+    for name, scheduling, workload_cpus in schedulings:
+        latencies, duration, workload_throughput = run(scheduling, workload_cpus, reports)
+        print('%-10s %18.0f %16.1f %16.1f %16.1f %20.1f' % (
+            name, len(reports) / duration, statistics.median(latencies) * 1e6,
+            latencies[int(len(latencies) * 0.99)] * 1e6, statistics.pstdev(latencies) * 1e6,
+            workload_throughput / 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,132 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Compare the json and the binary protocols of the SocketDB
+
+For hwpc reports of sensors with an increasing number of cores, measure :
+
+- the time needed to decode a report received on a connection : framing,
+  parsing and creation of the HWPCReport
+- the number of reports per second read by a puller from a SocketDB, when
+  NUMBER_OF_CLIENTS sensors send NUMBER_OF_REPORTS reports each as fast as
+  possible
+
+usage : python -m benchmarks.socket_binary_load [NUMBER_OF_REPORTS] [NUMBER_OF_CLIENTS]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from benchmarks.socket_puller_throughput import bench_throughput
+from powerapi.database import BINARY_PROTOCOL_HEADER
+from powerapi.database.binary_protocol import BinaryReportStream
+from powerapi.report import HWPCReport
+from powerapi.report_model import HWPCModel
+from powerapi.test_utils.db.socket import ClientThread, BinaryClientThread, BinaryReportEncoder
+from powerapi.test_utils.report.hwpc import gen_hwpc_reports
+from powerapi.utils import JsonStream
+
+#: (tuple): number of cores of the benchmarked sensors, on 2 sockets
+NUMBERS_OF_CORES = (4, 32, 128)
+#: (int): number of reports decoded for the decoding time
+NUMBER_OF_DECODED_REPORTS = 1000
+
+
+def gen_reports(number_of_reports, number_of_cores):
+    """
+    :return list: the reports of a sensor with a group of 4 events for each core
+    """
+    reports = gen_hwpc_reports(number_of_reports, number_of_sockets=2, number_of_cores=number_of_cores // 2)
+    for report in reports:
+        report.timestamp = report.timestamp.replace(microsecond=1000)
+    return reports
+
+
+def to_json(report):
+    return {'timestamp': report.timestamp.strftime('%Y-%m-%dT%H:%M:%S.%f'), 'sensor': report.sensor,
+            'target': report.target, 'groups': report.groups}
+
+
+async def decode_json(data):
+    stream_reader = asyncio.StreamReader(limit=len(data) + 1)
+    stream_reader.feed_data(data)
+    stream_reader.feed_eof()
+    stream = JsonStream(stream_reader)
+    report_model = HWPCModel()
+    json_str = await stream.read_json_object()
+    while json_str is not None:
+        HWPCReport.deserialize(report_model.from_json(json_str))
+        json_str = await stream.read_json_object()
+
+
+async def decode_binary(data):
+    stream_reader = asyncio.StreamReader(limit=len(data) + 1)
+    stream_reader.feed_data(data)
+    stream_reader.feed_eof()
+    stream = BinaryReportStream(stream_reader)
+    while await stream.read_report() is not None:
+        pass
+
+
+def bench_decoding(reports):
+    """
+    :return tuple: size (in bytes) of a report and time (in s) to decode it,
+                   with each protocol
+    """
+    json_data = b''.join(json.dumps(to_json(report)).encode('utf-8') for report in reports)
+    encoder = BinaryReportEncoder()
+    binary_data = b''.join(encoder.encode(report) for report in reports)
+
+    results = []
+    for decode, data in ((decode_json, json_data), (decode_binary, binary_data)):
+        begin = time.perf_counter()
+        asyncio.run(decode(data))
+        results.append((len(data) / len(reports), (time.perf_counter() - begin) / len(reports)))
+    return results
+
+
+def main(number_of_reports, number_of_clients):
+    print('%8s %-8s %12s %12s %15s' % ('cores', 'protocol', 'size (B)', 'decode (us)', 'reports/s'))
+    for number_of_cores in NUMBERS_OF_CORES:
+        decoding = bench_decoding(gen_reports(NUMBER_OF_DECODED_REPORTS, number_of_cores))
+        reports = gen_reports(number_of_reports, number_of_cores)
+        json_reports = [to_json(report) for report in reports]
+        for protocol, (size, decoding_time), client_reports, client_class in (
+                ('json', decoding[0], json_reports, ClientThread),
+                ('binary', decoding[1], reports, BinaryClientThread)):
+            throughput = bench_throughput(client_reports, number_of_clients, client_class)
+            print('%8d %-8s %12.0f %12.1f %15s' % (number_of_cores, protocol, size, decoding_time * 1e6,
+                                                   'timeout' if throughput is None else '%.0f' % throughput))
+            sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4)
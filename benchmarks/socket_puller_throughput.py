@@ -0,0 +1,170 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Measure the throughput of a puller reading a SocketDB
+
+Clients connect to the SocketDB and each sends NUMBER_OF_REPORTS hwpc reports
+as fast as possible, the puller reads them and sends them to a dispatcher
+that counts them. The throughput is the number of reports received by the
+dispatcher per second, from the connection of the clients to the reception
+of the last report. The puller and the dispatcher run as threads of the
+benchmark process
+
+usage : python -m benchmarks.socket_puller_throughput [NUMBER_OF_REPORTS] [NUMBER_OF_CLIENTS...]
+"""
+import json
+import socket
+import sys
+import threading
+import time
+
+import powerapi.test_utils.report as test_utils_report
+from powerapi.actor import Actor, State, Supervisor, THREAD_RUNTIME, INPROC_TRANSPORT
+from powerapi.database import SocketDB
+from powerapi.filter import Filter
+from powerapi.handler import Handler, PoisonPillMessageHandler, StartHandler
+from powerapi.message import PoisonPillMessage, StartMessage
+from powerapi.puller import PullerActor
+from powerapi.report import Report
+from powerapi.report_model import HWPCModel
+from powerapi.test_utils.db.socket import ClientThread
+
+#: (int): number of clients connected to the SocketDB by default
+NUMBER_OF_CLIENTS = (1, 4)
+#: (float): time (in s) to wait for the reports
+BENCH_TIMEOUT = 120
+
+
+class CountHandler(Handler):
+
+    def handle(self, msg):
+        self.state.received += 1
+        if self.state.received == self.state.expected:
+            self.state.done.set()
+
+
+class CountState(State):
+
+    def __init__(self, actor, expected):
+        State.__init__(self, actor)
+        self.expected = expected
+        self.received = 0
+        self.done = threading.Event()
+
+
+class CountDispatcher(Actor):
+
+    def __init__(self, name, expected):
+        Actor.__init__(self, name, runtime=THREAD_RUNTIME, transport=INPROC_TRANSPORT)
+        self.state = CountState(self, expected)
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, PoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, StartHandler(self.state))
+        self.add_handler(Report, CountHandler(self.state))
+
+
+def load_reports(number_of_reports):
+    with open(test_utils_report.__path__[0] + '/hwpc.json', 'r') as json_file:
+        reports = json.load(json_file)['reports']
+    return [reports[i % len(reports)] for i in range(number_of_reports)]
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_server(port):
+    """
+    Wait until the SocketDB listens, the puller starts it after its
+    initialization
+    """
+    deadline = time.perf_counter() + BENCH_TIMEOUT
+    while time.perf_counter() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return
+        except ConnectionRefusedError:
+            time.sleep(0.01)
+
+
+def bench_throughput(reports, number_of_clients, client_class=ClientThread):
+    """
+    :return float: number of reports received by the dispatcher per second,
+                   None if they weren't all received
+    """
+    supervisor = Supervisor()
+    dispatcher = CountDispatcher('bench_dispatcher', len(reports) * number_of_clients)
+    supervisor.launch_actor(dispatcher)
+
+    port = get_free_port()
+    report_filter = Filter()
+    report_filter.filter(lambda report: True, dispatcher)
+    puller = PullerActor('bench_puller', SocketDB(port), report_filter, HWPCModel(), stream_mode=True)
+    puller.set_runtime(THREAD_RUNTIME, INPROC_TRANSPORT)
+    supervisor.launch_actor(puller)
+    wait_server(port)
+
+    clients = [client_class(reports, port) for _ in range(number_of_clients)]
+    begin = time.perf_counter()
+    for client in clients:
+        client.start()
+    received = dispatcher.state.done.wait(BENCH_TIMEOUT)
+    duration = time.perf_counter() - begin
+    for client in clients:
+        client.join()
+
+    # the puller closes the sockets of its dispatcher when it is killed
+    dispatcher.hard_kill()
+    dispatcher.join()
+    puller.hard_kill()
+    puller.join()
+
+    if not received:
+        return None
+    return dispatcher.state.expected / duration
+
+
+def main(number_of_reports, numbers_of_clients):
+    reports = load_reports(number_of_reports)
+    print('%8s %8s %15s' % ('clients', 'reports', 'reports/s'))
+    for number_of_clients in numbers_of_clients:
+        throughput = bench_throughput(reports, number_of_clients)
+        if throughput is None:
+            print('%8d %8d   timeout' % (number_of_clients, len(reports) * number_of_clients))
+        else:
+            print('%8d %8d %15.0f' % (number_of_clients, len(reports) * number_of_clients, throughput))
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         [int(arg) for arg in sys.argv[2:]] or NUMBER_OF_CLIENTS)
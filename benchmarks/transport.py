@@ -0,0 +1,184 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compare the transports available for the actors sockets
+
+Messages are sent through a chain of actors that mimic the
+puller -> dispatcher -> formula -> pusher pipeline : the benchmark process plays
+the puller role and three actors forward the messages to the next one. The last
+actor computes the latency of each message from the timestamp set by the
+benchmark process.
+
+With the inproc transport, the actors run as threads of the benchmark process.
+
+For each transport, display the median and 99th percentile latency of messages
+sent one by one and the throughput of the chain when it is flooded
+
+usage : python -m benchmarks.transport [NUMBER_OF_MESSAGES]
+"""
+import statistics
+import sys
+import time
+
+from powerapi.actor import Actor, State, TCP_TRANSPORT, IPC_TRANSPORT, INPROC_TRANSPORT
+from powerapi.actor import PROCESS_RUNTIME, THREAD_RUNTIME
+from powerapi.handler import InitHandler, StartHandler, PoisonPillMessageHandler
+from powerapi.message import StartMessage, PoisonPillMessage, OKMessage
+from powerapi.test_utils.report.hwpc import gen_hwpc_reports
+
+#: (int): number of actors in the chain
+CHAIN_LENGTH = 3
+
+
+class StampedMessage:
+    """
+    Message carrying a report and the time when it was sent
+    """
+    def __init__(self, report):
+        self.report = report
+        self.stamp = time.monotonic()
+
+
+class FlushMessage:
+    """
+    Message asking the last actor of the chain to send back the latencies
+    measured since the last flush
+    """
+
+
+class ForwardState(State):
+
+    def __init__(self, actor, next_actor):
+        State.__init__(self, actor)
+        self.next_actor = next_actor
+        self.latencies = []
+
+
+class ForwardStartHandler(StartHandler):
+
+    def initialization(self):
+        if self.state.next_actor is not None:
+            self.state.next_actor.connect_data()
+
+
+class ForwardHandler(InitHandler):
+    """
+    Forward messages to the next actor of the chain or, for the last actor,
+    record their latency
+    """
+
+    def handle_batch(self, msgs):
+        if not self.state.initialized:
+            return
+        if self.state.next_actor is not None:
+            self.state.next_actor.send_data_many(msgs)
+            return
+        for msg in msgs:
+            self.handle(msg)
+
+    def handle(self, msg):
+        if self.state.next_actor is not None:
+            self.state.next_actor.send_data(msg)
+        elif isinstance(msg, FlushMessage):
+            self.state.actor.send_control(self.state.latencies)
+            self.state.latencies = []
+        else:
+            self.state.latencies.append(time.monotonic() - msg.stamp)
+
+
+class ForwardActor(Actor):
+
+    def __init__(self, name, next_actor, transport, runtime):
+        Actor.__init__(self, name, timeout=1000, transport=transport, runtime=runtime)
+        self.state = ForwardState(self, next_actor)
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, PoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, ForwardStartHandler(self.state))
+        self.add_handler(StampedMessage, ForwardHandler(self.state))
+        self.add_handler(FlushMessage, ForwardHandler(self.state))
+
+
+def start_chain(transport):
+    runtime = THREAD_RUNTIME if transport == INPROC_TRANSPORT else PROCESS_RUNTIME
+    actors = []
+    next_actor = None
+    for index in range(CHAIN_LENGTH):
+        next_actor = ForwardActor('bench_' + transport + '_' + str(index), next_actor, transport, runtime)
+        actors.append(next_actor)
+    for actor in actors:
+        actor.start()
+        actor.connect_control()
+        actor.send_control(StartMessage())
+        assert isinstance(actor.receive_control(2000), OKMessage)
+    first = actors[-1]
+    first.connect_data()
+    return first, actors[0], actors
+
+
+def stop_chain(actors):
+    for actor in actors:
+        actor.send_control(PoisonPillMessage(soft=False))
+    for actor in actors:
+        actor.join()
+
+
+def bench_transport(transport, reports):
+    first, last, actors = start_chain(transport)
+
+    for report in reports[:len(reports) // 10]:
+        first.send_data(StampedMessage(report))
+        time.sleep(0.001)
+    first.send_data(FlushMessage())
+    latencies = sorted(last.receive_control(10000))
+
+    begin = time.perf_counter()
+    for report in reports:
+        first.send_data(StampedMessage(report))
+    first.send_data(FlushMessage())
+    last.receive_control(60000)
+    flood_time = time.perf_counter() - begin
+
+    stop_chain(actors)
+    return (statistics.median(latencies) * 1e6, latencies[int(len(latencies) * 0.99)] * 1e6,
+            len(reports) / flood_time)
+
+
+def main(number_of_messages):
+    reports = gen_hwpc_reports(number_of_messages, number_of_cores=8)
+
+    print('%-10s %16s %16s %18s' % ('transport', 'p50 (us/msg)', 'p99 (us/msg)', 'throughput (msg/s)'))
+    for transport in (TCP_TRANSPORT, IPC_TRANSPORT, INPROC_TRANSPORT):
+        p50, p99, throughput = bench_transport(transport, reports)
+        print('%-10s %16.1f %16.1f %18.0f' % (transport, p50, p99, throughput))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
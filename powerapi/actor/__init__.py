@@ -28,8 +28,32 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from powerapi.actor.safe_context import SafeContext
-from powerapi.actor.socket_interface import SocketInterface, NotConnectedException
+from powerapi.actor.codec import Codec, PickleCodec, Pickle5Codec, ReportCodec, UnknowCodecException
+from powerapi.actor.codec import CODECS, DEFAULT_CODEC, register_codec, get_codec
+from powerapi.actor.codec import Envelope, ENVELOPE_MARKER
+from powerapi.actor.credits import Credits, NoCreditException
+from powerapi.actor.shm_ring import ShmRing, RingClosedException, DEFAULT_RING_CAPACITY
+from powerapi.actor.socket_interface import SocketInterface, NotConnectedException, UnknowTransportException
+from powerapi.actor.socket_interface import TRANSPORTS, DEFAULT_TRANSPORT, TCP_TRANSPORT, IPC_TRANSPORT, INPROC_TRANSPORT
+from powerapi.actor.socket_interface import UnknowChannelException, CHANNELS, DEFAULT_CHANNEL, ZMQ_CHANNEL, SHM_CHANNEL
+from powerapi.actor.socket_interface import BadAddressException, DEFAULT_BIND_ADDRESS
+from powerapi.actor.registry import Registry, RegistryTimeoutException, UnknowActorException
+from powerapi.actor.registry import register_actor, unregister_actor, lookup_actor
+from powerapi.actor.remote_actor import RemoteActor
+from powerapi.actor.router import Router, DealerInterface, UnknowTopologyException
+from powerapi.actor.router import TOPOLOGIES, DEFAULT_TOPOLOGY, PUSH_TOPOLOGY, ROUTER_TOPOLOGY
 from powerapi.actor.supervisor import Supervisor, ActorInitError, ActorAlreadySupervisedException
-from powerapi.actor.supervisor import CrashConfigureError, FailConfigureError
+from powerapi.actor.supervisor import CrashConfigureError, FailConfigureError, KILL_GRACE_PERIOD
+from powerapi.actor.stats import LatencyHistogram, ActorStats, StatsDumper, DEFAULT_STATS_PERIOD
+from powerapi.actor.embedded import QueueInterface, get_embedded_loop, run_embedded_loop, wait_embedded_actors
+from powerapi.actor.embedded import join_embedded_actors
+from powerapi.actor.scheduling import Scheduling, UnknowSchedulingPolicyException, BadCPUListException
+from powerapi.actor.scheduling import parse_cpu_list, get_available_cpus, role_scheduling
+from powerapi.actor.scheduling import ROLES, PULLER_ROLE, DISPATCHER_ROLE, FORMULA_ROLE, PUSHER_ROLE
+from powerapi.actor.scheduling import SCHEDULING_POLICIES, OTHER_POLICY, BATCH_POLICY, IDLE_POLICY
+from powerapi.actor.profiler import CProfiler, SamplingProfiler, UnknowProfileModeException, create_profiler
+from powerapi.actor.profiler import PROFILE_MODES, DEFAULT_PROFILE_MODE, CPROFILE_MODE, SAMPLING_MODE
+from powerapi.actor.profiler import DEFAULT_SAMPLING_INTERVAL, PROFILE_DIRECTORY, PROFILE_START_SIGNAL, PROFILE_STOP_SIGNAL
 from powerapi.actor.state import State
-from powerapi.actor.actor import Actor
+from powerapi.actor.actor import Actor, UnknowRuntimeException
+from powerapi.actor.actor import RUNTIMES, DEFAULT_RUNTIME, PROCESS_RUNTIME, THREAD_RUNTIME, EMBEDDED_RUNTIME
@@ -27,20 +27,57 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import copy
 import logging
 import signal
 import multiprocessing
 import setproctitle
+import os
 import sys
 import threading
+import time
 import traceback
 
 import zmq
 
-from powerapi.actor import State, SocketInterface
-from powerapi.message import PoisonPillMessage
+from powerapi.actor import State, SocketInterface, SafeContext, DEFAULT_CODEC, DEFAULT_TRANSPORT, DEFAULT_CHANNEL
+from powerapi.actor.stats import ActorStats
+from powerapi.actor.embedded import QueueInterface, current_actor, get_embedded_loop, run_embedded_loop
+from powerapi.actor.router import DealerInterface
+from powerapi.actor.profiler import create_profiler, get_profile_path, pop_profile_request
+from powerapi.actor.profiler import DEFAULT_PROFILE_MODE, DEFAULT_SAMPLING_INTERVAL, PROFILE_DIRECTORY
+from powerapi.actor.profiler import PROFILE_START_SIGNAL, PROFILE_STOP_SIGNAL
+from powerapi.exception import PowerAPIException
+from powerapi.message import PoisonPillMessage, StatsRequestMessage, ProfileStartMessage, ProfileStopMessage
 from powerapi.message import UnknowMessageTypeException
-from powerapi.handler import HandlerException
+from powerapi.handler import HandlerException, StatsRequestHandler, ProfileHandler
+from powerapi.utils import HotPathLogger
+
+
+#: (str): the actor runs in its own process
+PROCESS_RUNTIME = 'process'
+#: (str): the actor runs in a thread of the process that starts it
+THREAD_RUNTIME = 'thread'
+#: (str): the actor runs as an asyncio task of the event loop shared by all
+#: the embedded actors of the process that starts it
+EMBEDDED_RUNTIME = 'embedded'
+
+RUNTIMES = (PROCESS_RUNTIME, THREAD_RUNTIME, EMBEDDED_RUNTIME)
+DEFAULT_RUNTIME = PROCESS_RUNTIME
+
+#: (int): time (in ms) given to the sockets of an actor process to send their
+#: queued messages before the process exits
+EXIT_LINGER = 1000
+
+
+class UnknowRuntimeException(PowerAPIException):
+    """
+    Exception raised when attempting to run an actor with a runtime that
+    doesn't exist
+    """
+    def __init__(self, runtime):
+        PowerAPIException.__init__(self, 'unknow runtime ' + runtime)
+        self.runtime = runtime
 
 
 class Actor(multiprocessing.Process):
@@ -61,6 +98,8 @@ class Actor(multiprocessing.Process):
     |                                 | :meth:`send_control <powerapi.actor.actor.Actor.send_control>`                             |
     |                                 +--------------------------------------------------------------------------------------------+
     |                                 | :meth:`send_data <powerapi.actor.actor.Actor.send_data>`                                   |
+    |                                 +--------------------------------------------------------------------------------------------+
+    |                                 | :meth:`send_data_many <powerapi.actor.actor.Actor.send_data_many>`                         |
     +---------------------------------+--------------------------------------------------------------------------------------------+
     | Server interface                | :meth:`setup <powerapi.actor.actor.Actor.setup>`                                           |
     |                                 +--------------------------------------------------------------------------------------------+
@@ -76,9 +115,32 @@ class Actor(multiprocessing.Process):
     +---------------------------------+--------------------------------------------------------------------------------------------+
     | Server interface                | :attr:`state <powerapi.actor.actor.Actor.state>`                                           |
     +---------------------------------+--------------------------------------------------------------------------------------------+
+
+    :Runtime:
+
+    By default, an actor runs in its own process. With the thread runtime, the
+    actor runs in a thread of the process that starts it, that share the zmq
+    context of this process. Its sockets should then use the inproc
+    transport. The thread running the actor uses its own copy of the
+    socket interface, so the actor and the threads that communicate with it
+    never share a zmq socket.
+
+    With the embedded runtime, the actor runs as an asyncio task of an event
+    loop shared by all the embedded actors of the process, messages are put in
+    in-memory queues without being encoded. The loop runs when a client
+    waits for an answer of an actor or for its termination.
     """
 
-    def __init__(self, name, level_logger=logging.WARNING, timeout=None):
+    #: (threading.Thread): thread running the actor (thread runtime only)
+    _runner_thread = None
+
+    #: (asyncio.Task): task running the actor (embedded runtime only)
+    embedded_task = None
+
+    _socket_interface = None
+
+    def __init__(self, name, level_logger=logging.WARNING, timeout=None, codec=DEFAULT_CODEC,
+                 transport=DEFAULT_TRANSPORT, runtime=DEFAULT_RUNTIME, mailbox_size=0, channel=DEFAULT_CHANNEL):
         """
         Initialization and start of the process.
 
@@ -87,9 +149,25 @@ class Actor(multiprocessing.Process):
         :param int level_logger: Define the level of the logger
         :param int timeout: if define, do something if no msg is recv every
                             timeout (in ms)
+        :param str codec: name of the codec used to encode messages sent to
+                          this actor
+        :param str transport: transport used by the actor sockets (tcp, ipc or
+                              inproc)
+        :param str runtime: run the actor in its own process or in a thread
+                            (process or thread)
+        :param int mailbox_size: maximum number of messages waiting to be
+                                 handled by the actor, senders wait for free
+                                 space in the mailbox (0 for an unbounded
+                                 mailbox)
+        :param str channel: channel used by the data canal (zmq or shm), see
+                            :class:`SocketInterface
+                            <powerapi.actor.socket_interface.SocketInterface>`
         """
         multiprocessing.Process.__init__(self, name=name)
 
+        #: (str): runtime of the actor (process, thread or embedded)
+        self.runtime = None
+
         #: (logging.Logger): Logger
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level_logger)
@@ -107,11 +185,25 @@ class Actor(multiprocessing.Process):
         self.logger.addHandler(handler)
         #self.logger.addHandler(handlerf)
 
+        #: (powerapi.utils.HotPathLogger): logger used for each sent or
+        #: received message
+        self.hot_logger = HotPathLogger(self.logger)
+
         #: (powerapi.State): Actor context
         self.state = State(self)
 
         #: (powerapi.SocketInterface): Actor's SocketInterface
-        self.socket_interface = SocketInterface(name, timeout)
+        self.socket_interface = SocketInterface(name, timeout, codec, transport=transport, mailbox_size=mailbox_size,
+                                                channel=channel)
+        self.set_runtime(runtime)
+
+        #: (powerapi.SocketInterface): SocketInterface used by the thread
+        #: running the actor (thread runtime only)
+        self._runner_socket_interface = None
+
+        #: (multiprocessing.connection.Connection): connection closed when the
+        #: thread running the actor terminates (thread runtime only)
+        self._runner_sentinel = None
 
         #: (func): Actor behaviour
         self.behaviour = Actor._initial_behaviour
@@ -119,6 +211,248 @@ class Actor(multiprocessing.Process):
         #: (List): list of exception that restart the actor it they are raised
         self.low_exception = []
 
+        #: (powerapi.actor.stats.ActorStats): runtime statistics of the actor
+        self.stats = ActorStats()
+
+        #: (powerapi.actor.scheduling.Scheduling): cpu affinity and
+        #: scheduling policy applied when the actor starts, None to keep the
+        #: settings inherited from the process that starts it
+        self.scheduling = None
+
+        #: (powerapi.actor.profiler.CProfiler|SamplingProfiler): profiler of
+        #: the actor, None if the actor isn't profiled
+        self.profiler = None
+
+    @property
+    def socket_interface(self):
+        """
+        (powerapi.SocketInterface): Actor's SocketInterface, the thread
+        running an actor with the thread runtime, or the task running an
+        actor with the embedded runtime, gets its own copy of it
+        """
+        if self._runner_thread is not None and threading.current_thread() is self._runner_thread:
+            return self._runner_socket_interface
+        if self.embedded_task is not None and current_actor.get() is self:
+            return self._runner_socket_interface
+        return self._socket_interface
+
+    @socket_interface.setter
+    def socket_interface(self, socket_interface):
+        self._socket_interface = socket_interface
+
+    def set_runtime(self, runtime, transport=None):
+        """
+        Change the runtime of the actor
+
+        this method shouldn't be called once the actor is started
+
+        :param str runtime: run the actor in its own process, in a thread or
+                            in an asyncio task (process, thread or embedded)
+        :param str transport: if define, new transport used by the actor
+                              sockets
+        :raise UnknowRuntimeException: if the runtime doesn't exist
+        """
+        if runtime not in RUNTIMES:
+            raise UnknowRuntimeException(runtime)
+        self.runtime = runtime
+        if runtime == EMBEDDED_RUNTIME and not isinstance(self._socket_interface, QueueInterface):
+            socket_interface = self._socket_interface
+            mailbox_size = 0 if socket_interface.credits is None else socket_interface.credits.size
+            self.socket_interface = QueueInterface(self.name, socket_interface.timeout, mailbox_size,
+                                                   socket_interface.batch_size)
+        if transport is not None:
+            self.socket_interface.set_transport(transport)
+
+    def set_addresses(self, bind_address, advertise_address=None):
+        """
+        Change the addresses used by the tcp sockets of the actor, to make it
+        reachable from other nodes
+
+        this method shouldn't be called once the actor is started, it is
+        ignored with the embedded runtime
+
+        :param str bind_address: address of the network interface where the
+                                 sockets are bound
+        :param str advertise_address: address given to the clients to connect
+                                      to the sockets, the bind address if None
+        :raise BadAddressException: if the sockets are bound to all the
+                                    interfaces without advertise address
+        """
+        if self.runtime != EMBEDDED_RUNTIME:
+            self.socket_interface.set_addresses(bind_address, advertise_address)
+
+    def set_registry(self, registry_address):
+        """
+        Register the addresses of the actor sockets in a registry once the
+        actor is initialized by its StartMessage, clients started on other
+        nodes look them up by the actor name
+
+        this method shouldn't be called once the actor is started, it is
+        ignored with the embedded runtime
+
+        :param str registry_address: address of the registry
+                                     (:class:`Registry
+                                     <powerapi.actor.registry.Registry>`)
+        """
+        if self.runtime != EMBEDDED_RUNTIME:
+            self.socket_interface.registry_address = registry_address
+
+    def set_router(self, router):
+        """
+        Connect the actor to the router socket of its client instead of
+        binding its own sockets, data and control messages are then sent on
+        the same link
+
+        this method shouldn't be called once the actor is started, it is
+        ignored with the embedded runtime. The actor must be launched by the
+        thread owning the router
+
+        :param powerapi.actor.router.Router router: router of the client
+        """
+        if self.runtime == EMBEDDED_RUNTIME:
+            return
+        socket_interface = self._socket_interface
+        self.socket_interface = DealerInterface(router, self.name, socket_interface.timeout,
+                                                batch_size=socket_interface.batch_size,
+                                                batch_time=socket_interface.batch_time)
+        self.socket_interface.codec = socket_interface.codec
+        self.socket_interface.envelope = socket_interface.envelope
+
+    def set_scheduling(self, scheduling):
+        """
+        Change the cpu affinity and scheduling policy of the actor
+
+        this method shouldn't be called once the actor is started. The
+        scheduling is applied to the process (or thread) running the actor, it
+        is ignored with the embedded runtime, as all the embedded actors share
+        the thread of their event loop
+
+        :param powerapi.actor.scheduling.Scheduling scheduling: scheduling of
+                                                                the actor, None
+                                                                to keep the
+                                                                inherited one
+        """
+        self.scheduling = scheduling
+
+    def new_client(self):
+        """
+        Return a copy of this actor with its own (not connected) socket
+        interface
+
+        zmq sockets can't be shared between threads, a thread that want to
+        communicate with an actor that is already connected by another thread
+        must use its own client
+
+        :rtype: powerapi.actor.actor.Actor
+        """
+        client = copy.copy(self)
+        client.socket_interface = self._socket_interface.copy()
+        return client
+
+    def start(self):
+        """
+        Start the process or the thread that execute the actor code
+        """
+        if self.runtime == PROCESS_RUNTIME:
+            multiprocessing.Process.start(self)
+            return
+
+        if self.runtime == EMBEDDED_RUNTIME:
+            if self.embedded_task is not None:
+                raise RuntimeError('cannot start an actor twice')
+            self._runner_socket_interface = self._socket_interface.copy()
+            self.embedded_task = get_embedded_loop().create_task(self._run_embedded())
+            return
+
+        if self._runner_thread is not None:
+            raise RuntimeError('cannot start an actor twice')
+        self._runner_socket_interface = self._socket_interface.copy()
+        self._runner_sentinel, sentinel_writer = multiprocessing.Pipe(duplex=False)
+
+        def run_thread():
+            try:
+                self.run()
+            finally:
+                sentinel_writer.close()
+
+        self._runner_thread = threading.Thread(target=run_thread, name=self.name, daemon=True)
+        self._runner_thread.start()
+
+    def is_alive(self):
+        """
+        :return bool: True if the process or the thread that execute the actor
+                      code is running
+        """
+        if self.runtime == PROCESS_RUNTIME:
+            return multiprocessing.Process.is_alive(self)
+        if self.runtime == EMBEDDED_RUNTIME:
+            return self.embedded_task is not None and not self.embedded_task.done()
+        return self._runner_thread is not None and self._runner_thread.is_alive()
+
+    def join(self, timeout=None):
+        """
+        Wait until the process or the thread that execute the actor code
+        terminates
+
+        An actor with the embedded runtime can't be waited for by an actor
+        running on the same event loop, the method returns immediately
+
+        :param float timeout: if define, wait at most timeout seconds
+        """
+        if self.runtime == PROCESS_RUNTIME:
+            multiprocessing.Process.join(self, timeout)
+        elif self.runtime == EMBEDDED_RUNTIME:
+            if self.embedded_task is not None:
+                run_embedded_loop(self.embedded_task, timeout)
+        elif self._runner_thread is not None:
+            self._runner_thread.join(timeout)
+
+    def terminate(self):
+        """
+        Terminate the process that execute the actor code
+
+        A thread can't be terminated, an actor with the thread runtime is
+        stopped after handling its current messages. An actor with the
+        embedded runtime handles a hard PoisonPillMessage before any other
+        message, as a process does when it receives SIGTERM
+        """
+        if self.runtime == PROCESS_RUNTIME:
+            multiprocessing.Process.terminate(self)
+        elif self.runtime == EMBEDDED_RUNTIME:
+            if self.is_alive():
+                self._socket_interface.interrupt(PoisonPillMessage(soft=False))
+        else:
+            self.state.alive = False
+
+    def kill(self):
+        """
+        Kill the process that execute the actor code
+
+        see :meth:`terminate <powerapi.actor.actor.Actor.terminate>` for the
+        thread runtime, the task running an actor with the embedded runtime is
+        cancelled
+        """
+        if self.runtime == PROCESS_RUNTIME:
+            multiprocessing.Process.kill(self)
+        elif self.runtime == EMBEDDED_RUNTIME:
+            if self.embedded_task is not None:
+                self.embedded_task.cancel()
+        else:
+            self.terminate()
+
+    @property
+    def sentinel(self):
+        """
+        (int or multiprocessing.connection.Connection): object that become
+        ready when the process or the thread that execute the actor code
+        terminates, the task running the actor with the embedded runtime
+        """
+        if self.runtime == PROCESS_RUNTIME:
+            return multiprocessing.Process.sentinel.fget(self)
+        if self.runtime == EMBEDDED_RUNTIME:
+            return self.embedded_task
+        return self._runner_sentinel
+
     def run(self):
         """
         Main code executed by the actor
@@ -129,18 +463,47 @@ class Actor(multiprocessing.Process):
             try:
                 self.behaviour(self)
             except Exception as exn:
-                if type(exn) in self.low_exception:
-                    self.logger.error('Minor exception raised, restart actor !')
-                    traceback.print_exc()
-                    self.state.reinit()
-                else:
-                    self.state.alive = False
-                    self.logger.error('Major Exception raised, stop actor')
-                    traceback.print_exc()
+                self._handle_exception(exn)
+
+
+        self._kill_process()
+
+    async def _run_embedded(self):
+        """
+        Main code executed by the task running an actor with the embedded
+        runtime
 
+        Only the initial behaviour is supported : the task waits for messages
+        without blocking the event loop and handles them
+        """
+        current_actor.set(self)
+        self._setup()
+
+        while self.state.alive:
+            msgs = await self.socket_interface.wait_many()
+            try:
+                self._handle_messages(msgs)
+            except Exception as exn:
+                self._handle_exception(exn)
 
         self._kill_process()
 
+    def _handle_exception(self, exn):
+        """
+        Restart the actor if the exception raised by its behaviour is a low
+        exception, stop it otherwise
+
+        :param Exception exn: exception raised by the behaviour
+        """
+        if type(exn) in self.low_exception:
+            self.logger.error('Minor exception raised, restart actor !')
+            traceback.print_exc()
+            self.state.reinit()
+        else:
+            self.state.alive = False
+            self.logger.error('Major Exception raised, stop actor')
+            traceback.print_exc()
+
     def _signal_handler_setup(self):
         """
         Define how to handle signal interrupts
@@ -152,30 +515,60 @@ class Actor(multiprocessing.Process):
             self._kill_process()
             sys.exit(0)
 
+        def profile_start_handler(_, __):
+            request = pop_profile_request(os.getpid())
+            try:
+                self.start_profiling(request.get('mode'), request.get('output_dir'), request.get('interval'))
+            except PowerAPIException as exn:
+                self.logger.error(self.name + ' : ' + exn.msg)
+
+        def profile_stop_handler(_, __):
+            self.stop_profiling()
+
         signal.signal(signal.SIGTERM, term_handler)
         signal.signal(signal.SIGINT, term_handler)
+        signal.signal(PROFILE_START_SIGNAL, profile_start_handler)
+        signal.signal(PROFILE_STOP_SIGNAL, profile_stop_handler)
 
     def _setup(self):
         """
         Set actor specific configuration:
 
          - set the processus name
+         - apply the cpu affinity and scheduling policy
          - setup the socket interface
          - setup the signal handler
+         - add the handler that answers to StatsRequestMessage
+         - add the handler that starts and stops profiling
 
-        This method is called before entering on the behaviour loop
+        This method is called before entering on the behaviour loop, the
+        process name and the signal handler are only set with the process
+        runtime
         """
-        # Name process
-        setproctitle.setproctitle(self.name)
+        if self.runtime == PROCESS_RUNTIME:
+            # Name process
+            setproctitle.setproctitle(self.name)
+
+        if self.scheduling is not None and self.runtime != EMBEDDED_RUNTIME:
+            self.scheduling.apply(self.logger)
+
+        self.hot_logger.refresh()
 
         self.socket_interface.setup()
 
-        self.logger.debug(self.name + ' process created.')
+        self.logger.debug(self.name + ' ' + self.runtime + ' created.')
 
-        self._signal_handler_setup()
+        if self.runtime == PROCESS_RUNTIME:
+            self._signal_handler_setup()
 
         self.setup()
 
+        self.stats = ActorStats()
+        self.add_handler(StatsRequestMessage, StatsRequestHandler(self.state))
+        profile_handler = ProfileHandler(self.state)
+        self.add_handler(ProfileStartMessage, profile_handler)
+        self.add_handler(ProfileStopMessage, profile_handler)
+
     def setup(self):
         """
         Function called before entering on the behaviour loop
@@ -205,31 +598,113 @@ class Actor(multiprocessing.Process):
         """
         Initial behaviour of an actor
 
-        Wait for a message, and handle it with the correct handler
+        Wait for messages, and handle them with the correct handler
 
-        If the message is None, call the timout_handler otherwise find the
-        handler correponding to the message type and call it on the message.
+        Received messages are split in sequences of consecutive messages
+        handled by the same handler, each sequence is given to the
+        :meth:`handle_batch <powerapi.handler.handler.Handler.handle_batch>`
+        method of its handler.
         """
+        self._handle_messages(self.receive_many())
 
-        msg = self.receive()
-        # Timeout
-        if msg is None:
-            return
-        # Message
-        else:
+    def _handle_messages(self, msgs):
+        """
+        Split the received messages in sequences of consecutive messages
+        handled by the same handler and give each sequence to its handler
+
+        :param list msgs: received messages
+        """
+        index = 0
+        while index < len(msgs) and self.state.alive:
+            try:
+                handler = self.state.get_corresponding_handler(msgs[index])
+            except UnknowMessageTypeException:
+                self.logger.warning("UnknowMessageTypeException: " + str(msgs[index]))
+                index += 1
+                continue
+
+            end = index + 1
+            while end < len(msgs) and self._has_handler(msgs[end], handler):
+                end += 1
+
+            begin = time.perf_counter_ns()
             try:
-                handler = self.state.get_corresponding_handler(msg)
-                handler.handle_message(msg)
+                handler.handle_batch(msgs[index:end])
             except UnknowMessageTypeException:
-                self.logger.warning("UnknowMessageTypeException: " + str(msg))
+                self.logger.warning("UnknowMessageTypeException: " + str(msgs[index]))
             except HandlerException:
                 self.logger.warning("HandlerException")
+            except Exception:
+                self.socket_interface.put_back(msgs[end:])
+                raise
+            self.stats.record(handler, end - index, time.perf_counter_ns() - begin)
+            index = end
+
+    def get_stats(self):
+        """
+        Return the runtime statistics of the actor : messages rate, number of
+        messages and batch latency of each handler, time spent waiting for
+        messages and mailbox depth
+
+        :return dict: statistics of the actor
+        """
+        stats = self.stats.snapshot()
+        stats.update({'name': self.name,
+                      'pid': os.getpid(),
+                      'runtime': self.runtime,
+                      'socket': self.socket_interface.get_stats()})
+        return stats
+
+    def start_profiling(self, mode=None, output_dir=None, interval=None):
+        """
+        Start profiling the actor, the profile is written when the profiling
+        is stopped. A profiling that is already running is stopped first
+
+        this method must be called by the thread that runs the actor
+
+        :param str mode: profile mode (cprofile or sampling)
+        :param str output_dir: directory where the profile is written
+        :param float interval: time (in s) between two samples (sampling mode)
+        :raise UnknowProfileModeException: if the mode doesn't exist
+        """
+        path = get_profile_path(PROFILE_DIRECTORY if output_dir is None else output_dir, self.name)
+        profiler = create_profiler(DEFAULT_PROFILE_MODE if mode is None else mode, path,
+                                   DEFAULT_SAMPLING_INTERVAL if interval is None else interval)
+        self.stop_profiling()
+        self.profiler = profiler
+        self.profiler.start()
+        self.logger.info(self.name + ' : start profiling')
+
+    def stop_profiling(self):
+        """
+        Stop profiling the actor and write its profile
+
+        :return str: path of the written profile, None if the actor wasn't
+                     profiled
+        """
+        if self.profiler is None:
+            return None
+        path = self.profiler.stop()
+        self.profiler = None
+        self.logger.info(self.name + ' : profile written to ' + path)
+        return path
+
+    def _has_handler(self, msg, handler):
+        try:
+            return self.state.get_corresponding_handler(msg) is handler
+        except UnknowMessageTypeException:
+            return False
 
     def _kill_process(self):
         """
-        Kill the actor (close sockets)
+        Kill the actor (write its profile, close sockets)
         """
+        self.stop_profiling()
         self.socket_interface.close()
+        if self.runtime == PROCESS_RUNTIME:
+            # messages queued by the sockets (as the last reports sent to a
+            # pusher) are lost if the process exits before they are sent
+            SafeContext.destroy(EXIT_LINGER)
         self.logger.debug(self.name + " teardown")
 
     def connect_data(self):
@@ -254,7 +729,8 @@ class Actor(multiprocessing.Process):
         :param Object msg: the message to send to this actor
         """
         self.socket_interface.send_control(msg)
-        self.logger.debug('send control [' + str(msg) + '] to ' + self.name)
+        if __debug__:
+            self.hot_logger.debug('send control [%s] to %s', msg, self.name)
 
     def receive_control(self, timeout=None):
         """
@@ -264,17 +740,37 @@ class Actor(multiprocessing.Process):
             timeout = self.socket_interface.timeout
 
         msg = self.socket_interface.receive_control(timeout)
-        self.logger.debug("receive control : [" + str(msg) + "]")
+        if __debug__:
+            self.hot_logger.debug('receive control : [%s]', msg)
         return msg
 
-    def send_data(self, msg):
+    def send_data(self, msg, timeout=None):
         """
         Send a msg to this actor using the data canal
 
         :param Object msg: the message to send to this actor
+        :param float timeout: if the actor mailbox is bounded, time (in s) to
+                              wait for free space in it, None to wait until
+                              there is free space
+        :raise NoCreditException: if the mailbox is still full after timeout
+        """
+        self.socket_interface.send_data(msg, timeout)
+        if __debug__:
+            self.hot_logger.debug('send data [%s] to %s', msg, self.name)
+
+    def send_data_many(self, msgs, timeout=None):
         """
-        self.socket_interface.send_data(msg)
-        self.logger.debug('send data [' + str(msg) + '] to ' + self.name)
+        Send a batch of messages to this actor using the data canal
+
+        :param list msgs: the messages to send to this actor
+        :param float timeout: if the actor mailbox is bounded, time (in s) to
+                              wait for free space in it, None to wait until
+                              there is free space
+        :raise NoCreditException: if the mailbox is still full after timeout
+        """
+        self.socket_interface.send_data_many(msgs, timeout)
+        if __debug__:
+            self.hot_logger.debug('send %d data to %s', len(msgs), self.name)
 
     def receive(self):
         """
@@ -285,9 +781,23 @@ class Actor(multiprocessing.Process):
         :rtype: a list of Object
         """
         msg = self.socket_interface.receive()
-        self.logger.debug("receive data : [" + str(msg) + "]")
+        if __debug__:
+            self.hot_logger.debug('receive data : [%s]', msg)
         return msg
 
+    def receive_many(self):
+        """
+        Block until a message was received (or until timeout) an return it with
+        the messages already queued
+
+        :return: the list of received messages or an empty list if timeout
+        :rtype: a list of Object
+        """
+        msgs = self.socket_interface.receive_many()
+        if __debug__:
+            self.hot_logger.debug('receive %d data', len(msgs))
+        return msgs
+
     def soft_kill(self):
         """Kill this actor by sending a soft :class:`PoisonPillMessage
         <powerapi.message.message.PoisonPillMessage>`
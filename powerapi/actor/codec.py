@@ -0,0 +1,422 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import datetime
+import importlib
+import logging
+import pickle
+import struct
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+    logging.getLogger().info("msgpack is not installed.")
+
+from powerapi.exception import PowerAPIException
+from powerapi.report import Report, HWPCReport
+
+#: (str): name of the codec used when no codec is specified
+DEFAULT_CODEC = 'pickle'
+
+#: (bytes): first byte of the header frame of a batch of messages
+BATCH_MARKER = b'\x00'
+
+#: (bytes): first byte of the header frame of a report sent in a routing
+#:          envelope
+ENVELOPE_MARKER = b'\x01'
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_DATETIME_EXT = 1
+_TUPLE_EXT = 2
+_PICKLE_EXT = 3
+
+
+class UnknowCodecException(PowerAPIException):
+    """
+    Exception raised when attempting to use a codec that is not registered
+    """
+    def __init__(self, codec_name):
+        PowerAPIException.__init__(self, 'unknow codec ' + codec_name)
+        self.codec_name = codec_name
+
+
+def _unpickle_envelope(report):
+    return report
+
+
+class Envelope:
+    """
+    Report received in a routing envelope, whose payload was not decoded
+
+    The header of the envelope contains the class of the report and its
+    routing fields (see :attr:`Report.routing_fields
+    <powerapi.report.report.Report.routing_fields>`), that are readable as
+    attributes of the envelope. The payload contains the frames that encode
+    the report, they are forwarded unchanged to actors using the same codec
+
+    A pickled envelope is unpickled as the report it contains
+    """
+
+    def __init__(self, header, payload, codec):
+        """
+        :param header: header frame of the envelope
+        :param list payload: frames that encode the report
+        :param Codec codec: codec used to encode the report
+        """
+        #: (bytes-like): header frame of the envelope
+        self.header = header
+        #: (list): frames that encode the report
+        self.payload = payload
+        #: (Codec): codec used to encode the report
+        self.codec = codec
+
+        report_class, fields = pickle.loads(header[1:])
+        #: (type): class of the report
+        self.report_class = report_class
+        #: (dict): routing fields of the report, by field name
+        self.fields = fields
+
+    @staticmethod
+    def encode_header(report):
+        """
+        :param powerapi.Report report: report to put in an envelope
+        :return bytes: the header frame of the envelope of the report
+        """
+        fields = {name: getattr(report, name) for name in report.routing_fields}
+        return ENVELOPE_MARKER + pickle.dumps((type(report), fields))
+
+    def __getattr__(self, name):
+        fields = self.__dict__.get('fields')
+        if fields is None or name not in fields:
+            raise AttributeError(name)
+        return fields[name]
+
+    def open(self):
+        """
+        Decode the payload of the envelope
+
+        :return powerapi.Report: the report contained in the envelope
+        """
+        return self.codec.decode(self.payload)
+
+    def __reduce_ex__(self, protocol):
+        return _unpickle_envelope, (self.open(),)
+
+    def __str__(self):
+        return 'Envelope(%s, %s, %s, %s)' % (self.report_class.__name__, self.fields.get('timestamp'),
+                                             self.fields.get('sensor'), self.fields.get('target'))
+
+    def __repr__(self):
+        return str(self)
+
+
+class Codec:
+    """
+    Encode messages into a list of zmq frames and decode them back
+
+    Frames returned by :meth:`encode <powerapi.actor.codec.Codec.encode>` are
+    sent without copy, frames given to :meth:`decode
+    <powerapi.actor.codec.Codec.decode>` are buffers pointing on the received
+    zmq frames
+
+    A batch of messages is sent as one zmq message : a header frame that starts
+    with BATCH_MARKER and contains the number of frames of each message,
+    followed by the frames of each message.
+
+    A report can be sent in a routing envelope : a header frame that starts
+    with ENVELOPE_MARKER and contains the routing fields of the report,
+    followed by the frames that encode it. The receiver can route the report
+    on its header and forward the other frames unchanged. The first frame of
+    an encoded message must therefore not start with BATCH_MARKER or
+    ENVELOPE_MARKER
+    """
+
+    def encode(self, msg):
+        """
+        :param Object msg: message to encode
+        :return: frames that encode the message
+        :rtype: list of bytes-like objects
+        """
+        raise NotImplementedError()
+
+    def decode(self, frames):
+        """
+        :param list frames: buffers of the received frames
+        :return Object: the decoded message
+        """
+        raise NotImplementedError()
+
+    def encode_message(self, msg, envelope=False):
+        """
+        Encode a message, reports are put in a routing envelope if asked
+
+        The payload of a received :class:`Envelope
+        <powerapi.actor.codec.Envelope>` is forwarded unchanged if it was
+        encoded with the same codec, otherwise the report is decoded and
+        encoded again
+
+        :param Object msg: message to encode
+        :param bool envelope: put reports in a routing envelope
+        :return: frames that encode the message
+        :rtype: list of bytes-like objects
+        """
+        if type(msg) is Envelope:
+            if type(msg.codec) is type(self):
+                return [msg.header] + msg.payload if envelope else list(msg.payload)
+            msg = msg.open()
+        if envelope and isinstance(msg, Report):
+            return [Envelope.encode_header(msg)] + self.encode(msg)
+        return self.encode(msg)
+
+    def decode_message(self, frames, open_envelope=True):
+        """
+        Decode a message that may be in a routing envelope
+
+        :param list frames: buffers of the received frames
+        :param bool open_envelope: decode the report contained in an envelope
+                                   instead of returning an :class:`Envelope
+                                   <powerapi.actor.codec.Envelope>`
+        :return Object: the decoded message
+        """
+        header = frames[0]
+        if len(header) == 0 or header[:1] != ENVELOPE_MARKER:
+            return self.decode(frames)
+        if open_envelope:
+            return self.decode(frames[1:])
+        return Envelope(header, frames[1:], self)
+
+    def encode_many(self, msgs, envelope=False):
+        """
+        :param list msgs: messages to encode
+        :param bool envelope: put reports in a routing envelope
+        :return: frames that encode the batch of messages
+        :rtype: list of bytes-like objects
+        """
+        frames_count = []
+        frames = []
+        for msg in msgs:
+            msg_frames = self.encode_message(msg, envelope)
+            frames_count.append(len(msg_frames))
+            frames += msg_frames
+        return [BATCH_MARKER + struct.pack('!%dI' % len(frames_count), *frames_count)] + frames
+
+    def decode_many(self, frames, open_envelopes=True):
+        """
+        Decode frames that contain a single message or a batch of messages
+
+        :param list frames: buffers of the received frames
+        :param bool open_envelopes: decode the reports contained in routing
+                                    envelopes
+        :return list: the decoded messages
+        """
+        header = frames[0]
+        if len(header) == 0 or header[:1] != BATCH_MARKER:
+            return [self.decode_message(frames, open_envelopes)]
+
+        msgs = []
+        position = 1
+        for frames_count in struct.unpack('!%dI' % ((len(header) - 1) // 4), header[1:]):
+            msgs.append(self.decode_message(frames[position:position + frames_count], open_envelopes))
+            position += frames_count
+        return msgs
+
+
+class PickleCodec(Codec):
+    """
+    Encode messages in a single frame with the default pickle protocol
+    """
+
+    def encode(self, msg):
+        return [pickle.dumps(msg)]
+
+    def decode(self, frames):
+        return pickle.loads(frames[0])
+
+
+class Pickle5Codec(Codec):
+    """
+    Encode messages with the pickle protocol 5
+
+    Objects that expose their data through a buffer (numpy arrays, bytearray,
+    ...) are not copied in the pickle stream but sent as out-of-band frames
+    """
+
+    def encode(self, msg):
+        buffers = []
+        data = pickle.dumps(msg, protocol=5, buffer_callback=buffers.append)
+        return [data] + [buffer.raw() for buffer in buffers]
+
+    def decode(self, frames):
+        return pickle.loads(frames[0], buffers=frames[1:])
+
+
+def _encode_ext(obj):
+    if isinstance(obj, datetime.datetime) and obj.tzinfo is None:
+        return msgpack.ExtType(_DATETIME_EXT, struct.pack('!q', (obj - _EPOCH) // datetime.timedelta(microseconds=1)))
+    if isinstance(obj, tuple):
+        return msgpack.ExtType(_TUPLE_EXT, _packb(list(obj)))
+    return msgpack.ExtType(_PICKLE_EXT, pickle.dumps(obj))
+
+
+def _decode_ext(code, data):
+    if code == _DATETIME_EXT:
+        return _EPOCH + datetime.timedelta(microseconds=struct.unpack('!q', data)[0])
+    if code == _TUPLE_EXT:
+        return tuple(_unpackb(data))
+    if code == _PICKLE_EXT:
+        return pickle.loads(data)
+    return msgpack.ExtType(code, data)
+
+
+def _packb(obj):
+    return msgpack.packb(obj, default=_encode_ext, use_bin_type=True, strict_types=True)
+
+
+def _unpackb(data):
+    return msgpack.unpackb(data, ext_hook=_decode_ext, raw=False, strict_map_key=False)
+
+
+def _compact_groups(groups):
+    """
+    Store the event names of each HWPCReport group only once, followed by the
+    event values of each core
+
+    :return: the compacted groups or None if the cores of a group don't have
+             the same events
+    """
+    compacted_groups = {}
+    for group_name, sockets in groups.items():
+        event_names = None
+        values = {}
+        for socket_id, cores in sockets.items():
+            values[socket_id] = {}
+            for core_id, events in cores.items():
+                if event_names is None:
+                    event_names = list(events)
+                elif list(events) != event_names:
+                    return None
+                values[socket_id][core_id] = list(events.values())
+        compacted_groups[group_name] = [event_names, values]
+    return compacted_groups
+
+
+def _expand_groups(compacted_groups):
+    groups = {}
+    for group_name, (event_names, values) in compacted_groups.items():
+        groups[group_name] = {socket_id: {core_id: dict(zip(event_names, core_values)) for core_id, core_values in cores.items()}
+                              for socket_id, cores in values.items()}
+    return groups
+
+
+class ReportCodec(Codec):
+    """
+    Encode :class:`Report <powerapi.report.report.Report>` with msgpack
+
+    A report is sent as two frames : the name of its class and its attributes
+    encoded with msgpack. Event names of HWPCReport groups are sent once per
+    group instead of once per core. Others messages are pickled
+    """
+
+    def __init__(self):
+        #: (dict): cache of report class names, by report class
+        self._class_names = {}
+        #: (dict): cache of report classes, by report class name
+        self._classes = {}
+
+    def _get_class_name(self, report_class):
+        if report_class not in self._class_names:
+            class_name = (report_class.__module__ + ':' + report_class.__qualname__).encode()
+            self._class_names[report_class] = class_name
+            self._classes[class_name] = report_class
+        return self._class_names[report_class]
+
+    def _get_class(self, class_name):
+        if class_name not in self._classes:
+            module_name, qualname = class_name.decode().split(':')
+            report_class = importlib.import_module(module_name)
+            for name in qualname.split('.'):
+                report_class = getattr(report_class, name)
+            self._classes[class_name] = report_class
+        return self._classes[class_name]
+
+    def encode(self, msg):
+        if not isinstance(msg, Report):
+            return [b'', pickle.dumps(msg)]
+
+        data = msg.__dict__
+        if isinstance(msg, HWPCReport):
+            compacted_groups = _compact_groups(msg.groups)
+            if compacted_groups is not None:
+                data = dict(data)
+                data['groups'] = compacted_groups
+                data['_compacted'] = True
+        return [self._get_class_name(type(msg)), _packb(data)]
+
+    def decode(self, frames):
+        class_name = bytes(frames[0])
+        if class_name == b'':
+            return pickle.loads(frames[1])
+        report_class = self._get_class(class_name)
+        data = _unpackb(frames[1])
+        if data.pop('_compacted', False):
+            data['groups'] = _expand_groups(data['groups'])
+        report = report_class.__new__(report_class)
+        report.__dict__.update(data)
+        return report
+
+
+#: (dict): codec classes, by codec name
+CODECS = {
+    'pickle': PickleCodec,
+    'pickle5': Pickle5Codec,
+}
+
+if msgpack is not None:
+    CODECS['msgpack'] = ReportCodec
+
+
+def register_codec(codec_name, codec_class):
+    """
+    Make a codec available for the socket interfaces
+
+    :param str codec_name: name used to select the codec
+    :param type codec_class: class of the codec, must inherit from Codec
+    """
+    CODECS[codec_name] = codec_class
+
+
+def get_codec(codec_name):
+    """
+    :param str codec_name: name of a registered codec
+    :return Codec: a new instance of the codec
+    :raise UnknowCodecException: if no codec is registered with this name
+    """
+    if codec_name not in CODECS:
+        raise UnknowCodecException(codec_name)
+    return CODECS[codec_name]()
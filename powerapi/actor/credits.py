@@ -0,0 +1,135 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import multiprocessing
+import time
+
+from powerapi.exception import PowerAPIException
+
+
+class NoCreditException(PowerAPIException):
+    """
+    Exception raised when a message can't be sent to an actor because its
+    mailbox is full
+    """
+    def __init__(self, sent=0):
+        """
+        :param int sent: number of messages of the batch that were sent
+                         before the mailbox was full
+        """
+        PowerAPIException.__init__(self, 'mailbox is full')
+        self.sent = sent
+
+
+class Credits:
+    """
+    Credits of a bounded actor mailbox
+
+    Credits are shared between the actor and the processes that send it
+    messages : a sender acquires one credit per message sent and the actor
+    releases one credit per message read from its mailbox. The number of
+    messages waiting in the mailbox can't exceed its size
+    """
+
+    def __init__(self, size):
+        """
+        :param int size: size of the mailbox
+        """
+        if size <= 0:
+            raise ValueError('mailbox size must be positive')
+
+        #: (int): size of the mailbox
+        self.size = size
+
+        self._semaphore = multiprocessing.Semaphore(size)
+
+        # serialize the multi-credit acquisitions, two senders that each hold
+        # a part of the credits they wait for would never get the rest
+        self._batch_lock = multiprocessing.Lock()
+
+    def acquire(self, number=1, timeout=None):
+        """
+        Acquire credits to send messages
+
+        Credits of a batch are acquired atomically with respect to the other
+        batches : a single sender at a time holds a part of the credits it
+        requested
+
+        :param int number: number of credits to acquire, at most the mailbox
+                           size
+        :param float timeout: time (in s) to wait for the credits, None to wait
+                              until they are available, 0 to not wait
+        :return bool: True if the credits were acquired, False otherwise (no
+                      credit is acquired)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if number == 1:
+            return self._semaphore.acquire(True, timeout)
+
+        if not self._batch_lock.acquire(True, timeout):
+            return False
+        try:
+            acquired = 0
+            while acquired < number:
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                if not self._semaphore.acquire(True, remaining):
+                    self.release(acquired)
+                    return False
+                acquired += 1
+            return True
+        finally:
+            self._batch_lock.release()
+
+    def release(self, number=1):
+        """
+        Give back credits when messages are read from the mailbox
+
+        :param int number: number of credits to release
+        """
+        for _ in range(number):
+            self._semaphore.release()
+
+    def available(self):
+        """
+        :return int: number of messages that can be sent before the mailbox is
+                     full
+        """
+        return self._semaphore.get_value()
+
+    def queue_depth(self):
+        """
+        :return int: number of messages sent and not yet read from the mailbox
+        """
+        return self.size - self.available()
+
+    def get_metrics(self):
+        """
+        :return dict: flow control metrics of the mailbox
+        """
+        return {'mailbox_size': self.size, 'credits': self.available(), 'queue_depth': self.queue_depth()}
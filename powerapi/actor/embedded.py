@@ -0,0 +1,427 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import asyncio
+import contextvars
+import copy
+from collections import deque
+
+from powerapi.actor.credits import NoCreditException
+from powerapi.actor.socket_interface import NotConnectedException, DEFAULT_BATCH_SIZE
+
+#: (contextvars.ContextVar): actor running the current asyncio task, used by
+#: actors with the embedded runtime to tell their own code apart from the
+#: code of their clients that run on the same thread
+current_actor = contextvars.ContextVar('current_actor', default=None)
+
+_EMBEDDED_LOOP = None
+
+
+def get_embedded_loop():
+    """
+    :return asyncio.AbstractEventLoop: event loop running all the actors with
+                                       the embedded runtime of this process
+    """
+    global _EMBEDDED_LOOP
+    if _EMBEDDED_LOOP is None or _EMBEDDED_LOOP.is_closed():
+        _EMBEDDED_LOOP = asyncio.new_event_loop()
+    return _EMBEDDED_LOOP
+
+
+def run_embedded_loop(awaitable, timeout=None):
+    """
+    Run the embedded event loop until the given awaitable is done or until
+    timeout
+
+    Blocking calls (like waiting for an answer on the control canal) are made
+    from outside of the loop, they can't wait if the loop is already running
+
+    :param awaitable: coroutine or future to wait for
+    :param float timeout: time (in s) to wait, None to wait until the
+                          awaitable is done
+    :return bool: True if the awaitable is done, False if timeout or if the
+                  loop is already running
+    """
+    loop = get_embedded_loop()
+    if loop.is_running():
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        return False
+    future = asyncio.ensure_future(awaitable, loop=loop)
+    done, _ = loop.run_until_complete(asyncio.wait([future], timeout=timeout))
+    if not done:
+        future.cancel()
+    return bool(done)
+
+
+def wait_embedded_actors(actors):
+    """
+    Run the embedded event loop until one of the given actors terminates
+
+    :param list actors: actors with the embedded runtime
+    """
+    tasks = [actor.embedded_task for actor in actors if actor.embedded_task is not None]
+    if not tasks:
+        return
+    loop = get_embedded_loop()
+    loop.run_until_complete(asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED))
+
+
+def join_embedded_actors(actors, timeout=None):
+    """
+    Run the embedded event loop until all the given actors terminate or until
+    timeout
+
+    If the loop is already running (the caller is an embedded actor), the
+    actors can't be waited for, they terminate once the caller gives the hand
+    back to the loop
+
+    :param list actors: actors with the embedded runtime
+    :param float timeout: time (in s) to wait, None to wait until the actors
+                          terminate
+    :return list: actors still running after timeout
+    """
+    if get_embedded_loop().is_running():
+        return []
+    tasks = [actor.embedded_task for actor in actors if actor.embedded_task is not None]
+    if tasks:
+        run_embedded_loop(asyncio.wait(tasks), None if timeout is None else max(0, timeout))
+    return [actor for actor in actors if actor.embedded_task is not None and not actor.embedded_task.done()]
+
+
+class _Mailbox:
+    """
+    Messages waiting to be read by an actor with the embedded runtime, and
+    answers waiting to be read by its clients
+    """
+
+    def __init__(self, size):
+        #: (int): maximum number of messages on the data canal, 0 if unbounded
+        self.size = size
+        #: (collections.deque): messages sent on the data canal
+        self.data = deque()
+        #: (collections.deque): messages sent to the actor on the control canal
+        self.control = deque()
+        #: (collections.deque): messages sent by the actor on the control canal
+        self.answers = deque()
+        self._actor_event = None
+        self._client_event = None
+
+    def actor_event(self):
+        if self._actor_event is None:
+            self._actor_event = asyncio.Event()
+        return self._actor_event
+
+    def client_event(self):
+        if self._client_event is None:
+            self._client_event = asyncio.Event()
+        return self._client_event
+
+    def wake_actor(self):
+        if self._actor_event is not None:
+            self._actor_event.set()
+
+    def wake_client(self):
+        if self._client_event is not None:
+            self._client_event.set()
+
+
+class QueueInterface:
+    """
+    In-memory equivalent of the :class:`SocketInterface
+    <powerapi.actor.socket_interface.SocketInterface>` used by the actors with
+    the embedded runtime
+
+    Messages are put in queues shared by the actor and its clients, without
+    being encoded. The actor and its clients run on the same event loop, the
+    interface used by the actor is the one initialized with the setup method
+    """
+
+    def __init__(self, name, timeout, mailbox_size=0, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        :param str name: name of the actor using this interface
+        :param int timeout: time in millisecond to wait for a message
+        :param int mailbox_size: maximum number of messages waiting on the
+                                 data canal, 0 for an unbounded mailbox
+        :param int batch_size: maximum number of messages returned by
+                               receive_many
+        """
+        #: (str): name of the actor using this interface
+        self.name = name
+
+        #: (int): Time in millisecond to wait for a message
+        self.timeout = timeout
+
+        #: (int): maximum number of messages returned by receive_many
+        self.batch_size = batch_size
+
+        #: (str): the embedded runtime doesn't use any socket
+        self.transport = None
+
+        #: (int): number of messages received on the data canal
+        self.received_messages = 0
+
+        #: (int): number of times the interface waited for a message
+        self.poll_count = 0
+
+        self._mailbox = _Mailbox(mailbox_size)
+        self._server = False
+        self._data_connected = False
+        self._control_connected = False
+
+    def set_transport(self, transport):
+        """
+        Ignored, the embedded runtime doesn't use any socket
+        """
+
+    def copy(self):
+        """
+        Return a new interface, not connected, that share the queues of this
+        one
+
+        :rtype: powerapi.actor.embedded.QueueInterface
+        """
+        queue_interface = copy.copy(self)
+        queue_interface._server = False
+        queue_interface._data_connected = False
+        queue_interface._control_connected = False
+        return queue_interface
+
+    def setup(self):
+        """
+        Initialize the actor side of the interface
+        """
+        self._server = True
+
+    def connect_data(self):
+        """
+        Connect to the data canal of the actor
+        """
+        self._data_connected = True
+
+    def connect_control(self):
+        """
+        Connect to the control canal of the actor
+        """
+        self._control_connected = True
+
+    def close(self):
+        """
+        Nothing to release : the clients of an actor that run on the same
+        event loop share the same interface, one of them can't disconnect the
+        others
+        """
+
+    def send_control(self, msg):
+        """
+        Send a message on the control canal
+
+        :param Object msg: message to send
+        """
+        if self._server:
+            self._mailbox.answers.append(msg)
+            self._mailbox.wake_client()
+            return
+        if not self._control_connected:
+            raise NotConnectedException()
+        self._mailbox.control.append(msg)
+        self._mailbox.wake_actor()
+
+    def send_data(self, msg, timeout=None):
+        """
+        Send a message on data canal
+
+        The actor and its clients share the same thread, a client can't wait
+        for free space in a full mailbox
+
+        :param Object msg: message to send
+        :param float timeout: unused
+        :raise NoCreditException: if the mailbox is bounded and full
+        """
+        self.send_data_many([msg], timeout)
+
+    def send_data_many(self, msgs, timeout=None):
+        """
+        Send a batch of messages on data canal
+
+        :param list msgs: messages to send
+        :param float timeout: unused
+        :raise NoCreditException: if the mailbox is full, messages that fit in
+                                  the mailbox are sent (their number is given
+                                  by its sent attribute)
+        """
+        if not self._data_connected:
+            raise NotConnectedException()
+        mailbox = self._mailbox
+        free = len(msgs) if mailbox.size == 0 else mailbox.size - len(mailbox.data)
+        mailbox.data.extend(msgs[:free])
+        if msgs[:free]:
+            mailbox.wake_actor()
+        if free < len(msgs):
+            raise NoCreditException(free)
+
+    def receive_control(self, timeout):
+        """
+        Wait for a message sent by the actor on the control canal (client side)
+
+        Waiting runs the embedded event loop, a client that runs on the loop
+        only gets the answers that are already available
+
+        :param int timeout: time in millisecond to wait for a message
+        :return: the received message or None if timeout
+        """
+        if not self._control_connected:
+            raise NotConnectedException()
+        mailbox = self._mailbox
+
+        async def wait_answer():
+            event = mailbox.client_event()
+            event.clear()
+            if not mailbox.answers:
+                await event.wait()
+
+        if not mailbox.answers:
+            run_embedded_loop(wait_answer(), None if timeout is None else timeout / 1000)
+        return mailbox.answers.popleft() if mailbox.answers else None
+
+    def receive(self):
+        """
+        Return a message already received by the actor, without waiting. Control
+        messages have the priority
+
+        :return: the received message or None if there is no message
+        """
+        if self._mailbox.control:
+            return self._mailbox.control.popleft()
+        if self._mailbox.data:
+            self.received_messages += 1
+            return self._mailbox.data.popleft()
+        return None
+
+    def receive_many(self):
+        """
+        Return the messages already received by the actor, without waiting. A
+        control message is always returned alone
+
+        :return list: the received messages
+        """
+        mailbox = self._mailbox
+        if mailbox.control:
+            return [mailbox.control.popleft()]
+        msgs = []
+        while mailbox.data and len(msgs) < self.batch_size:
+            msgs.append(mailbox.data.popleft())
+        self.received_messages += len(msgs)
+        return msgs
+
+    async def wait_many(self):
+        """
+        Wait until a message is received (or until timeout) and return it with
+        the messages already received
+
+        A timeout of 0 would make the actor poll its mailbox without giving
+        the hand to the other actors, the actor waits for a message instead
+
+        :return list: the received messages, empty if timeout or if the actor
+                      was woken up
+        """
+        mailbox = self._mailbox
+        if not mailbox.control and not mailbox.data:
+            self.poll_count += 1
+            event = mailbox.actor_event()
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), self.timeout / 1000 if self.timeout else None)
+            except asyncio.TimeoutError:
+                return []
+        return self.receive_many()
+
+    def interrupt(self, msg):
+        """
+        Send a message on the control canal that will be handled by the actor
+        before any other message
+
+        :param Object msg: message to send
+        """
+        self._mailbox.control.appendleft(msg)
+        self._mailbox.wake_actor()
+
+    def wake(self):
+        """
+        Wake the actor up if it is waiting for a message
+        """
+        self._mailbox.wake_actor()
+
+    def register(self):
+        """
+        Embedded actors are only reachable from their process, they are never
+        registered
+        """
+
+    def watch(self, task, msg):
+        """
+        Send the given message on the control canal, before the control
+        messages already queued, once the given task is done
+
+        :param asyncio.Future task: watched task, the sentinel of an embedded
+                                    actor
+        :param msg: message sent when the task is done
+        """
+        task.add_done_callback(lambda _: self.interrupt(msg))
+
+    def put_back(self, msgs):
+        """
+        Put received messages back in front of the messages that will be
+        returned by the next calls to receive or receive_many
+
+        :param list msgs: messages to put back, in their reception order
+        """
+        self._mailbox.data.extendleft(reversed(msgs))
+        self.received_messages -= len(msgs)
+
+    def get_flow_control_metrics(self):
+        """
+        :return dict: current credits and queue depth of the mailbox, empty if
+                      the mailbox is unbounded
+        """
+        mailbox = self._mailbox
+        if mailbox.size == 0:
+            return {}
+        return {'mailbox_size': mailbox.size, 'credits': mailbox.size - len(mailbox.data),
+                'queue_depth': len(mailbox.data)}
+
+    def get_stats(self):
+        """
+        :return dict: number of received messages, number of waits and number
+                      of messages waiting in the mailbox
+        """
+        stats = {'received_messages': self.received_messages,
+                 'poll_count': self.poll_count,
+                 'pending_messages': len(self._mailbox.data)}
+        stats.update(self.get_flow_control_metrics())
+        return stats
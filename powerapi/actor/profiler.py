@@ -0,0 +1,251 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import cProfile
+import json
+import os
+import re
+import signal
+import sys
+import tempfile
+import threading
+from collections import Counter
+
+from powerapi.exception import PowerAPIException
+
+#: (str): deterministic profiling of the actor thread with cProfile, the
+#: profile is written as a pstats file
+CPROFILE_MODE = 'cprofile'
+#: (str): statistical profiling of the actor thread, its stack is sampled
+#: periodically and written as collapsed stacks (flame graph input)
+SAMPLING_MODE = 'sampling'
+
+PROFILE_MODES = (CPROFILE_MODE, SAMPLING_MODE)
+DEFAULT_PROFILE_MODE = CPROFILE_MODE
+
+#: (float): time (in s) between two samples of the sampling profiler
+DEFAULT_SAMPLING_INTERVAL = 0.005
+
+#: (str): directory where the profiles are written by default, and where the
+#: profiling requests sent with a signal are written
+PROFILE_DIRECTORY = os.path.join(tempfile.gettempdir(), 'powerapi', 'profiles')
+
+#: (int): signal that makes an actor process start profiling, with the
+#: parameters of its profiling request
+PROFILE_START_SIGNAL = signal.SIGUSR1
+#: (int): signal that makes an actor process stop profiling and write its
+#: profile
+PROFILE_STOP_SIGNAL = signal.SIGUSR2
+
+
+class UnknowProfileModeException(PowerAPIException):
+    """
+    Exception raised when attempting to profile an actor with a mode that
+    doesn't exist
+    """
+    def __init__(self, mode):
+        PowerAPIException.__init__(self, 'unknow profile mode ' + mode)
+        self.mode = mode
+
+
+class CProfiler:
+    """
+    Profile the thread that starts it with cProfile
+    """
+
+    def __init__(self, path):
+        """
+        :param str path: path of the profile, without extension
+        """
+        #: (str): path of the pstats file
+        self.path = path + '.pstats'
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        """
+        Start profiling the current thread
+        """
+        self._profile.enable()
+
+    def stop(self):
+        """
+        Stop profiling and write the pstats file
+
+        :return str: path of the written file
+        """
+        self._profile.disable()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._profile.dump_stats(self.path)
+        return self.path
+
+
+class SamplingProfiler:
+    """
+    Sample the stack of the thread that starts it
+
+    In the main thread, samples are taken by a SIGPROF handler triggered by
+    setitimer every interval of cpu time consumed by the process, so idle
+    time is not sampled. In other threads (where signal handlers can't be
+    set), samples are taken by a thread every interval of wall clock time
+    """
+
+    def __init__(self, path, interval=DEFAULT_SAMPLING_INTERVAL):
+        """
+        :param str path: path of the profile, without extension
+        :param float interval: time (in s) between two samples
+        """
+        #: (str): path of the collapsed stacks file
+        self.path = path + '.collapsed'
+
+        #: (float): time (in s) between two samples
+        self.interval = interval
+
+        #: (collections.Counter): number of samples of each collapsed stack
+        self.stacks = Counter()
+
+        self._thread_id = None
+        self._previous_handler = None
+        self._sampler = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """
+        Start sampling the stack of the current thread
+        """
+        self._thread_id = threading.get_ident()
+        if threading.current_thread() is threading.main_thread():
+            self._previous_handler = signal.signal(signal.SIGPROF, self._sample_handler)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._stopped.clear()
+            self._sampler = threading.Thread(target=self._run_sampler, daemon=True)
+            self._sampler.start()
+
+    def _sample_handler(self, _, frame):
+        self._sample(frame)
+
+    def _run_sampler(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                return
+            self._sample(frame)
+
+    def _sample(self, frame):
+        """
+        :param frame: innermost frame of the sampled stack
+        """
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(frame.f_globals.get('__name__', '?') + ':' + getattr(code, 'co_qualname', code.co_name))
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(names))] += 1
+
+    def stop(self):
+        """
+        Stop sampling and write the collapsed stacks file, one line per stack
+        with its number of samples
+
+        :return str: path of the written file
+        """
+        if self._sampler is not None:
+            self._stopped.set()
+            self._sampler.join()
+            self._sampler = None
+        else:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w') as collapsed_file:
+            for stack, count in self.stacks.most_common():
+                collapsed_file.write(stack + ' ' + str(count) + '\n')
+        return self.path
+
+
+def create_profiler(mode, path, interval=DEFAULT_SAMPLING_INTERVAL):
+    """
+    :param str mode: profile mode (cprofile or sampling)
+    :param str path: path of the profile, without extension
+    :param float interval: time (in s) between two samples (sampling mode)
+    :rtype: CProfiler or SamplingProfiler
+    :raise UnknowProfileModeException: if the mode doesn't exist
+    """
+    if mode == CPROFILE_MODE:
+        return CProfiler(path)
+    if mode == SAMPLING_MODE:
+        return SamplingProfiler(path, interval)
+    raise UnknowProfileModeException(mode)
+
+
+def get_profile_path(output_dir, actor_name):
+    """
+    :param str output_dir: directory of the profile
+    :param str actor_name: name of the profiled actor
+    :return str: path of the profile of the actor, without extension, named
+                 after the actor and its process
+    """
+    file_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', actor_name).strip('_') or 'actor'
+    return os.path.join(output_dir, file_name + '.' + str(os.getpid()))
+
+
+def _get_request_path(pid):
+    return os.path.join(PROFILE_DIRECTORY, str(pid) + '.request')
+
+
+def write_profile_request(pid, mode=DEFAULT_PROFILE_MODE, output_dir=PROFILE_DIRECTORY,
+                          interval=DEFAULT_SAMPLING_INTERVAL):
+    """
+    Write the parameters used by the actor process pid when it receives
+    PROFILE_START_SIGNAL
+
+    :param int pid: pid of the actor process
+    :param str mode: profile mode (cprofile or sampling)
+    :param str output_dir: directory where the profile is written
+    :param float interval: time (in s) between two samples (sampling mode)
+    """
+    os.makedirs(PROFILE_DIRECTORY, exist_ok=True)
+    with open(_get_request_path(pid), 'w') as request_file:
+        json.dump({'mode': mode, 'output_dir': output_dir, 'interval': interval}, request_file)
+
+
+def pop_profile_request(pid):
+    """
+    Read and remove the profiling request of the actor process pid
+
+    :param int pid: pid of the actor process
+    :return dict: parameters of the request, empty if there is no request
+    """
+    try:
+        with open(_get_request_path(pid)) as request_file:
+            request = json.load(request_file)
+        os.remove(_get_request_path(pid))
+    except (OSError, ValueError):
+        return {}
+    return request
@@ -0,0 +1,260 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Registry of the actors addresses
+
+Actors started by a supervisor running on another node can't give the
+addresses of their sockets to their clients through shared memory. When a
+socket interface has a registry address, it registers the addresses of its
+sockets in the registry once they are bound, and a client that doesn't know
+these addresses look them up in the registry by the name of the actor
+
+Requests and answers are encoded in JSON, the registry is reached on a tcp
+socket and never unpickles what it receives
+"""
+import json
+import threading
+import time
+
+import zmq
+
+from powerapi.actor.safe_context import SafeContext
+from powerapi.exception import PowerAPIException
+
+#: (float): time (in s) to wait for the answer of the registry, or for the
+#: registration of an actor that is looked up
+REGISTRY_TIMEOUT = 10.0
+
+#: (float): time (in s) between two lookups of an actor that is not
+#: registered yet
+LOOKUP_PERIOD = 0.05
+
+#: (float): time (in s) to wait for the answer of the registry when an actor
+#: unregisters at its termination, the registry may already be stopped
+UNREGISTER_TIMEOUT = 0.5
+
+#: (int): time (in ms) between two checks of the stop request by the thread
+#: serving the registry
+SERVE_PERIOD = 100
+
+_REGISTER = 'register'
+_UNREGISTER = 'unregister'
+_LOOKUP = 'lookup'
+
+
+class RegistryTimeoutException(PowerAPIException):
+    """
+    Exception raised when the registry doesn't answer to a request
+    """
+    def __init__(self, registry_address):
+        PowerAPIException.__init__(self, 'no answer from the registry ' + registry_address)
+        self.registry_address = registry_address
+
+
+class UnknowActorException(PowerAPIException):
+    """
+    Exception raised when an actor is not registered in the registry
+    """
+    def __init__(self, actor_name):
+        PowerAPIException.__init__(self, 'unknow actor ' + actor_name)
+        self.actor_name = actor_name
+
+
+class Registry:
+    """
+    Directory of the actors addresses, served on a zmq REP socket by a thread
+
+    The registry is started on the node that launches the actors whose
+    clients are on other nodes (or the opposite), its address is given to the
+    socket interfaces of all the actors
+    """
+
+    def __init__(self, bind_address='127.0.0.1', port=None, advertise_address=None):
+        """
+        :param str bind_address: address of the network interface where the
+                                 registry socket is bound
+        :param int port: port of the registry socket, a random port if None
+        :param str advertise_address: address used by the actors to reach the
+                                      registry, the bind address if None
+        """
+        #: (str): address of the network interface where the socket is bound
+        self.bind_address = bind_address
+        #: (int): port of the registry socket
+        self.port = port
+        #: (str): address used by the actors to reach the registry
+        self.advertise_address = bind_address if advertise_address is None else advertise_address
+
+        #: (str): address of the registry, None until it is started
+        self.address = None
+
+        #: (dict): (pull socket address, control socket address) of the
+        #:         registered actors, by actor name
+        self.actors = {}
+
+        self._socket = None
+        self._thread = None
+        self._stop_requested = threading.Event()
+
+    def start(self):
+        """
+        Bind the registry socket and start the thread that serves the requests
+        """
+        self._socket = SafeContext.get_context().socket(zmq.REP)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        if self.port is None:
+            self.port = self._socket.bind_to_random_port('tcp://' + self.bind_address)
+        else:
+            self._socket.bind('tcp://' + self.bind_address + ':' + str(self.port))
+        self.address = 'tcp://' + self.advertise_address + ':' + str(self.port)
+
+        self._stop_requested.clear()
+        self._thread = threading.Thread(target=self._serve, name='registry', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the thread serving the requests and close the registry socket
+        """
+        if self._thread is None:
+            return
+        self._stop_requested.set()
+        self._thread.join()
+        self._thread = None
+
+    def _serve(self):
+        try:
+            while not self._stop_requested.is_set():
+                if self._socket.poll(SERVE_PERIOD) == 0:
+                    continue
+                self._socket.send(_encode(self._handle(self._socket.recv())))
+        finally:
+            self._socket.close()
+
+    def _handle(self, data):
+        """
+        :param bytes data: JSON list of the request type and actor name,
+                           followed by the addresses of its sockets for a
+                           registration
+        :return: the addresses of the actor for a lookup (None if the actor is
+                 not registered), None otherwise or if the request is invalid
+        """
+        try:
+            request = json.loads(data)
+        except ValueError:
+            return None
+        if not isinstance(request, list) or len(request) < 2 or not all(isinstance(field, str) for field in request):
+            return None
+
+        request_type, actor_name = request[:2]
+        if request_type == _REGISTER and len(request) == 4:
+            self.actors[actor_name] = tuple(request[2:])
+        elif request_type == _UNREGISTER:
+            self.actors.pop(actor_name, None)
+        elif request_type == _LOOKUP:
+            return self.actors.get(actor_name)
+        return None
+
+
+def _encode(msg):
+    """
+    :return bytes: the given request or answer encoded in JSON
+    """
+    return json.dumps(msg).encode()
+
+
+def _request(registry_address, request, timeout):
+    """
+    Send a request to the registry and return its answer
+
+    :raise RegistryTimeoutException: if the registry doesn't answer before
+                                     timeout
+    """
+    socket = SafeContext.get_context().socket(zmq.REQ)
+    socket.setsockopt(zmq.LINGER, 0)
+    try:
+        socket.connect(registry_address)
+        socket.send(_encode(request))
+        if socket.poll(timeout * 1000) == 0:
+            raise RegistryTimeoutException(registry_address)
+        return json.loads(socket.recv())
+    finally:
+        socket.close()
+
+
+def register_actor(registry_address, actor_name, pull_socket_address, control_socket_address,
+                   timeout=REGISTRY_TIMEOUT):
+    """
+    Register the addresses of the sockets of an actor, replacing the addresses
+    previously registered with the same name
+
+    :param str registry_address: address of the registry
+    :param str actor_name: name of the actor
+    :param str pull_socket_address: address of the actor pull socket
+    :param str control_socket_address: address of the actor control socket
+    :param float timeout: time (in s) to wait for the registry
+    :raise RegistryTimeoutException: if the registry doesn't answer
+    """
+    _request(registry_address, (_REGISTER, actor_name, pull_socket_address, control_socket_address), timeout)
+
+
+def unregister_actor(registry_address, actor_name, timeout=REGISTRY_TIMEOUT):
+    """
+    Remove an actor from the registry
+
+    :param str registry_address: address of the registry
+    :param str actor_name: name of the actor
+    :param float timeout: time (in s) to wait for the registry
+    :raise RegistryTimeoutException: if the registry doesn't answer
+    """
+    _request(registry_address, (_UNREGISTER, actor_name), timeout)
+
+
+def lookup_actor(registry_address, actor_name, timeout=REGISTRY_TIMEOUT):
+    """
+    Return the addresses of the sockets of an actor, wait for its registration
+    if it is not registered yet
+
+    :param str registry_address: address of the registry
+    :param str actor_name: name of the actor
+    :param float timeout: time (in s) to wait for the registration of the
+                          actor, 0 to return immediately
+    :return (str, str): the address of the actor pull socket and of its
+                        control socket
+    :raise UnknowActorException: if the actor is not registered before timeout
+    :raise RegistryTimeoutException: if the registry doesn't answer
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        addresses = _request(registry_address, (_LOOKUP, actor_name), max(deadline - time.monotonic(), LOOKUP_PERIOD))
+        if addresses is not None:
+            return tuple(addresses)
+        if time.monotonic() >= deadline:
+            raise UnknowActorException(actor_name)
+        time.sleep(LOOKUP_PERIOD)
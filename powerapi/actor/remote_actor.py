@@ -0,0 +1,170 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from powerapi.actor.codec import DEFAULT_CODEC
+from powerapi.actor.socket_interface import SocketInterface, TCP_TRANSPORT
+from powerapi.actor.registry import lookup_actor, UnknowActorException, RegistryTimeoutException
+from powerapi.message import PoisonPillMessage
+
+
+class RemoteActor:
+    """
+    Client of an actor started by a supervisor running on another node, whose
+    addresses are looked up in a registry
+
+    Expose the part of the Actor interface used by the clients of an actor, so
+    a remote actor can replace a local one (as a pusher of a formula, or as a
+    worker of the dispatcher formula pool). The remote actor can't be joined
+    or killed, it belongs to its supervisor
+
+    The control canal of an actor accepts a single client, usually its
+    supervisor, the control methods can only be used if the remote actor is
+    not controlled by another client
+    """
+
+    def __init__(self, name, registry_address, codec=DEFAULT_CODEC, timeout=None):
+        """
+        :param str name: name of the remote actor
+        :param str registry_address: address of the registry where the actor
+                                     is registered
+        :param str codec: name of the codec used by the remote actor
+        :param int timeout: time in millisecond to wait for a message on the
+                            control canal
+        """
+        self.name = name
+
+        #: (powerapi.actor.SocketInterface): client interface of the remote
+        #:                                   actor, its addresses are looked
+        #:                                   up at connection
+        self.socket_interface = SocketInterface(name, timeout, codec=codec, transport=TCP_TRANSPORT)
+        self.socket_interface.registry_address = registry_address
+        self.socket_interface.remote = True
+
+    def new_client(self):
+        """
+        Return a copy of this remote actor with its own (not connected) socket
+        interface
+
+        :rtype: powerapi.actor.RemoteActor
+        """
+        client = RemoteActor.__new__(RemoteActor)
+        client.name = self.name
+        client.socket_interface = self.socket_interface.copy()
+        return client
+
+    @property
+    def sentinel(self):
+        """
+        None, the termination of a remote actor can't be watched
+        """
+        return None
+
+    def is_alive(self):
+        """
+        :return bool: True if the actor is registered in the registry
+        """
+        try:
+            lookup_actor(self.socket_interface.registry_address, self.name, 0)
+        except (UnknowActorException, RegistryTimeoutException):
+            return False
+        return True
+
+    def connect_data(self):
+        """
+        Open a canal that can be use for unidirectional communication to the
+        remote actor, wait for its registration
+
+        :raise UnknowActorException: if the actor is not registered in time
+        """
+        self.socket_interface.connect_data()
+
+    def connect_control(self):
+        """
+        Open a control canal with the remote actor, wait for its registration
+
+        :raise UnknowActorException: if the actor is not registered in time
+        """
+        self.socket_interface.connect_control()
+
+    def send_control(self, msg):
+        """
+        :param Object msg: the message to send to the remote actor on the
+                           control canal
+        """
+        self.socket_interface.send_control(msg)
+
+    def receive_control(self, timeout=None):
+        """
+        Receive a message from the remote actor on the control canal
+        """
+        if timeout is None:
+            timeout = self.socket_interface.timeout
+        return self.socket_interface.receive_control(timeout)
+
+    def send_data(self, msg, timeout=None):
+        """
+        :param Object msg: the message to send to the remote actor on the data
+                           canal
+        :param float timeout: unused, the mailbox of a remote actor is not
+                              bounded by its clients
+        """
+        self.socket_interface.send_data(msg, timeout)
+
+    def send_data_many(self, msgs, timeout=None):
+        """
+        :param list msgs: the messages to send to the remote actor on the
+                          data canal, in a single zmq message
+        :param float timeout: unused, the mailbox of a remote actor is not
+                              bounded by its clients
+        """
+        self.socket_interface.send_data_many(msgs, timeout)
+
+    def soft_kill(self):
+        """
+        Send a soft :class:`PoisonPillMessage
+        <powerapi.message.message.PoisonPillMessage>` to the remote actor on
+        the control canal and close the client sockets
+        """
+        self.send_control(PoisonPillMessage(soft=True))
+        self.socket_interface.close()
+
+    def hard_kill(self):
+        """
+        Send a hard :class:`PoisonPillMessage
+        <powerapi.message.message.PoisonPillMessage>` to the remote actor on
+        the control canal and close the client sockets
+        """
+        self.send_control(PoisonPillMessage(soft=False))
+        self.socket_interface.close()
+
+    def close(self):
+        """
+        Close the client sockets
+        """
+        self.socket_interface.close()
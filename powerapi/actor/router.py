@@ -0,0 +1,465 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import time
+import uuid
+from collections import deque
+
+import zmq
+from powerapi.actor import SafeContext
+from powerapi.actor.codec import DEFAULT_CODEC
+from powerapi.actor.socket_interface import SocketInterface, NotConnectedException, DEFAULT_BATCH_SIZE
+from powerapi.actor.socket_interface import DEFAULT_BATCH_TIME, DEFAULT_BIND_ADDRESS, TCP_TRANSPORT, IPC_TRANSPORT
+from powerapi.actor.socket_interface import IPC_DIRECTORY, WILDCARD_ADDRESSES, BadAddressException
+from powerapi.exception import PowerAPIException
+
+#: (str): each actor binds its own pull and control sockets, its clients
+#: connect one socket per canal
+PUSH_TOPOLOGY = 'push'
+#: (str): the actors connect a single dealer socket to the router socket of
+#: their client, data and control messages share this link
+ROUTER_TOPOLOGY = 'router'
+
+TOPOLOGIES = (PUSH_TOPOLOGY, ROUTER_TOPOLOGY)
+DEFAULT_TOPOLOGY = PUSH_TOPOLOGY
+
+#: (bytes): first frame sent by a dealer once connected to the router
+HELLO_FRAME = b'h'
+#: (bytes): first frame of the messages of the control canal
+CONTROL_FRAME = b'c'
+#: (bytes): first frame of the messages of the data canal
+DATA_FRAME = b'd'
+
+
+class UnknowTopologyException(PowerAPIException):
+    """
+    Exception raised when attempting to use a topology that doesn't exist
+    """
+    def __init__(self, topology):
+        PowerAPIException.__init__(self, 'unknow topology ' + topology)
+        self.topology = topology
+
+
+class Router:
+    """
+    Router socket bound by an actor (the dispatcher) to communicate with many
+    actors (its formulas), each one connected with a :class:`DealerInterface
+    <powerapi.actor.router.DealerInterface>` identified by its name
+
+    The actor holds one socket, and one tcp port, whatever the number of
+    actors it talks to. The router must only be used by the thread that
+    created it
+    """
+
+    def __init__(self, name, transport, bind_address=DEFAULT_BIND_ADDRESS, advertise_address=None):
+        """
+        :param str name: name of the actor owning the router
+        :param str transport: transport of the router socket (tcp, ipc or
+                              inproc), inproc requires that the dealers run in
+                              the process of the router
+        :param str bind_address: address of the network interface where the
+                                 tcp socket is bound
+        :param str advertise_address: address given to the dealers to connect
+                                      to the socket, the bind address if None
+        :raise BadAddressException: if the socket is bound to all the
+                                    interfaces without advertise address
+        """
+        if advertise_address is None:
+            if bind_address in WILDCARD_ADDRESSES:
+                raise BadAddressException(bind_address)
+            advertise_address = bind_address
+
+        self.name = name
+        self.transport = transport
+        self.bind_address = bind_address
+        self.advertise_address = advertise_address
+
+        #: (str): address where the dealers connect, known once the router
+        #:        is set up
+        self.address = None
+
+        #: (zmq.Socket): router socket, None until the router is set up
+        self.socket = None
+
+        #: (set): identities of the dealers that said hello but were not yet
+        #:        waited for
+        self._peers = set()
+
+        #: (dict): messages of the control canal received from each dealer
+        #:         (by identity) and not yet returned
+        self._control = {}
+
+    def setup(self):
+        """
+        Create and bind the router socket
+
+        Must be called by the thread (or process) using the router
+        """
+        self.socket = SafeContext.get_context().socket(zmq.ROUTER)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        # a dealer started again with the same identity replaces the old one
+        self.socket.setsockopt(zmq.ROUTER_HANDOVER, 1)
+        self.socket.set_hwm(0)
+        if self.transport == TCP_TRANSPORT:
+            port = self.socket.bind_to_random_port('tcp://' + self.bind_address)
+            self.address = 'tcp://' + self.advertise_address + ':' + str(port)
+        else:
+            if self.transport == IPC_TRANSPORT:
+                os.makedirs(IPC_DIRECTORY, exist_ok=True)
+                self.address = 'ipc://' + os.path.join(IPC_DIRECTORY, uuid.uuid4().hex + '_router')
+            else:
+                self.address = 'inproc://' + uuid.uuid4().hex + '_router'
+            self.socket.bind(self.address)
+
+    def _read(self, timeout):
+        """
+        Wait for a message sent by a dealer and store it
+
+        :param int timeout: time in millisecond to wait for a message, None to
+                            wait forever
+        :return bool: False if no message was received before timeout
+        """
+        if not self.socket.poll(timeout):
+            return False
+        frames = self.socket.recv_multipart(copy=False)
+        identity = frames[0].bytes
+        kind = frames[1].bytes
+        if kind == HELLO_FRAME:
+            self._peers.add(identity)
+        elif kind == CONTROL_FRAME:
+            self._control.setdefault(identity, deque()).append([frame.buffer for frame in frames[2:]])
+        return True
+
+    def wait_peer(self, identity):
+        """
+        Block until the dealer with the given identity is connected
+
+        :param bytes identity: identity of the dealer
+        """
+        if self.socket is None:
+            raise NotConnectedException()
+        while identity not in self._peers:
+            self._read(None)
+        self._peers.discard(identity)
+
+    def send(self, identity, kind, frames):
+        """
+        Send a message to a dealer, the message is dropped if the dealer is
+        not connected
+
+        :param bytes identity: identity of the dealer
+        :param bytes kind: CONTROL_FRAME or DATA_FRAME
+        :param list frames: frames that encode the message
+        """
+        if self.socket is None:
+            raise NotConnectedException()
+        self.socket.send_multipart([identity, kind] + frames, copy=False)
+
+    def receive_control(self, identity, timeout):
+        """
+        Wait for a message sent by a dealer on the control canal
+
+        :param bytes identity: identity of the dealer
+        :param int timeout: time in millisecond to wait for the message
+        :return list: frames of the message, None if timeout
+        """
+        if self.socket is None:
+            raise NotConnectedException()
+        deadline = None if timeout is None else time.monotonic() + timeout / 1000
+        queue = self._control.setdefault(identity, deque())
+        while not queue:
+            if deadline is None:
+                self._read(None)
+                continue
+            remaining = deadline - time.monotonic()
+            self._read(max(0, int(remaining * 1000)))
+            if remaining <= 0 and not queue:
+                return None
+        return queue.popleft()
+
+    def close(self):
+        """
+        Close the router socket, the dealers must have been stopped
+        """
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+        if self.transport == IPC_TRANSPORT and self.address is not None:
+            try:
+                os.unlink(self.address[len('ipc://'):])
+            except OSError:
+                pass
+
+
+class DealerInterface(SocketInterface):
+    """
+    Socket interface of an actor connected to the :class:`Router
+    <powerapi.actor.router.Router>` of its client
+
+    Server side, the actor connects a dealer socket, identified by its name,
+    to the router instead of binding a pull and a control socket. Client side
+    (in the thread owning the router), messages are sent through the router.
+    Data and control messages travel on the same link, so a control message
+    (as a PoisonPillMessage) is received after the data messages sent before
+    it
+    """
+
+    def __init__(self, router, name, timeout, codec=DEFAULT_CODEC, batch_size=DEFAULT_BATCH_SIZE,
+                 batch_time=DEFAULT_BATCH_TIME):
+        """
+        :param powerapi.actor.router.Router router: router of the client
+        :param str name: name of the actor using this interface, identity of
+                         its dealer socket
+        :param int timeout: time in millisecond to wait for a message
+        :param str codec: name of the codec used to encode the messages sent
+                          to the actor
+        :param int batch_size: maximum number of messages returned by
+                               receive_many
+        :param int batch_time: time (in µs) after which receive_many stop
+                               reading already queued messages
+        """
+        SocketInterface.__init__(self, name, timeout, codec, batch_size, batch_time)
+
+        #: (powerapi.actor.router.Router): router of the client
+        self.router = router
+
+        #: (bytes): identity of the dealer socket
+        self.identity = name.encode()
+
+        #: (zmq.Socket): dealer socket connected to the router (server side)
+        self.dealer_socket = None
+
+        #: (bool): True once the dealer is connected to the router (client
+        #:         side)
+        self._peer_connected = False
+
+        #: control message received in a batch of data messages, returned
+        #: once these messages are handled
+        self._pending_control = None
+
+    def copy(self):
+        socket_interface = SocketInterface.copy(self)
+        socket_interface.dealer_socket = None
+        socket_interface._peer_connected = False
+        socket_interface._pending_control = None
+        return socket_interface
+
+    def setup(self):
+        """
+        Connect the dealer socket to the router and say hello
+        """
+        self.dealer_socket = SafeContext.get_context().socket(zmq.DEALER)
+        self.dealer_socket.setsockopt(zmq.IDENTITY, self.identity)
+        self.dealer_socket.setsockopt(zmq.LINGER, 0)
+        self.dealer_socket.set_hwm(0)
+        self.dealer_socket.connect(self.router.address)
+        self.dealer_socket.send(HELLO_FRAME)
+        self.logger.debug("connected dealer to %s" % (self.router.address))
+
+    def register(self):
+        """
+        Actors connected to a router are not registered
+        """
+
+    def _connect_peer(self):
+        """
+        Wait until the dealer of the actor is connected to the router
+        """
+        if not self._peer_connected:
+            self.router.wait_peer(self.identity)
+            self._peer_connected = True
+
+    def connect_data(self):
+        """
+        Wait until the actor is connected to the router
+        """
+        self._connect_peer()
+
+    def connect_control(self):
+        """
+        Wait until the actor is connected to the router
+        """
+        self._connect_peer()
+
+    def send_control(self, msg):
+        """
+        Send a message on the control canal, from the actor to its client if
+        called server side
+
+        :param Object msg: message to send
+        """
+        frames = self.codec.encode(msg)
+        if self.dealer_socket is not None:
+            self.dealer_socket.send_multipart([CONTROL_FRAME] + frames, copy=False)
+            return
+        if not self._peer_connected:
+            raise NotConnectedException()
+        self.router.send(self.identity, CONTROL_FRAME, frames)
+
+    def receive_control(self, timeout):
+        """
+        Block until the actor sent a message on the control canal (client
+        side) or until timeout
+
+        :return: the received message or None if timeout
+        """
+        if not self._peer_connected:
+            raise NotConnectedException()
+        frames = self.router.receive_control(self.identity, timeout)
+        if frames is None:
+            return None
+        return self.codec.decode(frames)
+
+    def send_data(self, msg, timeout=None):
+        """
+        Send a message on data canal
+
+        :param Object msg: message to send
+        :param float timeout: unused, the mailbox of an actor connected to a
+                              router is not bounded
+        """
+        if not self._peer_connected:
+            raise NotConnectedException()
+        self.router.send(self.identity, DATA_FRAME, self.codec.encode_message(msg, self.envelope))
+
+    def send_data_many(self, msgs, timeout=None):
+        """
+        Send a batch of messages on data canal, in a single zmq message
+
+        :param list msgs: messages to send
+        :param float timeout: unused, the mailbox of an actor connected to a
+                              router is not bounded
+        """
+        if not self._peer_connected:
+            raise NotConnectedException()
+        if msgs:
+            self.router.send(self.identity, DATA_FRAME, self.codec.encode_many(msgs, self.envelope))
+
+    def _poll_dealer(self, timeout):
+        """
+        :param int timeout: time in millisecond to wait for a message
+        :return bool: True if a message is available on the dealer socket
+        """
+        begin = time.perf_counter()
+        ready = self.dealer_socket.poll(timeout)
+        self.poll_time += time.perf_counter() - begin
+        self.poll_count += 1
+        return ready != 0
+
+    def _recv_dealer(self, flags=0):
+        """
+        Receive a message from the dealer socket
+
+        :param int flags: zmq flags used to receive the message
+        :return (bool, list): True if the message was sent on the control
+                              canal, and the received messages
+        :raise zmq.Again: if flags contain zmq.NOBLOCK and no message is queued
+        """
+        frames = self.dealer_socket.recv_multipart(flags, copy=False)
+        buffers = [frame.buffer for frame in frames[1:]]
+        if frames[0].bytes == CONTROL_FRAME:
+            return True, [self.codec.decode(buffers)]
+        msgs = self.codec.decode_many(buffers, not self.envelope)
+        self.received_messages += len(msgs)
+        return False, msgs
+
+    def receive(self):
+        """
+        Block until a message was received (or until timeout) an return it
+
+        :return: the received message or None if timeout
+        """
+        if self.pending_msgs:
+            return self.pending_msgs.popleft()
+        if self._pending_control is not None:
+            return self._pop_control()
+        if not self._poll_dealer(self.timeout):
+            return None
+        control, msgs = self._recv_dealer()
+        if control:
+            return msgs[0]
+        self.pending_msgs.extend(msgs[1:])
+        return msgs[0]
+
+    def receive_many(self):
+        """
+        Block until a message was received (or until timeout) and return it
+        with all the messages already queued
+
+        At most :attr:`batch_size` messages are returned and queued messages
+        are read for at most :attr:`batch_time` µs. A control message is
+        always returned alone, after the data messages received before it
+
+        :return: the list of received messages, empty if timeout
+        """
+        if not self.pending_msgs:
+            if self._pending_control is not None:
+                return [self._pop_control()]
+            if not self._poll_dealer(self.timeout):
+                return []
+
+        msgs = list(self.pending_msgs)
+        self.pending_msgs.clear()
+        deadline = time.perf_counter() + self.batch_time / 1000000
+        while len(msgs) < self.batch_size and self._pending_control is None:
+            try:
+                control, received = self._recv_dealer(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+            if control:
+                if not msgs:
+                    return received
+                self._pending_control = received[0]
+                break
+            msgs += received
+            if time.perf_counter() > deadline:
+                break
+
+        if len(msgs) > self.batch_size:
+            self.pending_msgs.extend(msgs[self.batch_size:])
+            del msgs[self.batch_size:]
+        return msgs
+
+    def _pop_control(self):
+        """
+        :return: the control message received after the pending data messages
+        """
+        msg = self._pending_control
+        self._pending_control = None
+        return msg
+
+    def close(self):
+        """
+        Close the dealer socket (server side), the router belongs to the
+        client
+        """
+        if self.dealer_socket is not None:
+            self.dealer_socket.close()
+            self.dealer_socket = None
@@ -27,6 +27,8 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import resource
+
 import zmq
 from multiprocessing import current_process
 
@@ -50,10 +52,25 @@ class SafeContext():
 
         if cls._context is None or cls._current_pid != current_process().pid:
             cls._context = zmq.Context()
+            # each socket needs at least a file descriptor, the zmq limit of
+            # 1023 sockets is raised up to the limit of file descriptors
+            max_fds, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if max_fds > cls._context.get(zmq.MAX_SOCKETS):
+                cls._context.set(zmq.MAX_SOCKETS, max_fds)
             cls._current_pid = current_process().pid
 
         return cls._context
 
     @classmethod
-    def destroy(cls):
-        cls._context.destroy()
+    def destroy(cls, linger=None):
+        """
+        Close all the sockets of the context of the current process and
+        terminate it, if it was created by this process
+
+        :param int linger: time (in ms) given to the sockets to send their
+                           queued messages, None to use the linger value of
+                           each socket
+        """
+        if cls._context is not None and cls._current_pid == current_process().pid:
+            cls._context.destroy(linger)
+            cls._context = None
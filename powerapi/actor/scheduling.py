@@ -0,0 +1,221 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+CPU affinity and scheduling policy of the actors
+
+PowerAPI measures the energy consumed by the host it runs on, the actors
+processes disturb this measure and compete with the monitored workload. Each
+actor can be pinned to a set of cores, and run with a lower priority or a
+background scheduling policy
+"""
+import os
+
+from powerapi.exception import PowerAPIException
+
+#: (str): role of the actors reading the input databases
+PULLER_ROLE = 'puller'
+#: (str): role of the actors routing the reports to the formulas
+DISPATCHER_ROLE = 'dispatcher'
+#: (str): role of the actors computing the power estimations
+FORMULA_ROLE = 'formula'
+#: (str): role of the actors writing the output databases
+PUSHER_ROLE = 'pusher'
+
+ROLES = (PULLER_ROLE, DISPATCHER_ROLE, FORMULA_ROLE, PUSHER_ROLE)
+
+#: (str): default time-sharing policy of the system
+OTHER_POLICY = 'other'
+#: (str): policy for CPU-intensive, non interactive processes, that are a
+#: bit disfavored in scheduling decisions
+BATCH_POLICY = 'batch'
+#: (str): policy for processes that run only when the cores are idle
+IDLE_POLICY = 'idle'
+
+SCHEDULING_POLICIES = (OTHER_POLICY, BATCH_POLICY, IDLE_POLICY)
+
+
+class UnknowSchedulingPolicyException(PowerAPIException):
+    """
+    Exception raised when attempting to use a scheduling policy that doesn't
+    exist
+    """
+    def __init__(self, policy):
+        PowerAPIException.__init__(self, 'unknow scheduling policy ' + policy)
+        self.policy = policy
+
+
+class BadCPUListException(PowerAPIException):
+    """
+    Exception raised when a cpu list can't be parsed
+    """
+    def __init__(self, cpu_list):
+        PowerAPIException.__init__(self, 'bad cpu list ' + cpu_list)
+        self.cpu_list = cpu_list
+
+
+def parse_cpu_list(cpu_list):
+    """
+    Parse a list of cpu in the format used by taskset and the cpuset cgroup
+    (ex: 0-3,6)
+
+    :param str cpu_list: comma separated list of cpu ids or cpu ranges
+    :rtype: set(int)
+    :raise BadCPUListException: if the list is malformed
+    """
+    cpus = set()
+    try:
+        for cpu_range in cpu_list.split(','):
+            first, _, last = cpu_range.strip().partition('-')
+            first = int(first)
+            last = int(last) if last else first
+            if first < 0 or last < first:
+                raise ValueError()
+            cpus.update(range(first, last + 1))
+    except ValueError:
+        raise BadCPUListException(cpu_list)
+    return cpus
+
+
+def get_available_cpus():
+    """
+    :return: cpus that the current process is allowed to run on
+    :rtype: set(int)
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return os.sched_getaffinity(0)
+    return set(range(os.cpu_count()))
+
+
+def _get_policy_id(policy):
+    return {OTHER_POLICY: getattr(os, 'SCHED_OTHER', None),
+            BATCH_POLICY: getattr(os, 'SCHED_BATCH', None),
+            IDLE_POLICY: getattr(os, 'SCHED_IDLE', None)}[policy]
+
+
+class Scheduling:
+    """
+    CPU affinity, scheduling policy and niceness applied to an actor when it
+    starts
+
+    Settings are applied to the calling process, or to the calling thread
+    only when it isn't the main thread of its process (on Linux, affinity,
+    policy and niceness are per thread attributes). A setting that can't be
+    applied (not supported by the system or not permitted) is logged and
+    ignored, it never prevents the actor from running
+    """
+
+    def __init__(self, cpus=None, policy=None, nice=None):
+        """
+        :param set(int) cpus: cores on which the actor can run, None to keep
+                              the inherited affinity
+        :param str policy: scheduling policy of the actor (other, batch or
+                           idle), None to keep the inherited policy
+        :param int nice: niceness of the actor, None to keep the inherited one
+        :raise UnknowSchedulingPolicyException: if the policy doesn't exist
+        """
+        if policy is not None and policy not in SCHEDULING_POLICIES:
+            raise UnknowSchedulingPolicyException(policy)
+
+        #: (set(int)): cores on which the actor can run
+        self.cpus = None if cpus is None else set(cpus)
+        #: (str): scheduling policy of the actor
+        self.policy = policy
+        #: (int): niceness of the actor
+        self.nice = nice
+
+    def __repr__(self):
+        return 'Scheduling(cpus=%r, policy=%r, nice=%r)' % (self.cpus, self.policy, self.nice)
+
+    def __eq__(self, other):
+        return (isinstance(other, Scheduling) and self.cpus == other.cpus and self.policy == other.policy and
+                self.nice == other.nice)
+
+    def is_default(self):
+        """
+        :return: True if this scheduling keeps every inherited setting
+        """
+        return self.cpus is None and self.policy is None and self.nice is None
+
+    def apply(self, logger):
+        """
+        Apply the settings to the calling process (or thread)
+
+        :param logging.Logger logger: logger used to report the settings that
+                                      can't be applied
+        """
+        if self.cpus is not None:
+            self._apply_setting('cpu affinity', logger, lambda: os.sched_setaffinity(0, self.cpus))
+        if self.policy is not None:
+            policy_id = _get_policy_id(self.policy)
+            if policy_id is None:
+                logger.warning('scheduling policy ' + self.policy + ' not supported by the system')
+            else:
+                self._apply_setting('scheduling policy', logger,
+                                    lambda: os.sched_setscheduler(0, policy_id, os.sched_param(0)))
+        if self.nice is not None:
+            self._apply_setting('niceness', logger, lambda: os.setpriority(os.PRIO_PROCESS, 0, self.nice))
+
+    @staticmethod
+    def _apply_setting(setting_name, logger, apply_function):
+        try:
+            apply_function()
+        except AttributeError:
+            logger.warning(setting_name + ' not supported by the system')
+        except OSError as exn:
+            logger.warning('can\'t set ' + setting_name + ' : ' + str(exn))
+
+
+def role_scheduling(role, cpus=None, policy=None, nice=None, housekeeping_cpus=None):
+    """
+    Create the scheduling of the actors having the given role
+
+    When housekeeping cores are given, pushers, that only write the results,
+    are isolated on these cores and the other actors are kept away from them,
+    unless an explicit affinity is given for their role
+
+    :param str role: role of the actors (puller, dispatcher, formula or
+                     pusher)
+    :param set(int) cpus: cores on which the actors can run
+    :param str policy: scheduling policy of the actors
+    :param int nice: niceness of the actors
+    :param set(int) housekeeping_cpus: cores reserved to the housekeeping
+                                       actors (pushers)
+    :return: the scheduling, None if it keeps every inherited setting
+    :rtype: powerapi.actor.scheduling.Scheduling
+    """
+    if cpus is None and housekeeping_cpus:
+        if role == PUSHER_ROLE:
+            cpus = housekeeping_cpus
+        else:
+            # if every available core is a housekeeping core, keep the
+            # inherited affinity
+            cpus = (get_available_cpus() - set(housekeeping_cpus)) or None
+    scheduling = Scheduling(cpus, policy, nice)
+    return None if scheduling.is_default() else scheduling
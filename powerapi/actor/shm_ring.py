@@ -0,0 +1,237 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import ctypes
+import multiprocessing
+import struct
+from multiprocessing import shared_memory
+
+from powerapi.exception import PowerAPIException
+
+#: (int): default size (in bytes) of the data area of a ring
+DEFAULT_RING_CAPACITY = 4 * 1024 * 1024
+
+# the write (head) and read (tail) counters are stored in two different cache
+# lines at the beginning of the shared memory segment
+_HEAD_OFFSET = 0
+_TAIL_OFFSET = 64
+_HEADER_SIZE = 128
+
+_COUNTER = struct.Struct('=Q')
+_LENGTH = struct.Struct('=I')
+
+
+class RingClosedException(PowerAPIException):
+    """
+    Exception raised when attempting to use a ring whose shared memory segment
+    was released
+    """
+
+
+class ShmRing:
+    """
+    Lock-free single-producer/single-consumer ring buffer stored in a shared
+    memory segment
+
+    Each record of the ring is a list of frames (as returned by a codec),
+    stored as a length-prefixed sequence of length-prefixed frames. The
+    producer and the consumer only share two counters : the total number of
+    bytes written (head) and read (tail). The producer is the only one to
+    update the head and the consumer the only one to update the tail, so no
+    lock is needed to put or get records.
+
+    The ring doesn't provide any wakeup mechanism, :meth:`put
+    <powerapi.actor.shm_ring.ShmRing.put>` tells the producer when the
+    consumer may be waiting for data and has to be notified by another mean.
+
+    The shared memory segment must be created before the producer and the
+    consumer processes are forked
+    """
+
+    def __init__(self, capacity=DEFAULT_RING_CAPACITY):
+        """
+        :param int capacity: size (in bytes) of the data area of the ring
+        """
+        if capacity <= _LENGTH.size:
+            raise ValueError('ring capacity is too small')
+
+        #: (int): size (in bytes) of the data area of the ring
+        self.capacity = capacity
+
+        self._shm = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + capacity)
+        _COUNTER.pack_into(self._shm.buf, _HEAD_OFFSET, 0)
+        _COUNTER.pack_into(self._shm.buf, _TAIL_OFFSET, 0)
+
+        # True once a producer was registered with claim_producer
+        self._producer = multiprocessing.Value(ctypes.c_bool, False)
+
+    @property
+    def name(self):
+        """
+        (str): name of the shared memory segment
+        """
+        return self._shm.name
+
+    def _buffer(self):
+        if self._shm is None:
+            raise RingClosedException()
+        return self._shm.buf
+
+    def _get_counter(self, offset):
+        return _COUNTER.unpack_from(self._buffer(), offset)[0]
+
+    def _set_counter(self, offset, value):
+        _COUNTER.pack_into(self._buffer(), offset, value)
+
+    def claim_producer(self):
+        """
+        Register the caller as the only producer of the ring
+
+        :return bool: True if the caller is the producer, False if another
+                      producer was already registered
+        """
+        with self._producer.get_lock():
+            if self._producer.value:
+                return False
+            self._producer.value = True
+            return True
+
+    def empty(self):
+        """
+        :return bool: True if there is no record to read
+        """
+        return self._get_counter(_HEAD_OFFSET) == self._get_counter(_TAIL_OFFSET)
+
+    def used(self):
+        """
+        :return int: number of bytes written and not yet read
+        """
+        return self._get_counter(_HEAD_OFFSET) - self._get_counter(_TAIL_OFFSET)
+
+    def record_size(self, frames):
+        """
+        :param list frames: frames of a record
+        :return int: number of bytes used by the record in the ring
+        """
+        return _LENGTH.size * (2 + len(frames)) + sum(memoryview(frame).nbytes for frame in frames)
+
+    def _write(self, position, data):
+        buf = self._buffer()
+        index = position % self.capacity
+        size = len(data)
+        first = min(size, self.capacity - index)
+        buf[_HEADER_SIZE + index:_HEADER_SIZE + index + first] = data[:first]
+        if first < size:
+            buf[_HEADER_SIZE:_HEADER_SIZE + size - first] = data[first:]
+        return position + size
+
+    def _read(self, position, size):
+        buf = self._buffer()
+        index = position % self.capacity
+        first = min(size, self.capacity - index)
+        data = bytes(buf[_HEADER_SIZE + index:_HEADER_SIZE + index + first])
+        if first < size:
+            data += bytes(buf[_HEADER_SIZE:_HEADER_SIZE + size - first])
+        return data
+
+    def put(self, frames):
+        """
+        Write a record in the ring (producer side)
+
+        :param list frames: frames of the record (bytes-like objects)
+        :return bool or None: None if there is not enough free space in the
+                              ring, otherwise True if the consumer read all
+                              the previous records and may be waiting for
+                              this one
+        """
+        head = self._get_counter(_HEAD_OFFSET)
+        size = self.record_size(frames)
+        if size > self.capacity - (head - self._get_counter(_TAIL_OFFSET)):
+            return None
+
+        position = self._write(head, _LENGTH.pack(size - _LENGTH.size))
+        position = self._write(position, _LENGTH.pack(len(frames)))
+        for frame in frames:
+            data = memoryview(frame).cast('B')
+            position = self._write(position, _LENGTH.pack(len(data)))
+            position = self._write(position, data)
+
+        # publish the record then check if the consumer already read all the
+        # previous ones. The consumer does the opposite (publish the tail then
+        # check the head) so at least one of them sees the update of the other
+        self._set_counter(_HEAD_OFFSET, position)
+        return self._get_counter(_TAIL_OFFSET) == head
+
+    def get_all(self):
+        """
+        Read all the records available in the ring (consumer side)
+
+        :return list: the frames of each read record
+        """
+        records = []
+        tail = self._get_counter(_TAIL_OFFSET)
+        head = self._get_counter(_HEAD_OFFSET)
+        while tail != head:
+            while tail != head:
+                size = _LENGTH.unpack(self._read(tail, _LENGTH.size))[0]
+                record = self._read(tail + _LENGTH.size, size)
+                tail += _LENGTH.size + size
+                frames_count = _LENGTH.unpack_from(record, 0)[0]
+                frames = []
+                offset = _LENGTH.size
+                for _ in range(frames_count):
+                    length = _LENGTH.unpack_from(record, offset)[0]
+                    offset += _LENGTH.size
+                    frames.append(record[offset:offset + length])
+                    offset += length
+                records.append(frames)
+            self._set_counter(_TAIL_OFFSET, tail)
+            head = self._get_counter(_HEAD_OFFSET)
+        return records
+
+    def close(self):
+        """
+        Release the shared memory segment in the calling process
+        """
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self):
+        """
+        Release the shared memory segment and destroy it, the ring can't be
+        used anymore by any process
+        """
+        if self._shm is None:
+            return
+        shm = self._shm
+        self.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
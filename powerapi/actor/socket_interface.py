@@ -27,16 +27,76 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import pickle
 import logging
 import multiprocessing
+import copy
 import ctypes
+import os
+import tempfile
+import time
+import uuid
+from collections import deque
 
 import zmq
 from powerapi.actor import SafeContext
+from powerapi.actor.codec import DEFAULT_CODEC, get_codec
+from powerapi.actor.credits import Credits, NoCreditException
+from powerapi.actor.registry import register_actor, unregister_actor, lookup_actor, RegistryTimeoutException
+from powerapi.actor.registry import UNREGISTER_TIMEOUT
+from powerapi.actor.shm_ring import ShmRing, DEFAULT_RING_CAPACITY
 from powerapi.exception import PowerAPIException
 
-LOCAL_ADDR = 'tcp://127.0.0.1'
+#: (str): address of the network interface where the tcp sockets of the
+#: actors are bound by default
+DEFAULT_BIND_ADDRESS = '127.0.0.1'
+
+#: (tuple): bind addresses that match all the network interfaces, the
+#: sockets bound to them must have an advertise address
+WILDCARD_ADDRESSES = ('0.0.0.0', '*', '::')
+
+#: (str): actors sockets are bound to random ports on the bind address (the
+#: loopback interface by default)
+TCP_TRANSPORT = 'tcp'
+#: (str): actors sockets are unix domain sockets created in IPC_DIRECTORY
+IPC_TRANSPORT = 'ipc'
+#: (str): actors sockets are in-process sockets, usable only by actors that
+#: run in the same process and share the same zmq context
+INPROC_TRANSPORT = 'inproc'
+
+TRANSPORTS = (TCP_TRANSPORT, IPC_TRANSPORT, INPROC_TRANSPORT)
+DEFAULT_TRANSPORT = TCP_TRANSPORT
+
+#: (str): directory where the unix domain sockets of the ipc transport are
+#: created
+IPC_DIRECTORY = os.path.join(tempfile.gettempdir(), 'powerapi')
+
+#: (str): messages of the data canal are sent on the pull socket
+ZMQ_CHANNEL = 'zmq'
+#: (str): messages of the data canal sent by a single producer are written in
+#: a shared memory ring, the pull socket is only used to wake up the actor
+SHM_CHANNEL = 'shm'
+
+CHANNELS = (ZMQ_CHANNEL, SHM_CHANNEL)
+DEFAULT_CHANNEL = ZMQ_CHANNEL
+
+#: (int): maximum time (in ms) an actor using the shm channel waits on its
+#: sockets before checking its ring
+RING_POLL_PERIOD = 100
+
+#: (float): maximum time (in s) the producer of a full ring sleeps before
+#: checking again if there is free space in it
+RING_MAX_WAIT = 0.001
+
+#: (int): maximum number of messages returned by a call to receive_many
+DEFAULT_BATCH_SIZE = 100
+
+#: (int): time (in µs) after which receive_many stop reading already queued
+#: messages
+DEFAULT_BATCH_TIME = 1000
+
+#: (object): returned by the poll of a socket interface when a watched file
+#: descriptor became ready
+NOTIFICATION = object()
 
 
 class NotConnectedException(PowerAPIException):
@@ -45,6 +105,36 @@ class NotConnectedException(PowerAPIException):
     that is not conected
     """
 
+
+class UnknowTransportException(PowerAPIException):
+    """
+    Exception raised when attempting to create a socket interface with a
+    transport that doesn't exist
+    """
+    def __init__(self, transport):
+        PowerAPIException.__init__(self, 'unknow transport ' + transport)
+        self.transport = transport
+
+class BadAddressException(PowerAPIException):
+    """
+    Exception raised when the sockets of an actor are bound to all the network
+    interfaces without an address to advertise to their clients
+    """
+    def __init__(self, bind_address):
+        PowerAPIException.__init__(self, 'an advertise address is needed to bind to ' + bind_address)
+        self.bind_address = bind_address
+
+
+class UnknowChannelException(PowerAPIException):
+    """
+    Exception raised when attempting to create a socket interface with a
+    data channel that doesn't exist
+    """
+    def __init__(self, channel):
+        PowerAPIException.__init__(self, 'unknow channel ' + channel)
+        self.channel = channel
+
+
 class SocketInterface:
     """
     Interface to handle comunication to/from the actor
@@ -58,22 +148,88 @@ class SocketInterface:
     - :meth:`connect_data <powerapi.actor.socket_interface.SocketInterface.connect_data>`
     - :meth:`connect_control <powerapi.actor.socket_interface.SocketInterface.connect_control>`
     - :meth:`send_data <powerapi.actor.socket_interface.SocketInterface.send_data>`
+    - :meth:`send_data_many <powerapi.actor.socket_interface.SocketInterface.send_data_many>`
     - :meth:`close <powerapi.actor.socket_interface.SocketInterface.close>`
 
     server interface methods :
 
     - :meth:`setup <powerapi.actor.socket_interface.SocketInterface.setup>`
     - :meth:`receive <powerapi.actor.socket_interface.SocketInterface.receive>`
+    - :meth:`receive_many <powerapi.actor.socket_interface.SocketInterface.receive_many>`
     - :meth:`close <powerapi.actor.socket_interface.SocketInterface.close>`
     """
 
-    def __init__(self, name, timeout):
+    def __init__(self, name, timeout, codec=DEFAULT_CODEC, batch_size=DEFAULT_BATCH_SIZE, batch_time=DEFAULT_BATCH_TIME,
+                 transport=DEFAULT_TRANSPORT, mailbox_size=0, channel=DEFAULT_CHANNEL,
+                 ring_capacity=DEFAULT_RING_CAPACITY):
         """
         :param str name: name of the actor using this interface
         :param int timeout: time in millisecond to wait for a message
+        :param str codec: name of the codec used to encode the messages sent
+                          to the actor
+        :param int batch_size: maximum number of messages returned by
+                               receive_many
+        :param int batch_time: time (in µs) after which receive_many stop
+                               reading already queued messages
+        :param str transport: transport used by the actor sockets (tcp, ipc or
+                              inproc)
+        :param int mailbox_size: maximum number of messages waiting on the
+                                 data canal, 0 for an unbounded mailbox
+        :param str channel: channel used by the data canal (zmq or shm), with
+                            the shm channel, the first client that sends a
+                            message on the data canal sends all its messages
+                            through a shared memory ring, the other clients
+                            use the pull socket
+        :param int ring_capacity: size (in bytes) of the shared memory ring
+                                  (shm channel only)
+        :raise UnknowChannelException: if the channel doesn't exist
         """
+        if channel not in CHANNELS:
+            raise UnknowChannelException(channel)
+
         self.logger = logging.getLogger(name)
 
+        #: (str): name of the actor, used to register its addresses
+        self.name = name
+
+        #: (str): transport used by the actor sockets
+        self.transport = None
+
+        #: (str): address of the network interface where the tcp sockets are
+        #:        bound
+        self.bind_address = DEFAULT_BIND_ADDRESS
+
+        #: (str): address of the tcp sockets given to the clients
+        self.advertise_address = DEFAULT_BIND_ADDRESS
+
+        #: (str): address of the registry where the socket addresses are
+        #:        registered once the actor is initialized, and looked up by
+        #:        the clients of a remote actor, None to give the addresses
+        #:        through shared memory only
+        self.registry_address = None
+
+        #: (bool): True if the actor may have been started on another node,
+        #:         its addresses are then looked up in the registry by the
+        #:         clients
+        self.remote = False
+
+        #: (bool): True if the socket addresses were registered (server side)
+        self._registered = False
+
+        #: (str): prefix of the addresses of the ipc and inproc sockets
+        self._address_prefix = None
+
+        self.set_transport(transport)
+
+        #: (powerapi.actor.codec.Codec): codec used to encode/decode messages
+        self.codec = get_codec(codec)
+
+        #: (bool): if True, the clients send the reports in routing envelopes
+        #:         and the actor receives :class:`Envelope
+        #:         <powerapi.actor.codec.Envelope>` instead of the decoded
+        #:         reports
+        self.envelope = False
+
         #: (int): Time in millisecond to wait for a message before execute
         #:        timeout_handler
         self.timeout = timeout
@@ -84,9 +240,57 @@ class SocketInterface:
         #: (str): Address of the control socket
         self.control_socket_address = None
 
+        #: (int): maximum number of messages returned by receive_many
+        self.batch_size = batch_size
+
+        #: (int): time (in µs) after which receive_many stop reading already
+        #:        queued messages
+        self.batch_time = batch_time
+
+        #: (collections.deque): messages received in a batch but not yet
+        #:                      returned
+        self.pending_msgs = deque()
+
+        #: (powerapi.actor.credits.Credits): credits of the data canal, None
+        #:                                   if the mailbox is unbounded
+        self.credits = Credits(mailbox_size) if mailbox_size > 0 else None
+
+        #: (str): channel used by the data canal
+        self.channel = channel
+
+        #: (powerapi.actor.shm_ring.ShmRing): ring of the shm channel, created
+        #:                                    before the actor is started to
+        #:                                    be shared with its producer
+        self.ring = ShmRing(ring_capacity) if channel == SHM_CHANNEL else None
+
+        #: (bool): True if this interface is the producer of the ring, None
+        #:         until it sends its first message on the data canal
+        self._ring_producer = None
+
+        #: (bool): True if this interface is the consumer of the ring (server
+        #:         side)
+        self._ring_consumer = False
+
+        #: (int): number of messages received on the data canal
+        self.received_messages = 0
+
+        #: (int): number of times the interface waited for a message
+        self.poll_count = 0
+
+        #: (float): total time (in s) spent waiting for a message
+        self.poll_time = 0.0
+
         #: (zmq.Poller): ZMQ Poller for read many socket at same time
         self.poller = zmq.Poller()
 
+        #: (dict): message returned for each watched file descriptor (or
+        #:         object with a fileno method) when it becomes ready
+        self.watched = {}
+
+        #: (collections.deque): messages of the watched file descriptors that
+        #:                      became ready, not yet returned
+        self.notifications = deque()
+
         #: (zmq.Socket): ZMQ Pull socket for receiving data message
         self.pull_socket = None
 
@@ -107,6 +311,73 @@ class SocketInterface:
         self._pull_port.value = -1
         self._ctrl_port.value = -1
 
+    def set_transport(self, transport):
+        """
+        Change the transport used by the actor sockets
+
+        this method shouldn't be called once the socket interface was
+        initialized with the setup method
+
+        :param str transport: transport used by the actor sockets (tcp, ipc or
+                              inproc)
+        :raise UnknowTransportException: if the transport doesn't exist
+        """
+        if transport not in TRANSPORTS:
+            raise UnknowTransportException(transport)
+        self.transport = transport
+
+        # ipc and inproc addresses are chosen before the actor is started,
+        # tcp ports are chosen by the actor when it bind its sockets
+        self._address_prefix = None
+        if transport == IPC_TRANSPORT:
+            self._address_prefix = 'ipc://' + os.path.join(IPC_DIRECTORY, uuid.uuid4().hex)
+        elif transport == INPROC_TRANSPORT:
+            self._address_prefix = 'inproc://' + uuid.uuid4().hex
+
+    def set_addresses(self, bind_address, advertise_address=None):
+        """
+        Change the addresses used by the tcp sockets of the actor
+
+        this method shouldn't be called once the socket interface was
+        initialized with the setup method
+
+        :param str bind_address: address of the network interface where the
+                                 sockets are bound
+        :param str advertise_address: address given to the clients to connect
+                                      to the sockets, the bind address if None
+        :raise BadAddressException: if the sockets are bound to all the
+                                    interfaces without advertise address
+        """
+        if advertise_address is None:
+            if bind_address in WILDCARD_ADDRESSES:
+                raise BadAddressException(bind_address)
+            advertise_address = bind_address
+        self.bind_address = bind_address
+        self.advertise_address = advertise_address
+
+    def copy(self):
+        """
+        Return a new socket interface, without opened sockets, that use the
+        same addresses than this one
+
+        zmq sockets can't be shared between threads, each thread that
+        communicates with an actor must use its own socket interface
+
+        :rtype: powerapi.actor.socket_interface.SocketInterface
+        """
+        socket_interface = copy.copy(self)
+        socket_interface.pending_msgs = deque()
+        socket_interface.poller = zmq.Poller()
+        socket_interface.watched = {}
+        socket_interface.notifications = deque()
+        socket_interface.pull_socket = None
+        socket_interface.control_socket = None
+        socket_interface.push_socket = None
+        socket_interface._ring_producer = None
+        socket_interface._ring_consumer = False
+        socket_interface._registered = False
+        return socket_interface
+
     def setup(self):
         """
         Initialize sockets and send the selected port number to the father
@@ -114,39 +385,162 @@ class SocketInterface:
         """
         # create the pull socket (to communicate with this actor, others
         # process have to connect a push socket to this socket)
-        self.pull_socket, pull_port = self._create_socket(zmq.PULL, -1)
+        self.pull_socket, pull_port = self._create_socket(zmq.PULL, -1, 'pull')
 
         # create the control socket (to control this actor, a process have to
         # connect a pair socket to this socket with the `control` method)
-        self.control_socket, ctrl_port = self._create_socket(zmq.PAIR, 0)
+        self.control_socket, ctrl_port = self._create_socket(zmq.PAIR, 0, 'control')
 
-        self.pull_socket_address = LOCAL_ADDR + ':' + str(pull_port)
-        self.control_socket_address = LOCAL_ADDR + ':' + str(ctrl_port)
+        self.pull_socket_address = self._get_address('pull', pull_port)
+        self.control_socket_address = self._get_address('control', ctrl_port)
 
         self._pull_port.value = pull_port
         self._ctrl_port.value = ctrl_port
         self._values_available.set()
 
-    def _create_socket(self, socket_type, linger_value):
+
+        self._ring_consumer = self.ring is not None
+
+    def register(self):
+        """
+        Register the addresses of the sockets in the registry of the interface,
+        if it has one. Called once the actor is initialized, so clients
+        started on other nodes don't send messages it would ignore
+
+        this method shouldn't be called before the setup method
+
+        :raise RegistryTimeoutException: if the registry doesn't answer
+        """
+        if self.registry_address is not None:
+            register_actor(self.registry_address, self.name, self.pull_socket_address, self.control_socket_address)
+            self._registered = True
+
+    def _get_address(self, socket_name, port_number):
+        """
+        :param str socket_name: pull or control
+        :param int port_number: port where the socket is bound (tcp transport)
+        :return str: address of the given socket of the actor
         """
-        Create a socket of the given type, bind it to a random port and
-        register it to the poller
+        if self.transport == TCP_TRANSPORT:
+            return 'tcp://' + self.advertise_address + ':' + str(port_number)
+        return self._address_prefix + '_' + socket_name
+
+    def _create_socket(self, socket_type, linger_value, socket_name):
+        """
+        Create a socket of the given type, bind it to a random port (or to its
+        ipc/inproc address) and register it to the poller
 
         :param int socket_type: type of the socket to open
         :param int linger_value: -1 mean wait for receive all msg and block
                                  closing 0 mean hardkill the socket even if msg
                                  are still here.
+        :param str socket_name: pull or control
         :return (zmq.Socket, int): the initialized socket and the port where the
-                                   socket is bound
+                                   socket is bound (-1 if the transport is not
+                                   tcp)
         """
         socket = SafeContext.get_context().socket(socket_type)
         socket.setsockopt(zmq.LINGER, linger_value)
         socket.set_hwm(0)
-        port_number = socket.bind_to_random_port(LOCAL_ADDR)
+        if self.transport == TCP_TRANSPORT:
+            port_number = socket.bind_to_random_port('tcp://' + self.bind_address)
+        else:
+            if self.transport == IPC_TRANSPORT:
+                os.makedirs(IPC_DIRECTORY, exist_ok=True)
+            port_number = -1
+            socket.bind(self._get_address(socket_name, port_number))
         self.poller.register(socket, zmq.POLLIN)
-        self.logger.debug("bind to " + LOCAL_ADDR + ':' + str(port_number))
+        self.logger.debug("bind to " + self._get_address(socket_name, port_number))
         return (socket, port_number)
 
+    def _poll(self, timeout):
+        """
+        Wait until a message is available on the control or the pull socket
+
+        :param int timeout: time in millisecond to wait for a message
+        :return: the socket where a message is available (the control socket
+                 has the priority), NOTIFICATION if a watched file descriptor
+                 became ready or None if timeout
+        :rtype: zmq.Socket or None
+        """
+        if self.notifications:
+            return NOTIFICATION
+        begin = time.perf_counter()
+        events = self._poll_events(timeout)
+        self.poll_time += time.perf_counter() - begin
+        self.poll_count += 1
+        if self.watched:
+            events = self._pop_notifications(events)
+            if self.notifications:
+                return NOTIFICATION
+        for socket, _ in events:
+            if socket is not self.pull_socket:
+                return socket
+        return events[0][0] if events else None
+
+    def _pop_notifications(self, events):
+        """
+        Queue the messages of the watched file descriptors that became ready
+        and stop watching them
+
+        :param list events: the (socket, event) pairs returned by the poller
+        :return list: the events of the sockets
+        """
+        socket_events = []
+        for socket, event in events:
+            if socket in self.watched:
+                self.poller.unregister(socket)
+                self.notifications.append(self.watched.pop(socket))
+            else:
+                socket_events.append((socket, event))
+        return socket_events
+
+    def watch(self, fd, msg):
+        """
+        Watch a file descriptor polled with the sockets of the interface, the
+        given message is returned by receive or receive_many, before the
+        control messages, once the file descriptor is readable
+
+        Used to be woken up when a process terminates, by watching its
+        sentinel, without checking its state on each received message. The
+        file descriptor is watched only until it becomes readable
+
+        :param fd: file descriptor or object with a fileno method
+        :param msg: message returned when the file descriptor is readable
+        """
+        # the poller returns the file descriptor number of the ready objects
+        fd = fd if isinstance(fd, int) else fd.fileno()
+        self.watched[fd] = msg
+        self.poller.register(fd, zmq.POLLIN)
+
+    def _poll_events(self, timeout):
+        """
+        Poll the sockets of the interface
+
+        When the interface is the consumer of a ring, records available in the
+        ring make the pull socket ready and the sockets are polled by periods
+        of at most :data:`RING_POLL_PERIOD` ms, so data written in the ring is
+        read even if its wake up message was missed
+
+        :param int timeout: time in millisecond to wait for a message
+        :return list: the (socket, event) pairs of the ready sockets
+        """
+        if not self._ring_consumer:
+            return self.poller.poll(timeout)
+
+        remaining = timeout
+        while True:
+            if not self.ring.empty():
+                return self.poller.poll(0) or [(self.pull_socket, zmq.POLLIN)]
+            period = RING_POLL_PERIOD if remaining is None else min(remaining, RING_POLL_PERIOD)
+            events = self.poller.poll(period)
+            if events:
+                return events
+            if remaining is not None:
+                remaining -= period
+                if remaining <= 0:
+                    return []
+
     def receive(self):
         """
         Block until a message was received (or until timeout) an return the
@@ -155,14 +549,74 @@ class SocketInterface:
         :return: the list of received messages or None if timeout
         :rtype: a list of Object or None
         """
-        events = self.poller.poll(self.timeout)
+        while True:
+            socket = self._poll(0 if self.pending_msgs else self.timeout)
+
+            if socket is NOTIFICATION:
+                return self.notifications.popleft()
+            # If there is control socket, he has the priority
+            if socket is not None and socket is not self.pull_socket:
+                return self._recv_serialized(socket)
+            elif self.pending_msgs:
+                return self.pending_msgs.popleft()
+            elif socket is not None:
+                msgs = self._recv_data_many()
+                if not msgs:
+                    # wake up messages of ring records that were already read
+                    continue
+                self.pending_msgs.extend(msgs[1:])
+                return msgs[0]
+            return None
+
+    def receive_many(self):
+        """
+        Block until a message was received (or until timeout) and return it
+        with all the messages already queued on the data canal
 
-        # If there is control socket, he has the priority
-        if len(events) == 2:
-            return self._recv_serialized(self.control_socket)
-        elif len(events) == 1:
-            return self._recv_serialized(events[0][0])
-        return None
+        At most :attr:`batch_size` messages are returned and queued messages
+        are read for at most :attr:`batch_time` µs. A control message is
+        always returned alone
+
+        :return: the list of received messages, empty if timeout
+        :rtype: a list of Object
+        """
+        msgs = []
+        while not msgs:
+            socket = self._poll(0 if self.pending_msgs else self.timeout)
+
+            if socket is NOTIFICATION:
+                return [self.notifications.popleft()]
+            if socket is not None and socket is not self.pull_socket:
+                return [self._recv_serialized(socket)]
+            elif socket is None and not self.pending_msgs:
+                return []
+
+            # no message is read if the pull socket only received wake up
+            # messages of ring records that were already read, wait again
+            msgs = list(self.pending_msgs)
+            self.pending_msgs.clear()
+            deadline = time.perf_counter() + self.batch_time / 1000000
+            while len(msgs) < self.batch_size:
+                try:
+                    msgs += self._recv_data_many(zmq.NOBLOCK)
+                except zmq.Again:
+                    break
+                if time.perf_counter() > deadline:
+                    break
+
+        if len(msgs) > self.batch_size:
+            self.pending_msgs.extend(msgs[self.batch_size:])
+            del msgs[self.batch_size:]
+        return msgs
+
+    def put_back(self, msgs):
+        """
+        Put received messages back in front of the messages that will be
+        returned by the next calls to receive or receive_many
+
+        :param list msgs: messages to put back, in their reception order
+        """
+        self.pending_msgs.extendleft(reversed(msgs))
 
     def receive_control(self, timeout):
         """
@@ -196,25 +650,98 @@ class SocketInterface:
         if self.control_socket is not None:
             self.control_socket.close()
 
+        if self._ring_consumer:
+            self.ring.unlink()
+            self._ring_consumer = False
+
+        if self._registered:
+            self._registered = False
+            try:
+                unregister_actor(self.registry_address, self.name, UNREGISTER_TIMEOUT)
+            except RegistryTimeoutException:
+                self.logger.warning('registry ' + self.registry_address + ' unreachable, ' + self.name +
+                                    ' not unregistered')
+
     def _send_serialized(self, socket, msg):
         """
-        Send a serialized msg with pickle to the given socket
+        Send a msg serialized with the codec to the given socket
 
         :param zmq.Socket socket: socket used to send the message
         :param Object msg: message to send
         """
-        socket.send(pickle.dumps(msg))
+        socket.send_multipart(self.codec.encode(msg), copy=False)
 
     def _recv_serialized(self, socket):
         """
         Wait for a message from the given socket and return its deserialized
-        value (using pickle)
+        value (using the codec)
 
         :param zmq.Socket socket: socket to wait for a reception
         :return Object: the received message
         """
-        msg = pickle.loads(socket.recv())
-        return msg
+        frames = socket.recv_multipart(copy=False)
+        return self.codec.decode([frame.buffer for frame in frames])
+
+    def _recv_data_many(self, flags=0):
+        """
+        Receive the messages of a zmq message from the pull socket, or the
+        messages available in the ring, and give back their credits to the
+        senders
+
+        :param int flags: zmq flags used to receive the message
+        :return list: the received messages
+        :raise zmq.Again: if flags contain zmq.NOBLOCK and no message is queued
+        """
+        msgs = self._recv_ring() if self._ring_consumer else []
+        woken_up = False
+        while not msgs:
+            try:
+                frames = self.pull_socket.recv_multipart(flags, copy=False)
+            except zmq.Again:
+                if not woken_up:
+                    raise
+                break
+            if len(frames) == 1 and not frames[0].buffer:
+                # wake up message sent by the producer of the ring, its
+                # records may have already been read
+                woken_up = True
+                flags |= zmq.NOBLOCK
+                msgs = self._recv_ring()
+            else:
+                msgs = self.codec.decode_many([frame.buffer for frame in frames], not self.envelope)
+        self.received_messages += len(msgs)
+        if self.credits is not None:
+            self.credits.release(len(msgs))
+        return msgs
+
+    def _recv_ring(self):
+        """
+        Read all the records of the ring and return the decoded messages
+
+        :return list: the received messages
+        """
+        msgs = []
+        for frames in self.ring.get_all():
+            msgs += self.codec.decode_many(frames, not self.envelope)
+        return msgs
+
+    def _resolve_addresses(self):
+        """
+        Get the addresses of the actor sockets from the registry if the actor
+        is remote, otherwise from the shared memory written by the actor once
+        its sockets are bound
+
+        :raise UnknowActorException: if the remote actor is not registered in
+                                     time
+        """
+        if self.pull_socket_address is not None:
+            return
+        if self.remote:
+            self.pull_socket_address, self.control_socket_address = lookup_actor(self.registry_address, self.name)
+            return
+        self._values_available.wait()
+        self.pull_socket_address = self._get_address('pull', self._pull_port.value)
+        self.control_socket_address = self._get_address('control', self._ctrl_port.value)
 
     def connect_data(self):
         """
@@ -227,10 +754,7 @@ class SocketInterface:
         with the setup method
         """
 
-        if self.pull_socket_address is None:
-            self._values_available.wait()
-            self.pull_socket_address = LOCAL_ADDR + ':' + str(self._pull_port.value)
-            self.control_socket_address = LOCAL_ADDR + ':' + str(self._ctrl_port.value)
+        self._resolve_addresses()
 
         self.push_socket = SafeContext.get_context().socket(zmq.PUSH)
         self.push_socket.setsockopt(zmq.LINGER, -1)
@@ -246,10 +770,7 @@ class SocketInterface:
         this method shouldn't be called if socket interface was not initialized
         with the setup method
         """
-        if self.pull_socket_address is None:
-            self._values_available.wait()
-            self.pull_socket_address = LOCAL_ADDR + ':' + str(self._pull_port.value)
-            self.control_socket_address = LOCAL_ADDR + ':' + str(self._ctrl_port.value)
+        self._resolve_addresses()
 
         self.control_socket = SafeContext.get_context().socket(zmq.PAIR)
         self.control_socket.setsockopt(zmq.LINGER, 0)
@@ -268,12 +789,116 @@ class SocketInterface:
             raise NotConnectedException()
         self._send_serialized(self.control_socket, msg)
 
-    def send_data(self, msg):
+    def send_data(self, msg, timeout=None):
         """
         Send a message on data canal
 
+        If the mailbox of the actor is bounded, wait for a credit before
+        sending the message
+
         :param Object msg: message to send
+        :param float timeout: time (in s) to wait for a credit, None to wait
+                              until a credit is available
+        :raise NoCreditException: if no credit was available before timeout
+        """
+        if self.push_socket is None:
+            raise NotConnectedException()
+        if self.credits is not None and not self.credits.acquire(1, timeout):
+            raise NoCreditException()
+        self._send_data_frames(self.codec.encode_message(msg, self.envelope), 1, timeout)
+
+    def send_data_many(self, msgs, timeout=None):
+        """
+        Send a batch of messages on data canal, in a single zmq message
+
+        If the mailbox of the actor is bounded, wait for one credit per message
+        before sending them. Batches are split to the credits available when
+        they are sent, a sender never waits for more credits than the free
+        space of the mailbox (or one credit if it is full)
+
+        :param list msgs: messages to send
+        :param float timeout: time (in s) to wait for the credits of each zmq
+                              message, None to wait until they are available
+        :raise NoCreditException: if no credit was available before timeout,
+                                  messages of previous zmq messages are sent
+                                  (their number is given by its sent
+                                  attribute)
         """
         if self.push_socket is None:
             raise NotConnectedException()
-        self._send_serialized(self.push_socket, msg)
+        if self.credits is None:
+            if msgs:
+                self._send_data_frames(self.codec.encode_many(msgs, self.envelope), 0, timeout)
+            return
+
+        index = 0
+        while index < len(msgs):
+            batch = msgs[index:index + max(1, self.credits.available())]
+            if not self.credits.acquire(len(batch), timeout):
+                raise NoCreditException(index)
+            try:
+                self._send_data_frames(self.codec.encode_many(batch, self.envelope), len(batch), timeout)
+            except NoCreditException:
+                raise NoCreditException(index)
+            index += len(batch)
+
+    def _send_data_frames(self, frames, credits, timeout):
+        """
+        Send encoded messages on the data canal, through the ring if this
+        interface is its producer
+
+        A record bigger than the ring is sent on the pull socket, it may be
+        received before messages previously written in the ring
+
+        :param list frames: frames that encode the messages
+        :param int credits: number of credits acquired for the messages, given
+                            back if the messages can't be sent
+        :param float timeout: time (in s) to wait for free space in the ring,
+                              None to wait until there is enough space
+        :raise NoCreditException: if the ring was full until timeout
+        """
+        if self._ring_producer is None:
+            self._ring_producer = self.ring is not None and self.ring.claim_producer()
+        if not self._ring_producer or self.ring.record_size(frames) > self.ring.capacity:
+            self.push_socket.send_multipart(frames, copy=False)
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        wait = RING_MAX_WAIT / 64
+        wake_up = self.ring.put(frames)
+        while wake_up is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                if credits and self.credits is not None:
+                    self.credits.release(credits)
+                raise NoCreditException()
+            time.sleep(wait)
+            wait = min(wait * 2, RING_MAX_WAIT)
+            wake_up = self.ring.put(frames)
+
+        if wake_up:
+            self.push_socket.send(b'')
+
+    def get_flow_control_metrics(self):
+        """
+        :return dict: current credits and queue depth of the mailbox, empty if
+                      the mailbox is unbounded
+        """
+        if self.credits is None:
+            return {}
+        return self.credits.get_metrics()
+
+    def get_stats(self):
+        """
+        :return dict: number of received messages, number of calls and time
+                      spent (in s) waiting for messages, number of messages
+                      received but not handled yet and flow control metrics
+        """
+        stats = {'received_messages': self.received_messages,
+                 'poll_count': self.poll_count,
+                 'poll_time': self.poll_time,
+                 'pending_messages': len(self.pending_msgs)}
+        stats.update(self.get_flow_control_metrics())
+        if self.ring is not None:
+            stats['ring_capacity'] = self.ring.capacity
+            stats['ring_used'] = self.ring.used()
+        return stats
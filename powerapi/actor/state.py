@@ -52,6 +52,9 @@ class State:
         self.initialized = False
         #: (bool): True if the actor is alive, False otherwise
         self.alive = True
+        #: ({type: powerapi.handler.abstract_handler.AbstractHandler}): cache
+        #: of the handler resolved for each concrete message type
+        self._handler_cache = {}
         #: ([(type, powerapi.handler.abstract_handler.AbstractHandler)]):
         #: mapping between message type and handler that the mapped handler
         #: must handle
@@ -72,11 +75,39 @@ class State:
 
         :raises UnknowMessageTypeException: if no handler could be find
         """
-        for (msg_type, handler) in self.handlers:
-            if isinstance(msg, msg_type):
+        msg_class = type(msg)
+        try:
+            handler = self._handler_cache[msg_class]
+        except KeyError:
+            handler = self._resolve_handler(msg_class)
+            self._handler_cache[msg_class] = handler
+
+        if handler is None:
+            raise UnknowMessageTypeException()
+        return handler
+
+    def _resolve_handler(self, msg_class):
+        """
+        Return the first registered handler whose message type is in the MRO
+        of the given message class, None if there is no such handler
+        """
+        for (msg_type, handler) in self._handlers:
+            if issubclass(msg_class, msg_type):
                 return handler
+        return None
+
+    @property
+    def handlers(self):
+        """
+        ([(type, powerapi.handler.abstract_handler.AbstractHandler)]): mapping
+        between message type and handler that the mapped handler must handle
+        """
+        return self._handlers
 
-        raise UnknowMessageTypeException()
+    @handlers.setter
+    def handlers(self, handlers):
+        self._handlers = handlers
+        self._handler_cache.clear()
 
     def add_handler(self, message_type, handler):
         """
@@ -87,7 +118,8 @@ class State:
         :param handler: handler that will handle all messages of the given type
         :type handler: powerapi.handler.AbstractHandler
         """
-        self.handlers.append((message_type, handler))
+        self._handlers.append((message_type, handler))
+        self._handler_cache.clear()
 
     def reinit(self):
         pass
@@ -0,0 +1,231 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import json
+import sys
+import threading
+import time
+
+#: (int): number of bits of the values kept by the latency histograms, the
+#: relative error of the recorded latencies is bounded by
+#: 2 ** -(LATENCY_PRECISION_BITS - 1)
+LATENCY_PRECISION_BITS = 5
+#: (tuple): percentiles given by the latency histograms
+PERCENTILES = (50, 90, 99, 99.9)
+#: (float): default period (in s) between two dumps of the actors statistics
+DEFAULT_STATS_PERIOD = 10.0
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies (in ns)
+
+    Recorded values are truncated to their :attr:`precision_bits` most
+    significant bits and counted in one bucket per truncated value, so the
+    histogram has a constant relative precision with a small number of
+    buckets, whatever the range of the recorded values
+    """
+
+    def __init__(self, precision_bits=LATENCY_PRECISION_BITS):
+        """
+        :param int precision_bits: number of significant bits kept for each
+                                   recorded value
+        """
+        #: (int): number of significant bits kept for each recorded value
+        self.precision_bits = precision_bits
+        #: (dict): number of recorded values by bucket index
+        self.buckets = {}
+        #: (int): number of recorded values
+        self.count = 0
+        #: (int): sum of the recorded values
+        self.total = 0
+        #: (int): smallest recorded value
+        self.min = None
+        #: (int): biggest recorded value
+        self.max = 0
+
+    def _bucket_index(self, value):
+        shift = max(0, value.bit_length() - self.precision_bits)
+        return (shift << (self.precision_bits - 1)) + (value >> shift)
+
+    def _bucket_upper_bound(self, index):
+        if index < 1 << self.precision_bits:
+            return index
+        shift = (index >> (self.precision_bits - 1)) - 1
+        return ((index - (shift << (self.precision_bits - 1)) + 1) << shift) - 1
+
+    def record(self, value, count=1):
+        """
+        Record a latency
+
+        :param int value: recorded latency (in ns)
+        :param int count: number of times the latency is recorded
+        """
+        value = int(value)
+        index = self._bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, percentile):
+        """
+        :param float percentile: percentile to compute (between 0 and 100)
+        :return int: upper bound of the bucket containing the given percentile
+                     of the recorded values, 0 if no value was recorded
+        """
+        if self.count == 0:
+            return 0
+        rank = percentile * self.count / 100
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self._bucket_upper_bound(index), self.max)
+        return self.max
+
+    def to_dict(self):
+        """
+        :return dict: number of recorded values, mean, min, max and
+                      percentiles of the recorded latencies (in µs)
+        """
+        stats = {'count': self.count,
+                 'mean': self.total / self.count / 1000 if self.count else 0,
+                 'min': (self.min or 0) / 1000,
+                 'max': self.max / 1000}
+        for percentile in PERCENTILES:
+            stats['p' + str(percentile)] = self.percentile(percentile) / 1000
+        return stats
+
+
+class ActorStats:
+    """
+    Runtime statistics of an actor: number of handled messages and, for each
+    of its handlers, number of handled messages and latency histogram of the
+    batches of messages it handled
+
+    Messages received together are handled in one batch, whose latency is
+    recorded once : the latency of a single message is not measured
+    """
+
+    def __init__(self):
+        #: (float): time when the actor started
+        self.start_time = time.time()
+        #: (int): number of messages handled by the actor
+        self.handled_messages = 0
+        #: (dict): batch latency histogram of each handler, by handler class
+        #: name
+        self.handlers = {}
+        #: (dict): number of messages handled by each handler, by handler
+        #: class name
+        self.handler_messages = {}
+        #: (tuple): time and number of handled messages of the last snapshot
+        self._last_snapshot = (self.start_time, 0)
+
+    def record(self, handler, number_of_msgs, duration):
+        """
+        Record the handling of a batch of messages, its duration is recorded
+        once in the batch latency histogram of the handler
+
+        :param powerapi.handler.Handler handler: handler used to handle the
+                                                 messages
+        :param int number_of_msgs: number of handled messages
+        :param int duration: time (in ns) spent to handle the batch
+        """
+        name = type(handler).__name__
+        if name not in self.handlers:
+            self.handlers[name] = LatencyHistogram()
+            self.handler_messages[name] = 0
+        self.handlers[name].record(duration)
+        self.handler_messages[name] += number_of_msgs
+        self.handled_messages += number_of_msgs
+
+    def snapshot(self):
+        """
+        :return dict: uptime, number of handled messages, message rate since
+                      the last snapshot and, for each handler, its number of
+                      handled messages and its batch latencies
+        """
+        now = time.time()
+        last_time, last_handled_messages = self._last_snapshot
+        self._last_snapshot = (now, self.handled_messages)
+        elapsed = now - last_time
+        return {'uptime': now - self.start_time,
+                'handled_messages': self.handled_messages,
+                'messages_per_second': (self.handled_messages - last_handled_messages) / elapsed if elapsed > 0 else 0,
+                'handlers': {name: {'messages': self.handler_messages[name], 'batch_latency': histogram.to_dict()}
+                             for name, histogram in self.handlers.items()}}
+
+
+class StatsDumper(threading.Thread):
+    """
+    Thread that periodically collects the statistics of the actors of a
+    supervisor and writes them in a file, one JSON object per line and per
+    actor
+    """
+
+    def __init__(self, supervisor, output, period=DEFAULT_STATS_PERIOD):
+        """
+        :param powerapi.actor.Supervisor supervisor: supervisor of the actors
+        :param str output: path of the file where the statistics are
+                           appended, - for the standard output
+        :param float period: time (in s) between two dumps
+        """
+        threading.Thread.__init__(self, daemon=True)
+        self.supervisor = supervisor
+        self.output = output
+        self.period = period
+        self._stopped = threading.Event()
+
+    def dump(self, output_file):
+        """
+        Collect the statistics of the actors and write them in the given file
+        """
+        timestamp = time.time()
+        for stats in self.supervisor.collect_stats():
+            stats['timestamp'] = timestamp
+            output_file.write(json.dumps(stats, default=str) + '\n')
+        output_file.flush()
+
+    def run(self):
+        output_file = sys.stdout if self.output == '-' else open(self.output, 'a')
+        try:
+            while not self._stopped.wait(self.period):
+                self.dump(output_file)
+        finally:
+            if output_file is not sys.stdout:
+                output_file.close()
+
+    def stop(self):
+        """
+        Stop the thread and wait for its termination
+        """
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
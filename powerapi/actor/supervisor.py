@@ -27,10 +27,19 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import multiprocessing
+import multiprocessing.connection
+import time
 
+from powerapi.actor.embedded import join_embedded_actors
 from powerapi.exception import PowerAPIException
-from powerapi.message import StartMessage, ErrorMessage
+from powerapi.message import StartMessage, ErrorMessage, StatsRequestMessage, StatsMessage
+
+
+#: (float): time (in s) given to the actors still alive at the shutdown
+#: deadline to terminate after being asked to, before being killed
+KILL_GRACE_PERIOD = 1.0
 
 
 class ActorInitError(PowerAPIException):
@@ -77,6 +86,18 @@ class Supervisor:
         #: ([powerapi.actor.actor.Actor]): list of supervised actors
         self.supervised_actors = []
 
+    def supervise(self, actor):
+        """
+        Supervise an actor already launched (by an other supervisor), it is
+        then killed with the other supervised actors
+
+        :raise: powerapi.actor.ActorAlreadySupervisedException if the actor is
+                already supervised
+        """
+        if actor in self.supervised_actors:
+            raise ActorAlreadySupervisedException()
+        self.supervised_actors.append(actor)
+
     def launch_actor(self, actor, start_message=True):
         """
         Launch the actor :
@@ -91,25 +112,84 @@ class Supervisor:
         :raise: powerapi.actor.ActorInitError if the actor crash during the
                 initialisation process
         """
-        if actor.is_alive():
-            raise ActorAlreadyLaunchedException()
+        self.launch_actors([actor], start_message)
+
+    def launch_actors(self, actors, start_message=True, timeout=2000):
+        """
+        Launch several actors at once :
+          - start the processes of all the actors and connect their data and
+            control sockets
+          - send a StartMessage to all the actors if needed
+          - wait for the answers of all the actors, with a single deadline
+
+        The actors are initialized concurrently, so the launch takes as long
+        as the slowest initialisation instead of the sum of them. Actors that
+        answered OKMessage are supervised even if an other actor failed
+
+        :param list actors: actors to launch
+        :param boolean start_message: True a StartMessage need to be sent to
+                                      the actors
+        :param int timeout: time (in ms) given to all the actors to answer
+                            to the StartMessage
+
+        :raise: zmq.error.ZMQError if a communication error occurs
+        :raise: powerapi.actor.ActorInitError if an actor answered an
+                ErrorMessage
+        :raise: powerapi.actor.FailConfigureError if an actor didn't answer
+                before timeout
+        :raise: powerapi.actor.CrashConfigureError if an actor crashed during
+                the initialisation process
+
+        If several actors failed, the error of the first one (in the given
+        order) is raised
+        """
+        for actor in actors:
+            if actor.is_alive():
+                raise ActorAlreadyLaunchedException()
+
+        for actor in actors:
+            actor.start()
+            actor.connect_control()
+            actor.connect_data()
 
-        actor.start()
-        actor.connect_control()
-        actor.connect_data()
+        if not start_message:
+            self.supervised_actors += actors
+            return
 
-        if start_message:
+        for actor in actors:
             actor.send_control(StartMessage())
-            msg = actor.receive_control(2000)
-            if isinstance(msg, ErrorMessage):
-                raise ActorInitError(msg.error_message)
-            elif msg is None:
-                if actor.is_alive():
-                    actor.terminate()
-                    raise FailConfigureError("Unable to configure the " + actor.name)
-                else:
-                    raise CrashConfigureError("The " + actor.name + " crash during initialisation process")
-        self.supervised_actors.append(actor)
+
+        deadline = time.perf_counter() + timeout / 1000
+        error = None
+        for actor in actors:
+            msg = actor.receive_control(max(0, int((deadline - time.perf_counter()) * 1000)))
+            try:
+                self._check_start_answer(actor, msg)
+                self.supervised_actors.append(actor)
+            except (ActorInitError, FailConfigureError, CrashConfigureError) as exn:
+                error = exn if error is None else error
+
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def _check_start_answer(actor, msg):
+        """
+        Check the answer of an actor to the StartMessage
+
+        :raise: powerapi.actor.ActorInitError if the answer is an ErrorMessage
+        :raise: powerapi.actor.FailConfigureError if the actor didn't answer
+                (the actor is terminated)
+        :raise: powerapi.actor.CrashConfigureError if the actor is dead
+        """
+        if isinstance(msg, ErrorMessage):
+            raise ActorInitError(msg.error_message)
+        elif msg is None:
+            if actor.is_alive():
+                actor.terminate()
+                raise FailConfigureError("Unable to configure the " + actor.name)
+            else:
+                raise CrashConfigureError("The " + actor.name + " crash during initialisation process")
 
     def join(self):
         """
@@ -120,14 +200,105 @@ class Supervisor:
         # for actor in self.supervised_actors:
         #     actor.join()
 
-    def kill_actors(self, soft=False, by_data=False):
+    def collect_stats(self, timeout=1000):
+        """
+        Ask their runtime statistics to all the alive supervised actors
+
+        The request is sent to all the actors before waiting for the answers
+
+        :param int timeout: time (in ms) to wait for the answers of the actors
+        :return list: statistics of each actor that answered before timeout
+                      (and of the actors it supervises), one dict per actor
+        """
+        actors = [actor for actor in self.supervised_actors if actor.is_alive()]
+        for actor in actors:
+            actor.send_control(StatsRequestMessage(timeout))
+
+        deadline = time.perf_counter() + timeout / 1000
+        stats = []
+        for actor in actors:
+            msg = None
+            while not isinstance(msg, StatsMessage) and time.perf_counter() < deadline:
+                msg = actor.receive_control(int((deadline - time.perf_counter()) * 1000))
+            if isinstance(msg, StatsMessage):
+                stats += msg.stats
+        return stats
+
+    def kill_actors(self, soft=False, by_data=False, timeout=None):
         """
         Kill all the supervised actors
+
+        The actors of a stage (see :meth:`_kill_stages
+        <powerapi.actor.supervisor.Supervisor._kill_stages>`) are sent a
+        PoisonPillMessage at once and their terminations are waited together,
+        before killing the actors of the next stage. Actors still alive at the
+        deadline are terminated, then killed after :data:`KILL_GRACE_PERIOD`
+
+        :param bool soft: if True, the actors handle the messages of their
+                          mailbox before terminating
+        :param float timeout: time (in s) given to all the actors to
+                              terminate, None to wait until they terminate
+        :return list: actors that were terminated after the deadline
         """
-        for actor in self.supervised_actors:
-            if actor.is_alive():
+        deadline = None if timeout is None else time.monotonic() + timeout
+        forced = []
+        for stage in self._kill_stages():
+            actors = [actor for actor in stage if actor.is_alive()]
+            for actor in actors:
                 if soft:
                     actor.soft_kill()
                 else:
                     actor.hard_kill()
-                actor.join()
+            alive = self._wait_actors(actors, deadline)
+            if alive:
+                self._force_kill(alive)
+                forced += alive
+        return forced
+
+    def _kill_stages(self):
+        """
+        :return list: groups of actors killed one after the other, all the
+                      supervised actors are killed at once by default
+        """
+        return [self.supervised_actors]
+
+    @staticmethod
+    def _wait_actors(actors, deadline):
+        """
+        Wait until the given actors terminate, on their sentinels, or until
+        the deadline
+
+        :param list actors: actors to wait for
+        :param float deadline: time.monotonic() value of the deadline, None to
+                               wait until the actors terminate
+        :return list: actors still alive at the deadline
+        """
+        embedded = [actor for actor in actors if isinstance(actor.sentinel, asyncio.Future)]
+        pending = {actor.sentinel: actor for actor in actors
+                   if actor.sentinel is not None and actor not in embedded}
+        alive = []
+        if embedded:
+            alive += join_embedded_actors(embedded, None if deadline is None else deadline - time.monotonic())
+
+        while pending:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            ready = multiprocessing.connection.wait(list(pending), remaining)
+            if not ready:
+                break
+            for sentinel in ready:
+                # reap the terminated process (or thread)
+                pending.pop(sentinel).join()
+        return alive + list(pending.values())
+
+    def _force_kill(self, actors):
+        """
+        Terminate the given actors, and kill the ones still alive after
+        :data:`KILL_GRACE_PERIOD`
+
+        :param list actors: actors to stop
+        """
+        for actor in actors:
+            actor.terminate()
+        for actor in self._wait_actors(actors, time.monotonic() + KILL_GRACE_PERIOD):
+            actor.kill()
+            actor.join(KILL_GRACE_PERIOD)
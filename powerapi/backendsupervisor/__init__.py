@@ -27,4 +27,4 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from powerapi.backendsupervisor.backend_supervisor import BackendSupervisor
+from powerapi.backendsupervisor.backend_supervisor import BackendSupervisor, DEFAULT_SHUTDOWN_TIMEOUT
@@ -26,22 +26,50 @@
 # CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-import multiprocessing
-import signal
-
-from powerapi.actor import Supervisor
+from powerapi.actor import Supervisor, StatsDumper, DEFAULT_STATS_PERIOD, EMBEDDED_RUNTIME, wait_embedded_actors
 from powerapi.puller import PullerActor
 from powerapi.dispatcher import DispatcherActor
 
+#: (float): time (in s) given to the actors to terminate when the backend is
+#: interrupted in stream mode
+DEFAULT_SHUTDOWN_TIMEOUT = 30.0
+
 
 class BackendSupervisor(Supervisor):
 
-    def __init__(self, stream_mode):
+    def __init__(self, stream_mode, stats_file=None, stats_period=DEFAULT_STATS_PERIOD,
+                 shutdown_timeout=DEFAULT_SHUTDOWN_TIMEOUT):
+        """
+        :param bool stream_mode: enable stream mode
+        :param str stats_file: file where the statistics of the actors are
+                               periodically dumped as JSON lines (- for the
+                               standard output), None to disable the dump
+        :param float stats_period: time (in s) between two dumps of the
+                                   statistics
+        :param float shutdown_timeout: time (in s) given to the actors to
+                                       terminate when the backend is
+                                       interrupted in stream mode, the actors
+                                       still alive are then killed. None to
+                                       wait until they terminate
+        """
         super().__init__()
 
         #: (bool): Enable stream mode.
         self.stream_mode = stream_mode
 
+        #: (str): file where the statistics of the actors are dumped
+        self.stats_file = stats_file
+
+        #: (float): time (in s) between two dumps of the statistics
+        self.stats_period = stats_period
+
+        #: (float): time (in s) given to the actors to terminate in stream
+        #: mode
+        self.shutdown_timeout = shutdown_timeout
+
+        #: (powerapi.actor.StatsDumper): thread that dumps the statistics
+        self._stats_dumper = None
+
         #: (list): List of Puller
         self.pullers = []
 
@@ -64,6 +92,12 @@ class BackendSupervisor(Supervisor):
             else:
                 self.pushers.append(actor)
 
+        # the dumper thread can't communicate with embedded actors, that run on
+        # the event loop of the main thread
+        if self.stats_file is not None and not self._is_embedded():
+            self._stats_dumper = StatsDumper(self, self.stats_file, self.stats_period)
+            self._stats_dumper.start()
+
         if self.stream_mode:
             self.join_stream_mode_on()
         else:
@@ -74,41 +108,68 @@ class BackendSupervisor(Supervisor):
         Supervisor behaviour when stream mode is on.
         When end raise (for exemple by CRTL+C)
         -> Kill all actor in the following order (Puller - Dispatcher/Formula - Pusher)
-        1. Send SIGTERM
-        2. Join X seconds
-        3. If still alive, send SIGKILL
-        4. Join
+        1. Send a PoisonPillMessage to all the actors of a kind at once
+        2. Wait for all of them, until the shutdown deadline shared by all
+           the kinds
+        3. If still alive, send SIGTERM, then SIGKILL
         """
-        def kill_behaviour(actor):
-            actor.terminate()
-            actor.join(5)
-            if actor.is_alive():
-                actor.kill()
-                actor.join()
-
         for actor in self.supervised_actors:
             if not actor.is_alive():
-                self.kill_actors()
+                self._stop_stats_dumper()
+                self.kill_actors(timeout=self.shutdown_timeout)
                 return
-        
-        actor_sentinels = [actor.sentinel for actor in self.supervised_actors]
-        import select
-        select.select(actor_sentinels, actor_sentinels, actor_sentinels)
-        self.kill_actors()
+
+        if self._is_embedded():
+            try:
+                wait_embedded_actors(self.supervised_actors)
+            except KeyboardInterrupt:
+                pass
+        else:
+            actor_sentinels = [actor.sentinel for actor in self.supervised_actors]
+            import select
+            select.select(actor_sentinels, actor_sentinels, actor_sentinels)
+        self._stop_stats_dumper()
+        self.kill_actors(timeout=self.shutdown_timeout)
 
     def join_stream_mode_off(self):
         """
         Supervisor behaviour when stream mode is off.
         - Supervisor wait the Puller death
-        - Supervisor wait for the dispatcher death
-        - Supervisor send a PoisonPill (by_data) to the Pusher
-        - Supervisor wait for the Pusher death
+        - Supervisor send a soft PoisonPill to the Dispatchers, and wait for
+          their death
+        - Supervisor send a soft PoisonPill to the Pushers, and wait for their
+          death
+
+        The actors handle all the reports read by the pullers, the shutdown
+        has no deadline
+        """
+        self._wait_actors(self.pullers, None)
+        self._stop_stats_dumper()
+        self.kill_actors(soft=True)
+
+    def _kill_stages(self):
+        """
+        Kill the pullers first, then the dispatchers (that kill their
+        formulas) and the pushers last, so the reports computed by the
+        formulas reach the pushers before they flush their buffer
+        """
+        pullers = [actor for actor in self.supervised_actors if isinstance(actor, PullerActor)]
+        dispatchers = [actor for actor in self.supervised_actors if isinstance(actor, DispatcherActor)]
+        others = [actor for actor in self.supervised_actors if actor not in pullers and actor not in dispatchers]
+        return [pullers, dispatchers, others]
+
+    def _is_embedded(self):
+        """
+        :return bool: True if the supervised actors run on the event loop of
+                      the embedded runtime
+        """
+        return any(actor.runtime == EMBEDDED_RUNTIME for actor in self.supervised_actors)
+
+    def _stop_stats_dumper(self):
+        """
+        Stop the statistics dump before killing the actors, as the dump and the
+        kill use the same control sockets
         """
-        for puller in self.pullers:
-            puller.join()
-        for dispatcher in self.dispatchers:
-            dispatcher.soft_kill()
-            dispatcher.join()
-        for pusher in self.pushers:
-            pusher.soft_kill()
-            pusher.join()
+        if self._stats_dumper is not None:
+            self._stats_dumper.stop()
+            self._stats_dumper = None
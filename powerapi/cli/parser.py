@@ -451,10 +451,10 @@ class MainParser(Parser):
                 self.long_arg.append(gen_name(name))
 
     def add_argument(self, *names, flag=False, action=store_val, default=None,
-                     check=None, help='', type=str):
+                     check=None, check_msg='', help='', type=str):
         Parser.add_argument(self, *names, flag=flag, action=action,
-                            default=default, check=check, help=help,
-                            type=type)
+                            default=default, check=check, check_msg=check_msg,
+                            help=help, type=type)
         self._add_argument_names(names, flag)
 
     def add_component_subparser(self, component_type, subparser, help_str=''):
@@ -0,0 +1,161 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Start or stop profiling the running actors whose process name matches a
+pattern:
+
+    python -m powerapi.cli.profile --actor 'formula*' --mode sampling
+    python -m powerapi.cli.profile --actor 'formula*' --stop
+
+The request is sent with a signal, so only the actors started with the process
+runtime (whose process is named after the actor) can be profiled this way,
+the other actors are profiled with a ProfileStartMessage sent on the control
+canal of their supervisor
+"""
+import os
+import sys
+from fnmatch import fnmatchcase
+
+from powerapi.actor.profiler import PROFILE_MODES, DEFAULT_PROFILE_MODE, DEFAULT_SAMPLING_INTERVAL, PROFILE_DIRECTORY
+from powerapi.actor.profiler import PROFILE_START_SIGNAL, PROFILE_STOP_SIGNAL, write_profile_request
+from powerapi.cli.parser import MainParser, store_true
+from powerapi.cli.parser import BadValueException, MissingValueException, BadTypeException, UnknowArgException
+
+
+def check_profile_mode(mode):
+    return mode in PROFILE_MODES
+
+
+class ProfileCLIParser(MainParser):
+    """
+    Parser of the command that starts or stops profiling actors
+    """
+
+    def __init__(self):
+        MainParser.__init__(self)
+        self.add_argument('a', 'actor', help='name (or shell-style pattern) of the actors to profile')
+        self.add_argument('stop', flag=True, action=store_true, default=False,
+                          help='stop profiling the actors and write their profile')
+        self.add_argument('m', 'mode', help='profile mode (' + ', '.join(PROFILE_MODES) + ')',
+                          default=DEFAULT_PROFILE_MODE, check=check_profile_mode, check_msg='unknow profile mode')
+        self.add_argument('i', 'interval', help='time (in s) between two samples (sampling mode)',
+                          default=DEFAULT_SAMPLING_INTERVAL, type=float)
+        self.add_argument('o', 'output', help='directory where the profiles are written', default=PROFILE_DIRECTORY)
+
+    def parse_argv(self, argv):
+        """
+        :param list argv: command line arguments
+        :return dict: parsed arguments, None if they are incorrect
+        """
+        try:
+            config = self.parse(argv)
+        except BadValueException as exn:
+            print('CLI error : argument ' + exn.argument_name + ' : ' + exn.msg, file=sys.stderr)
+        except MissingValueException as exn:
+            print('CLI error : argument ' + exn.argument_name + ' : expect a value', file=sys.stderr)
+        except BadTypeException as exn:
+            print('CLI error : argument ' + exn.argument_name + ' : expect ' + exn.article + ' ' + exn.type_name,
+                  file=sys.stderr)
+        except UnknowArgException as exn:
+            print('CLI error : unknow argument ' + exn.argument_name, file=sys.stderr)
+        else:
+            if 'actor' in config:
+                return config
+            print('CLI error : no actor specified', file=sys.stderr)
+        return None
+
+
+def find_actor_processes(pattern):
+    """
+    Find the processes of the actors whose name matches the pattern, the
+    process of an actor started with the process runtime is named after the
+    actor
+
+    :param str pattern: name (or shell-style pattern) of the actors
+    :return list: pids of the actor processes
+    """
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit() or int(entry) == os.getpid():
+            continue
+        try:
+            with open(os.path.join('/proc', entry, 'cmdline'), 'rb') as cmdline_file:
+                cmdline = cmdline_file.read()
+        except OSError:
+            continue
+        process_name = cmdline.split(b'\0')[0].decode(errors='replace').strip()
+        if process_name and fnmatchcase(process_name, pattern):
+            pids.append(int(entry))
+    return pids
+
+
+def profile_actors(pattern, stop=False, mode=DEFAULT_PROFILE_MODE, output_dir=PROFILE_DIRECTORY,
+                   interval=DEFAULT_SAMPLING_INTERVAL):
+    """
+    Make the actor processes whose name matches the pattern start or stop
+    profiling
+
+    :param str pattern: name (or shell-style pattern) of the actors
+    :param bool stop: stop profiling if True, start profiling otherwise
+    :param str mode: profile mode (cprofile or sampling)
+    :param str output_dir: directory where the profiles are written
+    :param float interval: time (in s) between two samples (sampling mode)
+    :return list: pids of the signaled actor processes
+    """
+    signaled = []
+    for pid in find_actor_processes(pattern):
+        if not stop:
+            write_profile_request(pid, mode, os.path.abspath(output_dir), interval)
+        try:
+            os.kill(pid, PROFILE_STOP_SIGNAL if stop else PROFILE_START_SIGNAL)
+        except OSError:
+            continue
+        signaled.append(pid)
+    return signaled
+
+
+def main(argv):
+    """
+    :param list argv: command line arguments
+    :return int: exit status, 1 if no actor was found
+    """
+    config = ProfileCLIParser().parse_argv(argv)
+    if config is None:
+        return 2
+    pids = profile_actors(config['actor'], config['stop'], config['mode'], config['output'], config['interval'])
+    if not pids:
+        print('no actor process matches ' + config['actor'], file=sys.stderr)
+        return 1
+    for pid in pids:
+        print(('stop' if config['stop'] else 'start') + ' profiling process ' + str(pid))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
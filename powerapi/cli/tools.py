@@ -33,6 +33,10 @@ import logging
 
 from functools import reduce
 from powerapi.exception import PowerAPIException
+from powerapi.actor import CODECS, DEFAULT_CODEC, TRANSPORTS, DEFAULT_TRANSPORT, DEFAULT_STATS_PERIOD
+from powerapi.actor import DEFAULT_RUNTIME, PROCESS_RUNTIME, EMBEDDED_RUNTIME
+from powerapi.actor import ROLES, PULLER_ROLE, PUSHER_ROLE, SCHEDULING_POLICIES, BadCPUListException
+from powerapi.actor import parse_cpu_list, role_scheduling
 from powerapi.cli.parser import MainParser, ComponentSubParser
 from powerapi.cli.parser import store_true
 from powerapi.cli.parser import BadValueException, MissingValueException
@@ -40,8 +44,9 @@ from powerapi.cli.parser import BadTypeException, BadContextException
 from powerapi.cli.parser import UnknowArgException
 from powerapi.report_model import HWPCModel, PowerModel, FormulaModel, ControlModel
 from powerapi.database import MongoDB, CsvDB, InfluxDB2 ,InfluxDB, OpenTSDB, SocketDB, PrometheusDB, DirectPrometheusDB, VirtioFSDB
-from powerapi.puller import PullerActor
+from powerapi.puller import PullerActor, BLOCK_POLICY, FLOW_CONTROL_POLICIES
 from powerapi.pusher import PusherActor
+from powerapi.backendsupervisor import DEFAULT_SHUTDOWN_TIMEOUT
 from powerapi.report_modifier import LibvirtMapper
 
 
@@ -53,6 +58,81 @@ def check_csv_files(files):
     return reduce(lambda acc, f: acc and os.access(f, os.R_OK), files.split(','), True)
 
 
+def check_codec(codec_name):
+    return codec_name in CODECS
+
+
+def add_pusher_arguments(subparser):
+    """
+    Add the codec and mailbox_size arguments to the subparser of an output
+
+    :param powerapi.cli.parser.ComponentSubParser subparser: output subparser
+    """
+    subparser.add_argument('codec', help='codec used to encode the reports sent to the pusher (' + ', '.join(CODECS) + ')',
+                           default=DEFAULT_CODEC, check=check_codec, check_msg='unknow codec')
+    subparser.add_argument('mailbox_size', help='maximum number of reports waiting to be saved by the pusher (0 for unbounded)',
+                           default=0, type=int)
+
+
+def check_transport(transport):
+    return transport in TRANSPORTS
+
+
+#: (tuple): runtimes that can be selected for all the actors from the CLI
+CLI_RUNTIMES = (PROCESS_RUNTIME, EMBEDDED_RUNTIME)
+
+
+def check_runtime(runtime):
+    return runtime in CLI_RUNTIMES
+
+
+def check_cpu_list(cpu_list):
+    try:
+        return len(parse_cpu_list(cpu_list)) > 0
+    except BadCPUListException:
+        return False
+
+
+def check_scheduling_policy(policy):
+    return policy in SCHEDULING_POLICIES
+
+
+def gen_scheduling(config, role):
+    """
+    Create the scheduling of the actors having the given role from the
+    <role>_cpus, <role>_sched, <role>_nice and housekeeping_cpus arguments
+
+    :param dict config: parsed arguments
+    :param str role: role of the actors (puller, dispatcher, formula or
+                     pusher)
+    :return: the scheduling, None if no scheduling arguments are given
+    :rtype: powerapi.actor.Scheduling
+    """
+    def get_cpus(arg_name):
+        return parse_cpu_list(config[arg_name]) if config.get(arg_name) is not None else None
+
+    return role_scheduling(role, cpus=get_cpus(role + '_cpus'), policy=config.get(role + '_sched'),
+                           nice=config.get(role + '_nice'), housekeeping_cpus=get_cpus('housekeeping_cpus'))
+
+
+def gen_dispatcher_options(config):
+    """
+    Create the keyword arguments of DispatcherActor given on the command line :
+    the codec of the reports sent to the dispatcher (by the pullers) and to its
+    formula workers, the size of its mailbox and the transport of its sockets
+
+    :param dict config: parsed arguments
+    :return dict: keyword arguments of the dispatchers
+    """
+    return {'codec': config.get('dispatcher_codec', DEFAULT_CODEC),
+            'mailbox_size': config.get('dispatcher_mailbox_size', 0),
+            'transport': config.get('transport', DEFAULT_TRANSPORT)}
+
+
+def check_flow_control(policy):
+    return policy in FLOW_CONTROL_POLICIES
+
+
 def extract_file_names(arg, val, args, acc):
     acc[arg] = val.split(',')
     return args, acc
@@ -66,6 +146,35 @@ class CommonCLIParser(MainParser):
         self.add_argument('v', 'verbose', flag=True, action=enable_log, default=logging.NOTSET,
                           help='enable verbose mode')
         self.add_argument('s', 'stream', flag=True, action=store_true, default=False, help='enable stream mode')
+        self.add_argument('transport', help='transport used by the actors sockets (' + ', '.join(TRANSPORTS) + ')',
+                          default=DEFAULT_TRANSPORT, check=check_transport)
+        self.add_argument('dispatcher_mailbox_size', help='maximum number of reports waiting to be dispatched by each dispatcher, ' +
+                          'the pullers block or drop reports depending on their flow_control when it is full (0 for unbounded)',
+                          default=0, type=int)
+        self.add_argument('dispatcher_codec', help='codec used to encode the reports sent to the dispatchers and to their formula workers (' +
+                          ', '.join(CODECS) + ')', default=DEFAULT_CODEC, check=check_codec, check_msg='unknow codec')
+        self.add_argument('bind_address', help='address of the network interface where the tcp sockets of the pullers and pushers are bound',
+                          default=None)
+        self.add_argument('advertise_address', help='address given to the clients of the pullers and pushers started on other nodes ' +
+                          '(needed to bind to 0.0.0.0)', default=None)
+        self.add_argument('registry', help='address of the registry where the pullers and pushers register their addresses, ' +
+                          'to be reached by actors started on other nodes (ex: tcp://10.0.0.1:5555)', default=None)
+        self.add_argument('runtime', help='run each actor in its own process (process) or all the actors as asyncio tasks of a single process (embedded)',
+                          default=DEFAULT_RUNTIME, check=check_runtime)
+        self.add_argument('stats_file', help='file where the statistics of the actors are periodically dumped as JSON lines (- for the standard output)',
+                          default=None)
+        self.add_argument('stats_period', help='time (in s) between two dumps of the actors statistics',
+                          default=DEFAULT_STATS_PERIOD, type=float)
+        self.add_argument('shutdown_timeout', help='time (in s) given to the actors to terminate when the backend is interrupted ' +
+                          'in stream mode, before killing them', default=DEFAULT_SHUTDOWN_TIMEOUT, type=float)
+        for role in ROLES:
+            self.add_argument(role + '_cpus', help='cpus on which the ' + role + 's can run (ex: 0-3,6)', default=None,
+                              check=check_cpu_list)
+            self.add_argument(role + '_sched', help='scheduling policy of the ' + role + 's (' +
+                              ', '.join(SCHEDULING_POLICIES) + ')', default=None, check=check_scheduling_policy)
+            self.add_argument(role + '_nice', help='niceness of the ' + role + 's', default=None, type=int)
+        self.add_argument('housekeeping_cpus', help='cpus on which the pushers are isolated, the other actors avoid them unless their cpus are given',
+                          default=None, check=check_cpu_list)
 
         subparser_libvirt_mapper_modifier = ComponentSubParser('libvirt_mapper')
         subparser_libvirt_mapper_modifier.add_argument('u', 'uri', help='libvirt daemon uri', default='')
@@ -80,6 +189,8 @@ class CommonCLIParser(MainParser):
         subparser_mongo_input.add_argument('n', 'name', help='specify puller name', default='puller_mongodb')
         subparser_mongo_input.add_argument('m', 'model', help='specify data type that will be storen in the database',
                                            default='HWPCReport')
+        subparser_mongo_input.add_argument('flow_control', help='behaviour of the puller when a dispatcher mailbox is full (block or drop)',
+                                           default=BLOCK_POLICY, check=check_flow_control, check_msg='unknow flow control policy')
         self.add_actor_subparser('input', subparser_mongo_input,
                                      help_str='specify a database input : --db_output database_name ARG1 ARG2 ... ')
 
@@ -88,6 +199,10 @@ class CommonCLIParser(MainParser):
         subparser_socket_input.add_argument('n', 'name', help='specify puller name', default='puller_socket')
         subparser_socket_input.add_argument('m', 'model', help='specify data type that will be sent through the socket',
                                            default='HWPCReport')
+        subparser_socket_input.add_argument('flow_control', help='behaviour of the puller when a dispatcher mailbox is full (block or drop)',
+                                            default=BLOCK_POLICY, check=check_flow_control, check_msg='unknow flow control policy')
+        subparser_socket_input.add_argument('max_queue_size', help='maximum number of received reports waiting to be sent to the dispatchers (0 for unbounded)',
+                                            default=0, type=int)
         self.add_actor_subparser('input', subparser_socket_input,
                                      help_str='specify a database input : --db_output database_name ARG1 ARG2 ... ')
 
@@ -99,6 +214,8 @@ class CommonCLIParser(MainParser):
         subparser_csv_input.add_argument('m', 'model', help='specify data type that will be storen in the database',
                                          default='HWPCReport')
         subparser_csv_input.add_argument('n', 'name', help='specify puller name', default='puller_csv')
+        subparser_csv_input.add_argument('flow_control', help='behaviour of the puller when a dispatcher mailbox is full (block or drop)',
+                                         default=BLOCK_POLICY, check=check_flow_control, check_msg='unknow flow control policy')
         self.add_actor_subparser('input', subparser_csv_input,
                                      help_str='specify a database input : --db_output database_name ARG1 ARG2 ... ')
 
@@ -110,6 +227,7 @@ class CommonCLIParser(MainParser):
         subparser_virtiofs_output.add_argument('m', 'model', help='specify data type that will be storen in the database',
                                             default='PowerReport')
         subparser_virtiofs_output.add_argument('n', 'name', help='specify pusher name', default='pusher_virtiofs')
+        add_pusher_arguments(subparser_virtiofs_output)
         self.add_actor_subparser('output', subparser_virtiofs_output,
                                      help_str='specify a database output : --db_output database_name ARG1 ARG2 ...')
                 
@@ -121,6 +239,7 @@ class CommonCLIParser(MainParser):
         subparser_mongo_output.add_argument('m', 'model', help='specify data type that will be storen in the database',
                                             default='PowerReport')
         subparser_mongo_output.add_argument('n', 'name', help='specify pusher name', default='pusher_mongodb')
+        add_pusher_arguments(subparser_mongo_output)
         self.add_actor_subparser('output', subparser_mongo_output,
                                      help_str='specify a database output : --db_output database_name ARG1 ARG2 ...')
 
@@ -134,6 +253,7 @@ class CommonCLIParser(MainParser):
         subparser_prom_output.add_argument('m', 'model', help='specify data type that will be storen in the database',
                                             default='PowerReport')
         subparser_prom_output.add_argument('n', 'name', help='specify pusher name', default='pusher_prom')
+        add_pusher_arguments(subparser_prom_output)
         self.add_actor_subparser('output', subparser_prom_output,
                                      help_str='specify a database output : --db_output database_name ARG1 ARG2 ...')
 
@@ -145,6 +265,7 @@ class CommonCLIParser(MainParser):
         subparser_direct_prom_output.add_argument('m', 'model', help='specify data type that will be storen in the database',
                                             default='PowerReport')
         subparser_direct_prom_output.add_argument('n', 'name', help='specify pusher name', default='pusher_prom')
+        add_pusher_arguments(subparser_direct_prom_output)
         self.add_actor_subparser('output', subparser_direct_prom_output,
                                      help_str='specify a database output : --db_output database_name ARG1 ARG2 ...')
 
@@ -154,6 +275,7 @@ class CommonCLIParser(MainParser):
         subparser_csv_output.add_argument('m', 'model', help='specify data type that will be storen in the database',
                                           default='PowerReport')
         subparser_csv_output.add_argument('n', 'name', help='specify pusher name', default='pusher_csv')
+        add_pusher_arguments(subparser_csv_output)
         self.add_actor_subparser('output', subparser_csv_output,
                                      help_str='specify a database input : --db_output database_name ARG1 ARG2 ... ')
 
@@ -164,6 +286,7 @@ class CommonCLIParser(MainParser):
         subparser_influx_output.add_argument('m', 'model', help='specify data type that will be storen in the database',
                                              default='PowerReport')
         subparser_influx_output.add_argument('n', 'name', help='specify pusher name', default='pusher_influxdb')
+        add_pusher_arguments(subparser_influx_output)
         self.add_actor_subparser('output', subparser_influx_output,
                                      help_str='specify a database input : --db_output database_name ARG1 ARG2 ... ')
 
@@ -177,6 +300,7 @@ class CommonCLIParser(MainParser):
         subparser_influx2_output.add_argument('m', 'model', help='specify data type that will be stored in the database',
                                              default='PowerReport')
         subparser_influx2_output.add_argument('n', 'name', help='specify pusher name', default='pusher_influxdb2')
+        add_pusher_arguments(subparser_influx2_output)
         self.add_actor_subparser('output', subparser_influx2_output,
                                      help_str='specify a database input : --db_output database_name ARG1 ARG2 ... ')
 
@@ -189,6 +313,7 @@ class CommonCLIParser(MainParser):
         subparser_opentsdb_output.add_argument('m', 'model', help='specify data type that will be storen in the database',
                                              default='PowerReport')
         subparser_opentsdb_output.add_argument('n', 'name', help='specify pusher name', default='pusher_opentsdb')
+        add_pusher_arguments(subparser_opentsdb_output)
         self.add_actor_subparser('output', subparser_opentsdb_output,
                                      help_str='specify a database input : --db_output database_name ARG1 ARG2 ... ')
 
@@ -286,6 +411,8 @@ class DatabaseNameDoesNotExist(PowerAPIException):
         self.database_name = database_name
 
 class DBActorGenerator(Generator):
+    #: (str): role of the generated actors, used to select their scheduling
+    role = None
 
     def __init__(self, component_group_name):
         Generator.__init__(self, component_group_name)
@@ -298,7 +425,8 @@ class DBActorGenerator(Generator):
 
         self.db_factory = {
             'mongodb': lambda db_config: MongoDB(db_config['uri'], db_config['db'], db_config['collection']),
-            'socket': lambda db_config: SocketDB(db_config['port']),
+            'socket': lambda db_config: SocketDB(db_config['port'],
+                                                 0 if 'max_queue_size' not in db_config else db_config['max_queue_size']),
             'csv': lambda db_config: CsvDB(current_path=os.getcwd() if 'directory' not in db_config else db_config['directory'],
                                            files=[] if 'files' not in db_config else db_config['files']),
             'influxdb': lambda db_config: InfluxDB(db_config['uri'], db_config['port'], db_config['db']),
@@ -338,34 +466,55 @@ class DBActorGenerator(Generator):
     def _gen_actor(self, db_name, db_config, main_config, actor_name):
         db = self._generate_db(db_name, db_config, main_config)
         model = self.model_factory[db_config['model']]
-        return self._actor_factory(actor_name, db, model, main_config['stream'], main_config['verbose'])
-
-    def _actor_factory(self, name, db, model, stream_mode, level_logger):
+        codec = db_config['codec'] if 'codec' in db_config else DEFAULT_CODEC
+        transport = main_config['transport'] if 'transport' in main_config else DEFAULT_TRANSPORT
+        flow_control = db_config['flow_control'] if 'flow_control' in db_config else BLOCK_POLICY
+        mailbox_size = db_config['mailbox_size'] if 'mailbox_size' in db_config else 0
+        runtime = main_config['runtime'] if 'runtime' in main_config else DEFAULT_RUNTIME
+        actor = self._actor_factory(actor_name, db, model, main_config['stream'], main_config['verbose'], codec=codec,
+                                    transport=transport, flow_control=flow_control, mailbox_size=mailbox_size)
+        actor.set_runtime(runtime)
+        if main_config.get('bind_address') is not None:
+            actor.set_addresses(main_config['bind_address'], main_config.get('advertise_address'))
+        if main_config.get('registry') is not None:
+            actor.set_registry(main_config['registry'])
+        if self.role is not None:
+            actor.set_scheduling(gen_scheduling(main_config, self.role))
+        return actor
+
+    def _actor_factory(self, name, db, model, stream_mode, level_logger, codec=DEFAULT_CODEC,
+                       transport=DEFAULT_TRANSPORT, flow_control=BLOCK_POLICY, mailbox_size=0):
         raise NotImplementedError()
 
 
 class PullerGenerator(DBActorGenerator):
+    role = PULLER_ROLE
 
     def __init__(self, report_filter, report_modifier_list):
         DBActorGenerator.__init__(self, 'input')
         self.report_filter = report_filter
         self.report_modifier_list = report_modifier_list
 
-    def _actor_factory(self, name, db, model, stream_mode, level_logger):
-        return PullerActor(name, db, self.report_filter, model, stream_mode, level_logger=level_logger, report_modifier_list=self.report_modifier_list)
+    def _actor_factory(self, name, db, model, stream_mode, level_logger, codec=DEFAULT_CODEC,
+                       transport=DEFAULT_TRANSPORT, flow_control=BLOCK_POLICY, mailbox_size=0):
+        return PullerActor(name, db, self.report_filter, model, stream_mode, level_logger=level_logger, report_modifier_list=self.report_modifier_list,
+                           codec=codec, transport=transport, flow_control=flow_control)
 
 
 class PusherGenerator(DBActorGenerator):
+    role = PUSHER_ROLE
 
     def __init__(self):
         DBActorGenerator.__init__(self, 'output')
 
-    def _actor_factory(self, name, db, model, stream_mode, level_logger):
+    def _actor_factory(self, name, db, model, stream_mode, level_logger, codec=DEFAULT_CODEC,
+                       transport=DEFAULT_TRANSPORT, flow_control=BLOCK_POLICY, mailbox_size=0):
         if type(db) == PrometheusDB:
             max_size = -1
         else:
             max_size = 50
-        return PusherActor(name, model, db, level_logger, max_size=max_size)
+        return PusherActor(name, model, db, level_logger, max_size=max_size, codec=codec, transport=transport,
+                           mailbox_size=mailbox_size)
 
 class ReportModifierGenerator:
     def __init__(self):
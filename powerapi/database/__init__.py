@@ -30,7 +30,7 @@
 from powerapi.database.base_db import BaseDB, IterDB, DBError
 from powerapi.database.csvdb import CsvDB, CsvBadFilePathError
 from powerapi.database.csvdb import CsvBadCommonKeysError, HeaderAreNotTheSameError
-from powerapi.database.mongodb import MongoDB, MongoBadDBError
+from powerapi.database.mongodb import MongoDB, MongoBadDBError, MONGO_OWNER_FIELD
 from powerapi.database.opentsdb import OpenTSDB, CantConnectToOpenTSDBException
 from powerapi.database.influxdb import InfluxDB, CantConnectToInfluxDBException
 from powerapi.database.prometheus_db import PrometheusDB
@@ -38,3 +38,4 @@ from powerapi.database.virtiofs_db import VirtioFSDB
 from powerapi.database.direct_prometheus_db import DirectPrometheusDB
 from powerapi.database.influxdb2 import InfluxDB2, CantConnectToInfluxDB2Exception
 from .socket_db import SocketDB
+from .binary_protocol import BINARY_PROTOCOL_HEADER, BINARY_PROTOCOL_VERSION
@@ -59,6 +59,10 @@ class IterDB:
         self.stream_mode = stream_mode
         self.report_model = report_model
 
+        #: (Exception): error raised while reading a batch after its first
+        #: report, raised by the next read
+        self._pending_error = None
+
     def __iter__(self):
         """
         """
@@ -69,6 +73,63 @@ class IterDB:
         """
         raise NotImplementedError()
 
+    def next_batch(self, max_n: int, max_wait: float = 0) -> List[Report]:
+        """
+        Read the next reports, at most max_n
+
+        Generic implementation reading the reports one by one, databases that
+        can read several reports at once override it
+
+        :param max_n: maximum number of reports to read
+        :param max_wait: time (in s) to wait for more reports once a report
+                         was read, unused by databases that don't wait for
+                         reports
+        :raise StopIteration: if there is no report to read
+        """
+        return self._read_batch(self.__next__, max_n)
+
+    async def anext_batch(self, max_n: int, max_wait: float = 0) -> List[Report]:
+        """
+        Read the next reports of an asynchronous database, at most max_n
+
+        Generic implementation reading a single report
+
+        :param max_n: maximum number of reports to read
+        :param max_wait: time (in s) to wait for more reports once a report
+                         was read
+        :return: the read reports, an empty list if no report was received
+        """
+        report = await self.__anext__()
+        return [] if report is None else [report]
+
+    def _read_batch(self, read, max_n):
+        """
+        Call read until it returned max_n reports or raised StopIteration
+
+        An error raised after the first report is kept and raised by the next
+        call, so the reports read before it are not lost
+
+        :param func read: function that return the next report
+        :param int max_n: maximum number of reports to read
+        :raise StopIteration: if read returns no report
+        """
+        if self._pending_error is not None:
+            error, self._pending_error = self._pending_error, None
+            raise error
+
+        reports = []
+        try:
+            while len(reports) < max_n:
+                reports.append(read())
+        except StopIteration:
+            if not reports:
+                raise
+        except Exception as error:
+            if not reports:
+                raise
+            self._pending_error = error
+        return reports
+
 
 class BaseDB:
     """
@@ -0,0 +1,202 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Binary protocol used by sensors to send their hwpc reports to a SocketDB
+
+A connection starts with :data:`BINARY_PROTOCOL_HEADER`, followed by frames.
+Each frame is preceded by its size in bytes (a big endian unsigned 32 bits
+integer) and starts with its type :
+
+- string frame : ``!H`` id, then the utf-8 string. Defines the id of a
+  sensor, target, group or event name, for the rest of the connection
+- layout frame : ``!HHH`` layout id, group name id and number of events, the
+  ``!H`` id of each event, ``!H`` number of cpus, then the ``!HH`` socket and
+  core ids of each cpu. Defines the counters of a group sent in the reports
+- report frame : ``!qHHH`` timestamp (in ms since the epoch), sensor id, target
+  id and number of layouts, then for each layout its ``!H`` id and its
+  counters, as ``!Q`` integers ordered by cpu then by event
+
+Names and layouts are sent once per connection, a report frame only contains
+integers
+"""
+import asyncio
+import struct
+
+from powerapi.report import HWPCReport, DeserializationFail
+from powerapi.utils import timestamp_to_datetime, LENGTH_PREFIX
+
+#: (bytes): start of the connections using the binary protocol, a json
+#: stream can't start with it
+BINARY_PROTOCOL_MAGIC = b'PAPIB'
+#: (int): version of the binary protocol
+BINARY_PROTOCOL_VERSION = 1
+#: (bytes): first bytes sent by a sensor using the binary protocol
+BINARY_PROTOCOL_HEADER = BINARY_PROTOCOL_MAGIC + bytes([BINARY_PROTOCOL_VERSION])
+
+#: (int): type of a frame defining the id of a name
+STRING_FRAME = 1
+#: (int): type of a frame defining the counters of a group
+LAYOUT_FRAME = 2
+#: (int): type of a frame containing a report
+REPORT_FRAME = 3
+
+FRAME_TYPE = struct.Struct('!B')
+STRING_HEADER = struct.Struct('!H')
+LAYOUT_HEADER = struct.Struct('!HHH')
+NUMBER_OF_CPUS = struct.Struct('!H')
+REPORT_HEADER = struct.Struct('!qHHH')
+LAYOUT_ID = struct.Struct('!H')
+
+
+class Layout:
+    """
+    Counters of a group sent in a report frame
+    """
+
+    def __init__(self, group, events, cpus):
+        """
+        :param str group: name of the group
+        :param tuple events: names of the events of each cpu
+        :param list cpus: (socket id, core id) of each cpu
+        """
+        #: (str): name of the group
+        self.group = group
+        #: (tuple): names of the events of each cpu
+        self.events = events
+        #: (list): (socket id, core id) of each cpu
+        self.cpus = cpus
+        #: (struct.Struct): counters of the group in a report frame
+        self.counters = struct.Struct('!%dQ' % (len(events) * len(cpus)))
+
+    def decode(self, payload, offset, groups):
+        """
+        Add the counters of the layout to the groups of a report
+
+        :param memoryview payload: report frame
+        :param int offset: position of the counters in the frame
+        :param dict groups: groups of the report
+        :return int: position of the end of the counters in the frame
+        """
+        values = self.counters.unpack_from(payload, offset)
+        group = groups.setdefault(self.group, {})
+        number_of_events = len(self.events)
+        for index, (socket_id, core_id) in enumerate(self.cpus):
+            socket = group.get(socket_id)
+            if socket is None:
+                socket = group[socket_id] = {}
+            socket[core_id] = dict(zip(self.events, values[index * number_of_events:(index + 1) * number_of_events]))
+        return offset + self.counters.size
+
+
+class BinaryReportDecoder:
+    """
+    Decode the frames received on a connection using the binary protocol
+    """
+
+    def __init__(self):
+        #: (dict): name of each string id
+        self.strings = {}
+        #: (dict): layout of each layout id
+        self.layouts = {}
+
+    def decode(self, payload):
+        """
+        Decode a frame
+
+        :param bytes payload: the frame, without its size
+        :return HWPCReport: the report of a report frame, None for the other
+                            frames
+        :raise DeserializationFail: if the frame is malformed or uses an
+                                    undefined id
+        """
+        try:
+            payload = memoryview(payload)
+            frame_type, = FRAME_TYPE.unpack_from(payload)
+            if frame_type == REPORT_FRAME:
+                return self._decode_report(payload)
+            if frame_type == STRING_FRAME:
+                string_id, = STRING_HEADER.unpack_from(payload, FRAME_TYPE.size)
+                self.strings[string_id] = bytes(payload[FRAME_TYPE.size + STRING_HEADER.size:]).decode('utf-8')
+                return None
+            if frame_type == LAYOUT_FRAME:
+                self._decode_layout(payload)
+                return None
+        except (struct.error, KeyError, UnicodeDecodeError):
+            raise DeserializationFail()
+        raise DeserializationFail()
+
+    def _decode_layout(self, payload):
+        offset = FRAME_TYPE.size
+        layout_id, group_id, number_of_events = LAYOUT_HEADER.unpack_from(payload, offset)
+        offset += LAYOUT_HEADER.size
+        events = tuple(self.strings[event_id] for event_id in struct.unpack_from('!%dH' % number_of_events, payload, offset))
+        offset += 2 * number_of_events
+        number_of_cpus, = NUMBER_OF_CPUS.unpack_from(payload, offset)
+        offset += NUMBER_OF_CPUS.size
+        ids = struct.unpack_from('!%dH' % (2 * number_of_cpus), payload, offset)
+        cpus = [(str(ids[index]), str(ids[index + 1])) for index in range(0, len(ids), 2)]
+        self.layouts[layout_id] = Layout(self.strings[group_id], events, cpus)
+
+    def _decode_report(self, payload):
+        timestamp, sensor_id, target_id, number_of_layouts = REPORT_HEADER.unpack_from(payload, FRAME_TYPE.size)
+        offset = FRAME_TYPE.size + REPORT_HEADER.size
+        groups = {}
+        for _ in range(number_of_layouts):
+            layout_id, = LAYOUT_ID.unpack_from(payload, offset)
+            offset = self.layouts[layout_id].decode(payload, offset + LAYOUT_ID.size, groups)
+        if offset != len(payload):
+            raise DeserializationFail()
+        return HWPCReport(timestamp_to_datetime(timestamp), self.strings[sensor_id], self.strings[target_id], groups)
+
+
+class BinaryReportStream:
+    """
+    Read the reports received from a connection using the binary protocol,
+    once its header was read
+    """
+
+    def __init__(self, stream_reader):
+        self.stream_reader = stream_reader
+        self.decoder = BinaryReportDecoder()
+
+    async def read_report(self):
+        """
+        :return HWPCReport: the next report received from the connection, None
+                            if the connection was closed
+        :raise DeserializationFail: if a received frame is malformed
+        """
+        while True:
+            try:
+                size, = LENGTH_PREFIX.unpack(await self.stream_reader.readexactly(LENGTH_PREFIX.size))
+                payload = await self.stream_reader.readexactly(size)
+            except asyncio.IncompleteReadError:
+                return None
+            report = self.decoder.decode(payload)
+            if report is not None:
+                return report
@@ -28,6 +28,8 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import logging
+import uuid
+from collections import deque
 try:
     import pymongo
 except ImportError:
@@ -38,7 +40,9 @@ from powerapi.database.base_db import BaseDB, DBError, IterDB
 from powerapi.report import Report
 from powerapi.report_model import ReportModel
 
-
+#: (str): field set on the documents claimed by a reader in stream mode,
+#: before they are read and removed from the collection
+MONGO_OWNER_FIELD = '_powerapi_owner'
 
 
 class MongoBadDBError(DBError):
@@ -64,6 +68,14 @@ class MongoIterDB(IterDB):
         #: (pymongo.Cursor): Cursor which return data
         self.cursor = None
 
+        #: (collections.deque): documents removed from the collection and not
+        #: yet returned (stream mode)
+        self._removed = deque()
+
+        #: (str): token identifying the documents claimed by this reader
+        #: (stream mode)
+        self.owner = uuid.uuid4().hex
+
         self.__iter__()
 
     def __iter__(self):
@@ -80,14 +92,40 @@ class MongoIterDB(IterDB):
         """
         if not self.stream_mode:
             json = self.cursor.next()
+        elif self._removed:
+            json = self._removed.popleft()
         else:
-            json = self.db.collection.find_one_and_delete({})
+            json = self.db.collection.find_one_and_delete({MONGO_OWNER_FIELD: {'$exists': False}})
             if json is None:
                 raise StopIteration()
 
 
         return self.report_model.get_type().deserialize(self.report_model.from_mongodb(json))
 
+    def next_batch(self, max_n: int, max_wait: float = 0) -> List[Report]:
+        """
+        Read the next reports, at most max_n
+
+        In stream mode, the documents of a batch are claimed, by setting their
+        :data:`MONGO_OWNER_FIELD` to the token of the reader, before being read and
+        removed from the collection. A document is claimed by a single reader,
+        several pullers can read the same collection without reading a
+        document twice. Documents claimed by a reader that stops before
+        removing them stay in the collection. The cursor used otherwise
+        already fetches the documents by batches
+        """
+        if self.stream_mode and not self._removed:
+            unclaimed = {MONGO_OWNER_FIELD: {'$exists': False}}
+            ids = [json['_id'] for json in self.db.collection.find(unclaimed, {'_id': True}, limit=max_n)]
+            if ids:
+                self.db.collection.update_many(dict(unclaimed, _id={'$in': ids}), {'$set': {MONGO_OWNER_FIELD: self.owner}})
+                jsons = list(self.db.collection.find({MONGO_OWNER_FIELD: self.owner}))
+                self.db.collection.delete_many({MONGO_OWNER_FIELD: self.owner})
+                for json in jsons:
+                    del json[MONGO_OWNER_FIELD]
+                self._removed.extend(jsons)
+        return self._read_batch(self.__next__, max_n)
+
 
 class MongoDB(BaseDB):
     """
@@ -27,29 +27,43 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 import asyncio
+from collections import deque
 from queue import Queue, Empty
 from threading import Thread
 from socket import socket
 
 from . import IterDB, BaseDB
+from .binary_protocol import BinaryReportStream, BINARY_PROTOCOL_MAGIC, BINARY_PROTOCOL_HEADER
+from powerapi.report import Report, DeserializationFail
 from powerapi.utils import JsonStream
 
 BUFFER_SIZE = 4096
 SOCKET_TIMEOUT = 0.5
+#: (float): time (in s) to wait for a report before giving the hand back to
+#: the puller, when the database isn't read in stream mode
+READ_TIMEOUT = 2
 
 
 class SocketDB(BaseDB):
 
-    def __init__(self, port):
+    def __init__(self, port, max_queue_size=0):
+        """
+        :param int port: port where the sensors connect to send their reports
+        :param int max_queue_size: maximum number of received reports waiting
+                                   to be read by the puller, when it is
+                                   reached, the socket stop reading the sensors
+                                   connections (0 for an unbounded queue)
+        """
         BaseDB.__init__(self)
         self.asynchrone=True
         self.queue = None
         # self.loop = asyncio.get_event_loop()
         self.port = port
         self.server = None
+        self.max_queue_size = max_queue_size
 
     async def connect(self):
-        self.queue = asyncio.Queue()
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
         # self.queue = Queue()
         self.server = await asyncio.start_server(self.gen_server_callback(), host='127.0.0.1', port=self.port)
 
@@ -61,8 +75,22 @@ class SocketDB(BaseDB):
         return IterSocketDB(report_model, stream_mode, self.queue)
 
     def gen_server_callback(self):
+        """
+        Sensors send json reports, or hwpc reports with the binary protocol.
+        The protocol of a connection is detected from its first bytes, json
+        strings are deserialized by the puller and binary reports are put in
+        the queue already decoded
+        """
         async def callback(stream_reader, _):
-            stream = JsonStream(stream_reader)
+            header = await _read_header(stream_reader)
+            if header == BINARY_PROTOCOL_HEADER:
+                await self._read_binary_reports(BinaryReportStream(stream_reader))
+                return
+            if header.startswith(BINARY_PROTOCOL_MAGIC):
+                # unsupported version of the binary protocol
+                return
+
+            stream = JsonStream(stream_reader, data=header)
             while True:
                 json_str = await stream.read_json_object()
                 if json_str is None:
@@ -72,6 +100,32 @@ class SocketDB(BaseDB):
 
         return callback
 
+    async def _read_binary_reports(self, stream):
+        try:
+            report = await stream.read_report()
+            while report is not None:
+                await self.queue.put(report)
+                report = await stream.read_report()
+        except DeserializationFail:
+            # the frames of the connection can't be delimited any more
+            return
+
+
+async def _read_header(stream_reader):
+    """
+    Read the first bytes of a connection, until they are the header of the
+    binary protocol or can't be its beginning
+
+    :return bytes: the read bytes
+    """
+    header = b''
+    while len(header) < len(BINARY_PROTOCOL_HEADER) and BINARY_PROTOCOL_HEADER.startswith(header):
+        data = await stream_reader.read(len(BINARY_PROTOCOL_HEADER) - len(header))
+        if not data:
+            break
+        header += data
+    return header
+
 
 class IterSocketDB(IterDB):
     """
@@ -85,6 +139,10 @@ class IterSocketDB(IterDB):
 
         self.queue = queue
 
+        #: (collections.deque): json reports taken from the queue and not yet
+        #: deserialized
+        self._received = deque()
+
     def __aiter__(self):
         """
         """
@@ -95,11 +153,71 @@ class IterSocketDB(IterDB):
         """
         """
         try:
-            json = await asyncio.wait_for(self.queue.get(), 2)
+            json = await self._get()
             # json = self.queue.get_nowait()
             # self.queue.get()
+            if isinstance(json, Report):
+                return json
             report = self.report_model.get_type().deserialize(self.report_model.from_json(json))
             return report
         # except Empty:
         except asyncio.TimeoutError:
             return None
+
+    async def anext_batch(self, max_n, max_wait=0):
+        """
+        Read the next reports, at most max_n
+
+        Wait for a first report then take the reports already received from
+        the queue, and those received during max_wait, without giving the hand
+        back to the event loop for each of them
+
+        In stream mode, wait until a first report is received, the reading is
+        stopped by cancelling it. Otherwise wait at most READ_TIMEOUT
+
+        :param int max_n: maximum number of reports to read
+        :param float max_wait: time (in s) to wait for more reports once a
+                               report was read
+        :return list: the read reports, an empty list if no report was
+                      received
+        """
+        if self._pending_error is None and not self._received:
+            try:
+                self._received.append(await self._get())
+            except asyncio.TimeoutError:
+                return []
+
+            deadline = asyncio.get_running_loop().time() + max_wait
+            while len(self._received) < max_n:
+                try:
+                    self._received.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        self._received.append(await asyncio.wait_for(self.queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+        return self._read_batch(self._deserialize_received, max_n)
+
+    async def _get(self):
+        """
+        Wait for the next json report of the queue
+
+        :raise asyncio.TimeoutError: if no report was received during
+                                     READ_TIMEOUT and stream mode is disabled
+        """
+        if self.stream_mode:
+            return await self.queue.get()
+        return await asyncio.wait_for(self.queue.get(), READ_TIMEOUT)
+
+    def _deserialize_received(self):
+        if not self._received:
+            raise StopIteration()
+        json = self._received.popleft()
+        if isinstance(json, Report):
+            # decoded from the binary protocol
+            return json
+        return self.report_model.get_type().deserialize(self.report_model.from_json(json))
@@ -72,48 +72,14 @@ class HWPCDispatchRule(DispatchRule):
         if self.depth == HWPCDepthLevel.ROOT:
             return [(report.sensor,)]
 
-        non_shared_group = _extract_non_shared_group(report)
+        sockets = report.sockets
 
         if self.depth == HWPCDepthLevel.SOCKET:
-            id_list = []
-            for socket_report in non_shared_group.items():
-                id_list.append((report.sensor, socket_report[0]))
-            return id_list
+            return [(report.sensor, socket_id) for socket_id in sockets]
 
         if self.depth == HWPCDepthLevel.CORE:
-            id_list = []
-            for socket_report in non_shared_group.items():
-                for core_report in socket_report[1].items():
-                    id_list.append((report.sensor, socket_report[0],
-                                    core_report[0]))
-            return id_list
+            return [(report.sensor, socket_id, core_id) for socket_id, core_ids in sockets.items()
+                    for core_id in core_ids]
 
         return []
 
-
-def _number_of_core_per_socket(group):
-    """
-    Compute the number of core per socket in this group
-    :param group: group must be a valide group (composed by socket, core, event)
-    :type group: Dict
-    :rtype: int : the number of core per socket in this group
-    """
-    return len(list(group.values())[0])
-
-
-def _extract_non_shared_group(report):
-    """
-    extract a non shared group form the given report.
-    A shared group is a group that contains events that are shared between
-    multiple cores (like RAPL or PCU)
-
-    :rtype:{str:HWPCReportSocket}: a group containing ReportSocket
-    """
-    biggest_group = None
-    maximum_number_of_core = -1
-    for _, group in report.groups.items():
-        number_of_core = _number_of_core_per_socket(group)
-        if number_of_core > maximum_number_of_core:
-            maximum_number_of_core = number_of_core
-            biggest_group = group
-    return biggest_group
@@ -28,5 +28,8 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from powerapi.dispatcher.handlers import FormulaDispatcherReportHandler, StartHandler, DispatcherPoisonPillMessageHandler
+from powerapi.dispatcher.handlers import FormulaTerminatedMessage, FormulaTerminatedHandler
 from powerapi.dispatcher.state import RouteTable, DispatcherState
+from powerapi.dispatcher.formula_worker import FormulaWorkerActor, PooledFormula, FormulaReportMessage, FORMULA_POOL_CPU_COUNT
+from powerapi.dispatcher.formula_shell import FormulaShellPool, ShellFormula
 from powerapi.dispatcher.dispatcher_actor import DispatcherActor, NoPrimaryDispatchRuleRuleException
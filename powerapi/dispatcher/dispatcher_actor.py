@@ -27,13 +27,21 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import itertools
 import logging
-from powerapi.actor import Actor
+from powerapi.actor import Actor, DEFAULT_CODEC, DEFAULT_TRANSPORT, DEFAULT_RUNTIME, PROCESS_RUNTIME, THREAD_RUNTIME
+from powerapi.actor import INPROC_TRANSPORT, DEFAULT_CHANNEL, EMBEDDED_RUNTIME, Envelope
+from powerapi.actor import Router, TOPOLOGIES, DEFAULT_TOPOLOGY, ROUTER_TOPOLOGY, UnknowTopologyException
 from powerapi.exception  import PowerAPIException
 from powerapi.report import Report
 from powerapi.message import PoisonPillMessage, StartMessage
 from powerapi.dispatcher import StartHandler, DispatcherState, DispatcherPoisonPillMessageHandler
 from powerapi.dispatcher import FormulaDispatcherReportHandler
+from powerapi.dispatcher.handlers import FormulaTerminatedMessage, FormulaTerminatedHandler
+from powerapi.dispatcher.formula_worker import FormulaWorkerActor, PooledFormula, get_formula_pool_size
+from powerapi.dispatcher.formula_shell import FormulaShellPool, ShellFormula, FormulaShellReadyMessage
+from powerapi.dispatcher.formula_shell import FormulaShellReadyHandler
+from powerapi.utils import HashRing
 
 
 class NoPrimaryDispatchRuleRuleException(PowerAPIException):
@@ -51,7 +59,11 @@ class DispatcherActor(Actor):
     if no Formula exist for this message.
     """
 
-    def __init__(self, name, formula_init_function, route_table, level_logger=logging.WARNING, timeout=None):
+    def __init__(self, name, formula_init_function, route_table, level_logger=logging.WARNING, timeout=None,
+                 codec=DEFAULT_CODEC, transport=DEFAULT_TRANSPORT, formula_runtime=DEFAULT_RUNTIME,
+                 formula_pool_size=None, mailbox_size=0, formula_shell_pool_size=0, channel=DEFAULT_CHANNEL,
+                 runtime=DEFAULT_RUNTIME, formula_scheduling=None, respawn_formulas=False,
+                 routing_envelope=False, remote_formula_workers=None, formula_topology=DEFAULT_TOPOLOGY):
         """
         :param str name: Actor name
         :param func formula_init_function: Function for creating Formula
@@ -60,14 +72,118 @@ class DispatcherActor(Actor):
         :param int level_logger: Define the level of the logger
         :param bool timeout: Define the time in millisecond to wait for a
                              message before run timeout_handler
+        :param str codec: name of the codec used to encode messages sent to
+                          the dispatcher
+        :param str transport: transport used by the dispatcher sockets
+        :param str formula_runtime: run each formula in its own process or in
+                                    a thread of the dispatcher process
+        :param int formula_pool_size: if define, formulas are hosted by a pool
+                                      of formula_pool_size worker processes
+                                      (FORMULA_POOL_CPU_COUNT to use one
+                                      worker per available core) instead of
+                                      running in their own process
+        :param int mailbox_size: maximum number of reports waiting to be
+                                 dispatched (0 for an unbounded mailbox)
+        :param int formula_shell_pool_size: if greater than 0, each formula
+                                            runs in a pre-started process
+                                            taken from a warm pool of
+                                            formula_shell_pool_size shells
+                                            (process runtime only, ignored
+                                            with a formula pool)
+        :param str channel: channel used to receive reports (zmq or shm), with
+                            the shm channel, the reports of the first puller
+                            that sends reports to the dispatcher are written
+                            in a shared memory ring
+        :param str runtime: runtime of the dispatcher, with the embedded
+                            runtime, the formulas are embedded actors running
+                            on the event loop of the dispatcher, formula pools
+                            are not used
+        :param powerapi.actor.Scheduling formula_scheduling: cpu affinity and
+                                                             scheduling policy
+                                                             of the formulas
+                                                             (or of the
+                                                             workers hosting
+                                                             them)
+        :param bool respawn_formulas: create again the formulas that
+                                      terminate (or whose worker terminates),
+                                      otherwise their reports are dropped.
+                                      Formulas are detected as terminated
+                                      when the sentinel of their process, or
+                                      thread, is ready
+        :param bool routing_envelope: receive the reports in routing
+                                      envelopes, reports are routed on the
+                                      fields of the envelope header and their
+                                      payload is forwarded to the formulas
+                                      without being decoded (if they use the
+                                      same codec). The dispatch rules must
+                                      only read the routing fields of the
+                                      reports
+        :param list remote_formula_workers: if define, formulas are hosted by
+                                            these formula workers started on
+                                            other nodes
+                                            (:class:`RemoteActor
+                                            <powerapi.actor.RemoteActor>`),
+                                            instead of local processes. The
+                                            remote workers are not terminated
+                                            with the dispatcher
+        :param str formula_topology: with the push topology, each formula
+                                     binds its own sockets and the dispatcher
+                                     connects two sockets per formula. With
+                                     the router topology, the dispatcher binds
+                                     a single router socket where the formulas
+                                     connect, control messages are sent on the
+                                     same link as the reports. Only used by
+                                     formulas running in their own process or
+                                     thread (not in a pool or a shell)
+        :raise UnknowTopologyException: if the formula topology doesn't exist
         """
-        Actor.__init__(self, name, level_logger, timeout)
+        if formula_topology not in TOPOLOGIES:
+            raise UnknowTopologyException(formula_topology)
+
+        Actor.__init__(self, name, level_logger, timeout, codec, transport, runtime, mailbox_size=mailbox_size,
+                       channel=channel)
+        if runtime != EMBEDDED_RUNTIME:
+            self.socket_interface.envelope = routing_envelope
 
         # (func): Function for creating Formula
         self.formula_init_function = formula_init_function
 
+        # (str): name of the codec used to encode the messages sent to the
+        # dispatcher and to the workers of its formula pool (or shells)
+        self.codec = codec
+
+        # (str): runtime of the formulas created by the dispatcher
+        self.formula_runtime = formula_runtime
+
+        # (powerapi.actor.Scheduling): scheduling of the formulas created by
+        # the dispatcher
+        self.formula_scheduling = formula_scheduling
+
+        # (int): number of worker of the formula pool, None if formulas are
+        # not hosted by a pool
+        self.formula_pool_size = None
+        if formula_pool_size is not None and runtime != EMBEDDED_RUNTIME:
+            self.formula_pool_size = get_formula_pool_size(formula_pool_size)
+
+        # (list): formula workers started on other nodes that host the
+        # formulas, None if formulas are hosted on this node
+        self.remote_formula_workers = remote_formula_workers
+
+        # (int): number of ready formula shells kept by the warm pool, 0 if
+        # formulas are not created in shells
+        self.formula_shell_pool_size = 0
+        if self.formula_pool_size is None and formula_runtime == PROCESS_RUNTIME and runtime != EMBEDDED_RUNTIME and \
+           remote_formula_workers is None:
+            self.formula_shell_pool_size = formula_shell_pool_size
+
+        # (bool): True if the formulas connect to a router socket of the
+        # dispatcher
+        self.formula_router = formula_topology == ROUTER_TOPOLOGY and self.formula_pool_size is None and \
+            self.formula_shell_pool_size == 0 and remote_formula_workers is None and runtime != EMBEDDED_RUNTIME
+
         # (powerapi.DispatcherState): Actor state
         self.state = DispatcherState(self, self._create_factory(), route_table)
+        self.state.respawn_formulas = respawn_formulas
 
     def setup(self):
         """
@@ -78,9 +194,28 @@ class DispatcherActor(Actor):
         if self.state.route_table.primary_dispatch_rule is None:
             raise NoPrimaryDispatchRuleRuleException()
 
-        self.add_handler(Report, FormulaDispatcherReportHandler(self.state))
+        report_handler = FormulaDispatcherReportHandler(self.state)
+        self.add_handler(Report, report_handler)
+        self.add_handler(Envelope, report_handler)
         self.add_handler(PoisonPillMessage, DispatcherPoisonPillMessageHandler(self.state))
         self.add_handler(StartMessage, StartHandler(self.state))
+        self.add_handler(FormulaTerminatedMessage, FormulaTerminatedHandler(self.state))
+
+        if self.remote_formula_workers is not None:
+            for worker in self.remote_formula_workers:
+                worker.connect_data()
+
+        if self.formula_router:
+            # formula threads share the dispatcher zmq context
+            transport = INPROC_TRANSPORT if self.formula_runtime == THREAD_RUNTIME else self.socket_interface.transport
+            self.state.formula_router = Router(self.name, transport, self.socket_interface.bind_address,
+                                               self.socket_interface.advertise_address)
+            self.state.formula_router.setup()
+
+        if self.formula_shell_pool_size > 0:
+            self.add_handler(FormulaShellReadyMessage, FormulaShellReadyHandler(self.state))
+            self.state.formula_shell_pool = self._create_shell_pool()
+            self.state.formula_shell_pool.start()
 
     def _create_factory(self):
         """
@@ -89,11 +224,94 @@ class DispatcherActor(Actor):
         :return: Formula Factory
         :rtype: func(formula_id) -> Formula
         """
+        if self.remote_formula_workers is not None:
+            return self._create_remote_pool_factory()
+        if self.formula_pool_size is not None:
+            return self._create_pool_factory()
+        if self.formula_shell_pool_size > 0:
+            return lambda formula_id: ShellFormula(self.state.formula_shell_pool, str((self.name,) + formula_id))
+
         formula_init_function = self.formula_init_function
 
         def factory(formula_id):
             formula = formula_init_function(str((self.name,) + formula_id), self.logger.getEffectiveLevel())
+            if self.runtime == EMBEDDED_RUNTIME:
+                formula.set_runtime(EMBEDDED_RUNTIME)
+            elif self.formula_runtime == THREAD_RUNTIME:
+                # formula threads share the dispatcher zmq context
+                formula.set_runtime(THREAD_RUNTIME, INPROC_TRANSPORT)
+            if self.state.formula_router is not None:
+                formula.set_router(self.state.formula_router)
+            formula.set_scheduling(self.formula_scheduling)
             self.state.supervisor.launch_actor(formula, start_message=False)
+            self.state.watch_formula_host(formula)
             return formula
 
         return factory
+
+    def _create_pool_factory(self):
+        """
+        Create a Formula Factory that consistently hash the formula ids onto
+        a fixed pool of worker processes, each worker hosting many formulas
+
+        Workers are started when their first formula is created, a
+        terminated worker is started again when one of its formulas is
+        respawned
+
+        :return: Formula Factory
+        :rtype: func(formula_id) -> PooledFormula
+        """
+        workers = {}
+        ring = HashRing(range(self.formula_pool_size))
+
+        def factory(formula_id):
+            formula_name = str((self.name,) + formula_id)
+            index = ring.get_node(formula_name)
+            if index not in workers or not workers[index].is_alive():
+                worker = FormulaWorkerActor(self.name + '_worker_' + str(index), self.formula_init_function,
+                                            self.logger.getEffectiveLevel(), codec=self.codec,
+                                            transport=self.socket_interface.transport,
+                                            respawn_formulas=self.state.respawn_formulas)
+                worker.set_scheduling(self.formula_scheduling)
+                self.state.supervisor.launch_actor(worker)
+                self.state.watch_formula_host(worker)
+                workers[index] = worker
+            return PooledFormula(workers[index], formula_name)
+
+        return factory
+
+    def _create_remote_pool_factory(self):
+        """
+        Create a Formula Factory that consistently hash the formula ids onto
+        the formula workers started on other nodes
+
+        :return: Formula Factory
+        :rtype: func(formula_id) -> PooledFormula
+        """
+        workers = self.remote_formula_workers
+        ring = HashRing(range(len(workers)))
+
+        def factory(formula_id):
+            formula_name = str((self.name,) + formula_id)
+            return PooledFormula(workers[ring.get_node(formula_name)], formula_name)
+
+        return factory
+
+    def _create_shell_pool(self):
+        """
+        Create the warm pool of formula shells, each shell is a formula worker
+        that will host a single formula
+
+        :rtype: powerapi.dispatcher.FormulaShellPool
+        """
+        shell_ids = itertools.count()
+
+        def shell_factory():
+            shell = FormulaWorkerActor(self.name + '_shell_' + str(next(shell_ids)), self.formula_init_function,
+                                       self.logger.getEffectiveLevel(), codec=self.codec,
+                                       transport=self.socket_interface.transport,
+                                       respawn_formulas=self.state.respawn_formulas)
+            shell.set_scheduling(self.formula_scheduling)
+            return shell
+
+        return FormulaShellPool(shell_factory, self.state.supervisor, self.formula_shell_pool_size, self)
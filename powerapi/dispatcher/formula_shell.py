@@ -0,0 +1,329 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import queue
+import threading
+
+from powerapi.actor import NoCreditException, Supervisor
+from powerapi.handler import InitHandler
+from powerapi.dispatcher.formula_worker import FormulaReportMessage
+
+#: (float): time (in s) waited by the filler thread between two checks of
+#: the pool termination
+SHELL_POOL_CHECK_PERIOD = 0.1
+#: (float): time (in s) given to the warm pool to provide a shell to the
+#: formulas still waiting for one when the dispatcher is killed
+SHELL_POOL_FLUSH_TIMEOUT = 5.0
+#: (float): time (in s) waited by the filler thread before launching a shell
+#: again after a failed launch, doubled after each consecutive failure
+SHELL_POOL_RETRY_DELAY = 0.1
+#: (float): maximum time (in s) waited by the filler thread between two
+#: failed launches
+SHELL_POOL_MAX_RETRY_DELAY = 5.0
+
+
+class FormulaShellReadyMessage:
+    """
+    Message sent by the warm pool to its dispatcher when new shells are
+    available for the formulas waiting for one
+    """
+
+    def __str__(self):
+        return 'FormulaShellReadyMessage'
+
+
+class FormulaShellReadyHandler(InitHandler):
+    """
+    Bind the formulas waiting for a shell when the warm pool has new shells
+    """
+
+    def handle(self, msg):
+        """
+        :param FormulaShellReadyMessage msg: notification of the warm pool
+        """
+        self.state.formula_shell_pool.bind_pending()
+
+
+class ShellFormula:
+    """
+    Formula hosted by a formula shell taken from a warm pool
+
+    The formula is bound to a shell when one is available, reports sent to it
+    before are buffered and sent in one batch once it is bound. Expose the
+    part of the Actor interface used by the dispatcher to send reports to a
+    formula
+    """
+
+    def __init__(self, pool, name):
+        """
+        :param FormulaShellPool pool: warm pool that provides the shell
+        :param str name: formula name
+        """
+        self.pool = pool
+        self.name = name
+        #: (powerapi.dispatcher.FormulaWorkerActor): shell hosting the
+        #: formula, None until the formula is bound
+        self.shell = None
+        #: (list): reports received before the formula is bound
+        self.buffer = []
+
+    def bind(self, block=False, timeout=None):
+        """
+        Take a shell from the warm pool if the formula is not bound yet and
+        send it the buffered reports
+
+        :param bool block: wait for a shell if none is available
+        :param float timeout: time (in s) to wait for a shell
+        :return bool: True if the formula is bound to a shell
+        """
+        if self.shell is None:
+            self.shell = self.pool.acquire(block, timeout)
+            if self.shell is None:
+                return False
+            self.pool.dispatcher.state.watch_formula_host(self.shell)
+            if self.buffer:
+                self.shell.send_data_many([FormulaReportMessage(self.name, msg) for msg in self.buffer])
+                self.buffer = []
+        return True
+
+    def is_alive(self):
+        """
+        :return bool: True if the formula is waiting for a shell or if the
+                      shell hosting it is alive
+        """
+        return self.shell is None or self.shell.is_alive()
+
+    def send_data(self, msg):
+        """
+        Send a report to the formula through its shell, or buffer it if the
+        formula is not bound yet
+
+        :param powerapi.Report msg: report to send
+        """
+        self.send_data_many([msg])
+
+    def send_data_many(self, msgs):
+        """
+        Send a batch of reports to the formula through its shell, or buffer
+        them if the formula is not bound yet
+
+        :param list msgs: reports to send
+        """
+        if not self.bind():
+            self.pool.add_pending(self)
+            self.buffer += msgs
+            return
+        self.shell.send_data_many([FormulaReportMessage(self.name, msg) for msg in msgs])
+
+
+class FormulaShellPool:
+    """
+    Warm pool of pre-started formula shells
+
+    A formula shell is a FormulaWorkerActor launched before any formula needs
+    it : its process is forked, its sockets are bound and it is initialized.
+    A shell is assigned to a single formula on demand, the formula is then
+    created in a thread of the shell when it receives its first report.
+
+    A background thread launches new shells to keep the pool full, so the
+    dispatcher never waits for a fork when a new formula appears. When
+    formulas are waiting for a shell, this thread wakes the dispatcher up with
+    a FormulaShellReadyMessage as soon as a shell is available. A failed
+    launch is retried after a delay that grows with the consecutive failures
+
+    The shells are launched by a supervisor owned by the filler thread and
+    are supervised by the dispatcher supervisor once the dispatcher takes
+    them from the pool, so the dispatcher supervisor and the shells sockets
+    are only used by the dispatcher thread
+    """
+
+    def __init__(self, shell_factory, supervisor, size, dispatcher, launcher=None):
+        """
+        :param func shell_factory: function that return a new unlaunched
+                                   formula shell
+        :param powerapi.actor.Supervisor supervisor: dispatcher supervisor,
+                                                     that supervises the
+                                                     shells taken from the
+                                                     pool
+        :param int size: number of ready shells kept in the pool
+        :param powerapi.dispatcher.DispatcherActor dispatcher: dispatcher that
+                                                               uses the pool
+        :param powerapi.actor.Supervisor launcher: supervisor used by the
+                                                   filler thread to launch
+                                                   the shells (a new one by
+                                                   default)
+        """
+        self.shell_factory = shell_factory
+        self.supervisor = supervisor
+        self.launcher = Supervisor() if launcher is None else launcher
+        self.size = size
+        self.dispatcher = dispatcher
+        self.logger = dispatcher.logger
+        #: (queue.Queue): launched shells not assigned to a formula yet
+        self.shells = queue.Queue()
+        #: (list): formulas waiting for a shell
+        self.pending = []
+        self._free_slots = threading.Semaphore(size)
+        self._stopped = threading.Event()
+        self._filler = None
+        #: (bool): True if the dispatcher was notified of available shells
+        #: and didn't bind the pending formulas since
+        self._notified = False
+
+    def start(self):
+        """
+        Start the thread that fills the pool
+        """
+        self._filler = threading.Thread(target=self._fill, name='formula_shell_pool', daemon=True)
+        self._filler.start()
+
+    def _fill(self):
+        client = self.dispatcher.new_client()
+        client.connect_data()
+        try:
+            retry_delay = SHELL_POOL_RETRY_DELAY
+            while not self._stopped.is_set():
+                if self._free_slots.acquire(timeout=SHELL_POOL_CHECK_PERIOD):
+                    shell = self._launch()
+                    if shell is None:
+                        self._free_slots.release()
+                        self._stopped.wait(retry_delay)
+                        retry_delay = min(retry_delay * 2, SHELL_POOL_MAX_RETRY_DELAY)
+                        continue
+                    retry_delay = SHELL_POOL_RETRY_DELAY
+                    self.shells.put(shell)
+                self._notify(client)
+        finally:
+            client.socket_interface.close()
+
+    def _launch(self):
+        """
+        Launch a new shell with the supervisor of the filler thread
+
+        :return: the launched shell, None if the launch failed
+        :rtype: powerapi.dispatcher.FormulaWorkerActor
+        """
+        shell = None
+        try:
+            shell = self.shell_factory()
+            self.launcher.launch_actor(shell)
+            # the shell is supervised by the dispatcher supervisor once taken
+            # from the pool
+            self.launcher.supervised_actors.remove(shell)
+            return shell
+        except Exception as exn:
+            self.logger.error('unable to launch a formula shell, retry later : ' + str(exn))
+            if shell is not None and shell.is_alive():
+                shell.terminate()
+            return None
+
+    def _notify(self, client):
+        """
+        Wake the dispatcher up if formulas are waiting for available shells
+
+        :param powerapi.dispatcher.DispatcherActor client: client of the
+                                                           dispatcher owned
+                                                           by the filler
+                                                           thread
+        """
+        if self._notified or not self.pending or self.shells.empty():
+            return
+        # set before sending, the dispatcher may reset it as soon as it
+        # receives the message
+        self._notified = True
+        try:
+            client.send_data(FormulaShellReadyMessage(), timeout=0)
+        except NoCreditException:
+            # the dispatcher mailbox is full, retry on the next check
+            self._notified = False
+
+    def acquire(self, block=False, timeout=None):
+        """
+        Take a launched shell from the pool
+
+        :param bool block: wait for a shell if none is available
+        :param float timeout: time (in s) to wait for a shell
+        :return: a shell or None if no shell is available
+        :rtype: powerapi.dispatcher.FormulaWorkerActor
+        """
+        try:
+            shell = self.shells.get(block, timeout)
+        except queue.Empty:
+            return None
+        self._free_slots.release()
+        self.supervisor.supervise(shell)
+        return shell
+
+    def add_pending(self, formula):
+        """
+        Register a formula waiting for a shell
+
+        :param ShellFormula formula: unbound formula
+        """
+        if formula not in self.pending:
+            self.pending.append(formula)
+
+    def bind_pending(self, block=False, timeout=None):
+        """
+        Bind the formulas waiting for a shell, in their creation order
+
+        :param bool block: wait for the shells if none are available
+        :param float timeout: time (in s) to wait for each shell
+        """
+        self._notified = False
+        while self.pending and self.pending[0].bind(block, timeout):
+            self.pending.pop(0)
+
+    def stop(self):
+        """
+        Stop the thread that fills the pool, the shells left in the pool are
+        supervised by the dispatcher supervisor to be killed with the other
+        actors of the dispatcher
+        """
+        self._stopped.set()
+        if self._filler is not None:
+            self._filler.join()
+        while True:
+            try:
+                self.supervisor.supervise(self.shells.get_nowait())
+            except queue.Empty:
+                return
+
+    def close(self, soft=False):
+        """
+        Stop filling the pool, with a soft close, first send their buffered
+        reports to the formulas waiting for a shell
+
+        :param bool soft: True to send the buffered reports
+        """
+        if soft:
+            self.bind_pending(True, SHELL_POOL_FLUSH_TIMEOUT)
+            for formula in self.pending:
+                self.logger.warning('no formula shell available for ' + formula.name + ', drop its reports')
+        self.stop()
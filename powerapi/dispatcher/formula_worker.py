@@ -0,0 +1,267 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import logging
+import os
+
+from powerapi.actor import Actor, State, DEFAULT_CODEC, DEFAULT_TRANSPORT, THREAD_RUNTIME, INPROC_TRANSPORT
+from powerapi.handler import Handler, InitHandler, StartHandler, PoisonPillMessageHandler
+from powerapi.message import PoisonPillMessage, StartMessage
+from powerapi.dispatcher.handlers import FORMULA_JOIN_TIMEOUT, FormulaTerminatedMessage
+
+#: (int): size the formula pool to the number of cores available to the
+#: dispatcher
+FORMULA_POOL_CPU_COUNT = 0
+
+
+def get_formula_pool_size(pool_size):
+    """
+    :param int pool_size: requested size of the formula pool
+    :return int: the number of worker of the formula pool
+    """
+    if pool_size != FORMULA_POOL_CPU_COUNT:
+        return pool_size
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
+class FormulaReportMessage:
+    """
+    Message sent by the dispatcher to a formula worker, that contains a report
+    and the name of the formula that must handle it
+    """
+
+    def __init__(self, formula_name, report):
+        """
+        :param str formula_name: name of the formula that must handle the report
+        :param powerapi.Report report: report
+        """
+        self.formula_name = formula_name
+        self.report = report
+
+    def __str__(self):
+        return 'FormulaReportMessage(' + self.formula_name + ', ' + str(self.report) + ')'
+
+
+class PooledFormula:
+    """
+    Formula hosted by a formula worker
+
+    Expose the part of the Actor interface used by the dispatcher to send
+    reports to a formula
+    """
+
+    def __init__(self, worker, name):
+        """
+        :param FormulaWorkerActor worker: worker hosting the formula
+        :param str name: formula name
+        """
+        self.worker = worker
+        self.name = name
+
+    def is_alive(self):
+        """
+        :return bool: True if the worker hosting the formula is alive
+        """
+        return self.worker.is_alive()
+
+    def send_data(self, msg):
+        """
+        Send a report to the formula through its worker
+
+        :param powerapi.Report msg: report to send
+        """
+        self.worker.send_data(FormulaReportMessage(self.name, msg))
+
+    def send_data_many(self, msgs):
+        """
+        Send a batch of reports to the formula through its worker
+
+        :param list msgs: reports to send
+        """
+        self.worker.send_data_many([FormulaReportMessage(self.name, msg) for msg in msgs])
+
+
+class FormulaWorkerState(State):
+    """
+    State of the formula worker, that contains the formulas it hosts
+    """
+
+    def __init__(self, actor, formula_init_function, respawn_formulas=False):
+        """
+        :param Actor actor: formula worker
+        :param func formula_init_function: function used by the dispatcher to
+                                           create a formula
+        :param bool respawn_formulas: create again the hosted formulas that
+                                      terminated, otherwise their reports are
+                                      dropped
+        """
+        State.__init__(self, actor)
+
+        #: (func): function used to create a formula
+        self.formula_init_function = formula_init_function
+
+        #: (dict): hosted formulas by name
+        self.formulas = {}
+
+        #: (bool): True if terminated formulas are created again, otherwise
+        #: their reports are dropped
+        self.respawn_formulas = respawn_formulas
+
+        #: (set): names of the terminated formulas whose reports are dropped
+        self.dead_formulas = set()
+
+    def get_formula(self, formula_name):
+        """
+        Return the hosted formula with the given name, create and start it in
+        a thread of the worker if it doesn't exist
+
+        The worker is woken up with a FormulaTerminatedMessage when the thread
+        of the formula terminates
+
+        :param str formula_name: formula name
+        :rtype: powerapi.formula.FormulaActor
+        """
+        if formula_name not in self.formulas:
+            formula = self.formula_init_function(formula_name, self.actor.logger.getEffectiveLevel())
+            formula.set_runtime(THREAD_RUNTIME, INPROC_TRANSPORT)
+            self.supervisor.launch_actor(formula, start_message=False)
+            self.actor.socket_interface.watch(formula.sentinel, FormulaTerminatedMessage(formula))
+            self.formulas[formula_name] = formula
+        return self.formulas[formula_name]
+
+    def remove_formula(self, formula):
+        """
+        Forget a terminated formula, the next call to get_formula with its name
+        creates it again
+
+        :param powerapi.formula.FormulaActor formula: terminated formula
+        """
+        formula.join(FORMULA_JOIN_TIMEOUT)
+        self.supervisor.supervised_actors.remove(formula)
+        if self.formulas.get(formula.name) is formula:
+            del self.formulas[formula.name]
+
+
+class FormulaWorkerReportHandler(InitHandler):
+    """
+    Forward the received reports to the hosted formulas
+    """
+
+    def handle(self, msg):
+        """
+        :param FormulaReportMessage msg: report and name of its formula
+        """
+        self.handle_batch([msg])
+
+    def handle_batch(self, msgs):
+        """
+        Forward the received reports to their formula, reports of the same
+        formula are sent in one batch
+
+        :param list msgs: FormulaReportMessage list
+        """
+        if not self.state.initialized:
+            return
+
+        formula_reports = {}
+        for msg in msgs:
+            if msg.formula_name not in formula_reports:
+                formula_reports[msg.formula_name] = []
+            formula_reports[msg.formula_name].append(msg.report)
+
+        for formula_name, reports in formula_reports.items():
+            if formula_name not in self.state.dead_formulas:
+                self.state.get_formula(formula_name).send_data_many(reports)
+
+
+class FormulaWorkerTerminatedHandler(Handler):
+    """
+    Forget the hosted formulas whose thread terminated, without stopping the
+    other formulas of the worker. They are respawned on their next report or
+    their reports are dropped
+    """
+
+    def handle(self, msg):
+        """
+        :param FormulaTerminatedMessage msg: termination of a hosted formula
+        """
+        formula = msg.host
+        self.state.remove_formula(formula)
+        if self.state.respawn_formulas:
+            self.state.actor.logger.warning('formula ' + formula.name + ' terminated, respawn it')
+        else:
+            self.state.actor.logger.error('formula ' + formula.name + ' terminated, its reports are dropped')
+            self.state.dead_formulas.add(formula.name)
+
+
+class FormulaWorkerPoisonPillMessageHandler(PoisonPillMessageHandler):
+    def teardown(self, soft=False):
+        self.state.supervisor.kill_actors(soft=soft)
+
+
+class FormulaWorkerActor(Actor):
+    """
+    Process of the dispatcher formula pool, that hosts many formulas
+
+    Each formula is created with the dispatcher formula init function and runs
+    in a thread of the worker
+    """
+
+    def __init__(self, name, formula_init_function, level_logger=logging.WARNING, timeout=None,
+                 codec=DEFAULT_CODEC, transport=DEFAULT_TRANSPORT, respawn_formulas=False):
+        """
+        :param str name: Actor name
+        :param func formula_init_function: Function for creating Formula
+        :param int level_logger: Define the level of the logger
+        :param int timeout: Define the time in millisecond to wait for a
+                            message before run timeout_handler
+        :param str codec: name of the codec used to encode messages sent to
+                          the worker
+        :param str transport: transport used by the worker sockets
+        :param bool respawn_formulas: create again the hosted formulas that
+                                      terminated, otherwise their reports are
+                                      dropped. The worker keeps running in
+                                      both cases
+        """
+        Actor.__init__(self, name, level_logger, timeout, codec, transport)
+
+        #: (FormulaWorkerState): Actor state
+        self.state = FormulaWorkerState(self, formula_init_function, respawn_formulas)
+
+    def setup(self):
+        """
+        Define StartMessage, PoisonPillMessage, FormulaReportMessage and
+        FormulaTerminatedMessage handlers
+        """
+        self.add_handler(FormulaReportMessage, FormulaWorkerReportHandler(self.state))
+        self.add_handler(FormulaTerminatedMessage, FormulaWorkerTerminatedHandler(self.state))
+        self.add_handler(PoisonPillMessage, FormulaWorkerPoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, StartHandler(self.state))
@@ -28,9 +28,12 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from powerapi.handler import InitHandler, Handler, StartHandler, PoisonPillMessageHandler
-from powerapi.message import OKMessage, StartMessage
+from powerapi.message import OKMessage, StartMessage, UnknowMessageTypeException
 from powerapi.exception import PowerAPIException
 
+#: (float): time (in s) given to a terminated formula host to be joined
+FORMULA_JOIN_TIMEOUT = 0.5
+
 
 def _clean_list(id_list):
     """
@@ -49,13 +52,57 @@ def _clean_list(id_list):
 
 class DispatcherPoisonPillMessageHandler(PoisonPillMessageHandler):
     def teardown(self, soft=False):
+        if self.state.formula_shell_pool is not None:
+            self.state.formula_shell_pool.close(soft)
         self.state.supervisor.kill_actors(soft=soft)
+        if self.state.formula_router is not None:
+            self.state.formula_router.close()
 
 
 class DispatcherSendMessageToDeadFormulaError(PowerAPIException):
     pass
 
 
+class FormulaTerminatedMessage:
+    """
+    Message returned to the dispatcher by its socket interface when the
+    sentinel of an actor hosting formulas (formula, pool worker or shell)
+    becomes ready
+    """
+
+    def __init__(self, host):
+        """
+        :param powerapi.actor.Actor host: terminated actor
+        """
+        self.host = host
+
+    def __str__(self):
+        return 'FormulaTerminatedMessage(' + self.host.name + ')'
+
+
+class FormulaTerminatedHandler(Handler):
+    """
+    Update the cached liveness of the formulas when an actor hosting formulas
+    terminates, dead formulas are respawned or their reports are dropped
+    """
+
+    def handle(self, msg):
+        """
+        :param FormulaTerminatedMessage msg: termination of a formula host
+        """
+        # the sentinel of a thread is ready just before the end of the thread
+        msg.host.join(FORMULA_JOIN_TIMEOUT)
+        for formula_id, formula in list(self.state.get_all_formula()):
+            if formula in self.state.dead_formulas or formula.is_alive():
+                continue
+            if self.state.respawn_formulas:
+                self.state.actor.logger.warning('formula ' + str(formula_id) + ' terminated, respawn it')
+                self.state.respawn_formula(formula_id)
+            else:
+                self.state.actor.logger.error('formula ' + str(formula_id) + ' terminated, its reports are dropped')
+                self.state.dead_formulas.add(formula)
+
+
 class FormulaDispatcherReportHandler(InitHandler):
     """
     Split received report into sub-reports (if needed) and return the sub
@@ -77,23 +124,70 @@ class FormulaDispatcherReportHandler(InitHandler):
                  that identitfy the formula_actor
         :rtype:  list(tuple(formula_id, report))
         """
+        dead_formulas = self.state.dead_formulas
+        for formula in self._get_formulas(msg):
+            if formula not in dead_formulas:
+                formula.send_data(msg)
+        self._bind_pending_formulas()
+
+    def handle_batch(self, msgs):
+        """
+        Send the received reports to their corresponding formula, reports
+        that must be sent to the same formula are sent in one batch
+
+        :param list msgs: Report messages
+        """
+        if not self.state.initialized:
+            return
+
+        formula_msgs = {}
+        for msg in msgs:
+            try:
+                formulas = self._get_formulas(msg)
+            except UnknowMessageTypeException:
+                self.state.actor.logger.warning("UnknowMessageTypeException: " + str(msg))
+                continue
+            for formula in formulas:
+                if formula not in formula_msgs:
+                    formula_msgs[formula] = []
+                formula_msgs[formula].append(msg)
+
+        dead_formulas = self.state.dead_formulas
+        for formula, batch in formula_msgs.items():
+            if formula in dead_formulas:
+                continue
+            if len(batch) == 1:
+                formula.send_data(batch[0])
+            else:
+                formula.send_data_many(batch)
+        self._bind_pending_formulas()
+
+    def _bind_pending_formulas(self):
+        """
+        Send their buffered reports to the formulas that were waiting for a
+        shell of the warm pool, if shells are now available
+        """
+        if self.state.formula_shell_pool is not None:
+            self.state.formula_shell_pool.bind_pending()
+
+    def _get_formulas(self, msg):
+        """
+        Return the formulas that must receive the given report, create them if
+        needed
+
+        :param powerapi.Report msg: Report message
+        :rtype: list(Formula)
+        """
         dispatch_rule = self.state.route_table.get_dispatch_rule(msg)
         primary_dispatch_rule = self.state.route_table.primary_dispatch_rule
 
+        formulas = []
         for formula_id in self._extract_formula_id(msg, dispatch_rule, primary_dispatch_rule):
-            primary_rule_fields = primary_dispatch_rule.fields
-            if len(formula_id) == len(primary_rule_fields):
-                formula = self.state.get_direct_formula(formula_id)
-                if formula.is_alive():
-                    formula.send_data(msg)
-                else:
-                    raise DispatcherSendMessageToDeadFormulaError()
+            if len(formula_id) == len(primary_dispatch_rule.fields):
+                formulas.append(self.state.get_direct_formula(formula_id))
             else:
-                for formula in self.state.get_corresponding_formula(list(formula_id)):
-                    if formula.is_alive():
-                        formula.send_data(msg)
-                    else:
-                        raise DispatcherSendMessageToDeadFormulaError()
+                formulas += self.state.get_corresponding_formula(list(formula_id))
+        return formulas
 
 
     def _extract_formula_id(self, report, dispatch_rule, primary_dispatch_rule):
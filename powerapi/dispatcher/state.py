@@ -27,9 +27,10 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from powerapi.actor import State
+from powerapi.actor import State, Envelope
 from powerapi.exception import PowerAPIException
 from powerapi.utils.tree import Tree
+from powerapi.dispatcher.handlers import FormulaTerminatedMessage
 from powerapi.message import UnknowMessageTypeException
 
 
@@ -50,6 +51,9 @@ class RouteTable:
         #: (array): Array of tuple that link a Report type to a DispatchRule
         # rule
         self.route_table = []
+        #: (dict): cache of the DispatchRule resolved for each concrete report
+        #: type
+        self._rule_cache = {}
         #: (powerapi.DispatchRule): Allow to define how to create the Formula id
         self.primary_dispatch_rule = None
 
@@ -58,18 +62,36 @@ class RouteTable:
         Return the corresponding group by rule mapped to the received message
         type
 
-        :param type msg: the received message
+        :param type msg: the received message, the type of the report is used
+                         for an :class:`Envelope
+                         <powerapi.actor.codec.Envelope>`
         :return: the dispatch_rule rule mapped to the received message type
         :rtype: powerapi.dispatch_rule.DispatchRule
         :raise: UnknowMessageTypeException if no group by rule is mapped to the
                 received message type
         """
-
+        msg_class = type(msg)
+        if msg_class is Envelope:
+            msg_class = msg.report_class
+        try:
+            dispatch_rule = self._rule_cache[msg_class]
+        except KeyError:
+            dispatch_rule = self._resolve_dispatch_rule(msg_class)
+            self._rule_cache[msg_class] = dispatch_rule
+
+        if dispatch_rule is None:
+            raise UnknowMessageTypeException(msg_class)
+        return dispatch_rule
+
+    def _resolve_dispatch_rule(self, msg_class):
+        """
+        Return the first DispatchRule whose report type is in the MRO of the
+        given report class, None if there is no such DispatchRule
+        """
         for (report_class, dispatch_rule) in self.route_table:
-            if isinstance(msg, report_class):
+            if issubclass(msg_class, report_class):
                 return dispatch_rule
-
-        raise UnknowMessageTypeException(type(msg))
+        return None
 
     def dispatch_rule(self, report_class, dispatch_rule):
         """
@@ -85,8 +107,8 @@ class RouteTable:
                 raise PrimaryDispatchRuleRuleAlreadyDefinedException()
             self.primary_dispatch_rule = dispatch_rule
 
-
         self.route_table.append((report_class, dispatch_rule))
+        self._rule_cache.clear()
 
 
 class DispatcherState(State):
@@ -127,6 +149,22 @@ class DispatcherState(State):
         #: (func): Factory for formula creation
         self.formula_factory = formula_factory
 
+        #: (powerapi.dispatcher.FormulaShellPool): warm pool of formula
+        #: shells, None if the formulas are not created in shells
+        self.formula_shell_pool = None
+
+        #: (powerapi.actor.Router): router socket where the formulas connect,
+        #: None if the formulas bind their own sockets
+        self.formula_router = None
+
+        #: (set): formulas known to be terminated, updated when the sentinel
+        #: of an actor hosting formulas becomes ready
+        self.dead_formulas = set()
+
+        #: (bool): True if terminated formulas are created again, otherwise
+        #: their reports are dropped
+        self.respawn_formulas = False
+
         self.route_table = route_table
 
     def add_formula(self, formula_id):
@@ -142,6 +180,31 @@ class DispatcherState(State):
         self.formula_dict[formula_id] = formula
         self.formula_tree.add(list(formula_id), formula)
 
+    def respawn_formula(self, formula_id):
+        """
+        Replace the formula corresponding to the given formula id with a new
+        one
+
+        :param tuple formula_id: Key corresponding to a Formula
+        """
+        self.formula_dict[formula_id] = self.formula_factory(formula_id)
+        self.formula_tree = Tree()
+        for other_formula_id, formula in self.formula_dict.items():
+            self.formula_tree.add(list(other_formula_id), formula)
+
+    def watch_formula_host(self, host):
+        """
+        Wake the dispatcher up with a FormulaTerminatedMessage when the given
+        actor, that hosts formulas, terminates
+
+        Must be called by the thread (or task) running the dispatcher
+
+        :param powerapi.actor.Actor host: launched formula, pool worker or
+                                          shell
+        """
+        if host.sentinel is not None:
+            self.actor.socket_interface.watch(host.sentinel, FormulaTerminatedMessage(host))
+
     def get_direct_formula(self, formula_id):
         """
         Get the formula corresponding to the given formula id
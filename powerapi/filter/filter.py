@@ -64,6 +64,11 @@ class Filter:
         """
         Get the list of dispatchers to whom send the report, or None
 
+        Rules that only read the routing fields of the report (see
+        :attr:`Report.routing_fields
+        <powerapi.report.report.Report.routing_fields>`) can also route an
+        :class:`Envelope <powerapi.actor.codec.Envelope>` without decoding it
+
         :param powerapi.Report report: Message to send
         """
         # Error if filters is empty
@@ -76,3 +81,21 @@ class Filter:
                 dispatchers.append(dispatcher)
 
         return dispatchers
+
+    def route_many(self, reports):
+        """
+        Get the reports to send to each dispatcher
+
+        :param list reports: reports to send
+        :return list: (dispatcher, reports) tuples, in the order of the
+                      filters, the reports of a dispatcher keep their order
+        """
+        if not self.filters:
+            raise FilterUselessError()
+
+        batches = []
+        for rule, dispatcher in self.filters:
+            selected_reports = [report for report in reports if rule(report)]
+            if selected_reports:
+                batches.append((dispatcher, selected_reports))
+        return batches
@@ -31,7 +31,8 @@ import logging
 import re
 from typing import Dict
 
-from powerapi.actor import Actor, State, SocketInterface
+from powerapi.actor import Actor, State, SocketInterface, DEFAULT_CODEC, DEFAULT_TRANSPORT
+from powerapi.actor import DEFAULT_RUNTIME, THREAD_RUNTIME
 from powerapi.pusher import PusherActor
 
 
@@ -56,15 +57,21 @@ class FormulaActor(Actor):
     Formula actor abstract class.
     """
 
-    def __init__(self, name, pushers: Dict[str, PusherActor], level_logger=logging.WARNING, timeout=None):
+    def __init__(self, name, pushers: Dict[str, PusherActor], level_logger=logging.WARNING, timeout=None,
+                 codec=DEFAULT_CODEC, transport=DEFAULT_TRANSPORT, runtime=DEFAULT_RUNTIME,
+                 mailbox_size=0):
         """
         Initialize a new Formula actor.
         :param name: Actor name
         :param pushers: Pusher actors
         :param level_logger: Level of the logger
         :param timeout: Time in millisecond to wait for a message before calling the timeout handler
+        :param codec: Name of the codec used to encode messages sent to the formula
+        :param transport: Transport used by the formula sockets
+        :param runtime: Run the formula in its own process or in a thread
+        :param mailbox_size: Maximum number of reports waiting to be handled (0 for an unbounded mailbox)
         """
-        Actor.__init__(self, name, level_logger, timeout)
+        Actor.__init__(self, name, level_logger, timeout, codec, transport, runtime, mailbox_size)
 
         self.formula_metadata = self._extract_formula_metadata(name)
         self.state = FormulaState(self, pushers, self.formula_metadata)
@@ -88,5 +95,9 @@ class FormulaActor(Actor):
         """
         Setup the Formula actor.
         """
+        if self.runtime == THREAD_RUNTIME:
+            # pushers are shared by all the formulas running in the same
+            # process, each formula thread needs its own connection
+            self.state.pushers = {name: pusher.new_client() for name, pusher in self.state.pushers.items()}
         for _, pusher in self.state.pushers.items():
             pusher.connect_data()
@@ -30,3 +30,5 @@
 from powerapi.handler.handler import Handler, InitHandler, HandlerException
 from powerapi.handler.poison_pill_message_handler import PoisonPillMessageHandler
 from powerapi.handler.start_handler import StartHandler
+from powerapi.handler.stats_request_handler import StatsRequestHandler
+from powerapi.handler.profile_handler import ProfileHandler
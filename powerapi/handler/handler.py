@@ -62,6 +62,19 @@ class Handler:
         """
         self.handle(msg)
 
+    def handle_batch(self, msgs):
+        """
+        Handle a list of messages received at the same time
+
+        By default, call :meth:`Handler.handle_message
+        <powerapi.handler.abstract_handler.Handler.handle_message>` on each
+        message. Override this method to handle the messages in one go
+
+        :param list msgs: the messages received by the actor
+        """
+        for msg in msgs:
+            self.handle_message(msg)
+
     def handle(self, msg):
         """
         Handle a message and return a the new state value of the actor
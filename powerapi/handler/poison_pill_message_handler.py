@@ -52,15 +52,18 @@ class PoisonPillMessageHandler(Handler):
             self.state.actor.logger.warning("HandlerException")
 
     def _empty_mail_box(self):
-        print(str(self.state.actor.name) + " empty mail box")
-        while True:
-            self.state.actor.socket_interface.timeout = 0.1
-            msg = self.state.actor.socket_interface.receive()
-
-            if msg is not None:
+        """
+        Handle the messages already queued in the mailbox, by batches, without
+        waiting for new ones
+        """
+        self.state.actor.logger.debug(str(self.state.actor.name) + " empty mail box")
+        socket_interface = self.state.actor.socket_interface
+        socket_interface.timeout = 0
+        msgs = socket_interface.receive_many()
+        while msgs:
+            for msg in msgs:
                 self.handle_msg(msg)
-            else:
-                return
+            msgs = socket_interface.receive_many()
 
     def handle(self, msg):
         """
@@ -0,0 +1,60 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from fnmatch import fnmatchcase
+
+from powerapi.exception import PowerAPIException
+from powerapi.message import ProfileStartMessage
+from powerapi.handler import Handler
+
+
+class ProfileHandler(Handler):
+    """
+    Start or stop profiling the actor when it receives a ProfileStartMessage
+    or a ProfileStopMessage that targets it, and forward the message to the
+    actors it supervises
+    """
+
+    def handle(self, msg):
+        """
+        :param powerapi.ProfileStartMessage|powerapi.ProfileStopMessage msg:
+            Message that starts or stops profiling
+        """
+        actor = self.state.actor
+        if msg.actor_name is None or fnmatchcase(actor.name, msg.actor_name):
+            if isinstance(msg, ProfileStartMessage):
+                try:
+                    actor.start_profiling(msg.mode, msg.output_dir, msg.interval)
+                except PowerAPIException as exn:
+                    actor.logger.error(actor.name + ' : ' + exn.msg)
+            else:
+                actor.stop_profiling()
+
+        for supervised_actor in self.state.supervisor.supervised_actors:
+            if supervised_actor.is_alive():
+                supervised_actor.send_control(msg)
@@ -55,6 +55,7 @@ class StartHandler(Handler):
 
         if self.state.alive:
             self.state.initialized = True
+            self.state.actor.socket_interface.register()
             self.state.actor.send_control(OKMessage())
 
     def initialization(self):
@@ -92,3 +92,84 @@ class ErrorMessage(Message):
 
     def __str__(self):
         return "ErrorMessage"
+
+
+class StatsRequestMessage(Message):
+    """
+    Message sent on the control canal to ask an actor its runtime statistics,
+    the actor answers with a StatsMessage
+    """
+
+    def __init__(self, timeout=1000):
+        """
+        :param int timeout: time (in ms) given to the actor to collect the
+                            statistics of the actors it supervises
+        """
+        self.timeout = timeout
+
+    def __str__(self):
+        return "StatsRequestMessage"
+
+
+class ProfileStartMessage(Message):
+    """
+    Message sent on the control canal to make actors start profiling
+    themselves, the actor forwards it to the actors it supervises
+    """
+
+    def __init__(self, actor_name=None, mode=None, output_dir=None, interval=None):
+        """
+        :param str actor_name: name (or shell-style pattern) of the actors to
+                               profile, all the actors if None
+        :param str mode: profile mode (cprofile or sampling), default mode if
+                         None
+        :param str output_dir: directory where the profiles are written,
+                               default directory if None
+        :param float interval: time (in s) between two samples (sampling
+                               mode), default interval if None
+        """
+        self.actor_name = actor_name
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = interval
+
+    def __str__(self):
+        return "ProfileStartMessage"
+
+
+class ProfileStopMessage(Message):
+    """
+    Message sent on the control canal to make actors stop profiling and write
+    their profile, the actor forwards it to the actors it supervises
+    """
+
+    def __init__(self, actor_name=None):
+        """
+        :param str actor_name: name (or shell-style pattern) of the actors to
+                               stop profiling, all the actors if None
+        """
+        self.actor_name = actor_name
+
+    def __str__(self):
+        return "ProfileStopMessage"
+
+
+class StatsMessage(Message):
+    """
+    Message that contains the runtime statistics of an actor and of the actors
+    it supervises
+    """
+
+    def __init__(self, actor_name, stats):
+        """
+        :param str actor_name: name of the actor that answers
+        :param list stats: statistics of the actor followed by the statistics
+                           of the actors it supervises, one dict per actor.
+                           The latencies of a handler are measured per batch
+                           of messages handled together, not per message
+        """
+        self.actor_name = actor_name
+        self.stats = stats
+
+    def __str__(self):
+        return "StatsMessage"
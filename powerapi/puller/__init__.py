@@ -28,4 +28,6 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from powerapi.puller.handlers import PullerStartHandler, PullerPoisonPillMessageHandler
-from powerapi.puller.puller_actor import PullerActor, PullerState
+from powerapi.puller.handlers import BLOCK_POLICY, DROP_POLICY, FLOW_CONTROL_POLICIES
+from powerapi.puller.handlers import DEFAULT_PULL_BATCH_SIZE, DEFAULT_PULL_BATCH_TIME, MIN_PULL_BACKOFF
+from powerapi.puller.puller_actor import PullerActor, PullerState, UnknowFlowControlPolicyException
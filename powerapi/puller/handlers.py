@@ -26,30 +26,103 @@
 # CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-import time
 import asyncio
-import logging
+import multiprocessing
 import threading
 from threading import Thread
 
-from powerapi.actor import NotConnectedException
+import zmq
+
+from powerapi.actor import NotConnectedException, NoCreditException, EMBEDDED_RUNTIME, get_embedded_loop
 from powerapi.message import UnknowMessageTypeException, StartMessage, OKMessage, ErrorMessage
 from powerapi.handler import HandlerException
 from powerapi.exception import PowerAPIException
 from powerapi.filter import FilterUselessError
 from powerapi.handler import InitHandler, StartHandler, PoisonPillMessageHandler
-from powerapi.database import DBError, SocketDB
+from powerapi.database import DBError, SocketDB, IterDB
 from powerapi.message import ErrorMessage, PoisonPillMessage
 from powerapi.report.report import DeserializationFail
 from powerapi.report_model.report_model import BadInputData
 
+#: (str): when a dispatcher mailbox is full, wait for free space in it and
+#: stop reading the database
+BLOCK_POLICY = 'block'
+#: (str): when a dispatcher mailbox is full, drop the reports sent to it
+DROP_POLICY = 'drop'
+
+FLOW_CONTROL_POLICIES = (BLOCK_POLICY, DROP_POLICY)
+
+#: (float): time (in s) to wait for free space in a dispatcher mailbox before
+#: checking if the puller is still alive
+CREDIT_TIMEOUT = 0.1
+
+#: (int): maximum number of reports read from the database and sent to the
+#: dispatchers at once
+DEFAULT_PULL_BATCH_SIZE = 100
+#: (int): time (in ms) to wait for more reports once a report was read from a
+#: stream database (as SocketDB), 0 to only take the reports already received
+DEFAULT_PULL_BATCH_TIME = 0
+
+#: (int): time (in ms) to wait before reading again a stream database where no
+#: report was available, doubled after each empty read up to the puller timeout
+MIN_PULL_BACKOFF = 1
+
+#: (float): time (in s) to wait for the thread reading the database to stop
+#: when the puller is killed
+STOP_TIMEOUT = 1
+
+
 class NoReportExtractedException(PowerAPIException):
     """
     Exception raised when the handler can't extract a report from the given
     database
     """
 
+class PullBackoff:
+    """
+    Time to wait before reading again a stream database where no report was
+    available
+
+    The time starts at :data:`MIN_PULL_BACKOFF` ms, doubles after each empty
+    read up to the puller timeout, and is reset once a report is read
+    """
+
+    def __init__(self, max_backoff):
+        """
+        :param int max_backoff: maximum time (in ms) to wait
+        """
+        #: (int): maximum time (in ms) to wait
+        self.max_backoff = max_backoff
+        #: (int): time (in ms) to wait after the next empty read
+        self.backoff = min(MIN_PULL_BACKOFF, max_backoff)
+
+    def reset(self):
+        """
+        Reset the time to wait after a report was read
+        """
+        self.backoff = min(MIN_PULL_BACKOFF, self.max_backoff)
+
+    def next(self):
+        """
+        :return float: time (in s) to wait after an empty read
+        """
+        backoff = self.backoff
+        self.backoff = min(self.backoff * 2, self.max_backoff)
+        return backoff / 1000
+
+
 class DBPullerThread(Thread):
+    """
+    Thread reading the database and sending the reports to the dispatchers
+
+    The thread doesn't handle the messages of the puller : it stops when the
+    database is read, when the puller is killed or when :meth:`stop` is called
+    and its :attr:`sentinel` becomes readable, to wake up the puller waiting
+    for it and for its control messages
+
+    An asynchronous database (like SocketDB) is read by a single coroutine,
+    running on the event loop of the thread until the thread stops
+    """
 
     def __init__(self, state, timeout, handler):
         Thread.__init__(self)
@@ -58,85 +131,312 @@ class DBPullerThread(Thread):
         self.loop = None
         self.handler = handler
 
+        #: (multiprocessing.connection.Connection): readable once the thread
+        #: is terminated
+        self.sentinel, self._sentinel_writer = multiprocessing.Pipe(duplex=False)
+        #: (str): message of the error that stopped the thread, if any
+        self.error = None
+        self._stop_event = threading.Event()
+        self._task = None
+
+    def stop(self):
+        """
+        Stop the thread, without waiting for the database to return a report
+        if it is asynchronous
+        """
+        self._stop_event.set()
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self._cancel_task)
+            except RuntimeError:
+                # the event loop is already closed
+                pass
+
+    def _cancel_task(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def _running(self):
+        return self.state.alive and not self._stop_event.is_set()
+
+    def _run_coroutine(self, coroutine):
+        self._task = self.loop.create_task(coroutine)
+        try:
+            return self.loop.run_until_complete(self._task)
+        finally:
+            self._task = None
+
     def _connect(self):
         try:
-            self.state.database.connect()
-            self.loop.run_until_complete(self.state.database.connect())
+            self._run_coroutine(self.state.database.connect())
             self.state.database_it = self.state.database.iter(self.state.report_model, self.state.stream_mode)
 
         except DBError as error:
-            self.state.actor.send_control(ErrorMessage(error.msg))
-            self.state.alive = False
+            self.error = error.msg
 
     def _pull_database(self):
+        """
+        Read the next batch of reports
+
+        :return list: between one and batch_size reports
+        :raise NoReportExtractedException: if no report can be read
+        """
+        database_it = self.state.database_it
         try:
-            if self.state.asynchrone:
-                report = self.loop.run_until_complete(self.state.database_it.__anext__())
-                if report is not None:
-                    return report
-                else:
-                    raise StopIteration()
-            else:
-                return next(self.state.database_it)
+            if isinstance(database_it, IterDB):
+                return database_it.next_batch(self.state.batch_size, self.state.batch_time / 1000)
+            return [next(database_it)]
 
         except (StopIteration, BadInputData, DeserializationFail):
             raise NoReportExtractedException()
 
-    def _get_dispatchers(self, report):
-        return self.state.report_filter.route(report)
+    async def _apull_database(self):
+        """
+        Read the next batch of reports from an asynchronous database
 
-    def _modify_report(self, report):
-        for report_modifier in self.state.report_modifier_list:
-            report = report_modifier.modify_report(report)
-        return report
+        :return list: between one and batch_size reports
+        :raise NoReportExtractedException: if no report can be read
+        """
+        try:
+            reports = await self.state.database_it.anext_batch(self.state.batch_size, self.state.batch_time / 1000)
+        except (StopIteration, BadInputData, DeserializationFail):
+            raise NoReportExtractedException()
+        if not reports:
+            raise NoReportExtractedException()
+        return reports
 
-    def run(self):
+    def _get_dispatchers(self, reports):
+        return self.state.report_filter.route_many(reports)
+
+    def _send_reports(self, dispatcher, reports):
         """
-        Read data from Database and send it to the dispatchers.
-        If there is no more data, send a kill message to every
-        dispatcher.
-        If stream mode is disable, kill the actor.
+        Send reports to a dispatcher, if the dispatcher mailbox is full, wait
+        for free space in it or drop the reports that can't be sent depending
+        on the flow control policy
 
-        :param None msg: None.
+        :param powerapi.dispatcher.DispatcherActor dispatcher: dispatcher
+        :param list reports: reports to send
         """
-        if self.state.asynchrone:
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            self.state.loop = self.loop
-            self.loop.set_debug(enabled=True)
-            logging.basicConfig(level=logging.DEBUG)
-            self._connect()
+        if self.state.flow_control == DROP_POLICY:
+            try:
+                dispatcher.send_data_many(reports, timeout=0)
+            except NoCreditException as exn:
+                if self.state.dropped_reports == 0:
+                    self.state.actor.logger.warning('mailbox of ' + dispatcher.name + ' is full, drop reports')
+                self.state.dropped_reports += len(reports) - exn.sent
+            return
 
-        while self.state.alive:
+        while self._running():
+            try:
+                dispatcher.send_data_many(reports, timeout=CREDIT_TIMEOUT)
+                return
+            except NoCreditException as exn:
+                reports = reports[exn.sent:]
+
+    def _modify_reports(self, reports):
+        for report_modifier in self.state.report_modifier_list:
+            reports = [report_modifier.modify_report(report) for report in reports]
+        return reports
+
+    def _pull(self):
+        backoff = PullBackoff(self.state.timeout_puller)
+        while self._running():
             try:
-                raw_report = self._pull_database()
-                print(raw_report)
-                report = self._modify_report(raw_report)
-                
-                dispatchers = self._get_dispatchers(report)
-                for dispatcher in dispatchers:
-                    dispatcher.send_data(report)
+                reports = self._modify_reports(self._pull_database())
+                backoff.reset()
+
+                for dispatcher, dispatcher_reports in self._get_dispatchers(reports):
+                    self._send_reports(dispatcher, dispatcher_reports)
 
             except NoReportExtractedException:
-                time.sleep(self.state.timeout_puller/1000)
                 if not self.state.stream_mode:
-                    self.handler.handle_internal_msg(PoisonPillMessage(soft=False))
                     return
+                self._stop_event.wait(backoff.next())
 
             except FilterUselessError:
-                self.handler.handle_internal_msg(PoisonPillMessage(soft=False))
                 return
 
-            except StopIteration:
-                continue
+    async def _apull(self):
+        """
+        Read an asynchronous database until the thread is stopped
 
+        The reports are sent without giving the hand back to the event loop :
+        while a dispatcher mailbox is full, the database doesn't receive new
+        reports
+        """
+        while self._running():
+            try:
+                reports = self._modify_reports(await self._apull_database())
+
+                for dispatcher, dispatcher_reports in self._get_dispatchers(reports):
+                    self._send_reports(dispatcher, dispatcher_reports)
+
+            except NoReportExtractedException:
+                if not self.state.stream_mode:
+                    return
+
+            except FilterUselessError:
+                return
+
+    def run(self):
+        """
+        Read data from Database and send it to the dispatchers until the
+        thread is stopped.
+        If there is no more data and stream mode is disable, stop the thread.
+
+        Reports are read, modified, routed and sent by batches
+
+        :param None msg: None.
+        """
+        try:
+            if self.state.asynchrone:
+                self.loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self.loop)
+                self.state.loop = self.loop
+                self._connect()
+                if self.error is None:
+                    self._run_coroutine(self._apull())
+            else:
+                self._pull()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self.state.asynchrone and self.state.database_it is not None:
+                self.loop.run_until_complete(self.state.database.stop())
+            if self.loop is not None:
+                self.loop.close()
+            self._sentinel_writer.close()
+
+
+class EmbeddedDBPuller:
+    """
+    Read data from the database and send it to the dispatchers from a task of
+    the event loop of the embedded runtime
+
+    Equivalent of the DBPullerThread for a puller with the embedded runtime :
+    asynchronous databases (like SocketDB) are read directly on the event
+    loop, reports are given to the dispatchers without being encoded
+    """
+
+    def __init__(self, state, handler):
+        self.state = state
+        self.handler = handler
+
+    async def _connect(self):
+        try:
+            await self.state.database.connect()
+            self.state.database_it = self.state.database.iter(self.state.report_model, self.state.stream_mode)
+        except DBError as error:
+            self.state.actor.send_control(ErrorMessage(error.msg))
+            self.state.alive = False
+
+    async def _pull_database(self):
+        """
+        Read the next batch of reports
+
+        :return list: between one and batch_size reports
+        :raise NoReportExtractedException: if no report can be read
+        """
+        database_it = self.state.database_it
+        try:
+            if self.state.asynchrone:
+                reports = await database_it.anext_batch(self.state.batch_size, self.state.batch_time / 1000)
+                if not reports:
+                    raise NoReportExtractedException()
+                return reports
+            if isinstance(database_it, IterDB):
+                return database_it.next_batch(self.state.batch_size, self.state.batch_time / 1000)
+            return [next(database_it)]
+
+        except (StopIteration, BadInputData, DeserializationFail):
+            raise NoReportExtractedException()
+
+    def _get_dispatchers(self, reports):
+        return self.state.report_filter.route_many(reports)
+
+    async def _send_reports(self, dispatcher, reports):
+        """
+        Give reports to a dispatcher, if the dispatcher mailbox is full, let
+        the dispatcher handle its reports or drop the reports that don't fit
+        in it depending on the flow control policy
+        """
+        while self.state.alive:
+            try:
+                dispatcher.send_data_many(reports, timeout=0)
+                return
+            except NoCreditException as exn:
+                if self.state.flow_control == DROP_POLICY:
+                    if self.state.dropped_reports == 0:
+                        self.state.actor.logger.warning('mailbox of ' + dispatcher.name + ' is full, drop reports')
+                    self.state.dropped_reports += len(reports) - exn.sent
+                    return
+                reports = reports[exn.sent:]
+                await asyncio.sleep(0)
+
+    def _modify_reports(self, reports):
+        for report_modifier in self.state.report_modifier_list:
+            reports = [report_modifier.modify_report(report) for report in reports]
+        return reports
+
+    def _stop(self):
+        self.handler.handle_internal_msg(PoisonPillMessage(soft=False))
+        self.state.actor.socket_interface.wake()
+
+    async def run(self):
+        """
+        Read data from the database and send it to the dispatchers until the
+        puller is killed. If there is no more data and stream mode is
+        disabled, kill the puller
+        """
+        if self.state.asynchrone:
+            await self._connect()
+
+        backoff = PullBackoff(self.state.timeout_puller)
+        try:
+            while self.state.alive:
+                try:
+                    reports = self._modify_reports(await self._pull_database())
+                    backoff.reset()
+                    for dispatcher, dispatcher_reports in self._get_dispatchers(reports):
+                        await self._send_reports(dispatcher, dispatcher_reports)
+                    # let the other actors handle the sent reports
+                    await asyncio.sleep(0)
+
+                except NoReportExtractedException:
+                    if not self.state.stream_mode:
+                        self._stop()
+                        return
+                    # an asynchronous database already waited for reports
+                    await asyncio.sleep(0 if self.state.asynchrone else backoff.next())
+
+                except FilterUselessError:
+                    self._stop()
+                    return
+        finally:
+            if self.state.asynchrone and self.state.database_it is not None:
+                await self.state.database.stop()
 
 
 class PullerPoisonPillMessageHandler(PoisonPillMessageHandler):
     def teardown(self, soft=False):
+        # stop the thread reading the database before closing the sockets it
+        # uses, unless the puller is killed by this thread
+        thread = self.state.puller_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.stop()
+            thread.join(STOP_TIMEOUT)
+            if thread.is_alive():
+                self.state.actor.logger.warning('the thread reading the database is still running')
+
         for _, dispatcher in self.state.report_filter.filters:
             dispatcher.socket_interface.close()
 
+        # stop the task reading the database (embedded runtime), unless the
+        # puller is killed by this task
+        task = self.state.puller_task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
 class InitiatizationException(Exception):
 
     def __init__(self, msg):
@@ -188,6 +488,7 @@ class PullerStartHandler(StartHandler):
 
         if self.state.alive:
             self.state.initialized = True
+            self.state.actor.socket_interface.register()
             self.state.actor.send_control(OKMessage())
 
         self.pull_db()
@@ -196,18 +497,41 @@ class PullerStartHandler(StartHandler):
         """
         Initialize the database and connect all dispatcher to the
         socket_interface
+
+        With the embedded runtime, the database is read by a task of the event
+        loop and the method returns immediately. Otherwise the database is
+        read by a thread, and the puller waits for its control messages and
+        for the end of the thread at the same time
         """
-        # db_puller_thread = DBPullerThread(self.state, self.timeout, loop=asyncio.get_event_loop())
+        if self.state.actor.runtime == EMBEDDED_RUNTIME:
+            self.state.puller_task = get_embedded_loop().create_task(EmbeddedDBPuller(self.state, self).run())
+            return
+
         db_puller_thread = DBPullerThread(self.state, self.timeout, self)
+        self.state.puller_thread = db_puller_thread
         db_puller_thread.start()
-        # while db_puller_thread.is_alive() and self.state.alive:
-        while self.state.alive:
-            time.sleep(0.4)
-            msg = self.state.actor.receive_control(0.1)
-            if msg is not None:
-                self.handle_internal_msg(msg)
 
-        # self.handle_internal_msg(PoisonPillMessage(soft=False))
+        poller = zmq.Poller()
+        poller.register(self.state.actor.socket_interface.control_socket, zmq.POLLIN)
+        poller.register(db_puller_thread.sentinel, zmq.POLLIN)
+        while self.state.alive:
+            events = dict(poller.poll())
+            if self.state.actor.socket_interface.control_socket in events:
+                msg = self.state.actor.receive_control(0)
+                if msg is not None:
+                    self.handle_internal_msg(msg)
+            elif events:
+                self._puller_thread_terminated(db_puller_thread)
+
+    def _puller_thread_terminated(self, db_puller_thread):
+        """
+        Kill the puller once the thread reading the database is terminated
+        """
+        if db_puller_thread.error is not None:
+            self.state.actor.send_control(ErrorMessage(db_puller_thread.error))
+            self.state.alive = False
+            return
+        self.handle_internal_msg(PoisonPillMessage(soft=False))
 
     def _database_connection(self):
         try:
@@ -28,11 +28,12 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import logging
-from powerapi.actor import Actor, State
+from powerapi.actor import Actor, State, DEFAULT_CODEC, DEFAULT_TRANSPORT
 from powerapi.exception import PowerAPIException
 from powerapi.message import PoisonPillMessage, StartMessage
 from powerapi.puller import PullerPoisonPillMessageHandler
 from powerapi.puller import PullerStartHandler
+from powerapi.puller import BLOCK_POLICY, FLOW_CONTROL_POLICIES, DEFAULT_PULL_BATCH_SIZE, DEFAULT_PULL_BATCH_TIME
 from powerapi.actor import NotConnectedException
 
 
@@ -43,6 +44,16 @@ class NoReportExtractedException(PowerAPIException):
     """
 
 
+class UnknowFlowControlPolicyException(PowerAPIException):
+    """
+    Exception raised when attempting to create a puller with a flow control
+    policy that doesn't exist
+    """
+    def __init__(self, policy):
+        PowerAPIException.__init__(self, 'unknow flow control policy ' + policy)
+        self.policy = policy
+
+
 class PullerState(State):
     """
     Puller Actor State
@@ -51,10 +62,17 @@ class PullerState(State):
       - the database interface
       - the Filter class
     """
-    def __init__(self, actor, database, report_filter, report_model, stream_mode, timeout_puller, report_modifier_list=[], asynchrone=False):
+    def __init__(self, actor, database, report_filter, report_model, stream_mode, timeout_puller, report_modifier_list=[], asynchrone=False,
+                 flow_control=BLOCK_POLICY, batch_size=DEFAULT_PULL_BATCH_SIZE, batch_time=DEFAULT_PULL_BATCH_TIME):
         """
         :param BaseDB database: Allow to interact with a Database
         :param Filter report_filter: Filter of the Puller
+        :param str flow_control: behaviour of the puller when a dispatcher
+                                 mailbox is full (block or drop)
+        :param int batch_size: maximum number of reports read from the
+                               database and sent to the dispatchers at once
+        :param int batch_time: time (in ms) to wait for more reports once a
+                               report was read from a stream database
         """
         super().__init__(actor)
 
@@ -86,6 +104,40 @@ class PullerState(State):
 
         self.report_modifier_list = report_modifier_list
 
+        #: (str): behaviour of the puller when a dispatcher mailbox is full
+        self.flow_control = flow_control
+
+        #: (int): number of reports dropped because a dispatcher mailbox was
+        #: full
+        self.dropped_reports = 0
+
+        #: (asyncio.Task): task reading the database (embedded runtime only)
+        self.puller_task = None
+
+        #: (DBPullerThread): thread reading the database (process and thread
+        #: runtimes only)
+        self.puller_thread = None
+
+        #: (int): maximum number of reports read from the database and sent
+        #: to the dispatchers at once
+        self.batch_size = batch_size
+
+        #: (int): time (in ms) to wait for more reports once a report was read
+        #: from a stream database
+        self.batch_time = batch_time
+
+    def get_flow_control_metrics(self):
+        """
+        :return dict: number of dropped reports and the current credits and
+                      queue depth of each dispatcher with a bounded mailbox
+        """
+        metrics = {'dropped_reports': self.dropped_reports}
+        for _, dispatcher in self.report_filter.filters:
+            dispatcher_metrics = dispatcher.socket_interface.get_flow_control_metrics()
+            if dispatcher_metrics:
+                metrics[dispatcher.name] = dispatcher_metrics
+        return metrics
+
 
 class PullerActor(Actor):
     """
@@ -96,7 +148,9 @@ class PullerActor(Actor):
     """
 
     def __init__(self, name, database, report_filter, report_model, stream_mode=False, report_modifier_list=[], level_logger=logging.WARNING,
-                 timeout=0, timeout_puller=100):
+                 timeout=0, timeout_puller=100, codec=DEFAULT_CODEC,
+                 transport=DEFAULT_TRANSPORT, flow_control=BLOCK_POLICY, batch_size=DEFAULT_PULL_BATCH_SIZE,
+                 batch_time=DEFAULT_PULL_BATCH_TIME):
         """
         :param str name: Actor name.
         :param BaseDB database: Allow to interact with a Database.
@@ -104,11 +158,25 @@ class PullerActor(Actor):
         :param int level_logger: Define the level of the logger
         :param int tiemout_puller: (require stream mode) time (in ms) between two database reading
         :param bool asynchrone: use asynchrone driver
+        :param str codec: name of the codec used to encode messages sent to the puller
+        :param str transport: transport used by the puller sockets
+        :param str flow_control: behaviour of the puller when a dispatcher
+                                 mailbox is full : wait for free space in it
+                                 and stop reading the database (block) or
+                                 drop the reports sent to it (drop)
+        :param int batch_size: maximum number of reports read from the
+                               database and sent to the dispatchers at once
+        :param int batch_time: time (in ms) to wait for more reports once a
+                               report was read from a stream database
         """
+        if flow_control not in FLOW_CONTROL_POLICIES:
+            raise UnknowFlowControlPolicyException(flow_control)
 
-        Actor.__init__(self, name, level_logger, timeout)
+        Actor.__init__(self, name, level_logger, timeout, codec, transport)
         #: (State): Actor State.
-        self.state = PullerState(self, database, report_filter, report_model, stream_mode, timeout_puller, report_modifier_list=report_modifier_list, asynchrone=database.asynchrone)
+        self.state = PullerState(self, database, report_filter, report_model, stream_mode, timeout_puller,
+                                 report_modifier_list=report_modifier_list, asynchrone=database.asynchrone,
+                                 flow_control=flow_control, batch_size=batch_size, batch_time=batch_time)
 
         self.low_exception += database.exceptions
 
@@ -119,3 +187,13 @@ class PullerActor(Actor):
         """
         self.add_handler(PoisonPillMessage, PullerPoisonPillMessageHandler(self.state))
         self.add_handler(StartMessage, PullerStartHandler(self.state, 0.1))
+
+    def get_stats(self):
+        """
+        Add the flow control metrics of the puller to the actor statistics
+
+        :return dict: statistics of the puller
+        """
+        stats = Actor.get_stats(self)
+        stats['flow_control'] = self.state.get_flow_control_metrics()
+        return stats
@@ -81,11 +81,25 @@ class ReportHandler(InitHandler):
         :param powerapi.PowerReport msg: PowerReport to save.
         """
         self.state.buffer.append(msg)
+        self._save_buffer()
+
+    def handle_batch(self, msgs):
+        """
+        Save the received msgs in the database
+
+        :param list msgs: PowerReports to save.
+        """
+        if not self.state.initialized:
+            return
+        self.state.buffer += msgs
+        self._save_buffer()
+
+    def _save_buffer(self):
         if (time.time() - self.last_database_write_time > self.delay) or (len(self.state.buffer) > self.max_size):
             self.last_database_write_time = time.time()
 
             self.state.buffer.sort(key=lambda x: x.timestamp)
 
             self.state.database.save_many(self.state.buffer, self.state.report_model)
-            self.state.actor.logger.debug('save ' + str(len(self.state.buffer)) + ' reports in database')
+            self.state.actor.logger.debug('save %d reports in database', len(self.state.buffer))
             self.state.buffer = []
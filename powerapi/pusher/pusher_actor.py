@@ -28,7 +28,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import logging
-from powerapi.actor import Actor, State, SocketInterface
+from powerapi.actor import Actor, State, SocketInterface, DEFAULT_CODEC, DEFAULT_TRANSPORT
 from powerapi.pusher import ReportHandler, PusherStartHandler, PusherPoisonPillMessageHandler
 from powerapi.message import PoisonPillMessage, StartMessage
 
@@ -62,7 +62,8 @@ class PusherActor(Actor):
     The Pusher allow to save Report sent by Formula.
     """
 
-    def __init__(self, name, report_model, database, level_logger=logging.WARNING, timeout=1000, delay=100, max_size=50):
+    def __init__(self, name, report_model, database, level_logger=logging.WARNING, timeout=1000, delay=100, max_size=50,
+                 codec=DEFAULT_CODEC, transport=DEFAULT_TRANSPORT, mailbox_size=0):
         """
         :param str name: Pusher name.
         :param Report report_model: ReportModel
@@ -70,8 +71,12 @@ class PusherActor(Actor):
         :param int level_logger: Define the level of the logger
         :param int delay: number of ms before message containing in the buffer will be writen in database
         :param int max_size: maximum of message that the buffer can store before write them in database
+        :param str codec: name of the codec used to encode messages sent to the pusher
+        :param str transport: transport used by the pusher sockets
+        :param int mailbox_size: maximum number of reports waiting to be saved
+                                 (0 for an unbounded mailbox)
         """
-        Actor.__init__(self, name, level_logger, timeout)
+        Actor.__init__(self, name, level_logger, timeout, codec, transport, mailbox_size=mailbox_size)
 
         #: (State): State of the actor.
         self.state = PusherState(self, database, report_model)
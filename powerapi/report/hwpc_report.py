@@ -63,6 +63,8 @@ class HWPCReport(Report):
         }
     """
 
+    routing_fields = Report.routing_fields + ('sockets',)
+
     def __init__(self, timestamp: datetime, sensor: str, target: str, groups: Dict[str, Dict]):
         """
         Initialize an HWPC report using the given parameters.
@@ -76,6 +78,25 @@ class HWPCReport(Report):
         #: (dict): Events groups
         self.groups = groups
 
+    @property
+    def sockets(self) -> Dict:
+        """
+        Socket and core ids of the non shared group of the report. A shared
+        group is a group that contains events that are shared between
+        multiple cores (like RAPL or PCU), the non shared group is the group
+        with the biggest number of cores per socket
+
+        :return: list of the core ids, by socket id
+        """
+        biggest_group = {}
+        maximum_number_of_core = -1
+        for group in self.groups.values():
+            number_of_core = len(next(iter(group.values()), ()))
+            if number_of_core > maximum_number_of_core:
+                maximum_number_of_core = number_of_core
+                biggest_group = group
+        return {socket_id: list(cores) for socket_id, cores in biggest_group.items()}
+
     def __repr__(self) -> str:
         return 'HWCPReport(%s, %s, %s, %s)' % (self.timestamp, self.sensor, self.target, sorted(self.groups.keys()))
 
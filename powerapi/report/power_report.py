@@ -40,6 +40,8 @@ class PowerReport(Report):
     PowerReport stores the power estimation information.
     """
 
+    routing_fields = Report.routing_fields + ('socket', 'core')
+
     def __init__(self, timestamp: datetime, sensor: str, target: str, socket: int, power: float, metadata: Dict[str, Any], core: int = -1):
         """
         Initialize a Power report using the given parameters.
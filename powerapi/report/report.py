@@ -47,6 +47,10 @@ class Report(Message):
     Report abtract class.
     """
 
+    #: (tuple): name of the attributes sent in the header of a routing
+    #:          envelope, that can be read without decoding the report
+    routing_fields = ('timestamp', 'sensor', 'target')
+
     def __init__(self, timestamp: datetime, sensor: str, target: str):
         """
         Initialize a report using the given parameters.
@@ -27,10 +27,16 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 import json
+import struct
 import time
 from threading import Thread
 from socket import socket
 
+from powerapi.database.binary_protocol import BINARY_PROTOCOL_HEADER, STRING_FRAME, LAYOUT_FRAME, REPORT_FRAME
+from powerapi.database.binary_protocol import FRAME_TYPE, STRING_HEADER, LAYOUT_HEADER, NUMBER_OF_CPUS, REPORT_HEADER
+from powerapi.database.binary_protocol import LAYOUT_ID
+from powerapi.utils import LENGTH_PREFIX
+
 
 class ClientThread(Thread):
     """
@@ -74,3 +80,87 @@ class ClientThreadDelay(Thread):
         for msg in self.msg_list[midle:]:
             self.socket.send(bytes(json.dumps(msg), 'utf-8'))
         self.socket.close()
+
+
+class BinaryReportEncoder:
+    """
+    Encode hwpc reports with the binary protocol of the SocketDB
+
+    The names and layouts used by a report are encoded with it the first time
+    they are used. The cpus of a group that don't have the same events are
+    sent in different layouts
+    """
+
+    def __init__(self):
+        self.strings = {}
+        self.layouts = {}
+
+    @staticmethod
+    def _frame(frame_type, payload):
+        return LENGTH_PREFIX.pack(len(payload) + FRAME_TYPE.size) + FRAME_TYPE.pack(frame_type) + payload
+
+    def _string_id(self, string, frames):
+        if string not in self.strings:
+            self.strings[string] = len(self.strings)
+            frames.append(self._frame(STRING_FRAME, STRING_HEADER.pack(self.strings[string]) + string.encode('utf-8')))
+        return self.strings[string]
+
+    def _layout_id(self, group_name, events, cpus, frames):
+        key = (group_name, events, cpus)
+        if key not in self.layouts:
+            self.layouts[key] = len(self.layouts)
+            event_ids = [self._string_id(event, frames) for event in events]
+            payload = LAYOUT_HEADER.pack(self.layouts[key], self._string_id(group_name, frames), len(events))
+            payload += struct.pack('!%dH' % len(events), *event_ids)
+            payload += NUMBER_OF_CPUS.pack(len(cpus))
+            payload += struct.pack('!%dH' % (2 * len(cpus)), *[int(cpu_id) for cpu in cpus for cpu_id in cpu])
+            frames.append(self._frame(LAYOUT_FRAME, payload))
+        return self.layouts[key]
+
+    def encode(self, report):
+        """
+        :param HWPCReport report: report to encode
+        :return bytes: the frames of the report, preceded by the frames
+                       defining its new names and layouts
+        """
+        frames = []
+        sensor_id = self._string_id(report.sensor, frames)
+        target_id = self._string_id(report.target, frames)
+
+        layouts = []
+        for group_name, group in report.groups.items():
+            cpus_by_events = {}
+            for socket_id, socket in group.items():
+                for core_id, events in socket.items():
+                    cpus_by_events.setdefault(tuple(events), []).append((socket_id, core_id))
+            for events, cpus in cpus_by_events.items():
+                values = [group[socket_id][core_id][event] for socket_id, core_id in cpus for event in events]
+                layout_id = self._layout_id(group_name, events, tuple(cpus), frames)
+                layouts.append(LAYOUT_ID.pack(layout_id) + struct.pack('!%dQ' % len(values), *values))
+
+        timestamp = round(report.timestamp.timestamp() * 1000)
+        frames.append(self._frame(REPORT_FRAME, REPORT_HEADER.pack(timestamp, sensor_id, target_id, len(layouts))
+                                  + b''.join(layouts)))
+        return b''.join(frames)
+
+
+class BinaryClientThread(Thread):
+    """
+    Thread that open a connection to a socket and send it a list of hwpc
+    reports with the binary protocol
+    """
+
+    def __init__(self, report_list, port):
+        Thread.__init__(self)
+
+        self.report_list = report_list
+        self.socket = socket()
+        self.port = port
+
+    def run(self):
+        encoder = BinaryReportEncoder()
+        self.socket.connect(('localhost', self.port))
+        self.socket.sendall(BINARY_PROTOCOL_HEADER)
+        for report in self.report_list:
+            self.socket.sendall(encoder.encode(report))
+        self.socket.close()
@@ -27,7 +27,8 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 import json
-from typing import Dict
+import datetime
+from typing import Dict, List
 
 from powerapi.report import HWPCReport, create_socket_report, create_report_root, create_group_report, create_core_report
 import powerapi.test_utils.report as parent_module
@@ -121,3 +122,20 @@ def gen_hwpc_report():
     groupb = create_group_report('2', [socketc, socketd])
 
     return create_report_root([groupa, groupb])
+
+
+def gen_hwpc_reports(number_of_reports: int, number_of_sockets=2, number_of_cores=32,
+                     events=('RAPL_ENERGY_PKG', 'CPU_CLK_THREAD_UNHALTED:REF_P', 'INSTRUCTIONS_RETIRED', 'LLC_MISSES')) -> List[HWPCReport]:
+    """
+    Generate number_of_reports HWPCReport, with one group containing the given events for each core of each socket
+    Reports have a timestamp incremented by one second and are sent by the same sensor on the same target
+    """
+    reports = []
+    for i in range(number_of_reports):
+        sockets = [create_socket_report(socket_id, [create_core_report(core_id, None, None, events={event: i * 1000 + core_id
+                                                                                                   for event in events})
+                                                    for core_id in range(number_of_cores)])
+                   for socket_id in range(number_of_sockets)]
+        timestamp = datetime.datetime.fromtimestamp(0) + datetime.timedelta(seconds=i)
+        reports.append(create_report_root([create_group_report('group', sockets)], timestamp=timestamp, sensor='sensor', target='all'))
+    return reports
@@ -30,4 +30,7 @@
 from powerapi.utils.utils import *
 from powerapi.utils.tree import Tree
 from powerapi.utils.stat_buffer import StatBuffer
-from .json_stream import JsonStream
+from powerapi.utils.hash_ring import HashRing
+from powerapi.utils.hot_logger import HotPathLogger
+from .json_stream import JsonStream, UnknowFramingException, BRACE_FRAMING, NEWLINE_FRAMING
+from .json_stream import LENGTH_PREFIXED_FRAMING, FRAMINGS, LENGTH_PREFIX
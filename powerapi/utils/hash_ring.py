@@ -0,0 +1,96 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import bisect
+import hashlib
+
+
+class HashRing:
+    """
+    Consistent hashing ring that map keys to a fixed set of nodes
+
+    Each node is placed several times on the ring (virtual nodes), a key is
+    mapped to the first node following its hash on the ring. Adding or removing
+    a node only remaps the keys of this node
+    """
+
+    def __init__(self, nodes=(), replicas=100):
+        """
+        :param nodes: nodes to place on the ring
+        :param int replicas: number of virtual nodes per node
+        """
+        #: (int): number of virtual nodes per node
+        self.replicas = replicas
+        #: (list): sorted hashes of the virtual nodes
+        self._hashes = []
+        #: (dict): virtual node hash -> node
+        self._nodes = {}
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(key):
+        # python hash is salted per process, use a stable hash instead
+        return int.from_bytes(hashlib.md5(str(key).encode()).digest()[:8], 'big')
+
+    def add_node(self, node):
+        """
+        Place a node on the ring
+
+        :param node: node to add, its string representation must be unique
+        """
+        for replica in range(self.replicas):
+            virtual_hash = self._hash(str(node) + '#' + str(replica))
+            self._nodes[virtual_hash] = node
+            bisect.insort(self._hashes, virtual_hash)
+
+    def remove_node(self, node):
+        """
+        Remove a node from the ring
+
+        :param node: node to remove
+        """
+        for replica in range(self.replicas):
+            virtual_hash = self._hash(str(node) + '#' + str(replica))
+            del self._nodes[virtual_hash]
+            self._hashes.remove(virtual_hash)
+
+    def get_node(self, key):
+        """
+        :param key: key to map
+        :return: the node mapped to the given key
+        :raise ValueError: if the ring is empty
+        """
+        if not self._hashes:
+            raise ValueError('empty hash ring')
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._nodes[self._hashes[index]]
+
+    def __len__(self):
+        return len(self._hashes) // self.replicas
@@ -0,0 +1,98 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Logging facility for the code executed for each message
+"""
+import logging
+import os
+
+#: (bool): if True, messages are never logged by the hot path loggers, set
+#: with the POWERAPI_QUIET environment variable. Running python with the -O
+#: option also removes the hot path logging code guarded by __debug__ when
+#: the modules are compiled
+QUIET = os.environ.get('POWERAPI_QUIET', '') not in ('', '0')
+
+#: (int): by default, one message out of DEFAULT_SAMPLE_RATE is logged, set
+#: with the POWERAPI_LOG_SAMPLE_RATE environment variable
+DEFAULT_SAMPLE_RATE = max(1, int(os.environ.get('POWERAPI_LOG_SAMPLE_RATE', '1')))
+
+
+class HotPathLogger:
+    """
+    Debug logger for the hot paths of the actors (message sending and
+    reception)
+
+    Messages are formatted lazily, only when they are logged, and only one
+    message out of sample_rate is logged. The level of the wrapped logger is
+    checked when the hot path logger is created or refreshed, not for each
+    message
+
+    Calls should be guarded by __debug__ to be removed when python runs with
+    the -O option::
+
+        if __debug__:
+            self.hot_logger.debug('send data [%s] to %s', msg, self.name)
+    """
+
+    def __init__(self, logger, sample_rate=DEFAULT_SAMPLE_RATE):
+        """
+        :param logging.Logger logger: logger used to log the messages
+        :param int sample_rate: log one message out of sample_rate
+        """
+        #: (logging.Logger): wrapped logger
+        self.logger = logger
+        #: (int): one message out of sample_rate is logged
+        self.sample_rate = sample_rate
+        #: (bool): True if the debug messages are logged
+        self.enabled = False
+        self._count = 0
+        self.refresh()
+
+    def refresh(self):
+        """
+        Check again the level of the wrapped logger, must be called when this
+        level changes
+        """
+        self.enabled = not QUIET and self.logger.isEnabledFor(logging.DEBUG)
+
+    def debug(self, msg, *args):
+        """
+        Log a debug message, formatted with args (% style) only if it is
+        logged
+
+        :param str msg: message format
+        :param args: arguments of the message
+        """
+        if not self.enabled:
+            return
+        self._count += 1
+        if self._count >= self.sample_rate:
+            self._count = 0
+            self.logger.debug(msg, *args)
@@ -26,76 +26,190 @@
 # CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-import asyncio
+import re
+import struct
 
+from powerapi.exception import PowerAPIException
 
-DEFAULT_BUFFER_SIZE = 4096
 
+DEFAULT_BUFFER_SIZE = 65536
+
+#: (str): json objects are sent one after the other, each object ends with its
+#: closing brace
+BRACE_FRAMING = 'brace'
+#: (str): each json object is sent on its own line
+NEWLINE_FRAMING = 'newline'
+#: (str): each json object is preceded by its size in bytes, as a big endian
+#: unsigned 32 bits integer
+LENGTH_PREFIXED_FRAMING = 'length'
+
+FRAMINGS = (BRACE_FRAMING, NEWLINE_FRAMING, LENGTH_PREFIXED_FRAMING)
+
+#: (struct.Struct): size of a json object sent with the length prefixed framing
+LENGTH_PREFIX = struct.Struct('>I')
+
+# bytes of a json object until its next brace, braces inside strings
+# (with escaped quotes) included. Stops on the quote of an incomplete string
+_UNTIL_BRACE = re.compile(rb'(?:[^{}"]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+
+
+class UnknowFramingException(PowerAPIException):
+    """
+    Exception raised when a JsonStream is created with an unknown framing
+    """
+
+    def __init__(self, framing):
+        PowerAPIException.__init__(self, 'unknown json framing : ' + str(framing))
+        #: (str): the unknown framing
+        self.framing = framing
 
 
 class JsonStream:
 
     """read data received from a input utf-8 byte stream socket as a json stream
 
+    The received bytes are kept in a single buffer and the position of the end
+    of the current json object is searched incrementally : bytes already
+    scanned are not scanned again when more bytes are received. Braces inside
+    json strings are ignored
+
     :param stream_reader:
-    :param buffer_size: size of the buffer used to receive data from the socket,
-                        it must match the average size of received json string
-                        (default 4096 bytes)
+    :param buffer_size: maximum number of bytes read from the socket at once
+                        (default 65536 bytes)
+    :param framing: how json objects are delimited in the stream (brace,
+                    newline or length)
+    :param data: bytes of the stream already read from the socket
     """
 
-    def __init__(self, stream_reader, buffer_size=DEFAULT_BUFFER_SIZE):
+    def __init__(self, stream_reader, buffer_size=DEFAULT_BUFFER_SIZE, framing=BRACE_FRAMING, data=b''):
+        if framing not in FRAMINGS:
+            raise UnknowFramingException(framing)
         self.stream_reader = stream_reader
-        self.json_buffer = b''
+        self.json_buffer = bytearray(data)
         self.buffer_size = buffer_size
+        self.framing = framing
 
-    def _extract_json_end_position(self):
-        i = self.json_buffer.find(b'{') + 1
-        open_brackets = 1
+        # position of the first byte of the buffer that wasn't returned
+        self._start = 0
+        # position of the first byte of the buffer that wasn't scanned
+        self._scan_position = 0
+        # number of open braces of the current json object at _scan_position
+        self._depth = 0
+        # number of bytes of the current json object (length prefixed framing)
+        self._length = None
 
-        while open_brackets != 0:
-            if i >= len(self.json_buffer):
+    def _extract_json_end_position(self):
+        """
+        :return int: position of the end of the current json object, -1 if it
+                     wasn't received entirely
+        """
+        if self.framing == NEWLINE_FRAMING:
+            return self._extract_line_end_position()
+        if self.framing == LENGTH_PREFIXED_FRAMING:
+            return self._extract_frame_end_position()
+
+        buffer = self.json_buffer
+        position = self._scan_position
+        depth = self._depth
+        while True:
+            if depth == 0:
+                # skip what is sent between two json objects
+                position = buffer.find(b'{', position)
+                if position == -1:
+                    self._start = self._scan_position = len(buffer)
+                    return -1
+                self._start = position
+                position += 1
+                depth = 1
+
+            position = _UNTIL_BRACE.match(buffer, position).end()
+            if position == len(buffer) or buffer[position] == 0x22:  # "
+                # an incomplete string is scanned again once more bytes are
+                # received
+                self._scan_position, self._depth = position, depth
                 return -1
 
-            if self.json_buffer[i] == b'}'[0]:
-                open_brackets -= 1
-            elif self.json_buffer[i] == b'{'[0]:
-                open_brackets += 1
-            i += 1
-        return i
+            depth = depth + 1 if buffer[position] == 0x7b else depth - 1  # {
+            position += 1
+            if depth == 0:
+                self._scan_position, self._depth = position, 0
+                return position
+
+    def _extract_line_end_position(self):
+        while True:
+            end = self.json_buffer.find(b'\n', self._scan_position)
+            if end == -1:
+                self._scan_position = len(self.json_buffer)
+                return -1
+            if self.json_buffer[self._start:end].strip():
+                self._scan_position = end + 1
+                return end
+            # skip empty lines
+            self._start = self._scan_position = end + 1
+
+    def _extract_frame_end_position(self):
+        if self._length is None:
+            if len(self.json_buffer) - self._start < LENGTH_PREFIX.size:
+                return -1
+            self._length, = LENGTH_PREFIX.unpack_from(self.json_buffer, self._start)
+            self._start += LENGTH_PREFIX.size
+        end = self._start + self._length
+        if end > len(self.json_buffer):
+            return -1
+        self._length = None
+        self._scan_position = end
+        return end
 
     def _extract_json(self):
         i = self._extract_json_end_position()
         if i > 0:
-            json_str = self.json_buffer[:i]
-            self.json_buffer = self.json_buffer[i:]
-            return json_str.decode('utf-8')
+            json_str = self.json_buffer[self._start:i].decode('utf-8')
+            self._start = self._scan_position
+            return json_str
         else:
             return None
 
+    def _missing_bytes(self):
+        """
+        :return int: number of bytes to read to receive the current json
+                     object entirely, if known
+        """
+        if self._length is None:
+            return 0
+        return self._start + self._length - len(self.json_buffer)
+
     async def _get_bytes(self):
-        data = await self.stream_reader.read(n=self.buffer_size)
+        data = await self.stream_reader.read(n=max(self.buffer_size, self._missing_bytes()))
         return b'' if data is None else data
 
-    async def _extract_big_json(self):
-        stream_len = len(self.json_buffer)
-        self.json_buffer += await self._get_bytes()
+    async def _receive(self):
+        """
+        Append the received bytes to the buffer, after removing the bytes of
+        the returned json objects
 
-        if len(self.json_buffer) > stream_len:
-            json_str = self._extract_json()
-            if json_str is None:
-                return await self._extract_big_json()
-            else:
-                return json_str
-        else:
-            return None
+        :return bool: False if no bytes were received
+        """
+        data = await self._get_bytes()
+        if not data:
+            return False
+        if self._start > 0:
+            del self.json_buffer[:self._start]
+            self._scan_position -= self._start
+            self._start = 0
+        self.json_buffer += data
+        return True
 
     async def read_json_object(self):
         """
         return the first json object received from the connection as a string
+
+        :return str: the json object, None if the connection was closed (or
+                     the stream reader returned no data) before a whole json
+                     object was received
         """
-        self.json_buffer += await self._get_bytes()
         json_str = self._extract_json()
-        if json_str is None:
-            return await self._extract_big_json()
-        else:
-            return json_str
+        while json_str is None:
+            if not await self._receive():
+                return None
+            json_str = self._extract_json()
+        return json_str
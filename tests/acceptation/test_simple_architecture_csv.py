@@ -41,7 +41,8 @@ csv files contains 4 HWPC reports
 
 
 Scenario:
-  - Launch the full architecture
+  - Launch the full architecture, with each actor in its own process or with
+    all the actors embedded in the test process
 
 Test if:
   - each HWPCReport in the intput database was converted in one PowerReport per
@@ -52,6 +53,7 @@ import logging
 import pytest
 
 from powerapi.cli.tools import CommonCLIParser, PusherGenerator, PullerGenerator
+from powerapi.actor import PROCESS_RUNTIME, EMBEDDED_RUNTIME
 from powerapi.backendsupervisor import BackendSupervisor
 from powerapi.formula import DummyFormulaActor
 from powerapi.dispatch_rule import HWPCDispatchRule, HWPCDepthLevel
@@ -128,10 +130,12 @@ def check_output_file():
         assert int(output_line[3]) == 42
 
 
-def test_run(files, supervisor):
+@pytest.mark.parametrize('runtime', [PROCESS_RUNTIME, EMBEDDED_RUNTIME])
+def test_run(files, supervisor, runtime):
 
     config = {'verbose': LOG_LEVEL,
               'stream': False,
+              'runtime': runtime,
               'input': {'puller' : {'type': 'csv',
                                     'files': FILES,
                                     'model': 'HWPCReport',
@@ -153,7 +157,7 @@ def test_run(files, supervisor):
                               HWPCDispatchRule(getattr(HWPCDepthLevel, 'SOCKET'), primary=True))
 
     dispatcher = DispatcherActor('dispatcher', formula_factory, route_table,
-                                 level_logger=LOG_LEVEL)
+                                 level_logger=LOG_LEVEL, runtime=config['runtime'])
 
     # Puller
     report_filter = Filter()
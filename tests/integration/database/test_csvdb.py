@@ -208,6 +208,21 @@ class TestCsvDB():
             next(csvdb_iter)
         assert pytest_wrapped.type == StopIteration
 
+    def test_csvdb_next_batch(self, csvdb):
+        """
+        Read the two full HWPCReport in a batch, then raise StopIteration
+        """
+        csvdb.add_files(BASIC_FILES)
+        csvdb.connect()
+
+        csvdb_iter = csvdb.iter(HWPCModel(), False)
+        reports = csvdb_iter.next_batch(5)
+        assert len(reports) == 2
+        assert reports[0].timestamp < reports[1].timestamp
+
+        with pytest.raises(StopIteration):
+            csvdb_iter.next_batch(5)
+
     def test_csvdb_first_primary_missing(self, csvdb):
         """
         Create one full HWPCReport (the second), then return None
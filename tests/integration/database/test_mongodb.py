@@ -34,7 +34,7 @@ import pytest
 from powerapi.report_model import HWPCModel, PowerModel
 from powerapi.report import PowerReport, HWPCReport
 from powerapi.report import create_socket_report, create_report_root, create_group_report, create_core_report
-from powerapi.database import MongoDB, MongoBadDBError
+from powerapi.database import MongoDB, MongoBadDBError, MONGO_OWNER_FIELD
 
 from tests.mongo_utils import gen_base_test_unit_mongo
 from tests.mongo_utils import clean_base_test_unit_mongo
@@ -164,6 +164,47 @@ def test_mongodb_read_capped_db(database):
     assert pytest_wrapped.type == StopIteration
 
 
+def test_mongodb_next_batch_in_stream_mode_remove_the_read_reports(database):
+    """
+    Test read mongodb collection by batches in stream mode
+    """
+    mongodb = MongoDB(URI, "test_mongodb", "test_mongodb1")
+    mongodb.connect()
+    mongodb_iter = mongodb.iter(HWPCModel(), True)
+
+    assert len(mongodb_iter.next_batch(4)) == 4
+    assert mongodb.collection.count_documents({}) == 6
+    assert len(mongodb_iter.next_batch(10)) == 6
+    assert mongodb.collection.count_documents({}) == 0
+
+    with pytest.raises(StopIteration):
+        mongodb_iter.next_batch(10)
+
+
+def test_two_mongodb_readers_in_stream_mode_read_each_report_once(database):
+    """
+    Read the same mongodb collection by batches with two readers in stream
+    mode, a document is claimed by another reader before the first batch
+
+    Test if :
+      - the claimed document is not read
+      - each other report is read by a single reader
+    """
+    mongodb = MongoDB(URI, "test_mongodb", "test_mongodb1")
+    mongodb.connect()
+    claimed_id = mongodb.collection.find_one({})['_id']
+    mongodb.collection.update_one({'_id': claimed_id}, {'$set': {MONGO_OWNER_FIELD: 'other_reader'}})
+    readers = [mongodb.iter(HWPCModel(), True), mongodb.iter(HWPCModel(), True)]
+
+    reports = readers[0].next_batch(4) + readers[1].next_batch(4) + readers[0].next_batch(4)
+    assert len(reports) == 9
+    assert len(set(report.timestamp for report in reports)) == 9
+    assert mongodb.collection.count_documents({}) == 1
+
+    with pytest.raises(StopIteration):
+        readers[1].next_batch(4)
+
+
 def test_mongodb_save_basic_db(database):
     """
     Test save mongodb collection
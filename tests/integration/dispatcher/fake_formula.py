@@ -30,6 +30,7 @@ OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
 import logging
+import os
 import pickle
 import zmq
 from powerapi.handler import Handler, PoisonPillMessageHandler
@@ -63,6 +64,8 @@ class FakeFormulaActor(Actor):
     result to a Pusher.
     """
 
+    report_handler_class = HWPCReportHandler
+
     def __init__(self, name, push_socket_addr, level_logger=logging.DEBUG,
                  timeout=None):
         """
@@ -86,4 +89,38 @@ class FakeFormulaActor(Actor):
         self.push_socket = SafeContext.get_context().socket(zmq.PUSH)
         self.push_socket.connect(self.addr)
 
-        self.add_handler(Report, HWPCReportHandler(self.state, self.push_socket))
+        self.add_handler(Report, self.report_handler_class(self.state, self.push_socket))
+
+
+class ExitHandler(HWPCReportHandler):
+
+    def handle(self, msg):
+        HWPCReportHandler.handle(self, msg)
+        # closing a socket doesn't wait for its messages to be sent, the
+        # context termination does
+        SafeContext.destroy(1000)
+        os._exit(1)
+
+
+class ExitFormulaActor(FakeFormulaActor):
+    """
+    Fake formula whose process exits after handling its first report
+    """
+
+    report_handler_class = ExitHandler
+
+
+class CrashHandler(HWPCReportHandler):
+
+    def handle(self, msg):
+        HWPCReportHandler.handle(self, msg)
+        raise RuntimeError()
+
+
+class CrashAfterReportFormulaActor(FakeFormulaActor):
+    """
+    Fake formula whose actor stops, without exiting its process, after handling
+    its first report
+    """
+
+    report_handler_class = CrashHandler
@@ -29,17 +29,21 @@
 
 import logging
 import pickle
+import time
 
 import pytest
 
-from powerapi.actor import NotConnectedException, Supervisor, CrashConfigureError
+from powerapi.actor import NotConnectedException, Supervisor, CrashConfigureError, THREAD_RUNTIME, SHM_CHANNEL
+from powerapi.actor import PROCESS_RUNTIME, PUSH_TOPOLOGY, ROUTER_TOPOLOGY, UnknowTopologyException
 from powerapi.dispatcher import DispatcherActor, RouteTable
+from powerapi.dispatcher.formula_worker import FormulaWorkerActor, PooledFormula
 from powerapi.message import StartMessage, ErrorMessage, UnknowMessageTypeException
 from powerapi.dispatch_rule import HWPCDispatchRule, HWPCDepthLevel, DispatchRule
 from powerapi.dispatch_rule import PowerDispatchRule, PowerDepthLevel
 from powerapi.report import *
 from tests.utils import *
-from tests.integration.dispatcher.fake_formula import FakeFormulaActor
+from tests.integration.dispatcher.fake_formula import FakeFormulaActor, ExitFormulaActor
+from tests.integration.dispatcher.fake_formula import CrashAfterReportFormulaActor
 
 
 FORMULA_SOCKET_ADDR = 'ipc://@test_formula_socket'
@@ -188,7 +192,15 @@ def formula_socket():
     actions
     """
     socket = zmq.Context.instance().socket(zmq.PULL)
-    socket.bind(FORMULA_SOCKET_ADDR)
+    # the socket of the previous test may not be unbound yet
+    for _ in range(20):
+        try:
+            socket.bind(FORMULA_SOCKET_ADDR)
+            break
+        except zmq.ZMQError:
+            time.sleep(0.05)
+    else:
+        socket.bind(FORMULA_SOCKET_ADDR)
     yield socket
     socket.close()
 
@@ -377,24 +389,259 @@ def test_kill_dispatcher_with_formula(dispatcher_with_formula, formula_socket):
     assert receive(formula_socket) == ("('test_dispatcher-', 'toto')", 'terminated')
 
 
+@define_route_table(route_table_with_primary_rule())
+def test_dispatcher_with_thread_formula_runtime_forward_report_to_formula_thread(route_table, formula_socket):
+    """
+    Create a Dispatcher that run its formulas in threads, send it a report and
+    then kill it
+
+    Test :
+      - if the created formula receive the report
+      - if the dispatcher and its formula threads can be killed
+    """
+    dispatcher = DispatcherActor('test_dispatcher-',
+                                 lambda name, log: FakeFormulaActor(name, FORMULA_SOCKET_ADDR, level_logger=log),
+                                 route_table, level_logger=LOG_LEVEL, formula_runtime=THREAD_RUNTIME)
+    Supervisor().launch_actor(dispatcher)
+    dispatcher.send_data(gen_good_report())
+    assert receive(formula_socket) == ("('test_dispatcher-', 'toto')", gen_good_report())
+
+    dispatcher.hard_kill()
+    assert not is_actor_alive(dispatcher, time=2)
+
+
+def route_table_with_socket_primary_rule():
+    """
+    return a RouteTable with :
+      - a HWPCGrouptBy rule on the socket as primary rule
+    """
+    route_table = RouteTable()
+    route_table.dispatch_rule(HWPCReport, HWPCDispatchRule(HWPCDepthLevel.SOCKET, primary=True))
+    return route_table
+
+
+@define_route_table(route_table_with_socket_primary_rule())
+def test_dispatcher_with_formula_pool_forward_reports_to_formulas_hosted_by_workers(route_table, formula_socket):
+    """
+    Create a Dispatcher with a pool of two workers, send it a report that must
+    be split between two formulas and then kill it
+
+    Test :
+      - if each formula receive its sub-report
+      - if the dispatcher and its workers can be killed
+    """
+    dispatcher = DispatcherActor('test_dispatcher-',
+                                 lambda name, log: FakeFormulaActor(name, FORMULA_SOCKET_ADDR, level_logger=log),
+                                 route_table, level_logger=LOG_LEVEL, formula_pool_size=2)
+    Supervisor().launch_actor(dispatcher)
+    dispatcher.send_data(gen_good_report())
+    received = [receive(formula_socket), receive(formula_socket)]
+    assert sorted(name for name, _ in received) == ["('test_dispatcher-', 'toto', '1')",
+                                                    "('test_dispatcher-', 'toto', '2')"]
+    assert all(isinstance(report, HWPCReport) for _, report in received)
+
+    dispatcher.hard_kill()
+    assert not is_actor_alive(dispatcher, time=2)
+
+
+@define_route_table(route_table_with_socket_primary_rule())
+def test_dispatcher_with_formula_shell_pool_forward_reports_to_formulas_hosted_by_shells(route_table, formula_socket):
+    """
+    Create a Dispatcher with a warm pool of formula shells, send it a report
+    that must be split between two formulas and then kill it
+
+    Test :
+      - if each formula receive its sub-report
+      - if each formula is hosted by its own shell
+      - if the dispatcher and its shells can be killed
+    """
+    dispatcher = DispatcherActor('test_dispatcher-',
+                                 lambda name, log: FakeFormulaActor(name, FORMULA_SOCKET_ADDR, level_logger=log),
+                                 route_table, level_logger=LOG_LEVEL, formula_shell_pool_size=2)
+    Supervisor().launch_actor(dispatcher)
+    dispatcher.send_data(gen_good_report())
+    received = [receive(formula_socket), receive(formula_socket)]
+    assert sorted(name for name, _ in received) == ["('test_dispatcher-', 'toto', '1')",
+                                                    "('test_dispatcher-', 'toto', '2')"]
+    assert all(isinstance(report, HWPCReport) for _, report in received)
+
+    dispatcher.hard_kill()
+    assert not is_actor_alive(dispatcher, time=2)
+
+
+@define_route_table(route_table_with_socket_primary_rule())
+def test_dispatcher_with_shm_channel_forward_reports_received_through_the_ring(route_table, formula_socket):
+    """
+    Create a Dispatcher that receive its reports through a shared memory ring,
+    send it a report that must be split between two formulas and then kill it
+
+    Test :
+      - if the report was written in the ring
+      - if each formula receive its sub-report
+    """
+    dispatcher = DispatcherActor('test_dispatcher-',
+                                 lambda name, log: FakeFormulaActor(name, FORMULA_SOCKET_ADDR, level_logger=log),
+                                 route_table, level_logger=LOG_LEVEL, channel=SHM_CHANNEL)
+    Supervisor().launch_actor(dispatcher)
+    dispatcher.send_data(gen_good_report())
+    assert dispatcher.socket_interface._ring_producer
+    received = [receive(formula_socket), receive(formula_socket)]
+    assert sorted(name for name, _ in received) == ["('test_dispatcher-', 'toto', '1')",
+                                                    "('test_dispatcher-', 'toto', '2')"]
+
+    dispatcher.hard_kill()
+    assert not is_actor_alive(dispatcher, time=2)
+
+
+@pytest.mark.parametrize('formula_pool_size', [None, 2])
+@define_route_table(route_table_with_socket_primary_rule())
+def test_dispatcher_with_routing_envelope_forward_reports_to_formulas(route_table, formula_socket,
+                                                                       formula_pool_size):
+    """
+    Create a Dispatcher that receive its reports in routing envelopes, send it
+    a report that must be split between two formulas and then kill it
+
+    Test :
+      - if each formula receive the decoded report
+      - if the dispatcher can be killed
+    """
+    dispatcher = DispatcherActor('test_dispatcher-',
+                                 lambda name, log: FakeFormulaActor(name, FORMULA_SOCKET_ADDR, level_logger=log),
+                                 route_table, level_logger=LOG_LEVEL, formula_pool_size=formula_pool_size,
+                                 routing_envelope=True)
+    Supervisor().launch_actor(dispatcher)
+    dispatcher.send_data(gen_good_report())
+    received = [receive(formula_socket), receive(formula_socket)]
+    assert sorted(name for name, _ in received) == ["('test_dispatcher-', 'toto', '1')",
+                                                    "('test_dispatcher-', 'toto', '2')"]
+    assert all(report == gen_good_report() for _, report in received)
+
+    dispatcher.hard_kill()
+    assert not is_actor_alive(dispatcher, time=2)
+
+
+@pytest.mark.parametrize('formula_runtime', [PROCESS_RUNTIME, THREAD_RUNTIME])
+@define_route_table(route_table_with_socket_primary_rule())
+def test_dispatcher_with_router_topology_forward_reports_and_poison_pills_to_formulas(route_table, formula_socket,
+                                                                                      formula_runtime):
+    """
+    Create a Dispatcher whose formulas connect to its router socket, send it a
+    report that must be split between two formulas and then kill it
+
+    Test :
+      - if each formula receive its sub-report
+      - if the formulas receive the poison pill sent on the same link
+      - if the dispatcher can be killed
+    """
+    dispatcher = DispatcherActor('test_dispatcher-',
+                                 lambda name, log: FakeFormulaActor(name, FORMULA_SOCKET_ADDR, level_logger=log),
+                                 route_table, level_logger=LOG_LEVEL, formula_runtime=formula_runtime,
+                                 formula_topology=ROUTER_TOPOLOGY)
+    Supervisor().launch_actor(dispatcher)
+    dispatcher.send_data(gen_good_report())
+    received = [receive(formula_socket), receive(formula_socket)]
+    assert sorted(name for name, _ in received) == ["('test_dispatcher-', 'toto', '1')",
+                                                    "('test_dispatcher-', 'toto', '2')"]
+    assert all(isinstance(report, HWPCReport) for _, report in received)
+
+    dispatcher.hard_kill()
+    assert sorted(receive(formula_socket) for _ in range(2)) == [("('test_dispatcher-', 'toto', '1')", 'terminated'),
+                                                                 ("('test_dispatcher-', 'toto', '2')", 'terminated')]
+    assert not is_actor_alive(dispatcher, time=2)
+
+
+def test_create_dispatcher_with_unknow_topology_raise_UnknowTopologyException(route_table):
+    with pytest.raises(UnknowTopologyException):
+        DispatcherActor('test_dispatcher-', None, route_table, formula_topology='mesh')
+
+
 def crash_formula_factory(name, log):
     return CrashFormulaActor(name, {}, 0, RuntimeError, level_logger=log)
 
 
 @define_formula_factory(crash_formula_factory)
 @define_route_table(route_table_with_primary_rule())
-def test_dispatcher_send_report_to_a_dead_formula_must_crash(dispatcher_with_formula):
+def test_dispatcher_send_report_to_a_dead_formula_must_not_crash(dispatcher_with_formula):
     dispatcher_with_formula.send_data(gen_good_report())
     dispatcher_with_formula.send_data(gen_good_report())
     dispatcher_with_formula.send_data(gen_good_report())
     dispatcher_with_formula.send_data(gen_good_report())
-    assert not is_actor_alive(dispatcher_with_formula)
+    assert is_actor_alive(dispatcher_with_formula)
 
 @define_formula_factory(crash_formula_factory)
 @define_route_table(route_table_hwpc_not_primary())
-def test_dispatcher_send_non_primary_report_to_a_dead_formula_must_crash(dispatcher_with_formula):
+def test_dispatcher_send_non_primary_report_to_a_dead_formula_must_not_crash(dispatcher_with_formula):
     dispatcher_with_formula.send_data(gen_good_report())
-    assert not is_actor_alive(dispatcher_with_formula)
+    assert is_actor_alive(dispatcher_with_formula)
+
+
+@pytest.mark.parametrize('formula_topology', [PUSH_TOPOLOGY, ROUTER_TOPOLOGY])
+@pytest.mark.parametrize('respawn_formulas', [False, True])
+@define_route_table(route_table_with_primary_rule())
+def test_dispatcher_detect_terminated_formula(route_table, formula_socket, respawn_formulas, formula_topology):
+    """
+    Create a Dispatcher whose formulas exit after their first report, send it
+    a report, wait for the formula termination and send it a second report
+
+    Test :
+      - if the dispatcher is still alive
+      - if the second report is dropped, or received by a new formula if
+        formulas are respawned
+    """
+    dispatcher = DispatcherActor('test_dispatcher-',
+                                 lambda name, log: ExitFormulaActor(name, FORMULA_SOCKET_ADDR, level_logger=log),
+                                 route_table, level_logger=LOG_LEVEL, respawn_formulas=respawn_formulas,
+                                 formula_topology=formula_topology)
+    Supervisor().launch_actor(dispatcher)
+    dispatcher.send_data(gen_good_report())
+    assert receive(formula_socket) == ("('test_dispatcher-', 'toto')", gen_good_report())
+
+    # let the dispatcher detect the formula termination
+    time.sleep(0.5)
+    dispatcher.send_data(gen_good_report())
+    if respawn_formulas:
+        assert receive(formula_socket) == ("('test_dispatcher-', 'toto')", gen_good_report())
+    else:
+        assert receive(formula_socket) is None
+    assert dispatcher.is_alive()
+
+    dispatcher.hard_kill()
+    assert not is_actor_alive(dispatcher, time=2)
+
+
+@pytest.mark.parametrize('respawn_formulas', [False, True])
+def test_formula_worker_keep_running_when_a_hosted_formula_terminate(formula_socket, respawn_formulas):
+    """
+    Create a formula worker whose formulas stop after their first report, send
+    it a report, wait for the formula termination and send it a second report
+
+    Test :
+      - if the worker is still alive
+      - if the second report is dropped, or received by a new formula if
+        formulas are respawned
+    """
+    worker = FormulaWorkerActor('test_worker-',
+                                lambda name, log: CrashAfterReportFormulaActor(name, FORMULA_SOCKET_ADDR,
+                                                                            level_logger=log),
+                                LOG_LEVEL, respawn_formulas=respawn_formulas)
+    supervisor = Supervisor()
+    supervisor.launch_actor(worker)
+    formula = PooledFormula(worker, 'formula')
+    formula.send_data(gen_good_report())
+    assert receive(formula_socket) == ('formula', gen_good_report())
+
+    # let the worker detect the formula termination
+    time.sleep(0.5)
+    formula.send_data(gen_good_report())
+    if respawn_formulas:
+        assert receive(formula_socket) == ('formula', gen_good_report())
+    else:
+        assert receive(formula_socket) is None
+    time.sleep(0.5)
+    assert worker.is_alive()
+
+    supervisor.kill_actors()
+    assert not is_actor_alive(worker, time=2)
 
 #########################################
 # Dispatcher for HWPC and Power reports #
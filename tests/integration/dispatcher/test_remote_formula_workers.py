@@ -0,0 +1,126 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Dispatcher and formula worker started by two supervisors, in two processes
+bound to different loopback addresses, as they would be on two nodes
+"""
+import multiprocessing
+import pickle
+
+import pytest
+import zmq
+
+from powerapi.actor import Registry, RemoteActor, Supervisor
+from powerapi.dispatch_rule import HWPCDispatchRule, HWPCDepthLevel
+from powerapi.dispatcher import DispatcherActor, RouteTable
+from powerapi.dispatcher.formula_worker import FormulaWorkerActor
+from powerapi.report import HWPCReport
+from powerapi.test_utils.report.hwpc import gen_hwpc_report
+from tests.integration.dispatcher.fake_formula import FakeFormulaActor
+from tests.utils import is_actor_alive
+
+FORMULA_SOCKET_ADDR = 'ipc://@test_remote_formula_socket'
+WORKER_NAME = 'remote_worker'
+
+
+def formula_factory(name, log):
+    return FakeFormulaActor(name, FORMULA_SOCKET_ADDR, level_logger=log)
+
+
+def run_worker_node(registry_address, stop_event):
+    """
+    Start a formula worker bound to 127.0.0.2 with its own supervisor, kill it
+    when stop_event is set
+    """
+    worker = FormulaWorkerActor(WORKER_NAME, formula_factory)
+    worker.set_addresses('127.0.0.2')
+    worker.set_registry(registry_address)
+    supervisor = Supervisor()
+    supervisor.launch_actor(worker)
+    stop_event.wait()
+    supervisor.kill_actors()
+
+
+@pytest.fixture()
+def registry():
+    registry = Registry()
+    registry.start()
+    yield registry
+    registry.stop()
+
+
+@pytest.fixture()
+def worker_node(registry):
+    stop_event = multiprocessing.Event()
+    node = multiprocessing.Process(target=run_worker_node, args=(registry.address, stop_event))
+    node.start()
+    yield node
+    stop_event.set()
+    node.join(5)
+
+
+@pytest.fixture()
+def formula_socket():
+    socket = zmq.Context.instance().socket(zmq.PULL)
+    socket.bind(FORMULA_SOCKET_ADDR)
+    yield socket
+    socket.close()
+
+
+def receive(socket):
+    if socket.poll(2000) == 0:
+        return None
+    return pickle.loads(socket.recv())
+
+
+def test_dispatcher_forward_reports_to_formulas_hosted_by_a_remote_worker(registry, worker_node, formula_socket):
+    """
+    Create a Dispatcher bound to 127.0.0.3 whose formulas are hosted by a
+    worker started by another supervisor, send it a report and then kill it
+
+    Test :
+      - if the formula created in the remote worker receive the report
+      - if the dispatcher can be killed without killing the remote worker
+    """
+    route_table = RouteTable()
+    route_table.dispatch_rule(HWPCReport, HWPCDispatchRule(HWPCDepthLevel.ROOT, primary=True))
+    dispatcher = DispatcherActor('test_dispatcher-', formula_factory, route_table,
+                                 remote_formula_workers=[RemoteActor(WORKER_NAME, registry.address)])
+    dispatcher.set_addresses('127.0.0.3')
+    Supervisor().launch_actor(dispatcher)
+    assert dispatcher.socket_interface.pull_socket_address.startswith('tcp://127.0.0.3:')
+
+    report = gen_hwpc_report()
+    dispatcher.send_data(report)
+    assert receive(formula_socket) == ("('test_dispatcher-', 'toto')", report)
+
+    dispatcher.hard_kill()
+    assert not is_actor_alive(dispatcher, time=2)
+    assert RemoteActor(WORKER_NAME, registry.address).is_alive()
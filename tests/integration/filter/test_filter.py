@@ -91,3 +91,21 @@ class TestFilter:
         for _ in range(2):
             hwpc_report = next(mongodb_it)
             assert hwpc_filter.route(hwpc_report) == [1]
+
+    def test_route_many_with_two_filter(self, database):
+        """
+        Test filter with two filter on a batch of reports
+        - the 6 reports are sent to the first dispatcher
+        - the 2 first reports are sent to the second dispatcher
+        - the 2 next reports are sent to the third dispatcher
+        """
+        mongodb = MongoDB(URI, "test_filter", "test_filter1")
+        mongodb.connect()
+        hwpc_filter = Filter()
+        hwpc_filter.filter(lambda msg: "sensor" in msg.sensor, 1)
+        hwpc_filter.filter(lambda msg: "test1" in msg.sensor, 2)
+        hwpc_filter.filter(lambda msg: msg.sensor == "sensor_test2", 3)
+
+        reports = mongodb.iter(HWPCModel(), False).next_batch(6)
+        assert hwpc_filter.route_many(reports) == [(1, reports), (2, reports[:2]), (3, reports[2:4])]
+
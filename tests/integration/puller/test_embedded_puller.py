@@ -0,0 +1,111 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Test a puller with the embedded runtime, that read reports from a SocketDB on
+the event loop shared with the actor it sends reports to
+"""
+import json
+import socket
+from threading import Thread
+
+import pytest
+
+from powerapi.actor import Actor, State, Supervisor, EMBEDDED_RUNTIME, run_embedded_loop
+from powerapi.database import SocketDB
+from powerapi.filter import Filter
+from powerapi.handler import Handler, StartHandler, PoisonPillMessageHandler
+from powerapi.message import PoisonPillMessage, StartMessage
+from powerapi.puller import PullerActor
+from powerapi.report import HWPCReport
+from powerapi.report_model import HWPCModel
+
+
+class ForwardToControlHandler(Handler):
+    def handle(self, msg):
+        self.state.actor.send_control(msg)
+
+
+class FakeEmbeddedDispatcher(Actor):
+    """
+    Actor that send back the received reports on its control canal
+    """
+
+    def __init__(self, name):
+        Actor.__init__(self, name, timeout=100, runtime=EMBEDDED_RUNTIME)
+        self.state = State(self)
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, PoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, StartHandler(self.state))
+        self.add_handler(HWPCReport, ForwardToControlHandler(self.state))
+
+
+def free_tcp_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def send_reports(port, reports):
+    with socket.create_connection(('127.0.0.1', port)) as sock:
+        for report in reports:
+            sock.send(bytes(json.dumps(report), 'utf-8'))
+
+
+@pytest.fixture()
+def json_reports():
+    with open('tests/hwpc_reports.json', 'r') as json_file:
+        return json.load(json_file)['reports'][:10]
+
+
+def test_embedded_puller_send_reports_received_by_socket_db_to_embedded_dispatcher(json_reports):
+    port = free_tcp_port()
+    dispatcher = FakeEmbeddedDispatcher('dispatcher')
+    report_filter = Filter()
+    report_filter.filter(lambda msg: True, dispatcher)
+    puller = PullerActor('puller_socket', SocketDB(port), report_filter, HWPCModel(), stream_mode=True)
+    puller.set_runtime(EMBEDDED_RUNTIME)
+
+    supervisor = Supervisor()
+    supervisor.launch_actors([dispatcher, puller])
+    try:
+        client = Thread(target=send_reports, args=(port, json_reports))
+        # let the puller start its server before the client connects
+        assert dispatcher.receive_control(200) is None
+        client.start()
+        received = [dispatcher.receive_control(2000) for _ in json_reports]
+        client.join()
+        assert all(isinstance(report, HWPCReport) for report in received)
+        assert [report.target for report in received] == [report['target'] for report in json_reports]
+    finally:
+        supervisor.kill_actors()
+        run_embedded_loop(puller.state.puller_task, 1)
+
+    assert not puller.is_alive()
+    assert puller.state.puller_task.done()
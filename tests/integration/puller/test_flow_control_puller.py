@@ -0,0 +1,124 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Test several pullers sending batches of reports to a dispatcher whose mailbox
+is smaller than their batches
+"""
+import logging
+import pickle
+
+import pytest
+import zmq
+
+from powerapi.actor import Supervisor
+from powerapi.database import BaseDB, IterDB
+from powerapi.dispatch_rule import HWPCDispatchRule, HWPCDepthLevel
+from powerapi.dispatcher import DispatcherActor, RouteTable
+from powerapi.filter import Filter
+from powerapi.puller import PullerActor
+from powerapi.report import HWPCReport
+from powerapi.report_model import HWPCModel
+from powerapi.test_utils.report.hwpc import gen_hwpc_report
+from tests.integration.dispatcher.fake_formula import FakeFormulaActor
+
+FORMULA_SOCKET_ADDR = 'ipc://@test_flow_control_formula_socket'
+NUMBER_OF_REPORTS = 60
+BATCH_SIZE = 3
+MAILBOX_SIZE = 4
+
+
+class ListIterDB(IterDB):
+
+    def __init__(self, db, reports):
+        IterDB.__init__(self, db, None, False)
+        self.reports = iter(reports)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.reports)
+
+
+class ListDB(BaseDB):
+    """
+    Database whose iterator reads the reports of a list by batches
+    """
+
+    def __init__(self, reports):
+        BaseDB.__init__(self)
+        self.reports = reports
+
+    def connect(self):
+        pass
+
+    def iter(self, report_model, stream_mode):
+        return ListIterDB(self, self.reports)
+
+
+@pytest.fixture()
+def formula_socket():
+    socket = zmq.Context.instance().socket(zmq.PULL)
+    socket.bind(FORMULA_SOCKET_ADDR)
+    yield socket
+    socket.close()
+
+
+def receive(socket):
+    if socket.poll(2000) == 0:
+        return None
+    return pickle.loads(socket.recv())
+
+
+def test_two_pullers_sending_batches_bigger_than_half_the_dispatcher_mailbox_send_all_their_reports(formula_socket):
+    """
+    Create a dispatcher with a mailbox of 4 reports and two pullers that read
+    their database and send its reports by batches of 3
+
+    Test if the formula receives the reports of both pullers
+    """
+    route_table = RouteTable()
+    route_table.dispatch_rule(HWPCReport, HWPCDispatchRule(HWPCDepthLevel.ROOT, primary=True))
+    dispatcher = DispatcherActor('test_dispatcher-',
+                                 lambda name, log: FakeFormulaActor(name, FORMULA_SOCKET_ADDR, level_logger=log),
+                                 route_table, level_logger=logging.WARNING, mailbox_size=MAILBOX_SIZE)
+    pullers = []
+    for index in range(2):
+        report_filter = Filter()
+        report_filter.filter(lambda msg: True, dispatcher)
+        pullers.append(PullerActor('test_puller_' + str(index), ListDB([gen_hwpc_report()] * NUMBER_OF_REPORTS),
+                                   report_filter, HWPCModel(), batch_size=BATCH_SIZE))
+
+    supervisor = Supervisor()
+    supervisor.launch_actors([dispatcher] + pullers)
+    try:
+        received = [receive(formula_socket) for _ in range(2 * NUMBER_OF_REPORTS)]
+        assert all(report is not None for report in received)
+    finally:
+        supervisor.kill_actors()
@@ -61,6 +61,10 @@ class FakeActor(Actor):
     def is_alive(self):
         return self.alive
 
+    @property
+    def sentinel(self):
+        return None
+
     def hard_kill(self):
         self.alive = False
         self.q.put('hard kill')
@@ -69,9 +73,13 @@ class FakeActor(Actor):
         self.alive = False
         self.q.put('soft kill')
 
-    def send_data(self, msg):
+    def send_data(self, msg, timeout=None):
         self.q.put(msg)
 
+    def send_data_many(self, msgs, timeout=None):
+        for msg in msgs:
+            self.q.put(msg)
+
     def send_control(self, msg):
         self.q.put(msg)
 
@@ -0,0 +1,166 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import datetime
+import pickle
+
+import numpy
+import pytest
+
+from powerapi.actor import SocketInterface, CODECS, UnknowCodecException, get_codec, Envelope
+from powerapi.message import PoisonPillMessage
+from powerapi.report import PowerReport, HWPCReport
+from powerapi.test_utils.report.hwpc import gen_hwpc_report
+
+ACTOR_NAME = 'dummy_actor'
+
+
+def gen_power_report():
+    return PowerReport(datetime.datetime(2021, 4, 1, 12, 30, 15, 123456), 'sensor', 'target', 1, 42.5,
+                       {'scope': 'cpu', 'ratio': (1, 2)})
+
+
+@pytest.fixture(params=list(CODECS.keys()))
+def codec(request):
+    return get_codec(request.param)
+
+
+@pytest.fixture(params=list(CODECS.keys()))
+def connected_interface(request):
+    socket_interface = SocketInterface(ACTOR_NAME, 100, codec=request.param)
+    socket_interface.setup()
+    socket_interface.connect_data()
+    yield socket_interface
+    socket_interface.close()
+
+
+def test_get_unknow_codec_raise_UnknowCodecException():
+    with pytest.raises(UnknowCodecException):
+        get_codec('unknow')
+
+
+def test_encode_decode_hwpc_report_return_the_same_report(codec):
+    report = gen_hwpc_report()
+    decoded = codec.decode([memoryview(frame) for frame in codec.encode(report)])
+    assert decoded == report
+    assert decoded.groups == report.groups
+
+
+def test_encode_decode_power_report_keep_timestamp_and_metadata(codec):
+    report = gen_power_report()
+    decoded = codec.decode([memoryview(frame) for frame in codec.encode(report)])
+    assert decoded.timestamp == report.timestamp
+    assert decoded.metadata == report.metadata
+    assert decoded.power == report.power
+
+
+def test_encode_decode_message_that_is_not_a_report(codec):
+    decoded = codec.decode([memoryview(frame) for frame in codec.encode(PoisonPillMessage(soft=False))])
+    assert decoded == PoisonPillMessage(soft=False)
+
+
+def test_pickle5_codec_send_numpy_array_data_in_a_separate_frame():
+    frames = get_codec('pickle5').encode(numpy.arange(1000))
+    assert len(frames) == 2
+    assert len(frames[1]) == numpy.arange(1000).nbytes
+
+
+def test_send_and_receive_report_with_codec(connected_interface):
+    report = gen_hwpc_report()
+    connected_interface.send_data(report)
+    assert connected_interface.receive() == report
+
+
+def test_msgpack_codec_encode_decode_hwpc_report_with_different_events_per_core():
+    codec = get_codec('msgpack')
+    report = gen_hwpc_report()
+    report.groups['1']['1']['1']['other_event'] = 3
+    decoded = codec.decode([memoryview(frame) for frame in codec.encode(report)])
+    assert decoded.groups == report.groups
+
+
+def test_decode_report_in_envelope_without_opening_it_return_envelope_with_routing_fields(codec):
+    report = gen_hwpc_report()
+    frames = codec.encode_message(report, envelope=True)
+    envelope = codec.decode_message([memoryview(frame) for frame in frames], open_envelope=False)
+    assert isinstance(envelope, Envelope)
+    assert envelope.report_class is HWPCReport
+    assert envelope.timestamp == report.timestamp
+    assert envelope.sensor == report.sensor
+    assert envelope.target == report.target
+    assert envelope.sockets == report.sockets
+    assert envelope.open() == report
+
+
+def test_decode_report_in_envelope_return_the_report(codec):
+    report = gen_power_report()
+    frames = codec.encode_message(report, envelope=True)
+    decoded = codec.decode_message([memoryview(frame) for frame in frames])
+    assert decoded == report
+
+
+def test_encode_envelope_forward_its_payload_unchanged(codec):
+    report = gen_hwpc_report()
+    payload = codec.encode(report)
+    envelope = codec.decode_message([memoryview(frame) for frame in codec.encode_message(report, envelope=True)],
+                                    open_envelope=False)
+    assert [bytes(frame) for frame in codec.encode_message(envelope)] == [bytes(frame) for frame in payload]
+
+
+def test_encode_envelope_with_another_codec_encode_the_report_again():
+    report = gen_hwpc_report()
+    pickle_codec = get_codec('pickle')
+    envelope = pickle_codec.decode_message([memoryview(frame) for frame in
+                                            pickle_codec.encode_message(report, envelope=True)], open_envelope=False)
+    pickle5_codec = get_codec('pickle5')
+    assert pickle5_codec.decode(pickle5_codec.encode_message(envelope)) == report
+
+
+def test_decode_batch_of_envelopes_and_messages(codec):
+    msgs = [gen_hwpc_report(), PoisonPillMessage(soft=False), gen_power_report()]
+    frames = codec.encode_many(msgs, envelope=True)
+    decoded = codec.decode_many([memoryview(frame) for frame in frames], open_envelopes=False)
+    assert [type(msg) for msg in decoded] == [Envelope, PoisonPillMessage, Envelope]
+    assert [msg.open() for msg in (decoded[0], decoded[2])] == [msgs[0], msgs[2]]
+
+
+def test_pickle_envelope_unpickle_the_report(codec):
+    report = gen_hwpc_report()
+    envelope = codec.decode_message([memoryview(frame) for frame in codec.encode_message(report, envelope=True)],
+                                    open_envelope=False)
+    assert pickle.loads(pickle.dumps(envelope)) == report
+
+
+def test_interface_with_envelope_receive_envelope(connected_interface):
+    connected_interface.envelope = True
+    report = gen_hwpc_report()
+    connected_interface.send_data(report)
+    envelope = connected_interface.receive()
+    assert isinstance(envelope, Envelope)
+    assert envelope.open() == report
@@ -0,0 +1,103 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import queue
+import threading
+
+import pytest
+
+from powerapi.actor import Credits
+
+
+def test_create_credits_with_non_positive_size_raise_ValueError():
+    with pytest.raises(ValueError):
+        Credits(0)
+
+
+def test_new_credits_have_all_credits_available():
+    credits = Credits(10)
+    assert credits.available() == 10
+    assert credits.queue_depth() == 0
+
+
+def test_acquire_credits_decrease_available_credits():
+    credits = Credits(10)
+    assert credits.acquire(3)
+    assert credits.get_metrics() == {'mailbox_size': 10, 'credits': 7, 'queue_depth': 3}
+
+
+def test_release_credits_increase_available_credits():
+    credits = Credits(10)
+    credits.acquire(3)
+    credits.release(2)
+    assert credits.available() == 9
+
+
+def test_acquire_more_credits_than_available_without_waiting_return_False_and_acquire_nothing():
+    credits = Credits(10)
+    credits.acquire(8)
+    assert not credits.acquire(3, timeout=0)
+    assert credits.available() == 2
+
+
+def test_acquire_unavailable_credits_wait_for_timeout():
+    credits = Credits(1)
+    credits.acquire()
+    assert not credits.acquire(timeout=0.05)
+
+
+def test_two_senders_acquiring_batches_of_credits_on_a_small_mailbox_dont_deadlock():
+    """
+    Two threads send batches of 3 messages to a mailbox of size 4 while a
+    consumer reads the messages one by one, and releases their credits
+
+    Test if both senders send all their batches
+    """
+    credits = Credits(4)
+    mailbox = queue.Queue()
+
+    def send_batches():
+        for _ in range(200):
+            credits.acquire(3)
+            for _ in range(3):
+                mailbox.put(None)
+
+    def consume():
+        for _ in range(2 * 200 * 3):
+            mailbox.get()
+            credits.release()
+
+    threads = [threading.Thread(target=send_batches, daemon=True) for _ in range(2)]
+    threads.append(threading.Thread(target=consume, daemon=True))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert not any(thread.is_alive() for thread in threads)
+    assert credits.available() == 4
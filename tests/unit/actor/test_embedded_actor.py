@@ -0,0 +1,185 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import threading
+
+import pytest
+
+from powerapi.actor import Actor, State, Supervisor, EMBEDDED_RUNTIME, QueueInterface
+from powerapi.actor import NotConnectedException, NoCreditException
+from powerapi.handler import Handler, StartHandler, PoisonPillMessageHandler
+from powerapi.message import PoisonPillMessage, StartMessage, StatsRequestMessage, StatsMessage
+
+
+class EchoMessage:
+    def __init__(self, value):
+        self.value = value
+
+
+class EchoHandler(Handler):
+    def handle(self, msg):
+        self.state.actor.send_control(msg)
+
+
+class TeardownPoisonPillMessageHandler(PoisonPillMessageHandler):
+    def teardown(self, soft=False):
+        self.state.actor.send_control('teardown')
+
+
+class DummyEmbeddedActor(Actor):
+
+    def __init__(self, name, mailbox_size=0):
+        Actor.__init__(self, name, timeout=100, runtime=EMBEDDED_RUNTIME, mailbox_size=mailbox_size)
+        self.state = State(self)
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, TeardownPoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, StartHandler(self.state))
+        self.add_handler(EchoMessage, EchoHandler(self.state))
+
+
+@pytest.fixture()
+def actor():
+    return DummyEmbeddedActor('test_embedded_actor')
+
+
+@pytest.fixture()
+def started_actor(actor):
+    Supervisor().launch_actor(actor)
+    yield actor
+    if actor.is_alive():
+        actor.kill()
+        actor.join(1)
+
+
+def test_embedded_actor_use_a_queue_interface(actor):
+    assert isinstance(actor.socket_interface, QueueInterface)
+
+
+def test_set_embedded_runtime_replace_socket_interface_by_queue_interface():
+    actor = Actor('test_actor', timeout=100, mailbox_size=10)
+    actor.set_runtime(EMBEDDED_RUNTIME)
+    assert isinstance(actor.socket_interface, QueueInterface)
+    assert actor.socket_interface.timeout == 100
+    assert actor.socket_interface.get_flow_control_metrics()['mailbox_size'] == 10
+
+
+def test_send_message_on_data_canal_to_non_initialized_actor_raise_NotConnectedException(actor):
+    with pytest.raises(NotConnectedException):
+        actor.send_data(EchoMessage('toto'))
+
+
+def test_started_actor_run_in_a_task_of_the_current_thread(started_actor):
+    assert started_actor.is_alive()
+    assert started_actor.pid is None
+    assert not any(thread.name == 'test_embedded_actor' for thread in threading.enumerate())
+
+
+def test_send_StartMessage_to_already_started_actor_answer_ErrorMessage(started_actor):
+    started_actor.send_control(StartMessage())
+    assert started_actor.receive_control(2000).error_message == 'Actor already initialized'
+
+
+def test_messages_are_given_to_the_actor_without_being_encoded(started_actor):
+    msg = EchoMessage('toto')
+    started_actor.send_data(msg)
+    assert started_actor.receive_control(2000) is msg
+
+
+def test_send_data_many_messages_are_handled_in_order(started_actor):
+    msgs = [EchoMessage(i) for i in range(3)]
+    started_actor.send_data_many(msgs)
+    assert [started_actor.receive_control(2000) for _ in msgs] == msgs
+
+
+def test_receive_control_return_None_after_timeout(started_actor):
+    assert started_actor.receive_control(10) is None
+
+
+def test_send_PoisonPillMessage_stop_the_actor(started_actor):
+    started_actor.send_control(PoisonPillMessage(soft=True))
+    started_actor.join(1)
+    assert not started_actor.is_alive()
+    assert started_actor.receive_control(0) == 'teardown'
+
+
+def test_terminate_handle_PoisonPillMessage_before_queued_messages(started_actor):
+    started_actor.send_data(EchoMessage('toto'))
+    started_actor.terminate()
+    started_actor.join(1)
+    assert not started_actor.is_alive()
+    assert started_actor.receive_control(0) == 'teardown'
+
+
+def test_send_data_to_full_mailbox_raise_NoCreditException():
+    actor = DummyEmbeddedActor('test_embedded_actor', mailbox_size=2)
+    Supervisor().launch_actor(actor)
+    try:
+        with pytest.raises(NoCreditException):
+            actor.send_data_many([EchoMessage(i) for i in range(3)])
+        assert actor.receive_control(2000).value == 0
+        assert actor.receive_control(2000).value == 1
+        assert actor.receive_control(10) is None
+    finally:
+        actor.kill()
+        actor.join(1)
+
+
+def test_launch_actors_start_all_actors_on_the_same_loop():
+    actors = [DummyEmbeddedActor('test_embedded_actor_' + str(i)) for i in range(3)]
+    supervisor = Supervisor()
+    supervisor.launch_actors(actors)
+    try:
+        assert supervisor.supervised_actors == actors
+        assert len({actor.embedded_task.get_loop() for actor in actors}) == 1
+    finally:
+        supervisor.kill_actors()
+    assert not any(actor.is_alive() for actor in actors)
+
+
+def test_watched_actor_sentinel_send_message_to_the_watching_actor_when_the_watched_actor_terminates(started_actor):
+    watched_actor = DummyEmbeddedActor('test_watched_embedded_actor')
+    Supervisor().launch_actor(watched_actor)
+    started_actor.socket_interface.watch(watched_actor.sentinel, EchoMessage('terminated'))
+
+    watched_actor.send_control(PoisonPillMessage(soft=False))
+    watched_actor.join(1)
+    assert started_actor.receive_control(2000).value == 'terminated'
+
+
+def test_send_StatsRequestMessage_answer_StatsMessage(started_actor):
+    started_actor.send_data(EchoMessage('toto'))
+    assert started_actor.receive_control(2000).value == 'toto'
+
+    started_actor.send_control(StatsRequestMessage())
+    msg = started_actor.receive_control(2000)
+    assert isinstance(msg, StatsMessage)
+    stats = msg.stats[0]
+    assert stats['runtime'] == EMBEDDED_RUNTIME
+    assert stats['socket']['received_messages'] == 1
+    assert stats['handlers']['EchoHandler']['messages'] == 1
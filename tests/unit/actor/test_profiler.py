@@ -0,0 +1,198 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+import pstats
+import threading
+import time
+
+import pytest
+
+from powerapi.actor import Actor, State, Supervisor, THREAD_RUNTIME, PROCESS_RUNTIME, INPROC_TRANSPORT, DEFAULT_TRANSPORT
+from powerapi.actor import CProfiler, SamplingProfiler, UnknowProfileModeException, create_profiler
+from powerapi.actor import SAMPLING_MODE, CPROFILE_MODE
+from powerapi.actor import profiler
+from powerapi.actor.profiler import get_profile_path, write_profile_request, pop_profile_request
+from powerapi.cli.profile import profile_actors
+from powerapi.handler import Handler, StartHandler, PoisonPillMessageHandler
+from powerapi.message import PoisonPillMessage, StartMessage, ProfileStartMessage, ProfileStopMessage
+
+
+def busy_function(duration):
+    end = time.process_time() + duration
+    while time.process_time() < end:
+        sum(range(100))
+
+
+class BusyMessage:
+    def __init__(self, duration):
+        self.duration = duration
+
+
+class BusyHandler(Handler):
+    def handle(self, msg):
+        busy_function(msg.duration)
+        self.state.actor.send_control('done')
+
+
+class ProfiledActor(Actor):
+
+    def __init__(self, name, runtime):
+        Actor.__init__(self, name, timeout=100, transport=INPROC_TRANSPORT if runtime == THREAD_RUNTIME else DEFAULT_TRANSPORT,
+                       runtime=runtime)
+        self.state = State(self)
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, PoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, StartHandler(self.state))
+        self.add_handler(BusyMessage, BusyHandler(self.state))
+
+
+@pytest.fixture
+def request_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, 'PROFILE_DIRECTORY', str(tmp_path / 'requests'))
+    return tmp_path / 'requests'
+
+
+def wait_file(path, timeout=5):
+    end = time.time() + timeout
+    while not os.path.exists(path) and time.time() < end:
+        time.sleep(0.05)
+    return os.path.exists(path)
+
+
+def test_cprofiler_write_a_pstats_file_with_the_profiled_functions(tmp_path):
+    cprofiler = CProfiler(str(tmp_path / 'actor'))
+    cprofiler.start()
+    busy_function(0.01)
+    path = cprofiler.stop()
+
+    assert path == str(tmp_path / 'actor.pstats')
+    stats = pstats.Stats(path)
+    assert any(function_name == 'busy_function' for _, _, function_name in stats.stats)
+
+
+def test_sampling_profiler_in_main_thread_write_collapsed_stacks(tmp_path):
+    sampling_profiler = SamplingProfiler(str(tmp_path / 'actor'), interval=0.001)
+    sampling_profiler.start()
+    busy_function(0.2)
+    path = sampling_profiler.stop()
+
+    assert path == str(tmp_path / 'actor.collapsed')
+    with open(path) as collapsed_file:
+        lines = collapsed_file.read().splitlines()
+    stacks = dict(line.rsplit(' ', 1) for line in lines)
+    busy_stack = next(stack for stack in stacks if __name__ + ':busy_function' in stack.split(';'))
+    assert int(stacks[busy_stack]) > 0
+    frames = busy_stack.split(';')
+    test_frame = __name__ + ':test_sampling_profiler_in_main_thread_write_collapsed_stacks'
+    assert frames.index(test_frame) < frames.index(__name__ + ':busy_function')
+
+
+def test_sampling_profiler_in_other_thread_sample_this_thread_only(tmp_path):
+    sampling_profiler = SamplingProfiler(str(tmp_path / 'actor'), interval=0.001)
+
+    def run():
+        sampling_profiler.start()
+        busy_function(0.2)
+        sampling_profiler.stop()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+    assert sampling_profiler.stacks
+    assert all(stack.split(';')[-1] != __name__ + ':test_sampling_profiler_in_other_thread_sample_this_thread_only'
+               for stack in sampling_profiler.stacks)
+    assert any('busy_function' in stack for stack in sampling_profiler.stacks)
+
+
+def test_create_profiler_with_unknow_mode_raise_UnknowProfileModeException(tmp_path):
+    assert isinstance(create_profiler(CPROFILE_MODE, str(tmp_path)), CProfiler)
+    assert isinstance(create_profiler(SAMPLING_MODE, str(tmp_path)), SamplingProfiler)
+    with pytest.raises(UnknowProfileModeException):
+        create_profiler('perf', str(tmp_path))
+
+
+def test_profile_path_is_named_after_the_actor_and_its_process():
+    assert get_profile_path('/tmp/profiles', 'formula/(socket, cpu0)') == \
+        '/tmp/profiles/formula_socket_cpu0.' + str(os.getpid())
+
+
+def test_profile_request_is_removed_once_read(request_directory):
+    write_profile_request(1234, SAMPLING_MODE, '/tmp/profiles', 0.01)
+    assert pop_profile_request(1234) == {'mode': SAMPLING_MODE, 'output_dir': '/tmp/profiles', 'interval': 0.01}
+    assert pop_profile_request(1234) == {}
+
+
+def test_thread_actor_profile_itself_between_ProfileStartMessage_and_ProfileStopMessage(tmp_path):
+    supervisor = Supervisor()
+    actor = ProfiledActor('test_profiled_thread_actor', THREAD_RUNTIME)
+    supervisor.launch_actor(actor)
+    try:
+        actor.send_control(ProfileStartMessage('test_profiled_*', SAMPLING_MODE, str(tmp_path), 0.001))
+        actor.send_data(BusyMessage(0.2))
+        assert actor.receive_control(5000) == 'done'
+        actor.send_control(ProfileStopMessage())
+        actor.send_data(BusyMessage(0))
+        assert actor.receive_control(5000) == 'done'
+    finally:
+        supervisor.kill_actors()
+
+    path = get_profile_path(str(tmp_path), 'test_profiled_thread_actor') + '.collapsed'
+    with open(path) as collapsed_file:
+        assert 'busy_function' in collapsed_file.read()
+
+
+def test_ProfileStartMessage_with_unknow_mode_doesnt_stop_the_actor(tmp_path):
+    supervisor = Supervisor()
+    actor = ProfiledActor('test_profiled_thread_actor', THREAD_RUNTIME)
+    supervisor.launch_actor(actor)
+    try:
+        actor.send_control(ProfileStartMessage(mode='perf', output_dir=str(tmp_path)))
+        actor.send_data(BusyMessage(0))
+        assert actor.receive_control(5000) == 'done'
+        assert actor.is_alive()
+    finally:
+        supervisor.kill_actors()
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_process_actor_is_profiled_by_signals(tmp_path, request_directory):
+    supervisor = Supervisor()
+    actor = ProfiledActor('test_profiled_process_actor', PROCESS_RUNTIME)
+    supervisor.launch_actor(actor)
+    try:
+        assert profile_actors('test_profiled_process_*', mode=CPROFILE_MODE, output_dir=str(tmp_path)) == [actor.pid]
+        actor.send_data(BusyMessage(0.05))
+        assert actor.receive_control(5000) == 'done'
+        assert profile_actors('test_profiled_process_*', stop=True) == [actor.pid]
+        path = os.path.join(str(tmp_path), 'test_profiled_process_actor.' + str(actor.pid) + '.pstats')
+        assert wait_file(path)
+    finally:
+        supervisor.kill_actors()
@@ -0,0 +1,127 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import pickle
+
+import pytest
+import zmq
+
+from powerapi.actor import Registry, RegistryTimeoutException, UnknowActorException, BadAddressException
+from powerapi.actor import register_actor, unregister_actor, lookup_actor, SocketInterface, RemoteActor
+from powerapi.actor import SafeContext
+
+ACTOR_NAME = 'dummy_actor'
+
+
+@pytest.fixture()
+def registry():
+    registry = Registry()
+    registry.start()
+    yield registry
+    registry.stop()
+
+
+@pytest.fixture()
+def remote_interface(registry):
+    """
+    socket interface of an actor bound on another loopback address and
+    registered in the registry
+    """
+    socket_interface = SocketInterface(ACTOR_NAME, 100)
+    socket_interface.set_addresses('127.0.0.2')
+    socket_interface.registry_address = registry.address
+    socket_interface.setup()
+    socket_interface.register()
+    yield socket_interface
+    socket_interface.close()
+
+
+def test_lookup_registered_actor_return_its_addresses(registry):
+    register_actor(registry.address, ACTOR_NAME, 'tcp://127.0.0.2:1', 'tcp://127.0.0.2:2')
+    assert lookup_actor(registry.address, ACTOR_NAME) == ('tcp://127.0.0.2:1', 'tcp://127.0.0.2:2')
+
+
+def test_lookup_unregistered_actor_raise_UnknowActorException(registry):
+    register_actor(registry.address, ACTOR_NAME, 'tcp://127.0.0.2:1', 'tcp://127.0.0.2:2')
+    unregister_actor(registry.address, ACTOR_NAME)
+    with pytest.raises(UnknowActorException):
+        lookup_actor(registry.address, ACTOR_NAME, 0.1)
+
+
+def test_pickled_request_is_answered_without_being_unpickled(registry):
+    socket = SafeContext.get_context().socket(zmq.REQ)
+    socket.setsockopt(zmq.LINGER, 0)
+    socket.connect(registry.address)
+    socket.send(pickle.dumps(('register', ACTOR_NAME, 'tcp://127.0.0.2:1', 'tcp://127.0.0.2:2')))
+    assert socket.poll(1000) != 0
+    assert socket.recv() == b'null'
+    socket.close()
+
+    assert registry.actors == {}
+    register_actor(registry.address, ACTOR_NAME, 'tcp://127.0.0.2:1', 'tcp://127.0.0.2:2')
+    assert lookup_actor(registry.address, ACTOR_NAME) == ('tcp://127.0.0.2:1', 'tcp://127.0.0.2:2')
+
+
+def test_request_to_stopped_registry_raise_RegistryTimeoutException():
+    registry = Registry()
+    registry.start()
+    registry.stop()
+    with pytest.raises(RegistryTimeoutException):
+        register_actor(registry.address, ACTOR_NAME, 'tcp://127.0.0.2:1', 'tcp://127.0.0.2:2', timeout=0.1)
+
+
+def test_bind_to_all_interfaces_without_advertise_address_raise_BadAddressException():
+    with pytest.raises(BadAddressException):
+        SocketInterface(ACTOR_NAME, 100).set_addresses('0.0.0.0')
+
+
+def test_setup_interface_with_registry_register_its_advertised_addresses(registry, remote_interface):
+    pull_address, control_address = lookup_actor(registry.address, ACTOR_NAME)
+    assert pull_address == remote_interface.pull_socket_address
+    assert pull_address.startswith('tcp://127.0.0.2:')
+    assert control_address.startswith('tcp://127.0.0.2:')
+
+
+def test_close_interface_with_registry_unregister_it(registry, remote_interface):
+    remote_interface.close()
+    with pytest.raises(UnknowActorException):
+        lookup_actor(registry.address, ACTOR_NAME, 0)
+
+
+def test_remote_actor_send_data_to_actor_found_in_the_registry(registry, remote_interface):
+    remote_actor = RemoteActor(ACTOR_NAME, registry.address)
+    remote_actor.connect_data()
+    remote_actor.send_data('toto')
+    assert remote_interface.receive() == 'toto'
+    assert remote_actor.is_alive()
+    remote_actor.close()
+
+
+def test_remote_actor_not_registered_is_not_alive(registry):
+    assert not RemoteActor(ACTOR_NAME, registry.address).is_alive()
@@ -0,0 +1,109 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import pytest
+
+from powerapi.actor import Router, DealerInterface, NotConnectedException, INPROC_TRANSPORT, TCP_TRANSPORT
+from powerapi.message import PoisonPillMessage, OKMessage
+
+ACTOR_NAME = 'dummy_actor'
+
+
+@pytest.fixture(params=[INPROC_TRANSPORT, TCP_TRANSPORT])
+def router(request):
+    router = Router('dummy_dispatcher', request.param)
+    router.setup()
+    yield router
+    router.close()
+
+
+@pytest.fixture()
+def server(router):
+    """
+    dealer interface of an actor connected to the router
+    """
+    socket_interface = DealerInterface(router, ACTOR_NAME, 500)
+    socket_interface.setup()
+    yield socket_interface
+    socket_interface.close()
+
+
+@pytest.fixture()
+def client(server):
+    """
+    client side of the dealer interface, sending through the router
+    """
+    client = server.copy()
+    client.connect_control()
+    client.connect_data()
+    return client
+
+
+def test_send_data_before_connection_raise_NotConnectedException(router):
+    with pytest.raises(NotConnectedException):
+        DealerInterface(router, ACTOR_NAME, 500).send_data('toto')
+
+
+def test_data_sent_through_the_router_is_received_by_the_dealer(client, server):
+    client.send_data('toto')
+    client.send_data_many(['titi', 'tata'])
+    assert server.receive() == 'toto'
+    assert server.receive_many() == ['titi', 'tata']
+    assert server.received_messages == 3
+
+
+def test_control_message_is_received_after_the_data_sent_before_it(client, server):
+    client.send_data_many(['toto', 'titi'])
+    client.send_control(PoisonPillMessage(soft=False))
+    client.send_data('tata')
+    assert server.receive_many() == ['toto', 'titi']
+    assert server.receive_many() == [PoisonPillMessage(soft=False)]
+    assert server.receive_many() == ['tata']
+
+
+def test_control_message_read_in_a_batch_is_returned_alone_after_the_batch(client, server):
+    client.send_data('toto')
+    client.send_control(PoisonPillMessage(soft=True))
+    client.send_data('titi')
+    server.dealer_socket.poll(500)
+    assert server.receive_many() == ['toto']
+    assert server.receive() == PoisonPillMessage(soft=True)
+    assert server.receive() == 'titi'
+    assert server.receive_many() == []
+
+
+def test_control_message_sent_by_the_dealer_is_received_by_the_client(client, server):
+    server.send_control(OKMessage())
+    assert isinstance(client.receive_control(500), OKMessage)
+    assert client.receive_control(50) is None
+
+
+def test_receive_without_message_return_None_after_timeout(server):
+    assert server.receive() is None
+    assert server.receive_many() == []
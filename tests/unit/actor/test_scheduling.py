@@ -0,0 +1,120 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+
+import pytest
+from mock import Mock
+
+from powerapi.actor import Actor, State, Supervisor, Scheduling, EMBEDDED_RUNTIME
+from powerapi.actor import parse_cpu_list, get_available_cpus, role_scheduling, BadCPUListException
+from powerapi.actor import UnknowSchedulingPolicyException, IDLE_POLICY, BATCH_POLICY, PULLER_ROLE, PUSHER_ROLE
+from powerapi.handler import StartHandler, PoisonPillMessageHandler
+from powerapi.message import PoisonPillMessage, StartMessage
+
+
+class DummyActor(Actor):
+
+    def __init__(self, name, runtime):
+        Actor.__init__(self, name, timeout=100, runtime=runtime)
+        self.state = State(self)
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, PoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, StartHandler(self.state))
+
+
+@pytest.fixture()
+def supervisor():
+    supervisor = Supervisor()
+    yield supervisor
+    supervisor.kill_actors()
+
+
+@pytest.mark.parametrize('cpu_list, cpus', [('0', {0}), ('0-3', {0, 1, 2, 3}), ('1,4-5, 7', {1, 4, 5, 7})])
+def test_parse_cpu_list_return_the_listed_cpus(cpu_list, cpus):
+    assert parse_cpu_list(cpu_list) == cpus
+
+
+@pytest.mark.parametrize('cpu_list', ['', 'a', '3-1', '-1', '0,'])
+def test_parse_malformed_cpu_list_raise_BadCPUListException(cpu_list):
+    with pytest.raises(BadCPUListException):
+        parse_cpu_list(cpu_list)
+
+
+def test_create_scheduling_with_unknow_policy_raise_UnknowSchedulingPolicyException():
+    with pytest.raises(UnknowSchedulingPolicyException):
+        Scheduling(policy='fifo')
+
+
+def test_role_scheduling_without_setting_return_None():
+    assert role_scheduling(PULLER_ROLE) is None
+
+
+def test_role_scheduling_with_housekeeping_cpus_isolate_pushers_on_these_cpus():
+    available_cpus = get_available_cpus()
+    housekeeping_cpu = min(available_cpus)
+
+    assert role_scheduling(PUSHER_ROLE, housekeeping_cpus={housekeeping_cpu}).cpus == {housekeeping_cpu}
+    puller_scheduling = role_scheduling(PULLER_ROLE, housekeeping_cpus={housekeeping_cpu})
+    if len(available_cpus) == 1:
+        assert puller_scheduling is None
+    else:
+        assert puller_scheduling.cpus == available_cpus - {housekeeping_cpu}
+
+
+def test_role_scheduling_with_housekeeping_cpus_keep_the_cpus_given_for_the_role():
+    assert role_scheduling(PUSHER_ROLE, cpus={1}, housekeeping_cpus={0}).cpus == {1}
+
+
+def test_apply_scheduling_that_is_not_permitted_log_a_warning_without_raising():
+    logger = Mock()
+    Scheduling(cpus={os.cpu_count() + 1024}).apply(logger)
+    assert logger.warning.called
+
+
+def test_process_actor_apply_its_scheduling_when_it_starts(supervisor):
+    cpus = {min(get_available_cpus())}
+    nice = min(os.getpriority(os.PRIO_PROCESS, 0) + 1, 19)
+    actor = DummyActor('test_scheduling_actor', 'process')
+    actor.set_scheduling(Scheduling(cpus, IDLE_POLICY, nice))
+    supervisor.launch_actor(actor)
+
+    assert os.sched_getaffinity(actor.pid) == cpus
+    assert os.sched_getscheduler(actor.pid) == os.SCHED_IDLE
+    assert os.getpriority(os.PRIO_PROCESS, actor.pid) == nice
+
+
+def test_embedded_actor_ignore_its_scheduling(supervisor):
+    policy = os.sched_getscheduler(0)
+    actor = DummyActor('test_scheduling_embedded_actor', EMBEDDED_RUNTIME)
+    actor.set_scheduling(Scheduling(policy=BATCH_POLICY))
+    supervisor.launch_actor(actor)
+
+    assert actor.is_alive()
+    assert os.sched_getscheduler(0) == policy
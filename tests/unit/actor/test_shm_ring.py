@@ -0,0 +1,127 @@
+"""
+Copyright (c) 2018, INRIA
+Copyright (c) 2018, University of Lille
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+* Redistributions of source code must retain the above copyright notice, this
+  list of conditions and the following disclaimer.
+
+* Redistributions in binary form must reproduce the above copyright notice,
+  this list of conditions and the following disclaimer in the documentation
+  and/or other materials provided with the distribution.
+
+* Neither the name of the copyright holder nor the names of its
+  contributors may be used to endorse or promote products derived from
+  this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+
+import multiprocessing
+
+import pytest
+
+from powerapi.actor import ShmRing, RingClosedException
+
+
+@pytest.fixture()
+def ring():
+    """Return a small ring, destroyed after testing
+
+    """
+    shm_ring = ShmRing(64)
+    yield shm_ring
+    shm_ring.unlink()
+
+
+def test_create_ring_with_too_small_capacity_raise_ValueError():
+    with pytest.raises(ValueError):
+        ShmRing(4)
+
+
+def test_new_ring_is_empty(ring):
+    assert ring.empty()
+    assert ring.used() == 0
+    assert ring.get_all() == []
+
+
+def test_put_and_get_records(ring):
+    """test if the records are read in the order they were written, with all
+    their frames
+
+    """
+    ring.put([b'toto', b'titi'])
+    ring.put([b'tata'])
+    assert ring.used() == ring.record_size([b'toto', b'titi']) + ring.record_size([b'tata'])
+    assert ring.get_all() == [[b'toto', b'titi'], [b'tata']]
+    assert ring.empty()
+
+
+def test_put_ask_for_a_wake_up_only_if_the_consumer_read_all_records(ring):
+    assert ring.put([b'toto']) is True
+    assert ring.put([b'titi']) is False
+    ring.get_all()
+    assert ring.put([b'tata']) is True
+
+
+def test_put_in_full_ring_return_None(ring):
+    record = [b'x' * 20]
+    assert ring.put(record) is not None
+    assert ring.put(record) is not None
+    assert ring.put(record) is None
+    assert ring.get_all() == [record, record]
+
+
+def test_records_written_across_the_end_of_the_ring(ring):
+    """test if records split between the end and the beginning of the data
+    area are read correctly
+
+    """
+    for index in range(20):
+        record = [bytes([index]) * (index % 7 + 1), b'frame']
+        assert ring.put(record) is not None
+        assert ring.get_all() == [record]
+
+
+def test_only_first_producer_is_registered(ring):
+    assert ring.claim_producer()
+    assert not ring.claim_producer()
+
+
+def test_use_unlinked_ring_raise_RingClosedException(ring):
+    ring.unlink()
+    with pytest.raises(RingClosedException):
+        ring.put([b'toto'])
+
+
+def produce(ring, number):
+    for index in range(number):
+        record = [str(index).encode()]
+        while ring.put(record) is None:
+            pass
+
+
+def test_records_written_by_another_process_are_read_in_order():
+    ring = ShmRing(256)
+    producer = multiprocessing.Process(target=produce, args=(ring, 2000))
+    producer.start()
+    try:
+        received = []
+        while len(received) < 2000:
+            received += [int(frames[0]) for frames in ring.get_all()]
+        assert received == list(range(2000))
+    finally:
+        producer.join()
+        ring.unlink()
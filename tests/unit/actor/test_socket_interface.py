@@ -29,11 +29,14 @@ OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
+import multiprocessing
+
 import pytest
 import platform
 import zmq
 
-from powerapi.actor import SocketInterface
+from powerapi.actor import SocketInterface, UnknowTransportException, IPC_TRANSPORT, INPROC_TRANSPORT
+from powerapi.actor import NoCreditException, UnknowChannelException, SHM_CHANNEL
 
 
 ACTOR_NAME = 'dummy_actor'
@@ -194,3 +197,287 @@ def test_multiple_receive(fully_connected_interface):
 
     fully_connected_interface.send_control(push_msg)
     assert fully_connected_interface.receive() == push_msg
+
+
+def test_send_many_and_receive_many(connected_interface):
+    """test to send a batch of messages from the push socket and receive them
+    in one call
+
+    """
+    msgs = ['toto', 'titi', 'tata']
+    connected_interface.send_data_many(msgs)
+    assert connected_interface.receive_many() == msgs
+
+
+def test_send_many_and_receive_one_by_one(connected_interface):
+    """test to send a batch of messages from the push socket and receive them
+    with the receive method
+
+    """
+    msgs = ['toto', 'titi', 'tata']
+    connected_interface.send_data_many(msgs)
+    for msg in msgs:
+        assert connected_interface.receive() == msg
+    assert connected_interface.receive() is None
+
+
+def test_receive_many_drain_queued_messages(connected_interface):
+    """test if receive_many return all the messages sent one by one and
+    already queued on the pull socket
+
+    """
+    msgs = ['msg' + str(i) for i in range(10)]
+    for msg in msgs:
+        connected_interface.send_data(msg)
+    received = []
+    while len(received) < len(msgs):
+        received += connected_interface.receive_many()
+    assert received == msgs
+
+
+def test_receive_many_return_at_most_batch_size_messages(connected_interface):
+    """test if receive_many keep the messages above batch_size for the next
+    call
+
+    """
+    connected_interface.batch_size = 2
+    connected_interface.send_data_many(['toto', 'titi', 'tata'])
+    assert connected_interface.receive_many() == ['toto', 'titi']
+    assert connected_interface.receive_many() == ['tata']
+
+
+def test_receive_many_return_control_message_before_queued_messages(fully_connected_interface):
+    """test if a control message is returned alone before messages that are
+    already received on the data canal
+
+    """
+    fully_connected_interface.batch_size = 1
+    fully_connected_interface.send_data_many(['toto', 'titi'])
+    assert fully_connected_interface.receive_many() == ['toto']
+    fully_connected_interface.send_control('control')
+    assert fully_connected_interface.receive_many() == ['control']
+    assert fully_connected_interface.receive_many() == ['titi']
+
+
+def test_create_socket_interface_with_unknow_transport_raise_UnknowTransportException():
+    """test if creating a socket interface with a transport that doesn't exist
+    raise an UnknowTransportException
+
+    """
+    with pytest.raises(UnknowTransportException):
+        SocketInterface(ACTOR_NAME, 100, transport='udp')
+
+
+@pytest.mark.parametrize('transport', [IPC_TRANSPORT, INPROC_TRANSPORT])
+def test_setup_with_transport_bind_sockets_to_transport_addresses(transport):
+    """test if the pull and control sockets are bound to addresses of the given
+    transport
+
+    """
+    socket_interface = SocketInterface(ACTOR_NAME, 100, transport=transport)
+    socket_interface.setup()
+    try:
+        assert socket_interface.pull_socket_address.startswith(transport + '://')
+        assert socket_interface.control_socket_address.startswith(transport + '://')
+        check_socket(socket_interface.pull_socket, zmq.PULL, socket_interface.pull_socket_address)
+        check_socket(socket_interface.control_socket, zmq.PAIR, socket_interface.control_socket_address)
+    finally:
+        socket_interface.close()
+
+
+@pytest.mark.parametrize('transport', [IPC_TRANSPORT, INPROC_TRANSPORT])
+def test_send_and_receive_with_transport(transport):
+    """test to send and receive messages from the push/pull and the control
+    socket with the given transport
+
+    """
+    socket_interface = SocketInterface(ACTOR_NAME, 100, transport=transport)
+    socket_interface.setup()
+    try:
+        socket_interface.connect_data()
+        socket_interface.send_data('push_msg')
+        assert socket_interface.receive() == 'push_msg'
+        socket_interface.connect_control()
+        socket_interface.send_control('control_msg')
+        assert socket_interface.receive() == 'control_msg'
+    finally:
+        socket_interface.close()
+
+
+@pytest.fixture()
+def bounded_interface():
+    """Return an initialized socket interface with a mailbox of two messages
+    and an open connection to the push socket
+
+    """
+    socket_interface = SocketInterface(ACTOR_NAME, 100, mailbox_size=2)
+    socket_interface.setup()
+    socket_interface.connect_data()
+    yield socket_interface
+    socket_interface.close()
+
+
+def test_send_data_to_full_mailbox_raise_NoCreditException(bounded_interface):
+    """test if sending a message to a full mailbox raise a NoCreditException
+    after timeout
+
+    """
+    bounded_interface.send_data('toto')
+    bounded_interface.send_data('titi')
+    with pytest.raises(NoCreditException):
+        bounded_interface.send_data('tata', timeout=0)
+    assert bounded_interface.get_flow_control_metrics() == {'mailbox_size': 2, 'credits': 0, 'queue_depth': 2}
+
+
+def test_receive_data_give_back_credits(bounded_interface):
+    """test if receiving messages give back their credits to the senders
+
+    """
+    bounded_interface.send_data_many(['toto', 'titi'])
+    assert bounded_interface.receive_many() == ['toto', 'titi']
+    assert bounded_interface.get_flow_control_metrics()['credits'] == 2
+    bounded_interface.send_data('tata', timeout=0)
+    assert bounded_interface.receive() == 'tata'
+
+
+def test_send_data_many_bigger_than_mailbox_raise_NoCreditException_when_mailbox_is_full(bounded_interface):
+    """test if a batch bigger than the mailbox is sent until the mailbox is
+    full
+
+    """
+    with pytest.raises(NoCreditException):
+        bounded_interface.send_data_many(['toto', 'titi', 'tata'], timeout=0)
+    assert bounded_interface.receive_many() == ['toto', 'titi']
+
+
+def test_send_data_many_send_the_messages_that_fit_in_the_free_space_of_the_mailbox(bounded_interface):
+    """test if a batch sent to a mailbox with one free credit sends its first
+    message before waiting for more credits, and gives its number in the
+    raised NoCreditException
+
+    """
+    bounded_interface.send_data('toto')
+    with pytest.raises(NoCreditException) as exn:
+        bounded_interface.send_data_many(['titi', 'tata'], timeout=0)
+    assert exn.value.sent == 1
+    assert bounded_interface.receive_many() == ['toto', 'titi']
+
+
+def test_get_stats_count_received_messages_and_poll_calls(connected_interface):
+    """test if the socket interface count the messages received on the data
+    canal and the calls to poll
+
+    """
+    connected_interface.send_data_many(['toto', 'titi', 'tata'])
+    assert connected_interface.receive() == 'toto'
+    stats = connected_interface.get_stats()
+    assert stats['received_messages'] == 3
+    assert stats['pending_messages'] == 2
+    assert stats['poll_count'] == 1
+
+
+def test_watched_fd_message_is_received_before_control_and_data_messages_when_fd_is_ready(fully_connected_interface):
+    """test if the message of a watched file descriptor is returned first once
+    the file descriptor is readable, and only once
+
+    """
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    fully_connected_interface.watch(reader, 'terminated')
+    fully_connected_interface.send_data('toto')
+    assert fully_connected_interface.receive_many() == ['toto']
+
+    fully_connected_interface.send_control('titi')
+    writer.close()
+    assert fully_connected_interface.receive_many() == ['terminated']
+    assert fully_connected_interface.receive_many() == ['titi']
+    assert fully_connected_interface.receive_many() == []
+    reader.close()
+
+
+def test_create_socket_interface_with_unknow_channel_raise_UnknowChannelException():
+    with pytest.raises(UnknowChannelException):
+        SocketInterface(ACTOR_NAME, 100, channel='pipe')
+
+
+@pytest.fixture()
+def shm_interface():
+    """Return an initialized socket interface using the shm channel with a
+    small ring, and an open connection to the push socket
+
+    """
+    socket_interface = SocketInterface(ACTOR_NAME, 100, channel=SHM_CHANNEL, ring_capacity=256)
+    socket_interface.setup()
+    socket_interface.connect_data()
+    yield socket_interface
+    socket_interface.close()
+
+
+def test_send_and_receive_with_shm_channel(shm_interface):
+    """test if messages sent by the first client are written in the ring and
+    received in their sending order
+
+    """
+    shm_interface.send_data('toto')
+    shm_interface.send_data_many(['titi', 'tata'])
+    assert shm_interface._ring_producer
+    assert shm_interface.receive() == 'toto'
+    assert shm_interface.receive_many() == ['titi', 'tata']
+    assert shm_interface.receive() is None
+    assert shm_interface.get_stats()['ring_used'] == 0
+
+
+def test_message_bigger_than_ring_is_sent_on_pull_socket(shm_interface):
+    shm_interface.send_data('x' * 1000)
+    assert shm_interface.ring.empty()
+    assert shm_interface.receive() == 'x' * 1000
+
+
+def test_send_data_to_full_ring_raise_NoCreditException(shm_interface):
+    shm_interface.send_data('x' * 150)
+    with pytest.raises(NoCreditException):
+        shm_interface.send_data('x' * 150, timeout=0.01)
+    assert shm_interface.receive() == 'x' * 150
+    shm_interface.send_data('x' * 150, timeout=0.01)
+
+
+def test_other_clients_of_shm_interface_use_pull_socket(shm_interface):
+    shm_interface.send_data('toto')
+    client = shm_interface.copy()
+    client.connect_data()
+    try:
+        client.send_data('titi')
+        assert not client._ring_producer
+        received = []
+        while len(received) < 2:
+            received += shm_interface.receive_many()
+        assert sorted(received) == ['titi', 'toto']
+    finally:
+        client.close()
+
+
+def send_from_process(socket_interface, number):
+    socket_interface.connect_data()
+    for index in range(number):
+        socket_interface.send_data(index)
+    socket_interface.close()
+
+
+def test_messages_sent_by_another_process_through_shm_channel_are_received_in_order():
+    """test if a consumer waiting on its sockets is woken up by a producer
+    that writes its messages in the ring from another process
+
+    """
+    socket_interface = SocketInterface(ACTOR_NAME, 1000, channel=SHM_CHANNEL, ring_capacity=1024)
+    socket_interface.setup()
+    producer = multiprocessing.Process(target=send_from_process, args=(socket_interface, 1000))
+    producer.start()
+    try:
+        received = []
+        while len(received) < 1000:
+            msgs = socket_interface.receive_many()
+            assert msgs
+            received += msgs
+        assert received == list(range(1000))
+    finally:
+        producer.join()
+        socket_interface.close()
@@ -0,0 +1,93 @@
+# Copyright (c) 2018, INRIA Copyright (c) 2018, University of Lille All rights
+# reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import pytest
+
+from mock import Mock
+
+from powerapi.actor import State
+from powerapi.message import UnknowMessageTypeException
+
+
+class Message1:
+    pass
+
+
+class Message2:
+    pass
+
+
+class SubMessage1(Message1):
+    pass
+
+
+@pytest.fixture
+def state():
+    return State(Mock())
+
+
+def test_get_corresponding_handler_of_unknow_message_raise_UnknowMessageTypeException(state):
+    state.add_handler(Message1, 'handler1')
+    with pytest.raises(UnknowMessageTypeException):
+        state.get_corresponding_handler(Message2())
+    with pytest.raises(UnknowMessageTypeException):
+        state.get_corresponding_handler(Message2())
+
+
+def test_get_corresponding_handler_return_handler_mapped_to_message_type(state):
+    state.add_handler(Message1, 'handler1')
+    state.add_handler(Message2, 'handler2')
+    assert state.get_corresponding_handler(Message1()) == 'handler1'
+    assert state.get_corresponding_handler(Message2()) == 'handler2'
+    assert state.get_corresponding_handler(Message1()) == 'handler1'
+
+
+def test_get_corresponding_handler_of_sub_message_return_handler_mapped_to_parent_type(state):
+    state.add_handler(Message1, 'handler1')
+    assert state.get_corresponding_handler(SubMessage1()) == 'handler1'
+
+
+def test_get_corresponding_handler_return_first_registered_matching_handler(state):
+    state.add_handler(Message1, 'handler1')
+    state.add_handler(SubMessage1, 'sub_handler1')
+    assert state.get_corresponding_handler(SubMessage1()) == 'handler1'
+
+
+def test_add_handler_after_lookup_invalidate_cached_handler(state):
+    with pytest.raises(UnknowMessageTypeException):
+        state.get_corresponding_handler(Message1())
+    state.add_handler(Message1, 'handler1')
+    assert state.get_corresponding_handler(Message1()) == 'handler1'
+
+
+def test_set_handlers_after_lookup_invalidate_cached_handler(state):
+    state.add_handler(Message1, 'handler1')
+    assert state.get_corresponding_handler(Message1()) == 'handler1'
+    state.handlers = [(Message1, 'new_handler1')]
+    assert state.get_corresponding_handler(Message1()) == 'new_handler1'
@@ -0,0 +1,87 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import pytest
+
+from powerapi.actor import LatencyHistogram, ActorStats
+from powerapi.handler import Handler
+
+
+@pytest.fixture
+def histogram():
+    return LatencyHistogram()
+
+
+def test_empty_histogram_percentile_is_zero(histogram):
+    assert histogram.percentile(50) == 0
+    assert histogram.to_dict()['count'] == 0
+
+
+def test_histogram_keep_exact_small_values(histogram):
+    for value in range(1, 11):
+        histogram.record(value)
+    assert histogram.count == 10
+    assert histogram.min == 1
+    assert histogram.max == 10
+    assert histogram.percentile(50) == 5
+    assert histogram.percentile(100) == 10
+
+
+@pytest.mark.parametrize('value', [100, 1000, 123456, 10 ** 9])
+def test_histogram_percentile_relative_error_is_bounded(histogram, value):
+    histogram.record(1)
+    histogram.record(value, 99)
+    assert value <= histogram.percentile(50) <= value * (1 + 2 ** -4)
+    assert histogram.percentile(1) == 1
+
+
+def test_histogram_percentiles_of_uniform_values(histogram):
+    for value in range(1, 10001):
+        histogram.record(value)
+    assert abs(histogram.percentile(50) - 5000) / 5000 < 2 ** -4
+    assert abs(histogram.percentile(99) - 9900) / 9900 < 2 ** -4
+    assert histogram.to_dict()['mean'] == pytest.approx(5.0005)
+
+
+def test_actor_stats_record_latency_of_each_batch_by_handler():
+    stats = ActorStats()
+    stats.record(Handler(None), 4, 4000)
+    stats.record(Handler(None), 1, 1000)
+    snapshot = stats.snapshot()
+    assert snapshot['handled_messages'] == 5
+    assert snapshot['handlers']['Handler']['messages'] == 5
+    assert snapshot['handlers']['Handler']['batch_latency']['count'] == 2
+    assert snapshot['handlers']['Handler']['batch_latency']['max'] == 4.0
+
+
+def test_actor_stats_messages_per_second_is_computed_since_last_snapshot():
+    stats = ActorStats()
+    stats.record(Handler(None), 4, 4000)
+    assert stats.snapshot()['messages_per_second'] > 0
+    assert stats.snapshot()['messages_per_second'] == 0
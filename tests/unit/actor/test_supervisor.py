@@ -27,11 +27,14 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import multiprocessing
+
 import pytest
 import zmq
 from mock import Mock
-from powerapi.actor import Actor, Supervisor, ActorInitError, State
-from powerapi.message import OKMessage, ErrorMessage, StartMessage
+from powerapi.actor import Actor, Supervisor, ActorInitError, FailConfigureError, State
+from powerapi.actor.supervisor import ActorAlreadySupervisedException
+from powerapi.message import OKMessage, ErrorMessage, StartMessage, StatsRequestMessage, StatsMessage
 
 #########
 # Utils #
@@ -51,6 +54,9 @@ class FakeActor(Actor):
     def kill(self):
         self.alive = False
 
+    def terminate(self):
+        self.alive = False
+
     def join(self):
         pass
 
@@ -85,6 +91,62 @@ class FakeActorInitError(FakeActor):
     def receive_control(self, timeout=None):
         return ErrorMessage('error')
 
+class FakeActorWithStats(FakeActor):
+    """
+    FakeActor that answer to StatsRequestMessage
+    """
+    def receive_control(self, timeout=None):
+        if isinstance(self.send_msg[-1], StatsRequestMessage):
+            return StatsMessage(self.name, [{'name': self.name}])
+        return OKMessage()
+
+
+class FakeActorWithEvents(FakeActor):
+    """
+    FakeActor that log its start and the messages it receive in a shared list
+    """
+    def __init__(self, events):
+        FakeActor.__init__(self)
+        self.events = events
+
+    def start(self):
+        FakeActor.start(self)
+        self.events.append('start')
+
+    def send_control(self, msg):
+        FakeActor.send_control(self, msg)
+        self.events.append(msg)
+
+
+class FakeActorWithSentinel(FakeActor):
+    """
+    FakeActor whose sentinel becomes ready when it terminates, it terminates
+    when it is killed if it is not stuck
+    """
+    def __init__(self, stuck=False):
+        FakeActor.__init__(self)
+        self.stuck = stuck
+        self.terminated = False
+        self._sentinel, self._sentinel_writer = multiprocessing.Pipe(duplex=False)
+
+    @property
+    def sentinel(self):
+        return self._sentinel
+
+    def hard_kill(self):
+        self.send_control('kill')
+        if not self.stuck:
+            self.terminate()
+
+    def terminate(self):
+        self.terminated = True
+        self.alive = False
+        self._sentinel_writer.close()
+
+    def join(self, timeout=None):
+        pass
+
+
 ############
 # Fixtures #
 ############
@@ -115,6 +177,15 @@ def test_launch_actor_put_actor_in_supervisor_supervised_actor_list(supervisor):
     assert actor in supervisor.supervised_actors
 
 
+def test_supervise_launched_actor_put_it_once_in_supervisor_supervised_actor_list(supervisor):
+    actor = FakeActor()
+    Supervisor().launch_actor(actor, start_message=False)
+    supervisor.supervise(actor)
+    assert actor in supervisor.supervised_actors
+    with pytest.raises(ActorAlreadySupervisedException):
+        supervisor.supervise(actor)
+
+
 def test_launch_actor_send_to_it_a_start_message(supervisor):
     actor = FakeActor()
     supervisor.launch_actor(actor)
@@ -144,6 +215,37 @@ def test_launch_an_actor_that_crash_with_ActorInitError_raise_ActorInitError_exc
         supervisor.launch_actor(actor)
 
 
+def test_launch_actors_put_all_actors_in_supervisor_supervised_actor_list(supervisor):
+    actors = [FakeActor(), FakeActor()]
+    supervisor.launch_actors(actors)
+    for actor in actors:
+        assert actor in supervisor.supervised_actors
+        assert isinstance(actor.send_msg.pop(), StartMessage)
+
+
+def test_launch_actors_start_all_actors_before_sending_start_messages(supervisor):
+    events = []
+    supervisor.launch_actors([FakeActorWithEvents(events), FakeActorWithEvents(events)])
+    assert events[:2] == ['start', 'start']
+    assert all(isinstance(event, StartMessage) for event in events[2:])
+
+
+def test_launch_actors_with_an_actor_that_crash_with_ActorInitError_supervise_other_actors(supervisor):
+    actor = FakeActor()
+    with pytest.raises(ActorInitError):
+        supervisor.launch_actors([FakeActorInitError(), actor])
+    assert actor in supervisor.supervised_actors
+    assert len(supervisor.supervised_actors) == 1
+
+
+def test_launch_actors_with_an_actor_that_dont_answer_raise_FailConfigureError(supervisor):
+    actor = FakeActor()
+    actor.receive_control = lambda timeout=None: None
+    with pytest.raises(FailConfigureError):
+        supervisor.launch_actors([actor], timeout=10)
+    assert actor not in supervisor.supervised_actors
+
+
 #############
 # TEST KILL #
 #############
@@ -151,3 +253,50 @@ def test_kill_actors_methods_all_actor_in_supervised_list_not_alive(supervisor):
     supervisor.kill_actors()
     for actor in supervisor.supervised_actors:
         assert not actor.is_alive()
+
+
+def test_kill_actors_send_poison_pill_to_all_actors_before_waiting_for_them():
+    supervisor = Supervisor()
+    first = FakeActorWithSentinel(stuck=True)
+    second = FakeActorWithSentinel()
+    supervisor.launch_actors([first, second], start_message=False)
+    # the first actor terminates only once the second one was killed
+    second_hard_kill = second.hard_kill
+    second.hard_kill = lambda: (second_hard_kill(), first.terminate())
+
+    assert supervisor.kill_actors(timeout=5) == []
+    assert first.send_msg == ['kill']
+    assert not first.is_alive() and not second.is_alive()
+
+
+def test_kill_actors_terminate_the_actors_still_alive_at_the_deadline():
+    supervisor = Supervisor()
+    stuck = FakeActorWithSentinel(stuck=True)
+    actor = FakeActorWithSentinel()
+    supervisor.launch_actors([stuck, actor], start_message=False)
+
+    assert supervisor.kill_actors(timeout=0.1) == [stuck]
+    assert stuck.terminated
+    assert not stuck.is_alive()
+
+
+##############
+# TEST STATS #
+##############
+def test_collect_stats_send_StatsRequestMessage_to_all_alive_actors_and_return_their_stats():
+    supervisor = Supervisor()
+    actor = FakeActorWithStats()
+    supervisor.launch_actor(actor, start_message=False)
+    dead_actor = FakeActorWithStats()
+    supervisor.launch_actor(dead_actor, start_message=False)
+    dead_actor.alive = False
+
+    assert supervisor.collect_stats() == [{'name': 'test_supervisor'}]
+    assert isinstance(actor.send_msg.pop(), StatsRequestMessage)
+    assert dead_actor.send_msg == []
+
+
+def test_collect_stats_ignore_actors_that_dont_answer_before_timeout():
+    supervisor = Supervisor()
+    supervisor.launch_actor(FakeActor(), start_message=False)
+    assert supervisor.collect_stats(timeout=100) == []
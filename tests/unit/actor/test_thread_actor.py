@@ -0,0 +1,140 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import threading
+import time
+import multiprocessing.connection
+
+import pytest
+
+from powerapi.actor import Actor, State, Supervisor, THREAD_RUNTIME, INPROC_TRANSPORT, UnknowRuntimeException
+from powerapi.handler import Handler, StartHandler, PoisonPillMessageHandler
+from powerapi.message import PoisonPillMessage, StartMessage, StatsRequestMessage, StatsMessage
+
+from tests.unit.actor.abstract_test_actor import AbstractTestActor
+
+
+class EchoMessage:
+    def __init__(self, value):
+        self.value = value
+
+
+class EchoHandler(Handler):
+    def handle(self, msg):
+        self.state.actor.send_control(msg.value)
+
+
+class DummyThreadActor(Actor):
+
+    def __init__(self, name):
+        Actor.__init__(self, name, timeout=100, transport=INPROC_TRANSPORT, runtime=THREAD_RUNTIME)
+        self.state = State(self)
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, PoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, StartHandler(self.state))
+        self.add_handler(EchoMessage, EchoHandler(self.state))
+
+
+class SlowStartHandler(StartHandler):
+    def initialization(self):
+        time.sleep(0.5)
+
+
+class SlowStartThreadActor(DummyThreadActor):
+
+    def setup(self):
+        self.add_handler(PoisonPillMessage, PoisonPillMessageHandler(self.state))
+        self.add_handler(StartMessage, SlowStartHandler(self.state))
+
+
+class TestThreadActor(AbstractTestActor):
+
+    @pytest.fixture()
+    def actor(self):
+        return DummyThreadActor('test_thread_actor')
+
+    def test_actor_run_in_a_thread_of_the_current_process(self, init_actor):
+        assert init_actor.pid is None
+        assert any(thread.name == 'test_thread_actor' for thread in threading.enumerate())
+
+    def test_actor_use_its_own_socket_interface_in_its_thread(self, started_actor):
+        started_actor.send_data(EchoMessage('toto'))
+        assert started_actor.receive_control(2000) == 'toto'
+
+    def test_sentinel_is_ready_when_actor_is_stopped(self, started_actor):
+        started_actor.send_control(PoisonPillMessage(soft=False))
+        assert multiprocessing.connection.wait([started_actor.sentinel], 2) == [started_actor.sentinel]
+        assert not started_actor.is_alive()
+
+    def test_new_client_can_send_data_from_another_thread(self, started_actor):
+        def send():
+            client = started_actor.new_client()
+            client.connect_data()
+            client.send_data(EchoMessage('titi'))
+            client.socket_interface.close()
+
+        thread = threading.Thread(target=send)
+        thread.start()
+        thread.join()
+        assert started_actor.receive_control(2000) == 'titi'
+
+    def test_send_StatsRequestMessage_answer_StatsMessage_with_handler_latencies(self, started_actor):
+        started_actor.send_data(EchoMessage('toto'))
+        started_actor.send_data(EchoMessage('titi'))
+        assert started_actor.receive_control(2000) == 'toto'
+        assert started_actor.receive_control(2000) == 'titi'
+
+        started_actor.send_control(StatsRequestMessage())
+        msg = started_actor.receive_control(2000)
+        assert isinstance(msg, StatsMessage)
+        assert msg.actor_name == 'test_thread_actor'
+        assert len(msg.stats) == 1
+        stats = msg.stats[0]
+        assert stats['name'] == 'test_thread_actor'
+        assert stats['runtime'] == THREAD_RUNTIME
+        assert stats['socket']['received_messages'] == 2
+        assert stats['handlers']['EchoHandler']['messages'] == 2
+        assert stats['handlers']['StartHandler']['messages'] == 1
+
+
+def test_create_actor_with_unknow_runtime_raise_UnknowRuntimeException():
+    with pytest.raises(UnknowRuntimeException):
+        Actor('test_actor', runtime='coroutine')
+
+
+def test_launch_actors_initialize_actors_concurrently():
+    supervisor = Supervisor()
+    actors = [SlowStartThreadActor('test_slow_actor_' + str(i)) for i in range(4)]
+    begin = time.perf_counter()
+    supervisor.launch_actors(actors)
+    try:
+        assert time.perf_counter() - begin < 1.5
+        assert supervisor.supervised_actors == actors
+    finally:
+        supervisor.kill_actors()
@@ -0,0 +1,61 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from mock import Mock
+
+from powerapi.backendsupervisor import BackendSupervisor
+from powerapi.dispatcher import DispatcherActor
+from powerapi.puller import PullerActor
+from powerapi.pusher import PusherActor
+
+
+def test_kill_stages_kill_pullers_then_dispatchers_then_pushers():
+    supervisor = BackendSupervisor(True)
+    pusher = Mock(spec=PusherActor)
+    dispatcher = Mock(spec=DispatcherActor)
+    puller = Mock(spec=PullerActor)
+    supervisor.supervised_actors = [pusher, dispatcher, puller]
+
+    assert supervisor._kill_stages() == [[puller], [dispatcher], [pusher]]
+
+
+def test_kill_actors_wait_for_each_stage_before_killing_the_next_one():
+    supervisor = BackendSupervisor(True)
+    events = []
+    actors = []
+    for actor_class in (PusherActor, DispatcherActor, PullerActor):
+        actor = Mock(spec=actor_class, sentinel=None)
+        actor.is_alive.return_value = True
+        actor.hard_kill.side_effect = lambda name=actor_class.__name__: events.append('kill ' + name)
+        actors.append(actor)
+    supervisor.supervised_actors = actors
+    supervisor._wait_actors = lambda stage, deadline: events.append('wait') or []
+
+    supervisor.kill_actors(timeout=1)
+    assert events == ['kill PullerActor', 'wait', 'kill DispatcherActor', 'wait', 'kill PusherActor', 'wait']
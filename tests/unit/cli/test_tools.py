@@ -34,8 +34,11 @@ import sys
 
 from mock import Mock, patch
 
-from powerapi.cli.tools import PullerGenerator, PusherGenerator, DBActorGenerator
+from powerapi.cli.tools import PullerGenerator, PusherGenerator, DBActorGenerator, CommonCLIParser, gen_dispatcher_options
 from powerapi.cli.tools import ModelNameDoesNotExist, DatabaseNameDoesNotExist
+from powerapi.actor import Scheduling, Pickle5Codec
+from powerapi.dispatcher import DispatcherActor, RouteTable
+from powerapi.filter import Filter
 from powerapi.puller import PullerActor
 from powerapi.database import MongoDB
 
@@ -101,6 +104,94 @@ def test_generate_puller_from_simple_config():
     assert db.collection_name == 'tutu'
 
 
+def test_generate_puller_with_transport_create_puller_that_use_this_transport():
+    """
+    generate csv puller from this config :
+    { 'verbose': True, 'stream': True, 'transport': 'ipc', 'input': {'toto': {'model': 'HWPCReport', 'type': 'csv', 'files': []}}}
+
+    Test if the puller socket interface use the ipc transport
+    """
+    args = {'verbose': True, 'stream': True, 'transport': 'ipc', 'input': {'toto': {'model': 'HWPCReport', 'type': 'csv',
+                                                                                   'files': []}}}
+    generator = PullerGenerator(None, [])
+    result = generator.generate(args)
+
+    assert result['toto'].socket_interface.transport == 'ipc'
+
+
+def test_generate_puller_with_puller_scheduling_create_puller_that_use_this_scheduling():
+    """
+    generate csv puller from this config :
+    { 'verbose': True, 'stream': True, 'puller_cpus': '0-1', 'puller_sched': 'idle', 'input': {'toto': {'model': 'HWPCReport', 'type': 'csv', 'files': []}}}
+
+    Test if the puller is pinned on cores 0 and 1 with the idle scheduling policy
+    """
+    args = {'verbose': True, 'stream': True, 'puller_cpus': '0-1', 'puller_sched': 'idle',
+            'input': {'toto': {'model': 'HWPCReport', 'type': 'csv', 'files': []}}}
+    generator = PullerGenerator(None, [])
+    result = generator.generate(args)
+
+    assert result['toto'].scheduling == Scheduling({0, 1}, 'idle')
+
+
+def test_generate_puller_with_addresses_and_registry_create_puller_reachable_from_other_nodes():
+    """
+    generate csv puller from this config :
+    { 'verbose': True, 'stream': True, 'bind_address': '0.0.0.0', 'advertise_address': '10.0.0.1',
+      'registry': 'tcp://10.0.0.2:5555', 'input': {'toto': {'model': 'HWPCReport', 'type': 'csv', 'files': []}}}
+
+    Test if the puller socket interface is bound to all the interfaces,
+    advertise 10.0.0.1 and use the given registry
+    """
+    args = {'verbose': True, 'stream': True, 'bind_address': '0.0.0.0', 'advertise_address': '10.0.0.1',
+            'registry': 'tcp://10.0.0.2:5555', 'input': {'toto': {'model': 'HWPCReport', 'type': 'csv', 'files': []}}}
+    generator = PullerGenerator(None, [])
+    result = generator.generate(args)
+
+    assert result['toto'].socket_interface.bind_address == '0.0.0.0'
+    assert result['toto'].socket_interface.advertise_address == '10.0.0.1'
+    assert result['toto'].socket_interface.registry_address == 'tcp://10.0.0.2:5555'
+
+
+def test_generate_puller_and_dispatcher_with_dispatcher_codec_make_puller_send_reports_with_this_codec():
+    """
+    parse this command line :
+    --dispatcher_codec pickle5 --input socket -p 9999
+
+    create a dispatcher with the generated dispatcher options and a puller
+    sending its reports to this dispatcher
+
+    Test if the socket the puller uses to send reports to the dispatcher encode
+    them with pickle5
+    """
+    config = CommonCLIParser().parse(['--dispatcher_codec', 'pickle5', '--input', 'socket', '-p', '9999'])
+    dispatcher = DispatcherActor('dispatcher', None, RouteTable(), **gen_dispatcher_options(config))
+    report_filter = Filter()
+    report_filter.filter(lambda msg: True, dispatcher)
+    puller = PullerGenerator(report_filter, []).generate(config)['puller_socket']
+
+    _, puller_dispatcher = puller.state.report_filter.filters[0]
+    assert isinstance(puller_dispatcher.socket_interface.codec, Pickle5Codec)
+
+
+def test_generate_pusher_and_dispatcher_with_mailbox_sizes_create_actors_with_bounded_mailboxes():
+    """
+    parse this command line :
+    --dispatcher_mailbox_size 10 --output csv -d /tmp --mailbox_size 5
+
+    create a dispatcher with the generated dispatcher options and the pusher
+
+    Test if the dispatcher mailbox size is 10 and the pusher mailbox size is 5
+    """
+    config = CommonCLIParser().parse(['--dispatcher_mailbox_size', '10', '--output', 'csv', '-d', '/tmp',
+                                      '--mailbox_size', '5'])
+    dispatcher = DispatcherActor('dispatcher', None, RouteTable(), **gen_dispatcher_options(config))
+    pusher = PusherGenerator().generate(config)['pusher_csv']
+
+    assert dispatcher.socket_interface.get_flow_control_metrics()['mailbox_size'] == 10
+    assert pusher.socket_interface.get_flow_control_metrics()['mailbox_size'] == 5
+
+
 def test_generate_two_pusher():
     """
     generate two mongodb puller from this config :
@@ -0,0 +1,114 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import asyncio
+import json
+
+import pytest
+
+import powerapi.database.socket_db
+from powerapi.database.socket_db import IterSocketDB
+from powerapi.report import DeserializationFail
+from powerapi.report_model import HWPCModel
+
+
+def extract_json_report(n):
+    with open('tests/hwpc_reports.json', 'r') as json_file:
+        reports = json.load(json_file)
+    return [json.dumps(report) for report in reports['reports'][:n]]
+
+
+def read_batches(json_reports, batches):
+    """
+    Put the json reports in the queue of an IterSocketDB and call anext_batch
+    for each (max_n, max_wait) of batches
+
+    :return list: result of each call, the raised exception if it fails
+    """
+    async def read():
+        queue = asyncio.Queue()
+        for json_report in json_reports:
+            queue.put_nowait(json_report)
+        iterator = IterSocketDB(HWPCModel(), True, queue)
+        results = []
+        for max_n, max_wait in batches:
+            try:
+                results.append(await iterator.anext_batch(max_n, max_wait))
+            except DeserializationFail as exn:
+                results.append(exn)
+        return results
+    return asyncio.run(read())
+
+
+def test_anext_batch_take_the_received_reports_at_most_max_n():
+    json_reports = extract_json_report(5)
+    first, second = read_batches(json_reports, [(3, 0), (3, 0)])
+    assert [report.target for report in first] == [json.loads(report)['target'] for report in json_reports[:3]]
+    assert len(second) == 2
+
+
+def test_anext_batch_wait_max_wait_for_more_reports():
+    async def read():
+        queue = asyncio.Queue()
+        iterator = IterSocketDB(HWPCModel(), True, queue)
+        json_reports = extract_json_report(2)
+        queue.put_nowait(json_reports[0])
+        asyncio.get_running_loop().call_later(0.05, queue.put_nowait, json_reports[1])
+        return await iterator.anext_batch(10, 0.5)
+
+    assert len(asyncio.run(read())) == 2
+
+
+def test_anext_batch_keep_the_reports_received_after_a_bad_report():
+    json_reports = extract_json_report(2)
+    first, error, second = read_batches([json_reports[0], '{}', json_reports[1]], [(3, 0), (3, 0), (3, 0)])
+    assert len(first) == 1
+    assert isinstance(error, DeserializationFail)
+    assert len(second) == 1
+
+
+def test_anext_batch_without_stream_mode_return_no_report_after_READ_TIMEOUT(monkeypatch):
+    monkeypatch.setattr(powerapi.database.socket_db, 'READ_TIMEOUT', 0.05)
+
+    async def read():
+        iterator = IterSocketDB(HWPCModel(), False, asyncio.Queue())
+        return await iterator.anext_batch(10)
+
+    assert asyncio.run(read()) == []
+
+
+def test_anext_batch_in_stream_mode_wait_for_a_first_report(monkeypatch):
+    monkeypatch.setattr(powerapi.database.socket_db, 'READ_TIMEOUT', 0.05)
+
+    async def read():
+        queue = asyncio.Queue()
+        iterator = IterSocketDB(HWPCModel(), True, queue)
+        asyncio.get_running_loop().call_later(0.2, queue.put_nowait, extract_json_report(1)[0])
+        return await iterator.anext_batch(10)
+
+    assert len(asyncio.run(read())) == 1
@@ -0,0 +1,74 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import pytest
+
+from powerapi.database import IterDB
+from powerapi.report import Report
+from powerapi.report_model.report_model import BadInputData
+
+REPORT1 = Report(1, 2, 3)
+REPORT2 = Report(3, 4, 5)
+
+
+class ListIterDB(IterDB):
+    """
+    IterDB that returns the items of a list, raising those that are exceptions
+    """
+
+    def __init__(self, items):
+        IterDB.__init__(self, None, None, False)
+        self.items = iter(items)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self.items)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+def test_next_batch_return_at_most_max_n_reports():
+    iter_db = ListIterDB([REPORT1, REPORT2, REPORT1])
+    assert iter_db.next_batch(2) == [REPORT1, REPORT2]
+    assert iter_db.next_batch(2) == [REPORT1]
+
+
+def test_next_batch_on_empty_database_raise_StopIteration():
+    with pytest.raises(StopIteration):
+        ListIterDB([]).next_batch(2)
+
+
+def test_next_batch_raise_error_read_after_first_report_on_next_call():
+    iter_db = ListIterDB([REPORT1, BadInputData(), REPORT2])
+    assert iter_db.next_batch(3) == [REPORT1]
+    with pytest.raises(BadInputData):
+        iter_db.next_batch(3)
+    assert iter_db.next_batch(3) == [REPORT2]
@@ -0,0 +1,117 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import asyncio
+import datetime
+import json
+import socket
+
+import pytest
+
+from powerapi.database import SocketDB, BINARY_PROTOCOL_HEADER
+from powerapi.database.binary_protocol import BinaryReportDecoder, LAYOUT_ID, REPORT_FRAME, REPORT_HEADER, FRAME_TYPE
+from powerapi.report import HWPCReport, DeserializationFail
+from powerapi.report_model import HWPCModel
+from powerapi.test_utils.db.socket import BinaryReportEncoder
+from powerapi.utils import LENGTH_PREFIX
+
+
+def gen_report(timestamp_ms):
+    groups = {'core': {'0': {'0': {'CYCLES': 1, 'INSTRUCTIONS': 2}, '1': {'CYCLES': 3, 'INSTRUCTIONS': 4}},
+                       '1': {'2': {'CYCLES': 5, 'INSTRUCTIONS': 2 ** 64 - 1}}},
+              'rapl': {'0': {'0': {'RAPL_ENERGY_PKG': timestamp_ms}}, '1': {'2': {'RAPL_ENERGY_DRAM': 7}}}}
+    timestamp = datetime.datetime.fromtimestamp(0) + datetime.timedelta(milliseconds=timestamp_ms)
+    return HWPCReport(timestamp, 'sensor', 'all', groups)
+
+
+def decode_frames(decoder, data):
+    reports = []
+    while data:
+        size, = LENGTH_PREFIX.unpack_from(data)
+        report = decoder.decode(data[LENGTH_PREFIX.size:LENGTH_PREFIX.size + size])
+        if report is not None:
+            reports.append(report)
+        data = data[LENGTH_PREFIX.size + size:]
+    return reports
+
+
+def assert_report_equals(report1, report2):
+    assert (report1.timestamp, report1.sensor, report1.target, report1.groups) == \
+        (report2.timestamp, report2.sensor, report2.target, report2.groups)
+
+
+def test_decode_reports_encoded_with_the_binary_protocol_return_the_same_reports():
+    encoder = BinaryReportEncoder()
+    reports = [gen_report(1500), gen_report(2856)]
+    first = encoder.encode(reports[0])
+    second = encoder.encode(reports[1])
+
+    # names and layouts are only sent with the first report
+    assert len(second) < len(first)
+    decoded = decode_frames(BinaryReportDecoder(), first + second)
+    assert len(decoded) == 2
+    for report, decoded_report in zip(reports, decoded):
+        assert_report_equals(report, decoded_report)
+
+
+def test_decode_report_frame_with_undefined_layout_raise_DeserializationFail():
+    payload = FRAME_TYPE.pack(REPORT_FRAME) + REPORT_HEADER.pack(0, 0, 0, 1) + LAYOUT_ID.pack(0)
+    with pytest.raises(DeserializationFail):
+        BinaryReportDecoder().decode(payload)
+
+
+def test_read_json_and_binary_reports_sent_to_a_socket_db():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    json_report = {'timestamp': '2020-09-08T15:46:44.856', 'sensor': 'json_sensor', 'target': 'all',
+                   'groups': {'core': {'0': {'0': {'CYCLES': 1}}}}}
+    binary_report = gen_report(1000)
+
+    async def read():
+        socket_db = SocketDB(port)
+        await socket_db.connect()
+        iterator = socket_db.iter(HWPCModel(), True)
+        try:
+            for data in (json.dumps(json_report).encode(),
+                         BINARY_PROTOCOL_HEADER + BinaryReportEncoder().encode(binary_report)):
+                _, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(data)
+                await writer.drain()
+                writer.close()
+            reports = []
+            while len(reports) < 2:
+                reports += await asyncio.wait_for(iterator.anext_batch(2), 5)
+            return reports
+        finally:
+            await socket_db.stop()
+
+    reports = sorted(asyncio.run(read()), key=lambda report: report.sensor)
+    assert reports[0].sensor == 'json_sensor'
+    assert reports[0].groups == json_report['groups']
+    assert_report_equals(reports[1], binary_report)
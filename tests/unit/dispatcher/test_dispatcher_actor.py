@@ -267,6 +267,34 @@ class TestDispatcher(AbstractTestActor):
         assert formula_queue.get(timeout=0.5) == 'soft kill'
 
 
+class TestRouteTable:
+
+    def test_get_dispatch_rule_of_unmapped_report_raise_UnknowMessageTypeException(self):
+        route_table = RouteTable()
+        route_table.dispatch_rule(Report1, DispatchRule1A(primary=True))
+        with pytest.raises(UnknowMessageTypeException):
+            route_table.get_dispatch_rule(REPORT_2)
+
+    def test_get_dispatch_rule_return_rule_mapped_to_report_type(self):
+        route_table = RouteTable()
+        rule1 = DispatchRule1A(primary=True)
+        rule2 = DispatchRule2A()
+        route_table.dispatch_rule(Report1, rule1)
+        route_table.dispatch_rule(Report2, rule2)
+        assert route_table.get_dispatch_rule(REPORT_1) is rule1
+        assert route_table.get_dispatch_rule(REPORT_2) is rule2
+        assert route_table.get_dispatch_rule(REPORT_1_B2) is rule1
+
+    def test_dispatch_rule_after_lookup_invalidate_cached_rule(self):
+        route_table = RouteTable()
+        route_table.dispatch_rule(Report1, DispatchRule1A(primary=True))
+        with pytest.raises(UnknowMessageTypeException):
+            route_table.get_dispatch_rule(REPORT_2)
+        rule2 = DispatchRule2A()
+        route_table.dispatch_rule(Report2, rule2)
+        assert route_table.get_dispatch_rule(REPORT_2) is rule2
+
+
 ###############################################
 ## TEST METIER DE L'EXTRACTION DU FORMULA ID ##
 ###############################################
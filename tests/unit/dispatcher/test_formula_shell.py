@@ -0,0 +1,173 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import time
+
+import pytest
+from mock import Mock
+
+from powerapi.dispatcher import FormulaShellPool, ShellFormula
+from powerapi.dispatcher.formula_shell import FormulaShellReadyMessage, SHELL_POOL_RETRY_DELAY
+
+
+class FakeShell:
+
+    def __init__(self):
+        self.received = []
+
+    def is_alive(self):
+        return True
+
+    def terminate(self):
+        pass
+
+    def send_data_many(self, msgs):
+        self.received += [(msg.formula_name, msg.report) for msg in msgs]
+
+
+@pytest.fixture
+def supervisor():
+    return Mock()
+
+
+@pytest.fixture
+def launcher():
+    return Mock()
+
+
+@pytest.fixture
+def dispatcher():
+    return Mock()
+
+
+@pytest.fixture
+def pool(supervisor, dispatcher, launcher):
+    pool = FormulaShellPool(FakeShell, supervisor, 2, dispatcher, launcher)
+    yield pool
+    pool.stop()
+
+
+def wait_for_full_pool(pool):
+    for _ in range(100):
+        if pool.shells.qsize() == pool.size:
+            return
+        time.sleep(0.01)
+
+
+def test_started_pool_launch_shells_until_it_is_full(pool, supervisor, launcher):
+    pool.start()
+    wait_for_full_pool(pool)
+    assert pool.shells.qsize() == 2
+    assert launcher.launch_actor.call_count == 2
+    assert not supervisor.launch_actor.called
+
+
+def test_acquire_shell_make_pool_launch_a_new_one(pool, supervisor, launcher):
+    pool.start()
+    wait_for_full_pool(pool)
+    shell = pool.acquire()
+    assert isinstance(shell, FakeShell)
+    supervisor.supervise.assert_called_once_with(shell)
+    wait_for_full_pool(pool)
+    assert launcher.launch_actor.call_count == 3
+
+
+def test_pool_launch_a_shell_again_after_a_failed_launch(pool, launcher):
+    launcher.launch_actor.side_effect = [Exception('fork failed'), Exception('fork failed'), None, None]
+    pool.start()
+    time.sleep(SHELL_POOL_RETRY_DELAY * 3)
+    wait_for_full_pool(pool)
+    assert pool.shells.qsize() == 2
+    assert launcher.launch_actor.call_count == 4
+
+
+def test_stopped_pool_give_its_shells_to_the_dispatcher_supervisor(pool, supervisor):
+    pool.start()
+    wait_for_full_pool(pool)
+    pool.stop()
+    assert supervisor.supervise.call_count == 2
+
+
+def test_acquire_shell_from_empty_pool_return_None(pool):
+    assert pool.acquire() is None
+
+
+def test_reports_sent_to_unbound_formula_are_buffered(pool):
+    formula = ShellFormula(pool, 'formula')
+    formula.send_data('report1')
+    formula.send_data_many(['report2', 'report3'])
+    assert formula.is_alive()
+    assert formula.shell is None
+    assert formula.buffer == ['report1', 'report2', 'report3']
+    assert pool.pending == [formula]
+
+
+def test_bind_pending_formula_send_buffered_reports_in_order(pool):
+    formula = ShellFormula(pool, 'formula')
+    formula.send_data('report1')
+    formula.send_data_many(['report2', 'report3'])
+    pool.start()
+    pool.bind_pending(block=True, timeout=2)
+
+    assert pool.pending == []
+    assert formula.shell.received == [('formula', 'report1'), ('formula', 'report2'), ('formula', 'report3')]
+    formula.send_data('report4')
+    assert formula.shell.received[-1] == ('formula', 'report4')
+
+
+def test_formulas_are_bound_to_different_shells(pool):
+    pool.start()
+    formula1 = ShellFormula(pool, 'formula1')
+    formula2 = ShellFormula(pool, 'formula2')
+    assert formula1.bind(block=True, timeout=2)
+    assert formula2.bind(block=True, timeout=2)
+    assert formula1.shell is not formula2.shell
+
+
+def test_soft_close_send_buffered_reports(pool):
+    formula = ShellFormula(pool, 'formula')
+    formula.send_data('report1')
+    pool.start()
+    pool.close(soft=True)
+    assert formula.shell.received == [('formula', 'report1')]
+
+
+def test_pool_notify_dispatcher_when_a_shell_is_available_for_pending_formulas(pool, dispatcher):
+    client = dispatcher.new_client.return_value
+    formula = ShellFormula(pool, 'formula')
+    formula.send_data('report1')
+    pool.start()
+    for _ in range(100):
+        if client.send_data.called:
+            break
+        time.sleep(0.01)
+
+    assert client.send_data.call_count == 1
+    assert isinstance(client.send_data.call_args[0][0], FormulaShellReadyMessage)
+    pool.bind_pending()
+    assert formula.shell.received == [('formula', 'report1')]
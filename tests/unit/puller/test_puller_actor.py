@@ -27,6 +27,7 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 import logging
+import time
 
 from multiprocessing import Queue
 
@@ -34,8 +35,10 @@ import pytest
 
 from mock import Mock
 from powerapi.report import Report
-from powerapi.puller import PullerActor
-from powerapi.message import StartMessage, ErrorMessage
+from powerapi.actor import NoCreditException
+from powerapi.puller import PullerActor, BLOCK_POLICY, DROP_POLICY, UnknowFlowControlPolicyException
+from powerapi.puller.handlers import DBPullerThread, PullBackoff
+from powerapi.message import StartMessage, ErrorMessage, OKMessage
 from powerapi.filter import Filter
 
 from ..actor.abstract_test_actor import AbstractTestActor
@@ -53,6 +56,17 @@ def define_filter(filt):
     return wrap
 
 
+def define_stream_mode(stream_mode):
+    """
+    Decorator to set the _stream_mode
+    attribute for individual tests.
+    """
+    def wrap(func):
+        setattr(func, '_stream_mode', stream_mode)
+        return func
+    return wrap
+
+
 def pytest_generate_tests(metafunc):
     """
     Function called by pytest when collecting a test_XXX function
@@ -74,15 +88,23 @@ def pytest_generate_tests(metafunc):
         filt = getattr(metafunc.function, '_filter', None)
         metafunc.parametrize('filt', [filt])
 
+    if 'stream_mode' in metafunc.fixturenames:
+        stream_mode = getattr(metafunc.function, '_stream_mode', False)
+        metafunc.parametrize('stream_mode', [stream_mode])
+
 
 class FakeDispatcher:
 
     def __init__(self):
         self.q = Queue()
 
-    def send_data(self, report):
+    def send_data(self, report, timeout=None):
         self.q.put(report, block=False)
 
+    def send_data_many(self, reports, timeout=None):
+        for report in reports:
+            self.q.put(report, block=False)
+
 
 class TestPuller(AbstractTestActorWithDB):
 
@@ -95,13 +117,20 @@ class TestPuller(AbstractTestActorWithDB):
         fake_filter = Mock()
         fake_filter.filters = [(Mock(return_value=True), Mock())]
         fake_filter.route = Mock(return_value=[fake_dispatcher])
+        fake_filter.route_many = lambda reports: [(fake_dispatcher, reports)]
         fake_filter.get_type = Mock(return_value=Report)
         return fake_filter
 
     @pytest.fixture
-    def actor(self, fake_db, filt, fake_filter):
+    def actor(self, fake_db, filt, fake_filter, stream_mode):
         filter = fake_filter if filt is None else filt
-        return PullerActor('puller_test', fake_db, filter, 0, level_logger=logging.DEBUG)
+        return PullerActor('puller_test', fake_db, filter, 0, stream_mode=stream_mode, level_logger=logging.DEBUG)
+
+    @define_stream_mode(True)
+    def test_send_StartMessage_to_already_started_actor_answer_ErrorMessage(self, started_actor):
+        # without stream mode, the puller terminates as soon as it read its
+        # empty database
+        AbstractTestActorWithDB.test_send_StartMessage_to_already_started_actor_answer_ErrorMessage(self, started_actor)
 
     @define_database_content([REPORT1, REPORT2])
     def test_start_actor_with_db_thath_contains_2_report_make_actor_send_reports_to_dispatcher(self, started_actor, fake_dispatcher, content):
@@ -117,3 +146,73 @@ class TestPuller(AbstractTestActorWithDB):
         init_actor.send_control(StartMessage())
         msg = init_actor.receive_control(2000)
         assert isinstance(msg, ErrorMessage)
+
+
+def test_create_puller_with_unknow_flow_control_policy_raise_UnknowFlowControlPolicyException():
+    with pytest.raises(UnknowFlowControlPolicyException):
+        PullerActor('puller_test', FakeDB([]), Mock(), 0, flow_control='wait')
+
+
+def test_send_report_to_full_dispatcher_with_drop_policy_drop_the_report():
+    state = Mock(flow_control=DROP_POLICY, dropped_reports=0, alive=True)
+    dispatcher = Mock(send_data_many=Mock(side_effect=NoCreditException()))
+    dispatcher.name = 'dispatcher'
+    DBPullerThread(state, 0, None)._send_reports(dispatcher, [REPORT1])
+
+    dispatcher.send_data_many.assert_called_once_with([REPORT1], timeout=0)
+    assert state.dropped_reports == 1
+
+
+def test_send_report_to_full_dispatcher_with_block_policy_wait_for_free_space():
+    state = Mock(flow_control=BLOCK_POLICY, dropped_reports=0, alive=True)
+    dispatcher = Mock(send_data_many=Mock(side_effect=[NoCreditException(), NoCreditException(), None]))
+    DBPullerThread(state, 0, None)._send_reports(dispatcher, [REPORT1])
+
+    assert dispatcher.send_data_many.call_count == 3
+    assert state.dropped_reports == 0
+
+
+def test_send_reports_to_full_dispatcher_with_drop_policy_drop_the_reports_that_were_not_sent():
+    state = Mock(flow_control=DROP_POLICY, dropped_reports=0, alive=True)
+    dispatcher = Mock(send_data_many=Mock(side_effect=NoCreditException(sent=1)))
+    dispatcher.name = 'dispatcher'
+    DBPullerThread(state, 0, None)._send_reports(dispatcher, [REPORT1, REPORT2, REPORT1])
+
+    assert state.dropped_reports == 2
+
+
+def test_send_reports_to_full_dispatcher_with_block_policy_send_again_the_reports_that_were_not_sent():
+    state = Mock(flow_control=BLOCK_POLICY, dropped_reports=0, alive=True)
+    dispatcher = Mock(send_data_many=Mock(side_effect=[NoCreditException(sent=1), None]))
+    DBPullerThread(state, 0, None)._send_reports(dispatcher, [REPORT1, REPORT2])
+
+    assert dispatcher.send_data_many.call_args_list[1][0][0] == [REPORT2]
+    assert state.dropped_reports == 0
+
+
+def test_pull_backoff_double_after_each_empty_read_up_to_the_puller_timeout():
+    backoff = PullBackoff(5)
+    assert [backoff.next() for _ in range(5)] == [0.001, 0.002, 0.004, 0.005, 0.005]
+
+    backoff.reset()
+    assert backoff.next() == 0.001
+
+
+def test_kill_puller_reading_an_empty_stream_database_terminate_it_without_waiting_the_puller_timeout():
+    fake_filter = Mock(filters=[(Mock(), Mock())], route_many=Mock(return_value=[]))
+    puller = PullerActor('puller_test', FakeDB([]), fake_filter, 0, stream_mode=True, timeout_puller=10000)
+    puller.start()
+    puller.connect_control()
+    try:
+        puller.send_control(StartMessage())
+        assert isinstance(puller.receive_control(2000), OKMessage)
+
+        begin = time.perf_counter()
+        puller.hard_kill()
+        puller.join(5)
+        assert not puller.is_alive()
+        assert time.perf_counter() - begin < 1
+    finally:
+        if puller.is_alive():
+            puller.terminate()
+        puller.socket_interface.close()
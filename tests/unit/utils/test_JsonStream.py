@@ -27,12 +27,13 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 import time
+import json
 import asyncio
 
 import pytest
 from mock import Mock
 
-from powerapi.utils import JsonStream
+from powerapi.utils import JsonStream, UnknowFramingException, NEWLINE_FRAMING, LENGTH_PREFIXED_FRAMING, LENGTH_PREFIX
 
 
 SOCKET_TIMEOUT = 0.2
@@ -51,7 +52,26 @@ class MockedStreamReader(Mock):
             byte_to_read = min(len(self.message), n)
             data = self.message[:byte_to_read]
             self.message = self.message[byte_to_read:]
-            return bytes(data, 'utf-8')
+            return data if isinstance(data, bytes) else bytes(data, 'utf-8')
+
+
+def read_json_objects(message, **kwargs):
+    """
+    Read all the json objects of a message with a JsonStream
+
+    :return list: the read json strings
+    """
+    stream = JsonStream(MockedStreamReader(message), **kwargs)
+
+    async def read():
+        json_strings = []
+        json_string = await stream.read_json_object()
+        while json_string is not None:
+            json_strings.append(json_string)
+            json_string = await stream.read_json_object()
+        return json_strings
+    return asyncio.get_event_loop().run_until_complete(read())
+
 
 def test_read_json_object_from_a_socket_without_data_return_None():
     socket = MockedStreamReader('')
@@ -156,3 +176,38 @@ def test_read_json_object_from_a_socket_with_one_json_string_two_times_bigger_th
     future = asyncio.ensure_future(stream.read_json_object())
     asyncio.get_event_loop().run_until_complete(future)
     assert future.result() is None
+
+
+def test_read_json_object_with_braces_and_escaped_quotes_in_strings_must_return_the_whole_json_string():
+    json_string = '{"a":"}{","b":{"c":"\\"}"},"d":"\\\\"}'
+    assert json.loads(json_string) == {'a': '}{', 'b': {'c': '"}'}, 'd': '\\'}
+
+    assert read_json_objects(json_string + '{"e":1}', buffer_size=3) == [json_string, '{"e":1}']
+
+
+def test_read_json_object_from_a_socket_with_a_json_string_much_bigger_than_the_buffer_size_must_return_it():
+    json_string = json.dumps({'core' + str(i): {'event': i, 'name': '{' * (i % 3)} for i in range(5000)})
+
+    assert read_json_objects(json_string + json_string, buffer_size=16) == [json_string, json_string]
+
+
+def test_read_json_object_with_newline_framing_must_return_each_line():
+    json1 = '{"a":"{"}'
+    json2 = '{"b":2}'
+
+    assert read_json_objects(json1 + '\n\n' + json2 + '\n' + '{"c"', buffer_size=4,
+                             framing=NEWLINE_FRAMING) == [json1, json2]
+
+
+def test_read_json_object_with_length_prefixed_framing_must_return_each_frame():
+    json1 = '{"a":"}"}'
+    json2 = '{"b":2}'
+    message = b''.join(LENGTH_PREFIX.pack(len(json_string)) + json_string.encode() for json_string in (json1, json2))
+
+    assert read_json_objects(message + LENGTH_PREFIX.pack(10) + b'{"c"', buffer_size=3,
+                             framing=LENGTH_PREFIXED_FRAMING) == [json1, json2]
+
+
+def test_create_json_stream_with_unknow_framing_raise_UnknowFramingException():
+    with pytest.raises(UnknowFramingException):
+        JsonStream(MockedStreamReader(''), framing='xml')
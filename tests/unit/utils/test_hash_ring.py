@@ -0,0 +1,75 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import pytest
+
+from powerapi.utils import HashRing
+
+
+def test_get_node_on_empty_ring_raise_ValueError():
+    with pytest.raises(ValueError):
+        HashRing().get_node('toto')
+
+
+def test_get_node_return_a_node_of_the_ring():
+    ring = HashRing(range(4))
+    assert all(ring.get_node('formula' + str(i)) in range(4) for i in range(100))
+
+
+def test_get_node_always_return_the_same_node_for_a_key():
+    ring = HashRing(range(4))
+    assert [ring.get_node('formula' + str(i)) for i in range(100)] == \
+        [HashRing(range(4)).get_node('formula' + str(i)) for i in range(100)]
+
+
+def test_keys_are_spread_over_all_nodes():
+    ring = HashRing(range(4))
+    counts = {node: 0 for node in range(4)}
+    for i in range(4000):
+        counts[ring.get_node('formula' + str(i))] += 1
+    assert all(count > 500 for count in counts.values())
+
+
+def test_add_node_only_remap_keys_to_the_new_node():
+    ring = HashRing(range(4))
+    before = {i: ring.get_node('formula' + str(i)) for i in range(1000)}
+    ring.add_node(4)
+    for i in range(1000):
+        node = ring.get_node('formula' + str(i))
+        assert node == before[i] or node == 4
+
+
+def test_remove_node_only_remap_keys_of_the_removed_node():
+    ring = HashRing(range(4))
+    before = {i: ring.get_node('formula' + str(i)) for i in range(1000)}
+    ring.remove_node(3)
+    assert len(ring) == 3
+    for i in range(1000):
+        if before[i] != 3:
+            assert ring.get_node('formula' + str(i)) == before[i]
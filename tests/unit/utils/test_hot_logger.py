@@ -0,0 +1,84 @@
+# Copyright (c) 2018, INRIA
+# Copyright (c) 2018, University of Lille
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import logging
+
+import pytest
+from mock import Mock
+
+from powerapi.utils import HotPathLogger
+
+
+class Unprintable:
+    def __str__(self):
+        raise AssertionError('message formatted while not logged')
+
+
+@pytest.fixture()
+def logger():
+    logger = logging.getLogger('test_hot_logger')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = Mock()
+    handler.level = logging.DEBUG
+    logger.addHandler(handler)
+    yield logger
+    logger.removeHandler(handler)
+
+
+def logged_messages(logger):
+    return [call.args[0].getMessage() for call in logger.handlers[0].handle.call_args_list]
+
+
+def test_debug_message_is_formatted_with_args(logger):
+    HotPathLogger(logger).debug('send data [%s] to %s', 'toto', 'actor')
+    assert logged_messages(logger) == ['send data [toto] to actor']
+
+
+def test_debug_message_is_not_formatted_when_debug_level_is_disabled(logger):
+    logger.setLevel(logging.WARNING)
+    hot_logger = HotPathLogger(logger)
+    hot_logger.debug('send data [%s]', Unprintable())
+    assert not hot_logger.enabled
+    assert logged_messages(logger) == []
+
+
+def test_refresh_take_new_logger_level_into_account(logger):
+    logger.setLevel(logging.WARNING)
+    hot_logger = HotPathLogger(logger)
+    logger.setLevel(logging.DEBUG)
+    hot_logger.refresh()
+    hot_logger.debug('toto')
+    assert logged_messages(logger) == ['toto']
+
+
+def test_sampled_logger_log_one_message_out_of_sample_rate(logger):
+    hot_logger = HotPathLogger(logger, sample_rate=3)
+    for i in range(7):
+        hot_logger.debug('message %d', i)
+    assert logged_messages(logger) == ['message 2', 'message 5']